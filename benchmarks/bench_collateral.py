@@ -0,0 +1,317 @@
+#!/usr/bin/env python3
+
+"""
+Collateral Benchmarks
+
+This script measures how the read, scan and write paths of this package scale
+with the size of the contract state, offline, against the in-process simulator
+(``celium_collateral_contracts.simulator``):
+- For every size N, a fresh chain is populated with N executors (deposits spread
+  over several miners) and M = N * reclaim ratio pending reclaim requests
+- Each benchmark runs a few rounds; its minimum, median and mean duration and
+  throughput (operations per second at the median) are recorded
+- Results are written as JSON, and ``--compare`` checks them against a previous
+  results file, exiting with status 1 when a benchmark got slower than the threshold
+
+Example:
+    python benchmarks/bench_collateral.py --sizes 10,100,1000 --compare benchmarks/results/1.0.63.json
+"""
+import argparse
+import asyncio
+import io
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+import uuid
+from contextlib import redirect_stderr, redirect_stdout
+from datetime import datetime, timezone
+
+from eth_abi import encode as abi_encode
+
+from celium_collateral_contracts.common import (
+    get_contract,
+    get_executor_collateral,
+    get_function_selectors,
+    send_transactions_pipelined,
+)
+from celium_collateral_contracts.deposit_collateral import deposit_collateral, deposit_collateral_batch
+from celium_collateral_contracts.executor_states import get_executor_states, get_reclaims
+from celium_collateral_contracts.get_collaterals import get_deposit_events
+from celium_collateral_contracts.get_reclaim_requests import get_reclaim_process_started_events
+from celium_collateral_contracts.simulator import FUNCTION_GAS, CollateralSimulator
+
+DEFAULT_SIZES = (10, 100, 1_000, 10_000, 100_000)
+DEFAULT_RECLAIM_RATIO = 0.1
+DEFAULT_ROUNDS = 3
+# Single-call and write benchmarks use at most this many operations per round
+DEFAULT_READ_SAMPLE = 1_000
+DEFAULT_WRITE_SAMPLE = 200
+# Deposits sent one after another, each waiting for its receipt
+SEQUENTIAL_WRITES = 20
+# A benchmark regressed when its median duration per operation is this much slower than the baseline's
+DEFAULT_THRESHOLD = 1.2
+
+MINERS = 10
+MIN_COLLATERAL_INCREASE = 10 ** 15
+SEED_BLOCK_SIZE = 1_000
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+
+
+class BenchmarkChain:
+    """A simulator populated with ``executors`` deposits and ``reclaims`` pending reclaim requests."""
+
+    def __init__(self, executors, reclaims):
+        self.simulator = CollateralSimulator(timestamp=1_700_000_000)
+        self.trustee = self.simulator.create_account()
+        self.miners = [self.simulator.create_account(balance=10 ** 30) for _ in range(MINERS)]
+        self.contract_address = self.simulator.deploy_collateral(
+            self.trustee.address, min_collateral_increase=MIN_COLLATERAL_INCREASE
+        )
+        self.w3 = self.simulator.get_web3()
+        self.executor_uuids = [str(uuid.UUID(int=index + 1)) for index in range(executors)]
+        self.reclaim_request_ids = list(range(1, reclaims + 1))
+        self._next_executor = executors + 1
+        self._populate(reclaims)
+
+    def _populate(self, reclaims):
+        self.seed_deposits(self.executor_uuids, self.miner_of)
+        self.seed([
+            (self.miner_of(index), "reclaimCollateral", ["bytes16", "string", "bytes16"],
+             [uuid.UUID(executor_uuid).bytes, "url", b"\x00" * 16], 0)
+            for index, executor_uuid in enumerate(self.executor_uuids[:reclaims])
+        ])
+
+    def seed_deposits(self, executor_uuids, miner_of):
+        """Deposit the minimum collateral for each executor, from ``miner_of(index)``."""
+        self.seed([
+            (miner_of(index), "deposit", ["bytes16"], [uuid.UUID(executor_uuid).bytes], MIN_COLLATERAL_INCREASE)
+            for index, executor_uuid in enumerate(executor_uuids)
+        ])
+
+    def seed(self, calls):
+        """Apply (sender, function name, argument types, arguments, value) calls.
+
+        Impersonated transactions skip signing and are mined in large blocks.
+        """
+        selectors = get_function_selectors()
+        self.simulator.automine = False
+        for start in range(0, len(calls), SEED_BLOCK_SIZE):
+            for sender, function, types, args, value in calls[start:start + SEED_BLOCK_SIZE]:
+                data = bytes.fromhex(selectors[function][2:]) + abi_encode(types, args)
+                self.simulator.transact(sender.address, self.contract_address, data, value, FUNCTION_GAS[function])
+            self.simulator.mine()
+        self.simulator.automine = True
+
+    def miner_of(self, index):
+        return self.miners[index % MINERS]
+
+    def new_executor_uuids(self, count):
+        """UUIDs of executors without collateral yet."""
+        executor_uuids = [str(uuid.UUID(int=self._next_executor + index)) for index in range(count)]
+        self._next_executor += count
+        return executor_uuids
+
+
+def _measure(function, rounds, setup=None):
+    """Durations of ``rounds`` calls of ``function``, given the result of the untimed ``setup()`` if any."""
+    durations = []
+    for _ in range(rounds):
+        # the library reports progress on stdout/stderr
+        with redirect_stdout(io.StringIO()), redirect_stderr(io.StringIO()):
+            args = (setup(),) if setup is not None else ()
+            start = time.perf_counter()
+            function(*args)
+            durations.append(time.perf_counter() - start)
+    return durations
+
+
+def run_benchmarks(size, reclaim_ratio=DEFAULT_RECLAIM_RATIO, rounds=DEFAULT_ROUNDS,
+                   read_sample=DEFAULT_READ_SAMPLE, write_sample=DEFAULT_WRITE_SAMPLE):
+    """Run every benchmark against a chain with ``size`` executors.
+
+    Returns:
+        list[dict]: One result per benchmark
+    """
+    reclaims = max(1, int(size * reclaim_ratio))
+    start = time.perf_counter()
+    chain = BenchmarkChain(size, reclaims)
+    populate_seconds = time.perf_counter() - start
+    w3, contract_address = chain.w3, chain.contract_address
+    latest = chain.simulator.block_number
+    reads = chain.executor_uuids[:read_sample]
+    writes = min(size, write_sample)
+
+    def single_reads():
+        for executor_uuid in reads:
+            get_executor_collateral(w3, contract_address, executor_uuid)
+
+    def pipelined_deposits():
+        deposits = [(executor_uuid, "0.001") for executor_uuid in chain.new_executor_uuids(writes)]
+        asyncio.run(deposit_collateral_batch(w3, chain.miners[0], deposits, contract_address))
+
+    def sequential_deposits():
+        async def deposit_all(executor_uuids):
+            for executor_uuid in executor_uuids:
+                await deposit_collateral(w3, chain.miners[1], "0.001", contract_address, executor_uuid)
+
+        asyncio.run(deposit_all(chain.new_executor_uuids(min(writes, SEQUENTIAL_WRITES))))
+
+    def slash_targets():
+        executor_uuids = chain.new_executor_uuids(writes)
+        chain.seed_deposits(executor_uuids, lambda index: chain.miners[2])
+        return executor_uuids
+
+    def pipelined_slashes(executor_uuids):
+        contract = get_contract(w3, contract_address)
+        functions = [
+            contract.functions.slashCollateral(uuid.UUID(executor_uuid).bytes, "url", b"\x00" * 16)
+            for executor_uuid in executor_uuids
+        ]
+        asyncio.run(send_transactions_pipelined(w3, chain.trustee, functions, gas_limit=200000))
+
+    benchmarks = [
+        ("scan_deposit_events", size,
+         lambda: asyncio.run(get_deposit_events(w3, contract_address, 0, latest)), None),
+        ("scan_reclaim_process_started_events", reclaims,
+         lambda: asyncio.run(get_reclaim_process_started_events(w3, contract_address, 0, latest)), None),
+        ("get_executor_collateral", len(reads), single_reads, None),
+        ("bulk_executor_states", size,
+         lambda: get_executor_states(w3, contract_address, chain.executor_uuids), None),
+        ("bulk_reclaims", reclaims,
+         lambda: get_reclaims(w3, contract_address, chain.reclaim_request_ids), None),
+        ("deposit_collateral", min(writes, SEQUENTIAL_WRITES), sequential_deposits, None),
+        ("pipelined_deposits", writes, pipelined_deposits, None),
+        ("pipelined_slashes", writes, pipelined_slashes, slash_targets),
+    ]
+    results = []
+    for name, operations, function, setup in benchmarks:
+        durations = _measure(function, rounds, setup)
+        median = statistics.median(durations)
+        results.append({
+            "benchmark": name,
+            "executors": size,
+            "reclaims": reclaims,
+            "operations": operations,
+            "rounds": rounds,
+            "min": min(durations),
+            "median": median,
+            "mean": statistics.mean(durations),
+            "ops_per_second": operations / median if median else None,
+            "populate_seconds": populate_seconds,
+        })
+    return results
+
+
+def package_version():
+    try:
+        from importlib.metadata import version
+
+        return version("celium-collateral-contracts")
+    except Exception:
+        return "dev"
+
+
+def compare_results(results, baseline, threshold=DEFAULT_THRESHOLD):
+    """Compare median durations per operation with a baseline results file.
+
+    Returns:
+        list[dict]: One entry per benchmark and size present in both, with the ratio
+            of the current duration per operation to the baseline's and whether it regressed
+    """
+    def per_operation(result):
+        return result["median"] / max(result["operations"], 1)
+
+    baseline_durations = {
+        (result["benchmark"], result["executors"]): per_operation(result) for result in baseline["results"]
+    }
+    comparisons = []
+    for result in results:
+        baseline_duration = baseline_durations.get((result["benchmark"], result["executors"]))
+        if not baseline_duration:
+            continue
+        ratio = per_operation(result) / baseline_duration
+        comparisons.append({
+            "benchmark": result["benchmark"],
+            "executors": result["executors"],
+            "baseline": baseline_duration,
+            "current": per_operation(result),
+            "ratio": ratio,
+            "regressed": ratio > threshold,
+        })
+    return comparisons
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark scans, bulk reads and pipelined writes against the Collateral simulator"
+    )
+    parser.add_argument(
+        "--sizes", default=",".join(str(size) for size in DEFAULT_SIZES),
+        help="Comma-separated numbers of executors to populate the chain with"
+    )
+    parser.add_argument(
+        "--reclaim-ratio", type=float, default=DEFAULT_RECLAIM_RATIO,
+        help="Pending reclaim requests per executor"
+    )
+    parser.add_argument("--rounds", type=int, default=DEFAULT_ROUNDS, help="Measured rounds per benchmark")
+    parser.add_argument(
+        "--read-sample", type=int, default=DEFAULT_READ_SAMPLE,
+        help="Executors read one by one in the get_executor_collateral benchmark"
+    )
+    parser.add_argument(
+        "--write-sample", type=int, default=DEFAULT_WRITE_SAMPLE,
+        help="Transactions per round of the pipelined write benchmarks"
+    )
+    parser.add_argument("--output", help="Results file (default: benchmarks/results/<version>.json)")
+    parser.add_argument("--compare", help="Results file of a previous run to compare with")
+    parser.add_argument(
+        "--threshold", type=float, default=DEFAULT_THRESHOLD,
+        help="Ratio of median durations per operation above which a benchmark counts as a regression"
+    )
+    args = parser.parse_args()
+
+    version = package_version()
+    results = []
+    for size in (int(size) for size in args.sizes.split(",")):
+        for result in run_benchmarks(size, args.reclaim_ratio, args.rounds, args.read_sample, args.write_sample):
+            print(
+                f"{result['benchmark']:<38} N={size:<7} {result['operations']:>7} ops "
+                f"median {result['median'] * 1000:10.2f} ms  {result['ops_per_second']:12.1f} ops/s",
+                file=sys.stderr,
+            )
+            results.append(result)
+
+    report = {
+        "version": version,
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+    output = args.output or os.path.join(RESULTS_DIR, f"{version}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Results written to {output}", file=sys.stderr)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        comparisons = compare_results(results, baseline, args.threshold)
+        for comparison in comparisons:
+            marker = "REGRESSED" if comparison["regressed"] else ""
+            print(
+                f"{comparison['benchmark']:<38} N={comparison['executors']:<7} "
+                f"{comparison['baseline'] * 1000:8.3f} -> {comparison['current'] * 1000:8.3f} ms/op "
+                f"(x{comparison['ratio']:.2f}) {marker}",
+                file=sys.stderr,
+            )
+        if any(comparison["regressed"] for comparison in comparisons):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
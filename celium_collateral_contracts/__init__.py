@@ -1,18 +1,72 @@
 # This file makes the scripts folder a Python package.
+#
+# Submodules are imported lazily (PEP 562) on first access of one of their names,
+# so scripts only pay for the dependencies they use, e.g. ``h160_to_ss58`` never
+# loads web3 or bittensor.
+import ast
+import functools
+import importlib
+import importlib.util
+import pathlib
+import sys
+import types
 
-from .verify_contract import *
-from .slash_collateral import *
-from .setup_evm import *
-from .send_to_ss58_precompile import *
-from .reclaim_collateral import *
-from .list_contracts import *
-from .get_reclaim_requests import *
-from .get_collaterals import *
-from .get_all_associations import *
-from .generate_keypair import *
-from .finalize_reclaim import *
-from .deposit_collateral import *
-from .deny_request import *
-from .common import *
-from .collateral_contract import *
-from .associate_evm_key import *
+# Submodules whose ``__all__`` names are exported. Where two modules export the
+# same name the later one wins, as with the star imports this replaced.
+_EXPORTING_MODULES = (
+    "simulator", "batch_runner", "daemon", "verify_contract", "slash_collateral", "setup_evm",
+    "send_to_ss58_precompile", "reclaim_collateral", "log_scanner", "get_reclaim_requests",
+    "get_collaterals", "generate_keypair", "finalize_reclaim", "deposit_collateral", "deny_request",
+    "event_index", "event_stream", "receipt_collector", "executor_states", "backup_state",
+    "collateral_view", "reclaim_tracker", "fees", "http_pool", "read_cache", "common",
+    "collateral_contract", "nonce_manager", "address_conversion", "subtensor",
+    # the package-level ``main`` used to be the last star-imported one
+    "associate_evm_key",
+)
+
+
+def _read_all(module):
+    """Read the ``__all__`` of a submodule from its source, without importing it."""
+    tree = ast.parse(pathlib.Path(__file__).with_name(f"{module}.py").read_text())
+    for node in tree.body:
+        if isinstance(node, ast.Assign) and any(getattr(target, "id", None) == "__all__" for target in node.targets):
+            return ast.literal_eval(node.value)
+    return ()
+
+
+@functools.cache
+def _name_to_module():
+    """Public name -> submodule defining it, read on first use."""
+    return {name: module for module in _EXPORTING_MODULES for name in _read_all(module)}
+
+
+def _rebind_shadowed():
+    """Point exported names back at their objects where a submodule of the same name was bound.
+
+    Importing a submodule binds it on the package, e.g. importing ``batch_runner``
+    binds the ``deposit_collateral`` module over the function of that name.
+    """
+    package = globals()
+    for name, module_name in _name_to_module().items():
+        module = sys.modules.get(f"{__name__}.{module_name}")
+        if module is not None and isinstance(package.get(name), types.ModuleType):
+            package[name] = getattr(module, name, package[name])
+
+
+def __getattr__(name):
+    if name == "__all__":
+        return sorted(_name_to_module())
+    module = _name_to_module().get(name)
+    if module is None:
+        if not name.startswith("__") and importlib.util.find_spec(f"{__name__}.{name}") is not None:
+            # submodule attribute, e.g. ``celium_collateral_contracts.common``
+            return importlib.import_module(f"{__name__}.{name}")
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f"{__name__}.{module}"), name)
+    globals()[name] = value
+    _rebind_shadowed()
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_name_to_module()))
@@ -8,8 +8,7 @@ in Substrate-based chains) and H160 addresses (Ethereum-style addresses).
 """
 import hashlib
 
-import bittensor_wallet
-import scalecodec
+__all__ = ["h160_to_ss58", "ss58_to_pubkey"]
 
 
 def ss58_to_pubkey(ss58_address: str) -> bytes:
@@ -25,6 +24,8 @@ def ss58_to_pubkey(ss58_address: str) -> bytes:
     Raises:
         ValueError: If the SS58 address is invalid
     """
+    import bittensor_wallet
+
     try:
         keypair = bittensor_wallet.Keypair(ss58_address=ss58_address)
 
@@ -46,6 +47,8 @@ def h160_to_ss58(h160_address: str, ss58_format: int = 42) -> str:
     Returns:
         str: The ss58 address
     """
+    import scalecodec
+
     if h160_address.startswith("0x"):
         h160_address = h160_address[2:]
 
@@ -7,6 +7,8 @@ import bittensor
 
 from celium_collateral_contracts.subtensor import associate_evm_key
 
+__all__ = ["main"]
+
 
 def main():
     parser = argparse.ArgumentParser()
@@ -1,102 +1,531 @@
 #!/usr/bin/env python3
 
+"""
+Collateral State Backup Script
+
+This script takes a snapshot of the Collateral contract state. Contract mappings
+cannot be enumerated over RPC, so the key set is derived by replaying the event
+history:
+- Executor UUIDs and miners from Deposit, ReclaimProcessStarted, Reclaimed and Slashed
+- Reclaim request IDs from ReclaimProcessStarted, minus those already Reclaimed or Denied
+The values of ``collaterals``, ``executorToMiner`` and ``reclaims`` are then
+bulk-read at one pinned block with batched calls and written to a compact,
+versioned JSON snapshot.
+
+Incremental (delta) snapshots only store the executors and reclaim requests
+touched by events since a previous snapshot's block. A full snapshot plus a chain
+of deltas is restored in O(changes), and can be compacted into a new full snapshot.
+"""
+
+import argparse
+import asyncio
+import gzip
 import json
-import os
+import sys
+import uuid
+from dataclasses import dataclass, field
+
 from web3 import Web3
 
-# Configuration (replace with your actual values)
-RPC_URL = "YOUR_RPC_URL"
-CONTRACT_ADDRESS = "YOUR_CONTRACT_ADDRESS"
-ABI_FILE = "abi.json"
+from celium_collateral_contracts.common import async_call, get_web3_connection, validate_address_format
+from celium_collateral_contracts.common import get_contract as get_collateral_contract
+from celium_collateral_contracts.event_index import EventIndex
+from celium_collateral_contracts.executor_states import (
+    ExecutorState,
+    ReclaimState,
+    async_get_executor_states,
+    async_get_reclaims,
+)
+from celium_collateral_contracts.log_scanner import COLLATERAL_EVENTS, LogScanner
+
+__all__ = [
+    "SNAPSHOT_VERSION", "ZERO_ADDRESS", "SnapshotError", "StateKeys", "CollateralSnapshot",
+    "SnapshotDelta", "write_snapshot", "read_snapshot", "collect_state_keys", "read_state",
+    "take_snapshot", "take_delta", "merge_deltas", "restore_state", "compact_snapshots",
+    "backup_collateral_state", "async_backup_collateral_state",
+]
+
+SNAPSHOT_VERSION = 1
+
+ZERO_ADDRESS = "0x0000000000000000000000000000000000000000"
+
+
+class SnapshotError(Exception):
+    """Raised when a snapshot cannot be taken or read."""
+    pass
+
+
+@dataclass
+class StateKeys:
+    """Keys of the Collateral contract mappings that were touched by events."""
+
+    executor_uuids: set = field(default_factory=set)
+    miners: set = field(default_factory=set)
+    open_reclaim_request_ids: set = field(default_factory=set)
+    closed_reclaim_request_ids: set = field(default_factory=set)
+
+    def add_event(self, name, executor_uuid=None, miner=None, reclaim_request_id=None):
+        """Record the keys touched by one event."""
+        if executor_uuid is not None:
+            self.executor_uuids.add(executor_uuid)
+        if miner is not None:
+            self.miners.add(miner)
+        if name == "ReclaimProcessStarted":
+            self.open_reclaim_request_ids.add(reclaim_request_id)
+        elif name in ("Reclaimed", "Denied"):
+            self.open_reclaim_request_ids.discard(reclaim_request_id)
+            self.closed_reclaim_request_ids.add(reclaim_request_id)
+
+
+def _executor_to_row(state):
+    return [state.executor_uuid, state.miner, str(state.collateral)]
+
+
+def _executor_from_row(row):
+    executor_uuid, miner, collateral = row
+    return ExecutorState(executor_uuid=executor_uuid, collateral=int(collateral), miner=miner)
+
+
+def _reclaim_to_row(reclaim):
+    return [reclaim.reclaim_request_id, reclaim.executor_uuid, reclaim.miner, str(reclaim.amount), reclaim.deny_timeout]
+
+
+def _reclaim_from_row(row):
+    reclaim_request_id, executor_uuid, miner, amount, deny_timeout = row
+    return ReclaimState(
+        reclaim_request_id=reclaim_request_id,
+        executor_uuid=executor_uuid,
+        miner=miner,
+        amount=int(amount),
+        deny_timeout=deny_timeout,
+    )
+
+
+@dataclass
+class CollateralSnapshot:
+    """State of a Collateral contract at one block.
+
+    Executors without collateral and owner, and reclaim requests that were
+    finalized or denied, are left out.
+    """
+
+    contract_address: str
+    block_number: int
+    executors: dict[str, ExecutorState]
+    reclaims: dict[int, ReclaimState]
+    version: int = SNAPSHOT_VERSION
+
+    def pending_reclaims(self):
+        """Collateral under pending reclaims per executor (the contract's private
+        ``collateralUnderPendingReclaims``)."""
+        pending = {}
+        for reclaim in self.reclaims.values():
+            pending[reclaim.executor_uuid] = pending.get(reclaim.executor_uuid, 0) + reclaim.amount
+        return pending
+
+    def apply_delta(self, delta):
+        """Apply a delta taken on top of this snapshot's block, in place and in O(changes)."""
+        if delta.contract_address != self.contract_address:
+            raise SnapshotError(f"Delta of contract {delta.contract_address} cannot be applied to {self.contract_address}")
+        if delta.base_block != self.block_number:
+            raise SnapshotError(
+                f"Delta based on block {delta.base_block} cannot be applied to a snapshot at block {self.block_number}"
+            )
+        for executor_uuid, state in delta.executors.items():
+            if state is None:
+                self.executors.pop(executor_uuid, None)
+            else:
+                self.executors[executor_uuid] = state
+        for reclaim_request_id, reclaim in delta.reclaims.items():
+            if reclaim is None:
+                self.reclaims.pop(reclaim_request_id, None)
+            else:
+                self.reclaims[reclaim_request_id] = reclaim
+        self.block_number = delta.block_number
+
+    def to_dict(self):
+        """Serialize to the compact snapshot format (amounts as decimal strings)."""
+        return {
+            "version": self.version,
+            "type": "full",
+            "contract_address": self.contract_address,
+            "block_number": self.block_number,
+            "executors": [_executor_to_row(state) for state in self.executors.values()],
+            "reclaims": [_reclaim_to_row(reclaim) for reclaim in self.reclaims.values()],
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        """Deserialize from the compact snapshot format."""
+        if data.get("version") != SNAPSHOT_VERSION:
+            raise SnapshotError(f"Unsupported snapshot version: {data.get('version')}")
+        executors = {row[0]: _executor_from_row(row) for row in data["executors"]}
+        reclaims = {row[0]: _reclaim_from_row(row) for row in data["reclaims"]}
+        return cls(
+            contract_address=data["contract_address"],
+            block_number=data["block_number"],
+            executors=executors,
+            reclaims=reclaims,
+        )
+
+
+@dataclass
+class SnapshotDelta:
+    """Changes of the Collateral contract state between two blocks.
+
+    Executors and reclaim requests that were emptied, finalized or denied map to None.
+    """
+
+    contract_address: str
+    base_block: int
+    block_number: int
+    executors: dict[str, ExecutorState | None]
+    reclaims: dict[int, ReclaimState | None]
+    version: int = SNAPSHOT_VERSION
+
+    def to_dict(self):
+        """Serialize to the compact delta format (amounts as decimal strings)."""
+        return {
+            "version": self.version,
+            "type": "delta",
+            "contract_address": self.contract_address,
+            "base_block": self.base_block,
+            "block_number": self.block_number,
+            "executors": [_executor_to_row(state) for state in self.executors.values() if state is not None],
+            "removed_executors": [executor_uuid for executor_uuid, state in self.executors.items() if state is None],
+            "reclaims": [_reclaim_to_row(reclaim) for reclaim in self.reclaims.values() if reclaim is not None],
+            "removed_reclaims": [reclaim_request_id for reclaim_request_id, reclaim in self.reclaims.items() if reclaim is None],
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        """Deserialize from the compact delta format."""
+        if data.get("version") != SNAPSHOT_VERSION:
+            raise SnapshotError(f"Unsupported snapshot version: {data.get('version')}")
+        executors = {row[0]: _executor_from_row(row) for row in data["executors"]}
+        executors.update(dict.fromkeys(data["removed_executors"]))
+        reclaims = {row[0]: _reclaim_from_row(row) for row in data["reclaims"]}
+        reclaims.update(dict.fromkeys(data["removed_reclaims"]))
+        return cls(
+            contract_address=data["contract_address"],
+            base_block=data["base_block"],
+            block_number=data["block_number"],
+            executors=executors,
+            reclaims=reclaims,
+        )
+
+
+def _open(path, mode):
+    return gzip.open(path, mode) if str(path).endswith(".gz") else open(path, mode)
+
+
+def write_snapshot(snapshot, path):
+    """Write a snapshot or delta as compact JSON, gzip-compressed if ``path`` ends with ``.gz``."""
+    with _open(path, "wt") as f:
+        json.dump(snapshot.to_dict(), f, separators=(",", ":"))
+
+
+def read_snapshot(path):
+    """Read a full snapshot or a delta written by ``write_snapshot``."""
+    with _open(path, "rt") as f:
+        data = json.load(f)
+    if data.get("type") == "delta":
+        return SnapshotDelta.from_dict(data)
+    return CollateralSnapshot.from_dict(data)
+
+
+async def collect_state_keys(w3, contract_address, block_num_low, block_num_high, index=None, keys=None,
+                             **scanner_options):
+    """Replay the event history of a block range to find the touched mapping keys.
 
-def get_contract(rpc_url, contract_address, abi_file):
-    """Connects to the blockchain and gets the contract instance."""
+    Args:
+        w3 (Web3 | AsyncWeb3): Web3 instance to use for blockchain interaction
+        contract_address (str): The address of the deployed Collateral contract
+        block_num_low (int): The starting block number (inclusive)
+        block_num_high (int): The ending block number (inclusive)
+        index (EventIndex | None): Local event index to read the events from; it is
+            synced up to ``block_num_high`` first, blocks before its start block are
+            scanned from the RPC
+        keys (StateKeys | None): Keys collected before, to be extended
+        **scanner_options: Extra options forwarded to ``LogScanner``
+
+    Returns:
+        StateKeys: The collected keys
+    """
+    keys = keys if keys is not None else StateKeys()
+    if index is not None:
+        for event in await index.fetch_events(w3, None, block_num_low, block_num_high, **scanner_options):
+            keys.add_event(event.event, event.executor_id, event.miner, event.reclaim_request_id)
+        return keys
+
+    scanner = LogScanner(w3, contract_address, COLLATERAL_EVENTS, **scanner_options)
+    async for event in scanner.scan(block_num_low, block_num_high):
+        args = event["args"]
+        keys.add_event(
+            event["event"],
+            str(uuid.UUID(bytes=args["executorId"])) if "executorId" in args else None,
+            args.get("miner"),
+            args.get("reclaimRequestId"),
+        )
+    return keys
+
+
+async def read_state(w3, contract_address, keys, block_number):
+    """Bulk-read the state of the given keys at a block.
+
+    Returns:
+        tuple[dict[str, ExecutorState], dict[int, ReclaimState]]: Non-empty executors
+            and open reclaim requests
+    """
+    executor_states = await async_get_executor_states(
+        w3, contract_address, sorted(keys.executor_uuids), block_identifier=block_number
+    )
+    executors = {
+        state.executor_uuid: state
+        for state in executor_states.values()
+        if state.collateral or state.miner != ZERO_ADDRESS
+    }
+    reclaim_states = await async_get_reclaims(
+        w3, contract_address, sorted(keys.open_reclaim_request_ids), block_identifier=block_number
+    )
+    reclaims = {reclaim_request_id: reclaim for reclaim_request_id, reclaim in reclaim_states.items() if reclaim.amount}
+    return executors, reclaims
+
+
+async def take_snapshot(w3, contract_address, block_number=None, start_block=0, index=None, **scanner_options):
+    """Take a snapshot of the Collateral contract state at a pinned block.
+
+    Args:
+        w3 (Web3 | AsyncWeb3): Web3 instance to use for blockchain interaction
+        contract_address (str): The address of the deployed Collateral contract
+        block_number (int | None): Block to take the snapshot at, defaults to the latest block
+        start_block (int): First block of the event history (e.g. the deployment block)
+        index (EventIndex | None): Local event index to read the event history from
+        **scanner_options: Extra options forwarded to ``LogScanner``
+
+    Returns:
+        CollateralSnapshot: The contract state at ``block_number``
+    """
+    contract_address = Web3.to_checksum_address(contract_address)
+    if block_number is None:
+        block_number = await async_call(w3, lambda: w3.eth.block_number)
+
+    keys = await collect_state_keys(w3, contract_address, start_block, block_number, index, **scanner_options)
+    print(
+        f"Found {len(keys.executor_uuids)} executors, {len(keys.miners)} miners and "
+        f"{len(keys.open_reclaim_request_ids)} open reclaim requests up to block {block_number}",
+        file=sys.stderr,
+    )
+    executors, reclaims = await read_state(w3, contract_address, keys, block_number)
+    return CollateralSnapshot(
+        contract_address=contract_address,
+        block_number=block_number,
+        executors=executors,
+        reclaims=reclaims,
+    )
+
+
+async def take_delta(w3, contract_address, base_block, block_number=None, index=None, **scanner_options):
+    """Take an incremental snapshot of the state changed after ``base_block``.
+
+    Only the executors and reclaim requests touched by events in
+    ``(base_block, block_number]`` are read; finalized or denied reclaim requests are
+    recorded as removed without reading them.
+
+    Args:
+        w3 (Web3 | AsyncWeb3): Web3 instance to use for blockchain interaction
+        contract_address (str): The address of the deployed Collateral contract
+        base_block (int): Block of the previous (full or delta) snapshot
+        block_number (int | None): Block to take the delta at, defaults to the latest block
+        index (EventIndex | None): Local event index to read the events from
+        **scanner_options: Extra options forwarded to ``LogScanner``
+
+    Returns:
+        SnapshotDelta: The changes between ``base_block`` and ``block_number``
+    """
+    contract_address = Web3.to_checksum_address(contract_address)
+    if block_number is None:
+        block_number = await async_call(w3, lambda: w3.eth.block_number)
+    if block_number < base_block:
+        raise SnapshotError(f"Block {block_number} is before the base block {base_block}")
+
+    keys = await collect_state_keys(w3, contract_address, base_block + 1, block_number, index, **scanner_options)
+    executors, reclaims = await read_state(w3, contract_address, keys, block_number)
+
+    executor_changes = {executor_uuid: executors.get(executor_uuid) for executor_uuid in keys.executor_uuids}
+    reclaim_changes = dict.fromkeys(keys.closed_reclaim_request_ids)
+    reclaim_changes.update(
+        (reclaim_request_id, reclaims.get(reclaim_request_id)) for reclaim_request_id in keys.open_reclaim_request_ids
+    )
+    return SnapshotDelta(
+        contract_address=contract_address,
+        base_block=base_block,
+        block_number=block_number,
+        executors=executor_changes,
+        reclaims=reclaim_changes,
+    )
+
+
+def merge_deltas(deltas):
+    """Merge a contiguous chain of deltas into one delta covering the whole range."""
+    deltas = sorted(deltas, key=lambda delta: delta.base_block)
+    if not deltas:
+        raise SnapshotError("No deltas to merge")
+    merged = SnapshotDelta(
+        contract_address=deltas[0].contract_address,
+        base_block=deltas[0].base_block,
+        block_number=deltas[0].base_block,
+        executors={},
+        reclaims={},
+    )
+    for delta in deltas:
+        if delta.base_block != merged.block_number:
+            raise SnapshotError(f"Gap between block {merged.block_number} and delta based on block {delta.base_block}")
+        merged.executors.update(delta.executors)
+        merged.reclaims.update(delta.reclaims)
+        merged.block_number = delta.block_number
+    return merged
+
+
+def restore_state(base, deltas=()):
+    """Merge a full snapshot and a chain of deltas into an in-memory snapshot.
+
+    Args:
+        base (CollateralSnapshot | str): Full snapshot or path of one
+        deltas (Iterable[SnapshotDelta | str]): Deltas or paths of deltas, in any order
+
+    Returns:
+        CollateralSnapshot: The state at the block of the last delta; ``base`` is not modified
+    """
+    base = read_snapshot(base) if not isinstance(base, CollateralSnapshot) else base
+    deltas = [read_snapshot(delta) if not isinstance(delta, SnapshotDelta) else delta for delta in deltas]
+
+    state = CollateralSnapshot(
+        contract_address=base.contract_address,
+        block_number=base.block_number,
+        executors=dict(base.executors),
+        reclaims=dict(base.reclaims),
+    )
+    for delta in sorted(deltas, key=lambda delta: delta.base_block):
+        state.apply_delta(delta)
+    return state
+
+
+def compact_snapshots(base_path, delta_paths, output_file):
+    """Compact a full snapshot and its deltas into a new full snapshot file."""
+    snapshot = restore_state(base_path, delta_paths)
+    write_snapshot(snapshot, output_file)
+    print(
+        f"Compacted {len(delta_paths)} deltas into a snapshot at block {snapshot.block_number} saved to {output_file}",
+        file=sys.stderr,
+    )
+    return snapshot
+
+
+def get_contract(rpc_url, contract_address, abi_file=None):
+    """Connects to the blockchain and gets the contract instance.
+
+    Kept for callers of ``backup_collateral_state(contract, ...)``; ``abi_file``
+    defaults to the package's contract ABI.
+
+    Returns:
+        tuple[Web3, Contract]: The connection and the contract
+    """
     w3 = Web3(Web3.HTTPProvider(rpc_url))
     if not w3.is_connected():
         raise Exception(f"Failed to connect to web3 provider at {rpc_url}")
-
+    if abi_file is None:
+        return w3, get_collateral_contract(w3, contract_address)
     with open(abi_file, "r") as f:
         abi = json.load(f)
+    return w3, w3.eth.contract(address=contract_address, abi=abi)
 
-    contract = w3.eth.contract(address=contract_address, abi=abi)
-    return w3, contract
-
-def backup_collateral_state(contract, output_file="collateral_backup.json"):
-    """Reads and backs up the state of collateral-related mappings."""
-    backup_data = {}
-
-    # NOTE: Reading full mappings is not directly supported via RPC.
-    # You typically need to know the keys (addresses, reclaimIds, executorUuids)
-    # or iterate through relevant events to collect keys.
-    # This is a basic example assuming you have a way to get the relevant keys.
-
-    # Example: Querying a few known addresses (replace with actual logic to get keys)
-    known_addresses = ["0x...", "0x..."] # Replace with logic to get miner addresses
-    known_reclaim_ids = [1, 2] # Replace with logic to get reclaim IDs
-    # known_executor_uuids = [...] # You would need to track these as well
-
-    backup_data["collaterals"] = {}
-    for address in known_addresses:
-        try:
-            collateral = contract.functions.collaterals(address).call()
-            backup_data["collaterals"][address] = collateral
-        except Exception as e:
-            print(f"Could not read collateral for {address}: {e}")
-
-    backup_data["collateralUnderPendingReclaims"] = {}
-    for address in known_addresses:
-         try:
-            pending = contract.functions.collateralUnderPendingReclaims(address).call()
-            backup_data["collateralUnderPendingReclaims"][address] = pending
-         except Exception as e:
-            print(f"Could not read pending collateral for {address}: {e}")
-
-
-    backup_data["validatorOfMiner"] = {}
-    for address in known_addresses:
-         try:
-            validator = contract.functions.validatorOfMiner(address).call()
-            backup_data["validatorOfMiner"][address] = validator
-         except Exception as e:
-            print(f"Could not read validator for {address}: {e}")
-
-    backup_data["reclaims"] = {}
-    for reclaim_id in known_reclaim_ids:
-        try:
-            reclaim = contract.functions.reclaims(reclaim_id).call()
-            # Reclaim struct might need conversion if it contains complex types
-            backup_data["reclaims"][reclaim_id] = {
-                "miner": reclaim[0],
-                "amount": reclaim[1],
-                "denyTimeout": reclaim[2],
-                "executorUuid": bytes(reclaim[3]).hex() # Convert bytes16 to hex string
-            }
-        except Exception as e:
-             # This will also catch cases where reclaim_id does not exist (amount == 0)
-            # print(f"Could not read reclaim {reclaim_id}: {e}")
-            pass # Ignore non-existent reclaims
-
-    # Backing up collateralPerExecutor is more complex as it's a nested mapping.
-    # You would need lists of both miner addresses and their associated executorUuids.
-    # backup_data["collateralPerExecutor"] = {}
-    # for miner_address in known_addresses:
-    #     backup_data["collateralPerExecutor"][miner_address] = {}
-    #     for executor_uuid in miners_known_executors.get(miner_address, []): # Need to know executors per miner
-    #         try:
-    #             collateral = contract.functions.collateralPerExecutor(miner_address, bytes.fromhex(executor_uuid)).call()
-    #             backup_data["collateralPerExecutor"][miner_address][executor_uuid] = collateral
-    #         except Exception as e:
-    #              print(f"Could not read collateral per executor {executor_uuid} for {miner_address}: {e}")
-
-
-    with open(output_file, "w") as f:
-        json.dump(backup_data, f, indent=4)
-
-    print(f"Backup saved to {output_file}")
 
-if __name__ == "__main__":
+def backup_collateral_state(contract, output_file="collateral_backup.json", block_number=None, start_block=0,
+                            index=None):
+    """Back up the state of a Collateral contract object to ``output_file``.
+
+    Blocking form of ``async_backup_collateral_state`` with the original
+    ``(contract, output_file)`` signature; the file is now a versioned snapshot
+    (see ``CollateralSnapshot``) instead of the former ad-hoc mapping dump.
+    """
+    return asyncio.run(
+        async_backup_collateral_state(contract.w3, contract.address, output_file, block_number, start_block, index)
+    )
+
+
+async def async_backup_collateral_state(w3, contract_address, output_file="collateral_backup.json",
+                                        block_number=None, start_block=0, index=None):
+    """Take a snapshot of the Collateral contract state and write it to ``output_file``."""
+    snapshot = await take_snapshot(w3, contract_address, block_number, start_block, index)
+    write_snapshot(snapshot, output_file)
+    print(
+        f"Backup of {len(snapshot.executors)} executors and {len(snapshot.reclaims)} reclaim requests "
+        f"at block {snapshot.block_number} saved to {output_file}",
+        file=sys.stderr,
+    )
+    return snapshot
+
+
+async def main():
+    parser = argparse.ArgumentParser(
+        description="Back up the state of the Collateral contract by replaying its events"
+    )
+    parser.add_argument(
+        "--contract-address", help="Address of the deployed Collateral contract"
+    )
+    parser.add_argument(
+        "--output", default="collateral_backup.json",
+        help="Snapshot file to write (gzip-compressed if it ends with .gz)"
+    )
+    parser.add_argument(
+        "--block-number", type=int, help="Block to take the snapshot at (defaults to the latest block)"
+    )
+    parser.add_argument(
+        "--start-block", type=int, default=0, help="First block of the event history, e.g. the deployment block"
+    )
+    parser.add_argument(
+        "--since", help="Previous snapshot or delta file; write a delta of the changes after its block"
+    )
+    parser.add_argument(
+        "--compact", nargs="+", metavar="SNAPSHOT",
+        help="Full snapshot followed by its delta files to compact into --output (no RPC access needed)"
+    )
+    parser.add_argument(
+        "--index-db", help="Path of a local event index database to read events from and keep in sync"
+    )
+    parser.add_argument("--network", default="finney", help="The Subtensor Network to connect to.")
+    args = parser.parse_args()
+
+    if args.compact:
+        compact_snapshots(args.compact[0], args.compact[1:], args.output)
+        return
+    if not args.contract_address:
+        parser.error("--contract-address is required")
+
+    validate_address_format(args.contract_address)
+    w3 = get_web3_connection(args.network)
+
+    index = EventIndex(args.index_db, args.contract_address) if args.index_db else None
     try:
-        w3, contract = get_contract(RPC_URL, CONTRACT_ADDRESS, ABI_FILE)
-        backup_collateral_state(contract)
-    except Exception as e:
-        print(f"An error occurred: {e}") 
\ No newline at end of file
+        if args.since:
+            delta = await take_delta(
+                w3, args.contract_address, read_snapshot(args.since).block_number, args.block_number, index
+            )
+            write_snapshot(delta, args.output)
+            print(
+                f"Delta of {len(delta.executors)} executors and {len(delta.reclaims)} reclaim requests "
+                f"for blocks {delta.base_block + 1}-{delta.block_number} saved to {args.output}",
+                file=sys.stderr,
+            )
+        else:
+            await async_backup_collateral_state(
+                w3, args.contract_address, args.output, args.block_number, args.start_block, index
+            )
+    finally:
+        if index is not None:
+            index.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
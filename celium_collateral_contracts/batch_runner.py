@@ -0,0 +1,501 @@
+#!/usr/bin/env python3
+
+"""
+Batch Command Runner
+
+This script runs a list of collateral operations (deposits, reclaims, denials,
+finalizations, slashes and queries) in one process instead of one interpreter
+per command:
+- Steps are read from a JSONL or YAML file, e.g. as written by
+  ``generate_commands.py --batch``
+- All steps share one connection (with its read cache) and one nonce counter per
+  account, so independent transactions are broadcast back-to-back
+- Steps run as soon as their dependencies completed: explicit ``after`` lists,
+  ``"@step-id"`` references to an earlier reclaim, and file order among steps
+  touching the same executor or reclaim request
+- Finalizations wait until the deny timeout of their reclaim request has passed
+  on-chain before they are sent
+- Every step's latency and result are reported as one JSON line on stdout
+
+Step format (one JSON object per line, or a YAML list of mappings)::
+
+    {"id": "reclaim", "op": "reclaim", "executor_uuid": "...", "url": "..."}
+    {"id": "finalize", "op": "finalize", "reclaim_request_id": "@reclaim"}
+"""
+import argparse
+import asyncio
+import json
+import sys
+import time
+import uuid
+from contextlib import redirect_stdout
+from dataclasses import asdict, dataclass, field
+
+from celium_collateral_contracts.common import (
+    async_call,
+    get_account,
+    get_connection_sharing,
+    get_executor_collateral,
+    get_miner_address_of_executor,
+    get_web3_connection,
+    share_connections,
+    validate_address_format,
+)
+from celium_collateral_contracts.deny_request import deny_reclaim_request
+from celium_collateral_contracts.deposit_collateral import deposit_collateral
+from celium_collateral_contracts.executor_states import async_get_reclaims
+from celium_collateral_contracts.finalize_reclaim import finalize_reclaim
+from celium_collateral_contracts.get_reclaim_requests import get_reclaim_process_started_events
+from celium_collateral_contracts.reclaim_collateral import reclaim_collateral
+from celium_collateral_contracts.slash_collateral import slash_collateral
+
+__all__ = [
+    "OPERATIONS", "OPERATION_ALIASES", "DEFAULT_MAX_CONCURRENCY", "BatchRunnerError", "BatchStep",
+    "StepResult", "parse_steps", "load_steps", "BatchRunner",
+]
+
+# Operation -> fields a step of it must have
+OPERATIONS = {
+    "deposit": ("executor_uuid", "amount_tao"),
+    "reclaim": ("executor_uuid",),
+    "deny": ("reclaim_request_id",),
+    "finalize": ("reclaim_request_id",),
+    "slash": ("executor_uuid",),
+    "get_executor_collateral": ("executor_uuid",),
+    "get_reclaim": ("reclaim_request_id",),
+    "get_reclaim_requests": ("block_start", "block_end"),
+    "get_balance": (),
+}
+
+# Script names accepted as operation names
+OPERATION_ALIASES = {
+    "deposit_collateral": "deposit",
+    "reclaim_collateral": "reclaim",
+    "deny_request": "deny",
+    "finalize_reclaim": "finalize",
+    "slash_collateral": "slash",
+}
+
+DEFAULT_MAX_CONCURRENCY = 16
+
+
+class BatchRunnerError(Exception):
+    """Raised when a batch file is malformed."""
+    pass
+
+
+@dataclass
+class BatchStep:
+    """One operation of a batch."""
+
+    id: str
+    op: str
+    params: dict
+    # IDs of the steps that must complete first
+    after: list = field(default_factory=list)
+
+
+@dataclass
+class StepResult:
+    """Result of one step of a batch."""
+
+    id: str
+    op: str
+    success: bool
+    # The step was not run because a dependency failed
+    skipped: bool = False
+    # Seconds from the start of the step until it completed, excluding `waited`
+    latency: float = 0.0
+    # Seconds spent waiting for a deny timeout to pass
+    waited: float = 0.0
+    result: dict | None = None
+    error: str | None = None
+
+
+def parse_steps(records):
+    """Validate step records and resolve their dependencies.
+
+    Args:
+        records (Iterable[dict]): Raw steps, in file order
+
+    Returns:
+        list[BatchStep]: Steps in file order, with implicit dependencies added
+
+    Raises:
+        BatchRunnerError: On unknown operations, missing fields, unknown or duplicate
+            step IDs, and dependency cycles
+    """
+    steps = []
+    ids = set()
+    for number, record in enumerate(records, 1):
+        if not isinstance(record, dict):
+            raise BatchRunnerError(f"Step {number} is not a mapping")
+        params = dict(record)
+        step_id = str(params.pop("id", f"step-{number}"))
+        op = params.pop("op", None)
+        op = OPERATION_ALIASES.get(op, op)
+        if op not in OPERATIONS:
+            raise BatchRunnerError(f"Step {step_id} has unknown op {op!r}, expected one of: {', '.join(OPERATIONS)}")
+        missing = [name for name in OPERATIONS[op] if params.get(name) is None]
+        if missing:
+            raise BatchRunnerError(f"Step {step_id} ({op}) is missing {', '.join(missing)}")
+        if step_id in ids:
+            raise BatchRunnerError(f"Duplicate step ID {step_id}")
+        ids.add(step_id)
+        after = params.pop("after", [])
+        steps.append(BatchStep(step_id, op, params, [after] if isinstance(after, str) else list(after)))
+
+    # steps touching the same executor or reclaim request keep their file order
+    last_by_key = {}
+    executor_keys = {}
+    for step in steps:
+        reference = step.params.get("reclaim_request_id")
+        if isinstance(reference, str) and reference.startswith("@"):
+            step.after.append(reference[1:])
+        keys = []
+        try:
+            if step.params.get("executor_uuid") is not None:
+                keys.append(("executor", str(uuid.UUID(str(step.params["executor_uuid"])))))
+                executor_keys[step.id] = keys[0]
+            if isinstance(reference, str) and reference.startswith("@"):
+                # the referenced reclaim step's executor is touched too
+                if reference[1:] in executor_keys:
+                    keys.append(executor_keys[reference[1:]])
+                keys.append(("reclaim", reference[1:]))
+            elif reference is not None:
+                keys.append(("reclaim", int(reference)))
+        except ValueError as e:
+            raise BatchRunnerError(f"Step {step.id} has an invalid executor UUID or reclaim request ID: {e}") from e
+        for key in keys:
+            if key in last_by_key:
+                step.after.append(last_by_key[key])
+            last_by_key[key] = step.id
+        step.after = list(dict.fromkeys(dependency for dependency in step.after if dependency != step.id))
+        for dependency in step.after:
+            if dependency not in ids:
+                raise BatchRunnerError(f"Step {step.id} depends on unknown step {dependency}")
+
+    _check_acyclic(steps)
+    return steps
+
+
+def _check_acyclic(steps):
+    dependencies = {step.id: step.after for step in steps}
+    done, visiting = set(), set()
+
+    def visit(step_id):
+        if step_id in done:
+            return
+        if step_id in visiting:
+            raise BatchRunnerError(f"Dependency cycle through step {step_id}")
+        visiting.add(step_id)
+        for dependency in dependencies[step_id]:
+            visit(dependency)
+        visiting.discard(step_id)
+        done.add(step_id)
+
+    for step in steps:
+        visit(step.id)
+
+
+def load_steps(path):
+    """Read and validate the steps of a batch file.
+
+    ``.yaml``/``.yml`` files hold a list of steps (or a mapping with a ``steps``
+    list) and need PyYAML; any other file, or ``-`` for stdin, is read as JSONL.
+    Blank lines and lines starting with ``#`` are ignored in JSONL.
+    """
+    if path.endswith((".yaml", ".yml")):
+        try:
+            import yaml
+        except ImportError as e:
+            raise BatchRunnerError("YAML batch files need PyYAML (pip install pyyaml)") from e
+        with open(path) as f:
+            document = yaml.safe_load(f)
+        records = document.get("steps") if isinstance(document, dict) else document
+        if not isinstance(records, list):
+            raise BatchRunnerError(f"{path} does not contain a list of steps")
+        return parse_steps(records)
+
+    f = sys.stdin if path == "-" else open(path)
+    try:
+        records = []
+        for number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            try:
+                records.append(json.loads(line))
+            except ValueError as e:
+                raise BatchRunnerError(f"Line {number} of {path} is not valid JSON: {e}") from e
+    finally:
+        if f is not sys.stdin:
+            f.close()
+    return parse_steps(records)
+
+
+def _tx_result(receipt):
+    return {"tx_hash": receipt["transactionHash"].to_0x_hex(), "block_number": receipt["blockNumber"]}
+
+
+class BatchRunner:
+    """Runs the steps of a batch over one shared connection.
+
+    Args:
+        w3 (Web3 | AsyncWeb3): Web3 instance shared by all steps
+        contract_address (str | None): Collateral contract of steps without a
+            ``contract_address`` of their own
+        private_key (str | None): Key of steps without a ``private_key`` of their
+            own; defaults to the PRIVATE_KEY environment variable
+        max_concurrency (int): Maximum number of steps running at the same time
+        poll_interval (float): Seconds between two chain-time checks while a
+            finalization waits for its deny timeout
+    """
+
+    def __init__(self, w3, contract_address=None, private_key=None,
+                 max_concurrency=DEFAULT_MAX_CONCURRENCY, poll_interval=2.0):
+        self.w3 = w3
+        self.contract_address = contract_address
+        self.private_key = private_key
+        self.max_concurrency = max_concurrency
+        self.poll_interval = poll_interval
+        self._accounts = {}
+
+    def _account(self, params):
+        key = params.get("private_key") or self.private_key
+        if key not in self._accounts:
+            self._accounts[key] = get_account(key)
+        return self._accounts[key]
+
+    def _contract_address(self, params):
+        contract_address = params.get("contract_address") or self.contract_address
+        if contract_address is None:
+            raise BatchRunnerError("No contract address given for the step or the batch")
+        validate_address_format(contract_address)
+        return contract_address
+
+    def _reclaim_request_id(self, params, results):
+        reference = params["reclaim_request_id"]
+        if isinstance(reference, str) and reference.startswith("@"):
+            result = results[reference[1:]].result or {}
+            if "reclaim_request_id" not in result:
+                raise BatchRunnerError(f"Step {reference[1:]} did not start a reclaim request")
+            return result["reclaim_request_id"], result.get("expiration_time")
+        return int(reference), None
+
+    async def _wait_for_deny_timeout(self, contract_address, reclaim_request_id, deny_timeout):
+        if deny_timeout is None:
+            reclaim = (await async_get_reclaims(self.w3, contract_address, [reclaim_request_id]))[reclaim_request_id]
+            if not reclaim.amount:
+                # nothing to wait for, the transaction reports why it fails
+                return
+            deny_timeout = reclaim.deny_timeout
+        while True:
+            block = await async_call(self.w3, self.w3.eth.get_block, "latest")
+            # the next block is the first one whose timestamp is past the deny timeout
+            if block["timestamp"] >= deny_timeout:
+                return
+            await asyncio.sleep(min(self.poll_interval, deny_timeout - block["timestamp"]))
+
+    async def wait_until_due(self, step, results):
+        """Wait until a finalization's deny timeout passed on-chain (unless ``wait_for_timeout`` is false)."""
+        if step.op != "finalize" or not step.params.get("wait_for_timeout", True):
+            return
+        reclaim_request_id, deny_timeout = self._reclaim_request_id(step.params, results)
+        await self._wait_for_deny_timeout(self._contract_address(step.params), reclaim_request_id, deny_timeout)
+
+    async def run_step(self, step, results):
+        """Run one step whose dependencies completed; ``results`` maps step IDs to their ``StepResult``."""
+        params = step.params
+        w3 = self.w3
+
+        if step.op == "deposit":
+            event, receipt = await deposit_collateral(
+                w3, self._account(params), params["amount_tao"], self._contract_address(params),
+                str(params["executor_uuid"]),
+            )
+            result = _tx_result(receipt)
+            if event is not None:
+                result["amount"] = event["args"]["amount"]
+        elif step.op == "reclaim":
+            receipt, event = await reclaim_collateral(
+                w3, self._account(params), self._contract_address(params), params.get("url", ""),
+                str(params["executor_uuid"]),
+            )
+            result = _tx_result(receipt)
+            result.update(
+                reclaim_request_id=event["args"]["reclaimRequestId"],
+                amount=event["args"]["amount"],
+                expiration_time=event["args"]["expirationTime"],
+            )
+        elif step.op == "deny":
+            reclaim_request_id, _ = self._reclaim_request_id(params, results)
+            _, receipt = await deny_reclaim_request(
+                w3, self._account(params), reclaim_request_id, params.get("url", ""), self._contract_address(params),
+            )
+            result = {"reclaim_request_id": reclaim_request_id, **_tx_result(receipt)}
+        elif step.op == "finalize":
+            reclaim_request_id, _ = self._reclaim_request_id(params, results)
+            event, receipt = await finalize_reclaim(
+                w3, self._account(params), reclaim_request_id, self._contract_address(params)
+            )
+            result = {"reclaim_request_id": reclaim_request_id, **_tx_result(receipt)}
+            result["amount"] = event["args"]["amount"] if event is not None else 0
+        elif step.op == "slash":
+            receipt, event = await slash_collateral(
+                w3, self._account(params), self._contract_address(params), params.get("url", ""),
+                str(params["executor_uuid"]),
+            )
+            result = {**_tx_result(receipt), "miner": event["args"]["miner"], "amount": event["args"]["amount"]}
+        elif step.op == "get_executor_collateral":
+            contract_address = self._contract_address(params)
+            executor_uuid = str(params["executor_uuid"])
+            collateral, miner = await asyncio.gather(
+                async_call(w3, get_executor_collateral, w3, contract_address, executor_uuid),
+                async_call(w3, get_miner_address_of_executor, w3, contract_address, executor_uuid),
+            )
+            result = {"collateral_tao": str(collateral), "miner": miner}
+        elif step.op == "get_reclaim":
+            reclaim_request_id, _ = self._reclaim_request_id(params, results)
+            reclaims = await async_get_reclaims(w3, self._contract_address(params), [reclaim_request_id])
+            result = asdict(reclaims[reclaim_request_id])
+        elif step.op == "get_reclaim_requests":
+            events = await get_reclaim_process_started_events(
+                w3, self._contract_address(params), int(params["block_start"]), int(params["block_end"]),
+                params.get("pending_only", False),
+            )
+            result = {"reclaim_request_ids": [event.reclaim_request_id for event in events]}
+        else:  # get_balance
+            address = params.get("address") or self._account(params).address
+            balance = await async_call(w3, w3.eth.get_balance, address)
+            result = {"address": address, "balance_tao": str(w3.from_wei(balance, "ether"))}
+
+        return result
+
+    async def run(self, steps, on_result=None):
+        """Run all steps, each as soon as its dependencies completed.
+
+        A step whose dependency failed is skipped. Independent transactions of the
+        same account are signed with consecutive nonces of its shared NonceManager
+        and broadcast without waiting for each other's receipts; for that
+        ``share_connections`` is turned on while the steps run.
+
+        Args:
+            steps (list[BatchStep]): Steps as returned by ``parse_steps``
+            on_result (Callable[[StepResult], None] | None): Called as each step completes
+
+        Returns:
+            list[StepResult]: One result per step, in input order
+        """
+        # the operations only count nonces locally on shared connections
+        sharing = get_connection_sharing()
+        share_connections()
+        try:
+            return await self._run(steps, on_result)
+        finally:
+            share_connections(*sharing)
+
+    async def _run(self, steps, on_result):
+        results = {}
+        tasks = {}
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def execute(step):
+            await asyncio.gather(*(tasks[dependency] for dependency in step.after))
+            failed = [dependency for dependency in step.after if not results[dependency].success]
+            if failed:
+                step_result = StepResult(
+                    step.id, step.op, success=False, skipped=True, error=f"Dependency {', '.join(failed)} failed"
+                )
+            else:
+                start = time.perf_counter()
+                waited = 0.0
+                try:
+                    # waiting for a deny timeout does not take up a concurrency slot
+                    await self.wait_until_due(step, results)
+                    waited = time.perf_counter() - start
+                    async with semaphore:
+                        result = await self.run_step(step, results)
+                    step_result = StepResult(
+                        step.id, step.op, True, latency=time.perf_counter() - start - waited, waited=waited,
+                        result=result,
+                    )
+                except Exception as e:
+                    step_result = StepResult(
+                        step.id, step.op, False, latency=time.perf_counter() - start - waited, waited=waited,
+                        error=str(e),
+                    )
+            results[step.id] = step_result
+            if on_result is not None:
+                on_result(step_result)
+
+        # dependencies are created first, parse_steps rejected cycles
+        remaining = list(steps)
+        while remaining:
+            for step in list(remaining):
+                if all(dependency in tasks for dependency in step.after):
+                    tasks[step.id] = asyncio.create_task(execute(step))
+                    remaining.remove(step)
+        await asyncio.gather(*tasks.values())
+        return [results[step.id] for step in steps]
+
+
+def _format_result(step_result):
+    report = asdict(step_result)
+    report["latency"] = round(report["latency"], 3)
+    report["waited"] = round(report["waited"], 3)
+    return json.dumps(report, default=str)
+
+
+async def main():
+    parser = argparse.ArgumentParser(
+        description="Run a batch of collateral operations in one process, with shared connection and nonces"
+    )
+    parser.add_argument("batch_file", help="JSONL or YAML file with one operation per step, or - for JSONL on stdin")
+    parser.add_argument("--contract-address", help="Collateral contract of steps that do not name one")
+    parser.add_argument("--private-key", help="Key of steps that do not name one (default: PRIVATE_KEY env)")
+    parser.add_argument("--network", default="finney")
+    parser.add_argument(
+        "--max-concurrency", type=int, default=DEFAULT_MAX_CONCURRENCY,
+        help="Maximum number of steps running at the same time"
+    )
+    parser.add_argument(
+        "--poll-interval", type=float, default=2.0,
+        help="Seconds between chain-time checks while a finalization waits for its deny timeout"
+    )
+    args = parser.parse_args()
+
+    try:
+        steps = load_steps(args.batch_file)
+    except BatchRunnerError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(2)
+
+    share_connections()
+    w3 = get_web3_connection(args.network)
+    runner = BatchRunner(w3, args.contract_address, args.private_key, args.max_concurrency, args.poll_interval)
+
+    def report(step_result):
+        status = "skipped" if step_result.skipped else "ok" if step_result.success else "failed"
+        print(f"[{status}] {step_result.id} ({step_result.op}) in {step_result.latency:.3f}s", file=sys.stderr)
+
+    start = time.perf_counter()
+    # the operations print their details; keep stdout for the JSON report
+    with redirect_stdout(sys.stderr):
+        results = await runner.run(steps, on_result=report)
+    elapsed = time.perf_counter() - start
+
+    for step_result in results:
+        print(_format_result(step_result))
+    failed = sum(not step_result.success for step_result in results)
+    print(
+        f"{len(results)} steps, {failed} failed, {elapsed:.3f}s wall time "
+        f"({sum(step_result.latency for step_result in results):.3f}s of step latency)",
+        file=sys.stderr,
+    )
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
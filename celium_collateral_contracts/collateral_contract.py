@@ -1,23 +1,50 @@
 import asyncio
 from celium_collateral_contracts.common import (
     get_web3_connection,
+    get_async_web3_connection,
     get_account,
+    get_contract,
+    get_websocket_url,
     validate_address_format,
-    get_executor_collateral,
-    get_miner_address_of_executor
+    executor_uuid_to_bytes,
+    async_call,
 )
-from celium_collateral_contracts.deposit_collateral import deposit_collateral
+from celium_collateral_contracts.deposit_collateral import deposit_collateral, deposit_collateral_batch
 from celium_collateral_contracts.reclaim_collateral import reclaim_collateral
-from celium_collateral_contracts.finalize_reclaim import finalize_reclaim
-from celium_collateral_contracts.deny_request import deny_reclaim_request
-from celium_collateral_contracts.slash_collateral import slash_collateral
-from celium_collateral_contracts.get_collaterals import get_deposit_events
-from celium_collateral_contracts.get_reclaim_requests import get_reclaim_process_started_events
+from celium_collateral_contracts.finalize_reclaim import finalize_reclaim, finalize_reclaims_batch
+from celium_collateral_contracts.deny_request import deny_reclaim_request, deny_reclaim_requests_batch
+from celium_collateral_contracts.slash_collateral import slash_collateral, slash_collateral_batch
+from celium_collateral_contracts.get_collaterals import get_deposit_events, get_deposit_events_from_index
+from celium_collateral_contracts.get_reclaim_requests import (
+    get_reclaim_process_started_events,
+    get_reclaim_process_started_events_from_index,
+)
+from celium_collateral_contracts.collateral_view import CollateralView
+from celium_collateral_contracts.reclaim_tracker import ReclaimTracker
+from celium_collateral_contracts.event_index import EventIndex
+from celium_collateral_contracts.event_stream import EventStream
+from celium_collateral_contracts.executor_states import async_get_executor_states
+
+__all__ = ["CollateralContract"]
+
 
 class CollateralContract:
-    def __init__(self, network: str, contract_address: str, owner_key=None, miner_key=None):
+    def __init__(
+        self,
+        network: str,
+        contract_address: str,
+        owner_key=None,
+        miner_key=None,
+        event_index_path=None,
+        use_async_web3=False,
+    ):
+        """
+        Args:
+            use_async_web3: Use a native AsyncWeb3 backend instead of the blocking Web3
+                one, so many concurrent queries and submissions share one event loop
+        """
         try:
-            self.w3 = get_web3_connection(network)
+            self.w3 = get_async_web3_connection(network) if use_async_web3 else get_web3_connection(network)
         except Exception as e:
             print(f"Warning: Failed to connect bittensor network. Error: {e}")
 
@@ -37,7 +64,9 @@ class CollateralContract:
             self.miner_address = None
             print(f"Warning: Failed to initialize miner account. Error: {e}")
 
+        self.network = network
         self.contract_address = contract_address
+        self.event_index = EventIndex(event_index_path, contract_address) if event_index_path else None
 
     async def deposit_collateral(self, amount_tao, executor_uuid):
         """Deposit collateral into the contract."""
@@ -49,6 +78,15 @@ class CollateralContract:
             executor_uuid,
         )
 
+    async def deposit_collateral_batch(self, deposits):
+        """Deposit collateral for many (executor_uuid, amount_tao) pairs with pipelined transactions."""
+        return await deposit_collateral_batch(
+            self.w3,
+            self.miner_account,
+            deposits,
+            self.contract_address,
+        )
+
     async def reclaim_collateral(self, url, executor_uuid):
         """Initiate reclaiming collateral."""
         return await reclaim_collateral(
@@ -68,6 +106,15 @@ class CollateralContract:
             self.contract_address,
         )
 
+    async def finalize_reclaims_batch(self, reclaim_request_ids):
+        """Finalize many reclaim requests with pipelined transactions, skipping those whose dry run reverts."""
+        return await finalize_reclaims_batch(
+            self.w3,
+            self.miner_account,
+            reclaim_request_ids,
+            self.contract_address,
+        )
+
     async def deny_reclaim_request(self, reclaim_request_id, url):
         """Deny a reclaim request."""
         return await deny_reclaim_request(
@@ -88,8 +135,32 @@ class CollateralContract:
             executor_uuid,
         )
 
+    async def deny_reclaim_requests_batch(self, denials):
+        """Deny many (reclaim_request_id, url) pairs with pipelined transactions."""
+        return await deny_reclaim_requests_batch(
+            self.w3,
+            self.owner_account,
+            denials,
+            self.contract_address,
+        )
+
+    async def slash_collateral_batch(self, slashes):
+        """Slash collateral of many (executor_uuid, url) pairs with pipelined transactions."""
+        return await slash_collateral_batch(
+            self.w3,
+            self.owner_account,
+            self.contract_address,
+            slashes,
+        )
+
+    async def sync_event_index(self):
+        """Catch the local event index up with the latest block."""
+        return await self.event_index.sync(self.w3)
+
     async def get_deposit_events(self, block_start, block_end):
         """Fetch deposit events within a block range."""
+        if self.event_index:
+            return await get_deposit_events_from_index(self.w3, self.event_index, block_start, block_end)
         return await get_deposit_events(
             self.w3,
             self.contract_address,
@@ -100,23 +171,77 @@ class CollateralContract:
     async def get_balance(self, address):
         """Get the balance of an Ethereum address."""
         validate_address_format(address)
-        balance = self.w3.eth.get_balance(address)
+        balance = await async_call(self.w3, self.w3.eth.get_balance, address)
         return self.w3.from_wei(balance, "ether")
 
-    async def get_reclaim_events(self):
-        """Fetch claim requests from the latest 1000 blocks."""
-        latest_block = self.w3.eth.block_number
+    async def get_reclaim_events(self, pending_only=False):
+        """Fetch claim requests from the latest 1000 blocks, optionally only those still pending."""
+        latest_block = await async_call(self.w3, lambda: self.w3.eth.block_number)
+        if self.event_index:
+            return await get_reclaim_process_started_events_from_index(
+                self.w3, self.event_index, latest_block-1000, latest_block, pending_only
+            )
         return await get_reclaim_process_started_events(
-            self.w3, self.contract_address, latest_block-1000, latest_block
+            self.w3, self.contract_address, latest_block-1000, latest_block, pending_only
         )
     
+    def stream_events(self, event_names=None, from_block=None, use_websocket=True):
+        """Stream Collateral events as they are mined, e.g. ``async for event in contract.stream_events()``.
+
+        Events arrive over a WebSocket logs subscription (or a polled log filter when
+        ``use_websocket`` is False or the WebSocket endpoint is unreachable), with
+        automatic resubscription and gap backfill.
+        """
+        options = {"event_names": event_names} if event_names else {}
+        return EventStream(
+            self.w3,
+            self.contract_address,
+            ws_url=get_websocket_url(self.network) if use_websocket else None,
+            from_block=from_block,
+            **options,
+        )
+
+    async def get_collateral_view(self, start_block=0, follow=True):
+        """Build an in-memory CollateralView for O(1) collateral lookups.
+
+        The view is seeded from a bulk read at the latest block (replaying events from
+        ``start_block`` to find the executors) and, with ``follow``, kept current from
+        ``stream_events`` in a background task.
+        """
+        view = await CollateralView.load(self.w3, self.contract_address, start_block=start_block, index=self.event_index)
+        if follow:
+            view.start_following(self.stream_events(from_block=view.block_number + 1))
+        return view
+
+    async def get_reclaim_tracker(self, start_block=0, follow=True):
+        """Build a ReclaimTracker of the open reclaim requests, ordered by deny deadline.
+
+        Like ``get_collateral_view``, the tracker is seeded from a bulk read at the
+        latest block and, with ``follow``, kept current from ``stream_events``.
+        """
+        tracker = await ReclaimTracker.load(self.w3, self.contract_address, start_block=start_block, index=self.event_index)
+        if follow:
+            tracker.start_following(self.stream_events(from_block=tracker.block_number + 1))
+        return tracker
+
     async def get_executor_collateral(self, executor_uuid):
         """Get the collateral amount for executor UUID."""
-        return get_executor_collateral(self.w3, self.contract_address, executor_uuid)
+        contract = get_contract(self.w3, self.contract_address)
+        collateral = await async_call(
+            self.w3, contract.functions.collaterals(executor_uuid_to_bytes(executor_uuid)).call
+        )
+        return self.w3.from_wei(collateral, "ether")
 
 
     async def get_miner_address_of_executor(self, executor_uuid):
-        return get_miner_address_of_executor(self.w3, self.contract_address, executor_uuid)
+        contract = get_contract(self.w3, self.contract_address)
+        return await async_call(
+            self.w3, contract.functions.executorToMiner(executor_uuid_to_bytes(executor_uuid)).call
+        )
+
+    async def get_executor_states(self, executor_uuids):
+        """Get collateral and owning miner for many executor UUIDs in batched calls."""
+        return await async_get_executor_states(self.w3, self.contract_address, executor_uuids)
     
 
 async def main():
@@ -156,9 +281,8 @@ async def main():
     ]
 
     # Example deposit (uncomment to perform deposits)
-    for uuid_str, amount in deposit_tasks:
-        print(f"Depositing collateral for executor {uuid_str}...")
-        await contract.deposit_collateral(amount, uuid_str)
+    print(f"Depositing collateral for {len(deposit_tasks)} executors...")
+    await contract.deposit_collateral_batch(deposit_tasks)
 
     # Print executor collateral for each UUID after deposits
     print("\n[EXECUTOR COLLATERAL AFTER DEPOSITS]:")
@@ -172,21 +296,21 @@ async def main():
  
     reclaim_requests = await contract.get_reclaim_events()
     print("reclaim_requests", reclaim_requests)
-    for reclaim_event in reclaim_requests:
-        reclaim_request_id = getattr(reclaim_event, "reclaim_request_id", None)
-        print("Reclaim Request Id:", reclaim_request_id)
-        if reclaim_request_id is not None:
-            try:
-                await contract.finalize_reclaim(reclaim_request_id)
-            except Exception as e:
-                print("Reclaim Error:", str(e))
+    finalize_outcomes = await contract.finalize_reclaims_batch(
+        [reclaim_event.reclaim_request_id for reclaim_event in reclaim_requests]
+    )
+    for outcome in finalize_outcomes:
+        print("Reclaim Request Id:", outcome.reclaim_request_id)
+        if not outcome.success:
+            print("Reclaim Error:", outcome.error)
 
-    for uuid_str, _ in deposit_tasks:
-        print(f"Slashing collateral for executor {uuid_str}...")
-        try:
-            await contract.slash_collateral("slashit", uuid_str)
-        except Exception as e:
-            print("Slash Error:", str(e))
+    print(f"Slashing collateral for {len(deposit_tasks)} executors...")
+    slash_outcomes = await contract.slash_collateral_batch(
+        [(uuid_str, "slashit") for uuid_str, _ in deposit_tasks]
+    )
+    for outcome in slash_outcomes:
+        if not outcome.success:
+            print("Slash Error:", outcome.executor_uuid, outcome.error)
 
     # Verify collateral
     for uuid_str, _ in deposit_tasks:
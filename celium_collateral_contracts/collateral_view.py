@@ -0,0 +1,256 @@
+"""
+Materialized Collateral View
+
+This module keeps an in-memory copy of the per-executor Collateral contract
+state, so questions like "is executor X sufficiently collateralized?" are
+answered with a dictionary lookup instead of an ``eth_call``:
+- Seeded from a bulk-read snapshot (see ``backup_state``)
+- Kept current by applying Deposit, ReclaimProcessStarted, Reclaimed, Denied and
+  Slashed events, e.g. from an ``EventStream``
+- Tracks the collateral under pending reclaims, mirroring the contract's private
+  ``collateralUnderPendingReclaims``
+- Periodically compared with the chain, repairing entries that drifted
+"""
+import asyncio
+import sys
+import uuid
+from dataclasses import dataclass
+
+from celium_collateral_contracts.backup_state import ZERO_ADDRESS, take_snapshot
+from celium_collateral_contracts.common import executor_uuid_to_bytes
+from celium_collateral_contracts.executor_states import (
+    ExecutorState,
+    ReclaimState,
+    async_get_executor_states,
+    async_get_reclaims,
+)
+
+__all__ = ["ViewMismatch", "CollateralView"]
+
+
+@dataclass
+class ViewMismatch:
+    """An entry of the view that differs from the chain."""
+
+    key: str | int
+    field: str
+    view_value: object
+    chain_value: object
+
+
+def _executor_key(executor_uuid):
+    if isinstance(executor_uuid, uuid.UUID):
+        return str(executor_uuid)
+    return str(uuid.UUID(bytes=executor_uuid_to_bytes(executor_uuid)))
+
+
+class CollateralView:
+    """In-memory, event-driven view of the Collateral contract state.
+
+    All amounts are in wei. The view reflects the chain at ``block_number``.
+
+    Args:
+        contract_address (str): The address of the deployed Collateral contract
+        block_number (int): Block whose state the view starts from
+    """
+
+    def __init__(self, contract_address, block_number):
+        self.contract_address = contract_address
+        self.block_number = block_number
+        self.collaterals = {}
+        self.miners = {}
+        self.pending = {}
+        self.reclaims = {}
+        # (block number, log index) of the last applied event
+        self._last_log = (block_number, float("inf"))
+        self._task = None
+
+    @classmethod
+    def from_snapshot(cls, snapshot):
+        """Build a view from a ``CollateralSnapshot``."""
+        view = cls(snapshot.contract_address, snapshot.block_number)
+        for state in snapshot.executors.values():
+            view.collaterals[state.executor_uuid] = state.collateral
+            if state.miner != ZERO_ADDRESS:
+                view.miners[state.executor_uuid] = state.miner
+        for reclaim in snapshot.reclaims.values():
+            view.reclaims[reclaim.reclaim_request_id] = reclaim
+        view.pending = snapshot.pending_reclaims()
+        return view
+
+    @classmethod
+    async def load(cls, w3, contract_address, block_number=None, start_block=0, index=None):
+        """Seed a view from a bulk read of the chain; see ``backup_state.take_snapshot``."""
+        return cls.from_snapshot(await take_snapshot(w3, contract_address, block_number, start_block, index))
+
+    def get_collateral(self, executor_uuid):
+        """Collateral of an executor."""
+        return self.collaterals.get(_executor_key(executor_uuid), 0)
+
+    def get_miner(self, executor_uuid):
+        """Address of the miner owning an executor, or None."""
+        return self.miners.get(_executor_key(executor_uuid))
+
+    def get_pending_reclaim_amount(self, executor_uuid):
+        """Collateral of an executor under pending reclaim requests."""
+        return self.pending.get(_executor_key(executor_uuid), 0)
+
+    def get_available_collateral(self, executor_uuid):
+        """Collateral of an executor that is not under a pending reclaim request."""
+        executor_uuid = _executor_key(executor_uuid)
+        return self.collaterals.get(executor_uuid, 0) - self.pending.get(executor_uuid, 0)
+
+    def is_sufficiently_collateralized(self, executor_uuid, min_collateral, include_pending=False):
+        """Check whether an executor holds at least ``min_collateral`` wei.
+
+        Collateral under pending reclaims is not counted unless ``include_pending`` is set.
+        """
+        if include_pending:
+            return self.get_collateral(executor_uuid) >= min_collateral
+        return self.get_available_collateral(executor_uuid) >= min_collateral
+
+    def _add_pending(self, executor_uuid, amount):
+        pending = self.pending.get(executor_uuid, 0) + amount
+        if pending > 0:
+            self.pending[executor_uuid] = pending
+        else:
+            self.pending.pop(executor_uuid, None)
+
+    def apply_event(self, event):
+        """Apply one decoded Collateral event.
+
+        Events at or before the last applied one (e.g. already contained in the seed
+        snapshot, or delivered twice) are ignored.
+
+        Returns:
+            bool: Whether the event changed the view
+        """
+        position = (event["blockNumber"], event["logIndex"])
+        if position <= self._last_log:
+            return False
+        self._last_log = position
+        self.block_number = event["blockNumber"]
+
+        args = event["args"]
+        name = event["event"]
+        executor_uuid = str(uuid.UUID(bytes=args["executorId"])) if "executorId" in args else None
+
+        if name == "Deposit":
+            self.collaterals[executor_uuid] = self.collaterals.get(executor_uuid, 0) + args["amount"]
+            self.miners[executor_uuid] = args["miner"]
+        elif name == "ReclaimProcessStarted":
+            self.reclaims[args["reclaimRequestId"]] = ReclaimState(
+                reclaim_request_id=args["reclaimRequestId"],
+                executor_uuid=executor_uuid,
+                miner=args["miner"],
+                amount=args["amount"],
+                deny_timeout=args["expirationTime"],
+            )
+            self._add_pending(executor_uuid, args["amount"])
+        elif name == "Reclaimed":
+            self.reclaims.pop(args["reclaimRequestId"], None)
+            self._add_pending(executor_uuid, -args["amount"])
+            collateral = self.collaterals.get(executor_uuid, 0) - args["amount"]
+            if collateral > 0:
+                self.collaterals[executor_uuid] = collateral
+            else:
+                self.collaterals.pop(executor_uuid, None)
+            # finalizing a reclaim releases the executor's owner
+            self.miners.pop(executor_uuid, None)
+        elif name == "Denied":
+            reclaim = self.reclaims.pop(args["reclaimRequestId"], None)
+            if reclaim is not None:
+                self._add_pending(reclaim.executor_uuid, -reclaim.amount)
+        elif name == "Slashed":
+            self.collaterals.pop(executor_uuid, None)
+            self.miners.pop(executor_uuid, None)
+        else:
+            return False
+        return True
+
+    async def follow(self, events):
+        """Apply events from an async iterator (e.g. an ``EventStream``) until it ends."""
+        async for event in events:
+            self.apply_event(event)
+
+    def start_following(self, events):
+        """Apply events from an async iterator in a background task."""
+        self._task = asyncio.create_task(self.follow(events))
+        return self._task
+
+    async def check_consistency(self, w3, repair=True):
+        """Compare the view with the chain at the view's block.
+
+        Args:
+            w3 (Web3 | AsyncWeb3): Web3 instance to use for blockchain interaction
+            repair (bool): Overwrite drifted entries with the chain values
+
+        Returns:
+            list[ViewMismatch]: Entries that differ from the chain
+        """
+        block_number = self.block_number
+        executor_uuids = sorted(set(self.collaterals) | set(self.miners) | set(self.pending))
+        reclaim_request_ids = sorted(self.reclaims)
+        executor_states = await async_get_executor_states(
+            w3, self.contract_address, executor_uuids, block_identifier=block_number
+        )
+        reclaim_states = await async_get_reclaims(
+            w3, self.contract_address, reclaim_request_ids, block_identifier=block_number
+        )
+
+        mismatches = []
+        for executor_uuid, state in executor_states.items():
+            collateral = self.collaterals.get(executor_uuid, 0)
+            if collateral != state.collateral:
+                mismatches.append(ViewMismatch(executor_uuid, "collateral", collateral, state.collateral))
+            miner = self.miners.get(executor_uuid, ZERO_ADDRESS)
+            if miner != state.miner:
+                mismatches.append(ViewMismatch(executor_uuid, "miner", miner, state.miner))
+        for reclaim_request_id, reclaim in reclaim_states.items():
+            view_reclaim = self.reclaims.get(reclaim_request_id)
+            if reclaim.amount != view_reclaim.amount:
+                mismatches.append(ViewMismatch(reclaim_request_id, "reclaim_amount", view_reclaim.amount, reclaim.amount))
+
+        if repair and mismatches and block_number == self.block_number:
+            self._repair(executor_states, reclaim_states)
+        return mismatches
+
+    def _repair(self, executor_states: dict[str, ExecutorState], reclaim_states: dict[int, ReclaimState]):
+        for executor_uuid, state in executor_states.items():
+            if state.collateral:
+                self.collaterals[executor_uuid] = state.collateral
+            else:
+                self.collaterals.pop(executor_uuid, None)
+            if state.miner != ZERO_ADDRESS:
+                self.miners[executor_uuid] = state.miner
+            else:
+                self.miners.pop(executor_uuid, None)
+        for reclaim_request_id, reclaim in reclaim_states.items():
+            if reclaim.amount:
+                self.reclaims[reclaim_request_id] = reclaim
+            else:
+                self.reclaims.pop(reclaim_request_id, None)
+        self.pending = {}
+        for reclaim in self.reclaims.values():
+            self._add_pending(reclaim.executor_uuid, reclaim.amount)
+
+    async def run_consistency_checks(self, w3, interval=600):
+        """Check the view against the chain every ``interval`` seconds, repairing drift."""
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                mismatches = await self.check_consistency(w3)
+            except Exception as e:
+                print(f"Collateral view consistency check failed: {e}", file=sys.stderr)
+                continue
+            if mismatches:
+                print(
+                    f"Collateral view repaired {len(mismatches)} entries at block {self.block_number}",
+                    file=sys.stderr,
+                )
+
+    def stop(self):
+        """Stop following events."""
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
@@ -4,7 +4,7 @@ Common Utilities for Collateral Management
 This module provides shared functionality for interacting with the Collateral smart contract.
 It includes utilities for:
 - Loading contract ABIs
-- Establishing Web3 connections
+- Establishing Web3 connections, blocking (Web3) or native async (AsyncWeb3)
 - Managing accounts and transactions
 - Retrieving and processing blockchain events
 - Validating addresses and calculating checksums
@@ -15,22 +15,107 @@ import pathlib
 import sys
 import json
 import hashlib
+import functools
+import weakref
+import asyncio
+import re
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
 
-import bittensor
-import requests
 import web3.providers.auto
 from eth_typing import URI
-from web3 import Web3
+from web3 import AsyncWeb3, HTTPProvider, Web3
+from eth_abi import decode as abi_decode
 from eth_account import Account
-from web3.exceptions import ContractLogicError
-
-
+from hexbytes import HexBytes
+from web3.exceptions import ContractLogicError, TimeExhausted, TransactionNotFound
+
+from celium_collateral_contracts.fees import Fees, async_suggest_fees, get_fee_config, suggest_fees
+from celium_collateral_contracts.http_pool import PooledAsyncHTTPProvider, get_http_pool_config, get_session
+from celium_collateral_contracts.nonce_manager import (
+    NonceManager,
+    get_nonce_manager,
+    is_already_known_error,
+    is_nonce_error,
+)
+
+if TYPE_CHECKING:
+    import bittensor
+
+__all__ = [
+    "load_contract_abi", "abi_signature", "get_event_topics", "get_function_selectors",
+    "get_contract", "RPC_URLS", "get_rpc_url", "get_websocket_url", "get_web3_connection",
+    "share_connections", "get_connection_sharing", "get_async_web3_connection", "is_async_web3",
+    "async_call", "get_account", "validate_address_format", "get_chain_id", "async_get_chain_id",
+    "DEFAULT_GAS_MARGIN", "PreflightError", "configure_preflight", "preflight_transaction",
+    "async_preflight_transaction", "build_and_send_transaction", "async_build_and_send_transaction",
+    "wait_for_receipt", "async_wait_for_receipt", "wait_for_receipts", "TransactionOutcome",
+    "send_transactions_pipelined", "calculate_md5_checksum", "calculate_md5_checksums",
+    "RevertReason", "ERROR_SELECTORS", "decode_revert_data", "get_revert_reason",
+    "async_get_revert_reason", "simulate_transaction", "explain_failed_transactions",
+    "get_evm_key_associations", "executor_uuid_to_bytes", "get_executor_collateral",
+    "get_miner_address_of_executor",
+]
+
+
+@functools.lru_cache(maxsize=None)
 def load_contract_abi():
-    """Load the contract ABI from the artifacts file."""
+    """Load the contract ABI from the artifacts file.
+
+    The file is parsed once per process; the returned list is shared and must not be modified.
+    """
     abi_file = pathlib.Path(__file__).parent / "abi.json"
     return json.loads(abi_file.read_text())
 
 
+def abi_signature(abi_item):
+    """Return the canonical signature of an ABI function, event or error, e.g. ``deposit(bytes16)``."""
+    return abi_item["name"] + "(" + ",".join(i["type"] for i in abi_item.get("inputs", [])) + ")"
+
+
+@functools.lru_cache(maxsize=None)
+def get_event_topics():
+    """Map the contract's event names to their topic hashes (0x-prefixed hex)."""
+    return {
+        item["name"]: Web3.to_hex(Web3.keccak(text=abi_signature(item)))
+        for item in load_contract_abi()
+        if item.get("type") == "event"
+    }
+
+
+@functools.lru_cache(maxsize=None)
+def get_function_selectors():
+    """Map the contract's function names to their 4-byte selectors (0x-prefixed hex)."""
+    return {
+        item["name"]: Web3.to_hex(Web3.keccak(text=abi_signature(item))[:4])
+        for item in load_contract_abi()
+        if item.get("type") == "function"
+    }
+
+
+# Attribute of a Web3 instance holding its contract objects by address. The objects
+# reference the instance, so they are kept on it rather than in a weak-keyed
+# registry, whose entries they would keep alive; they are collected together.
+_CONTRACTS_ATTRIBUTE = "_collateral_contracts"
+
+
+def get_contract(w3, contract_address):
+    """Return the Collateral contract object for a Web3 instance and address.
+
+    Contract objects are built once per (w3, address) pair and reused afterwards.
+    """
+    contract_address = Web3.to_checksum_address(contract_address)
+    contracts = vars(w3).setdefault(_CONTRACTS_ATTRIBUTE, {})
+    contract = contracts.get(contract_address)
+    if contract is None:
+        contract = w3.eth.contract(address=contract_address, abi=load_contract_abi())
+        contracts[contract_address] = contract
+    return contract
+
+
 RPC_URLS = {
     "local": "http://127.0.0.1:9944",
     # "finney": "https://entrypoint-finney.opentensor.ai",
@@ -39,18 +124,121 @@ RPC_URLS = {
 }
 
 
-def get_web3_connection(network: str) -> Web3:
-    """Get Web3 connection for the specified network."""
+def get_rpc_url(network: str) -> str:
+    """Get the EVM RPC URL of the specified network."""
     if network in RPC_URLS:
-        network_url = RPC_URLS[network]
+        return RPC_URLS[network]
+    # bittensor is slow to import, so it is only loaded for custom networks
+    from bittensor.utils import determine_chain_endpoint_and_network
+
+    _, network_url = determine_chain_endpoint_and_network(network)
+    return network_url
+
+
+def get_websocket_url(network: str) -> str:
+    """Get the EVM WebSocket URL of the specified network (served on the same endpoint as HTTP)."""
+    network_url = get_rpc_url(network)
+    if network_url.startswith("https://"):
+        return "wss://" + network_url[len("https://"):]
+    if network_url.startswith("http://"):
+        return "ws://" + network_url[len("http://"):]
+    return network_url
+
+
+# Connections reused across get_web3_connection calls, see share_connections
+_shared_connections = {}
+_share_connections = False
+_track_nonces = False
+
+
+def share_connections(enabled=True, track_nonces=True):
+    """Reuse one Web3 instance per network for all ``get_web3_connection`` calls of the process.
+
+    Meant for long-lived processes (see ``daemon``) running many commands: the
+    instances keep their read cache and contract objects between commands.
+
+    Args:
+        enabled (bool): Reuse connections
+        track_nonces (bool): Also count the nonces of single transactions locally
+            (see ``NonceManager``) instead of querying them for every transaction
+    """
+    global _share_connections, _track_nonces
+    _share_connections = enabled
+    _track_nonces = enabled and track_nonces
+    if not enabled:
+        _shared_connections.clear()
+
+
+def get_connection_sharing():
+    """The current ``share_connections`` settings as ``(enabled, track_nonces)``."""
+    return _share_connections, _track_nonces
+
+
+def get_web3_connection(network: str, read_cache=True) -> Web3:
+    """Get Web3 connection for the specified network.
+
+    HTTP(S) providers share the pooled session of the network (see ``http_pool``), so
+    connections are kept alive and reused across connections to the same network.
+    Unless ``read_cache`` is False, repeated read-only requests are served from a
+    block-aware cache (see ``read_cache``).
+    """
+    from celium_collateral_contracts.read_cache import install_read_cache
+
+    if _share_connections and (network, read_cache) in _shared_connections:
+        return _shared_connections[network, read_cache]
+    network_url = get_rpc_url(network)
+    if network_url.startswith(("http://", "https://")):
+        provider = HTTPProvider(
+            network_url,
+            request_kwargs={"timeout": get_http_pool_config().timeout},
+            session=get_session(network),
+        )
     else:
-        _, network_url = bittensor.utils.determine_chain_endpoint_and_network(network)
-    w3 = Web3(web3.providers.auto.load_provider_from_uri(URI(network_url)))
+        provider = web3.providers.auto.load_provider_from_uri(URI(network_url))
+    w3 = Web3(provider)
+    if read_cache:
+        install_read_cache(w3)
     if not w3.is_connected():
         raise ConnectionError("Failed to connect to the network")
+    if _share_connections:
+        _shared_connections[network, read_cache] = w3
+    return w3
+
+
+def get_async_web3_connection(network: str, read_cache=True) -> AsyncWeb3:
+    """Get a native async Web3 connection for the specified network.
+
+    Requests are sent over an aiohttp session owned by the provider and shared by
+    all requests of the returned instance, so many concurrent queries and
+    submissions can run on one event loop without worker threads. The session uses
+    the pool size, keep-alive and timeout settings of ``http_pool``. The connection
+    is opened lazily, use ``await w3.is_connected()`` to check it.
+    """
+    from celium_collateral_contracts.read_cache import install_read_cache
+
+    w3 = AsyncWeb3(PooledAsyncHTTPProvider(get_rpc_url(network), get_http_pool_config()))
+    if read_cache:
+        install_read_cache(w3)
     return w3
 
 
+def is_async_web3(w3):
+    """Check whether a Web3 instance is an AsyncWeb3 (native async) instance."""
+    return isinstance(w3, AsyncWeb3)
+
+
+async def async_call(w3, func, *args, **kwargs):
+    """Run a Web3 request without blocking the event loop.
+
+    With AsyncWeb3 the request is awaited directly, with the blocking Web3 backend it
+    runs in a worker thread. Properties can be read through a lambda, e.g.
+    ``await async_call(w3, lambda: w3.eth.block_number)``.
+    """
+    if is_async_web3(w3):
+        return await func(*args, **kwargs)
+    return await asyncio.to_thread(func, *args, **kwargs)
+
+
 def get_account(keystr=None):
     """Get the account from the keyfile or PRIVATE_KEY environment variable."""
     if keystr:
@@ -68,44 +256,514 @@ def validate_address_format(address):
         raise ValueError("Invalid address")
 
 
+# Chain IDs per Web3 instance, they never change for a connection
+_chain_ids = weakref.WeakKeyDictionary()
+
+
+def get_chain_id(w3):
+    """Return the chain ID of a Web3 connection, fetched once per instance."""
+    chain_id = _chain_ids.get(w3)
+    if chain_id is None:
+        chain_id = _chain_ids[w3] = w3.eth.chain_id
+    return chain_id
+
+
+async def async_get_chain_id(w3):
+    """Async counterpart of ``get_chain_id``, usable with both Web3 and AsyncWeb3."""
+    chain_id = _chain_ids.get(w3)
+    if chain_id is None:
+        chain_id = _chain_ids[w3] = await async_call(w3, lambda: w3.eth.chain_id)
+    return chain_id
+
+
+def _sign_transaction(w3, transaction, account):
+    signed_txn = w3.eth.account.sign_transaction(transaction, account.key)
+
+    raw_tx = getattr(signed_txn, "rawTransaction", None) or getattr(signed_txn, "raw_transaction", None)
+
+    if raw_tx is None:
+        raise AttributeError("Signed transaction has neither 'rawTransaction' nor 'raw_transaction'.")
+    return raw_tx
+
+
+def _handle_send_error(error, raw_tx, nonce, attempt, nonce_manager):
+    """Decide how to go on after a failed broadcast.
+
+    Returns the transaction hash if the node already has the transaction, None if it
+    should be sent again with a fresh nonce, and re-raises the error otherwise.
+    """
+    if nonce_manager is None:
+        raise error
+    if is_already_known_error(error):
+        # the node already has this exact transaction, e.g. after a retried request
+        return Web3.keccak(raw_tx)
+    nonce_manager.resync()
+    if attempt or not is_nonce_error(error):
+        raise error
+    print(f"Nonce {nonce} rejected, retrying with a fresh nonce: {error}", file=sys.stderr)
+    return None
+
+
+# Extra gas added on top of estimate_gas results, as a fraction of the estimate
+DEFAULT_GAS_MARGIN = 0.2
+
+_preflight_enabled = False
+_gas_margin = DEFAULT_GAS_MARGIN
+
+
+class PreflightError(Exception):
+    """Raised when a transaction is not broadcast because its simulation reverted."""
+
+    def __init__(self, reason):
+        super().__init__(f"Transaction would revert: {reason}")
+        self.reason = reason
+
+
+def configure_preflight(enabled=True, gas_margin=DEFAULT_GAS_MARGIN):
+    """Enable or disable the pre-flight simulation of all sent transactions by default.
+
+    Args:
+        enabled (bool): Simulate transactions before broadcasting them
+        gas_margin (float): Extra gas on top of the estimate, as a fraction of it
+    """
+    global _preflight_enabled, _gas_margin
+    _preflight_enabled = enabled
+    _gas_margin = gas_margin
+
+
+def _use_preflight(preflight):
+    return _preflight_enabled if preflight is None else preflight
+
+
+def _revert_reason_or_message(error):
+    revert_data = _extract_revert_data(error)
+    reason = decode_revert_data(revert_data) if revert_data else None
+    return reason or RevertReason(name=str(error) or "Could not parse error", args={})
+
+
+def _preflight_gas(estimate):
+    return int(estimate * (1 + _gas_margin))
+
+
+def preflight_transaction(w3, function_call, account, value=0):
+    """Simulate a transaction and size its gas limit before it is broadcast.
+
+    The call is executed with ``estimate_gas``; if it would revert, the custom
+    Solidity error is decoded (replaying it with ``eth_call`` when the estimate
+    error carries no revert data) and raised instead of wasting gas on-chain.
+
+    Returns:
+        int: The estimated gas plus the configured margin
+
+    Raises:
+        PreflightError: If the transaction would revert
+    """
+    params = {"from": account.address, "value": value}
+    try:
+        estimate = function_call.estimate_gas(params)
+    except ContractLogicError as e:
+        if _extract_revert_data(e) is None:
+            try:
+                function_call.call(params)
+            except ContractLogicError as call_error:
+                e = call_error
+        raise PreflightError(_revert_reason_or_message(e)) from e
+    return _preflight_gas(estimate)
+
+
+async def async_preflight_transaction(w3, function_call, account, value=0):
+    """Async counterpart of ``preflight_transaction``, usable with both Web3 and AsyncWeb3."""
+    if not is_async_web3(w3):
+        return await asyncio.to_thread(preflight_transaction, w3, function_call, account, value)
+    params = {"from": account.address, "value": value}
+    try:
+        estimate = await function_call.estimate_gas(params)
+    except ContractLogicError as e:
+        if _extract_revert_data(e) is None:
+            try:
+                await function_call.call(params)
+            except ContractLogicError as call_error:
+                e = call_error
+        raise PreflightError(_revert_reason_or_message(e)) from e
+    return _preflight_gas(estimate)
+
+
 def build_and_send_transaction(
-    w3, function_call, account, gas_limit=100000, value=0
+    w3, function_call, account, gas_limit=100000, value=0, nonce_manager=None, preflight=None
 ):
     """Build, sign and send a transaction.
 
+    Fees are suggested by the fee strategy (see ``fees``): EIP-1559 (type-2) fees
+    where the chain supports them, a legacy gas price otherwise.
+
     Args:
         w3: Web3 instance
         function_call: Contract function call to execute
         account: Account to send transaction from
         gas_limit: Maximum gas to use for the transaction
         value: Amount of ETH to send with the transaction (in Wei)
+        nonce_manager: Optional NonceManager of the account; when given, nonces are
+            tracked locally so transactions can be sent back-to-back without waiting
+            for receipts in between
+        preflight: Simulate the transaction first and use the estimated gas (plus a
+            margin) instead of ``gas_limit``; defaults to the ``configure_preflight`` setting
+
+    Raises:
+        PreflightError: If the pre-flight simulation reverts; nothing is broadcast
     """
-    transaction = function_call.build_transaction(
-        {
-            "from": account.address,
-            "nonce": w3.eth.get_transaction_count(account.address),
-            "gas": gas_limit,
-            "gasPrice": w3.eth.gas_price,
-            "chainId": w3.eth.chain_id,
-            "value": value,
-        }
-    )
+    if _use_preflight(preflight):
+        gas_limit = preflight_transaction(w3, function_call, account, value)
+    if nonce_manager is None and _track_nonces:
+        nonce_manager = get_nonce_manager(w3, account.address)
 
-    signed_txn = w3.eth.account.sign_transaction(transaction, account.key)
+    for attempt in range(2):
+        if nonce_manager is not None:
+            nonce = nonce_manager.allocate()
+        else:
+            nonce = w3.eth.get_transaction_count(account.address)
 
-    raw_tx = getattr(signed_txn, "rawTransaction", None) or getattr(signed_txn, "raw_transaction", None)
+        try:
+            transaction = function_call.build_transaction(
+                {
+                    "from": account.address,
+                    "nonce": nonce,
+                    "gas": gas_limit,
+                    **suggest_fees(w3).to_transaction_params(),
+                    "chainId": get_chain_id(w3),
+                    "value": value,
+                }
+            )
+            raw_tx = _sign_transaction(w3, transaction, account)
+        except Exception:
+            if nonce_manager is not None:
+                nonce_manager.release(nonce)
+            raise
 
-    if raw_tx is None:
-        raise AttributeError("Signed transaction has neither 'rawTransaction' nor 'raw_transaction'.")
+        try:
+            tx_hash = w3.eth.send_raw_transaction(raw_tx)
+        except Exception as e:
+            tx_hash = _handle_send_error(e, raw_tx, nonce, attempt, nonce_manager)
+            if tx_hash is None:
+                continue
 
-    tx_hash = w3.eth.send_raw_transaction(raw_tx)
-    print(f"Transaction sent: {tx_hash.hex()}", file=sys.stderr)
-    return tx_hash
+        print(f"Transaction sent: {tx_hash.to_0x_hex()}", file=sys.stderr)
+        _track_replaceable(tx_hash, transaction, account)
+        return tx_hash
+
+
+async def async_build_and_send_transaction(
+    w3, function_call, account, gas_limit=100000, value=0, nonce_manager=None, preflight=None
+):
+    """Async counterpart of ``build_and_send_transaction``.
+
+    With AsyncWeb3 every request is awaited natively (``function_call`` must then be
+    a call of a contract created by the AsyncWeb3 instance); with the blocking Web3
+    backend the transaction is built and sent in a worker thread.
+    """
+    if not is_async_web3(w3):
+        return await asyncio.to_thread(
+            build_and_send_transaction, w3, function_call, account, gas_limit, value, nonce_manager, preflight
+        )
+
+    if _use_preflight(preflight):
+        gas_limit = await async_preflight_transaction(w3, function_call, account, value)
+    if nonce_manager is None and _track_nonces:
+        nonce_manager = get_nonce_manager(w3, account.address)
+
+    for attempt in range(2):
+        if nonce_manager is not None:
+            nonce = await nonce_manager.async_allocate()
+        else:
+            nonce = await w3.eth.get_transaction_count(account.address)
+
+        try:
+            transaction = await function_call.build_transaction(
+                {
+                    "from": account.address,
+                    "nonce": nonce,
+                    "gas": gas_limit,
+                    **(await async_suggest_fees(w3)).to_transaction_params(),
+                    "chainId": await async_get_chain_id(w3),
+                    "value": value,
+                }
+            )
+            raw_tx = _sign_transaction(w3, transaction, account)
+        except Exception:
+            if nonce_manager is not None:
+                nonce_manager.release(nonce)
+            raise
+
+        try:
+            tx_hash = await w3.eth.send_raw_transaction(raw_tx)
+        except Exception as e:
+            tx_hash = _handle_send_error(e, raw_tx, nonce, attempt, nonce_manager)
+            if tx_hash is None:
+                continue
+
+        print(f"Transaction sent: {tx_hash.to_0x_hex()}", file=sys.stderr)
+        _track_replaceable(tx_hash, transaction, account)
+        return tx_hash
+
+
+@dataclass
+class _ReplaceableTransaction:
+    """A sent transaction that may be replaced with bumped fees while waiting for its receipt."""
+
+    transaction: dict
+    account: object
+    # Hashes of the original transaction and its replacements, oldest first
+    tx_hashes: list
+    replacements: int = 0
+
+
+# Most sent transactions kept for replacement; those whose receipts are never
+# waited for are forgotten oldest first
+MAX_REPLACEABLE_TRANSACTIONS = 1024
+
+# Transactions sent while replacements are enabled, by the hash they were sent with
+_replaceable_transactions = OrderedDict()
+_replaceable_lock = threading.Lock()
+
+
+def _track_replaceable(tx_hash, transaction, account):
+    if get_fee_config().replacement_deadline is None:
+        return
+    with _replaceable_lock:
+        _replaceable_transactions[bytes(HexBytes(tx_hash))] = _ReplaceableTransaction(transaction, account, [tx_hash])
+        while len(_replaceable_transactions) > MAX_REPLACEABLE_TRANSACTIONS:
+            _replaceable_transactions.popitem(last=False)
+
+
+def _pop_replaceable(tx_hash):
+    with _replaceable_lock:
+        return _replaceable_transactions.pop(bytes(HexBytes(tx_hash)), None)
+
+
+def _replacement_transaction(sent, suggested_fees):
+    """The transaction re-priced for a same-nonce replacement, or None if the fee cap is reached."""
+    config = get_fee_config()
+    fees = Fees.from_transaction(sent.transaction).bump(config.bump_percent).at_least(suggested_fees)
+    if fees.exceeds(config.max_fee_cap):
+        return None
+    transaction = {
+        key: value for key, value in sent.transaction.items()
+        if key not in ("type", "gasPrice", "maxFeePerGas", "maxPriorityFeePerGas")
+    }
+    transaction.update(fees.to_transaction_params())
+    return transaction
+
+
+def _record_replacement(sent, transaction, tx_hash):
+    print(
+        f"Transaction {sent.tx_hashes[0].to_0x_hex()} not mined in time, replaced by {tx_hash.to_0x_hex()} "
+        f"with bumped fees (nonce {transaction['nonce']})",
+        file=sys.stderr,
+    )
+    sent.transaction = transaction
+    sent.tx_hashes.append(tx_hash)
+
+
+def _next_wait(sent, deadline):
+    """Monotonic time until which to wait for a receipt before the next replacement."""
+    config = get_fee_config()
+    if sent.replacements >= config.max_replacements:
+        return deadline
+    return min(deadline, time.monotonic() + config.replacement_deadline)
+
+
+def _wait_replacing(w3, sent, timeout, poll_latency):
+    deadline = time.monotonic() + timeout
+    while True:
+        wait_until = _next_wait(sent, deadline)
+        while True:
+            for tx_hash in sent.tx_hashes:
+                try:
+                    return w3.eth.get_transaction_receipt(tx_hash)
+                except TransactionNotFound:
+                    pass
+            if time.monotonic() >= wait_until:
+                break
+            time.sleep(min(poll_latency, max(0, wait_until - time.monotonic())))
+        if time.monotonic() >= deadline:
+            raise TimeExhausted(
+                f"Transaction {sent.tx_hashes[0].to_0x_hex()} is not in the chain after {timeout} seconds"
+            )
+
+        sent.replacements += 1
+        transaction = _replacement_transaction(sent, suggest_fees(w3))
+        if transaction is None:
+            continue
+        try:
+            tx_hash = w3.eth.send_raw_transaction(_sign_transaction(w3, transaction, sent.account))
+        except Exception as e:
+            # e.g. nonce too low when one of the sent transactions was mined meanwhile
+            print(f"Replacement of transaction {sent.tx_hashes[0].to_0x_hex()} rejected: {e}", file=sys.stderr)
+            continue
+        _record_replacement(sent, transaction, tx_hash)
+
+
+async def _async_wait_replacing(w3, sent, timeout, poll_latency):
+    deadline = time.monotonic() + timeout
+    while True:
+        wait_until = _next_wait(sent, deadline)
+        while True:
+            for tx_hash in sent.tx_hashes:
+                try:
+                    return await async_call(w3, w3.eth.get_transaction_receipt, tx_hash)
+                except TransactionNotFound:
+                    pass
+            if time.monotonic() >= wait_until:
+                break
+            await asyncio.sleep(min(poll_latency, max(0, wait_until - time.monotonic())))
+        if time.monotonic() >= deadline:
+            raise TimeExhausted(
+                f"Transaction {sent.tx_hashes[0].to_0x_hex()} is not in the chain after {timeout} seconds"
+            )
+
+        sent.replacements += 1
+        transaction = _replacement_transaction(sent, await async_suggest_fees(w3))
+        if transaction is None:
+            continue
+        try:
+            tx_hash = await async_call(w3, w3.eth.send_raw_transaction, _sign_transaction(w3, transaction, sent.account))
+        except Exception as e:
+            print(f"Replacement of transaction {sent.tx_hashes[0].to_0x_hex()} rejected: {e}", file=sys.stderr)
+            continue
+        _record_replacement(sent, transaction, tx_hash)
 
 
 def wait_for_receipt(w3, tx_hash, timeout=300, poll_latency=2):
-    """Wait for transaction receipt and return it."""
-    return w3.eth.wait_for_transaction_receipt(tx_hash, timeout, poll_latency)
+    """Wait for transaction receipt and return it.
+
+    If fee replacements are enabled (``FeeConfig.replacement_deadline``) and the
+    transaction was sent by ``build_and_send_transaction``, it is re-broadcast with
+    bumped fees at the same nonce whenever the deadline passes without a receipt;
+    the receipt of whichever version is mined is returned.
+    """
+    sent = _pop_replaceable(tx_hash)
+    if sent is None:
+        return w3.eth.wait_for_transaction_receipt(tx_hash, timeout, poll_latency)
+    return _wait_replacing(w3, sent, timeout, poll_latency)
+
+
+async def async_wait_for_receipt(w3, tx_hash, timeout=300, poll_latency=2):
+    """Wait for transaction receipt without blocking the event loop (Web3 or AsyncWeb3).
+
+    Stuck transactions are replaced like in ``wait_for_receipt``.
+    """
+    sent = _pop_replaceable(tx_hash)
+    if sent is None:
+        return await async_call(w3, w3.eth.wait_for_transaction_receipt, tx_hash, timeout, poll_latency)
+    return await _async_wait_replacing(w3, sent, timeout, poll_latency)
+
+
+async def wait_for_receipts(w3, tx_hashes, timeout=300, poll_latency=2, return_exceptions=False):
+    """Wait for the receipts of many transactions concurrently.
+
+    Receipts are collected by a ``ReceiptCollector``: one head poll every
+    ``poll_latency`` seconds and one batched receipt request per new block, instead
+    of polling each transaction. Transactions that may be replaced with bumped
+    fees (see ``wait_for_receipt``) are followed individually.
+
+    Args:
+        return_exceptions: Return errors (e.g. timeouts) in place of the receipts
+            instead of raising the first one
+
+    Returns:
+        list: Receipts in the order of ``tx_hashes``
+    """
+    from celium_collateral_contracts.receipt_collector import ReceiptCollector
+
+    async with ReceiptCollector(w3, poll_interval=poll_latency) as collector:
+        return await asyncio.gather(
+            *(
+                async_wait_for_receipt(w3, tx_hash, timeout, poll_latency)
+                if bytes(HexBytes(tx_hash)) in _replaceable_transactions
+                else collector.wait(tx_hash, timeout)
+                for tx_hash in tx_hashes
+            ),
+            return_exceptions=return_exceptions,
+        )
+
+
+@dataclass
+class TransactionOutcome:
+    """Result of one transaction of a pipelined batch."""
+
+    tx_hash: str | None
+    receipt: dict | None
+    error: str | None
+
+    @property
+    def success(self):
+        return self.error is None
+
+
+async def send_transactions_pipelined(w3, account, function_calls, gas_limit=200000, values=None, preflight=None):
+    """Send many contract calls back-to-back and collect their receipts.
+
+    Transactions are signed with sequential nonces from the account's NonceManager and
+    broadcast without waiting in between; receipts are then awaited concurrently and
+    the revert reasons of failed transactions are decoded concurrently as well.
+
+    Args:
+        w3: Web3 or AsyncWeb3 instance
+        account: Account to send the transactions from
+        function_calls: Contract function calls to execute
+        gas_limit: Maximum gas to use per transaction
+        values: Optional amounts of ETH (in Wei) to send with each call
+        preflight: Simulate all calls concurrently before sending; calls that would
+            revert are not broadcast, the others use their estimated gas. Defaults to
+            the ``configure_preflight`` setting
+
+    Returns:
+        list[TransactionOutcome]: One outcome per function call, in input order
+    """
+    function_calls = list(function_calls)
+    values = list(values) if values is not None else [0] * len(function_calls)
+    nonce_manager = get_nonce_manager(w3, account.address)
+
+    if _use_preflight(preflight):
+        gas_limits = await asyncio.gather(
+            *(
+                async_preflight_transaction(w3, function_call, account, value)
+                for function_call, value in zip(function_calls, values)
+            ),
+            return_exceptions=True,
+        )
+    else:
+        gas_limits = [gas_limit] * len(function_calls)
+
+    outcomes = []
+    for function_call, value, call_gas_limit in zip(function_calls, values, gas_limits):
+        if isinstance(call_gas_limit, Exception):
+            outcomes.append(TransactionOutcome(tx_hash=None, receipt=None, error=f"Pre-flight failed: {call_gas_limit}"))
+            continue
+        try:
+            tx_hash = await async_build_and_send_transaction(
+                w3, function_call, account, gas_limit=call_gas_limit, value=value,
+                nonce_manager=nonce_manager, preflight=False,
+            )
+            outcomes.append(TransactionOutcome(tx_hash=tx_hash, receipt=None, error=None))
+        except Exception as e:
+            outcomes.append(TransactionOutcome(tx_hash=None, receipt=None, error=f"Failed to send transaction: {e}"))
+
+    sent = [outcome for outcome in outcomes if outcome.tx_hash is not None]
+    receipts = await wait_for_receipts(w3, [outcome.tx_hash for outcome in sent], return_exceptions=True)
+    for outcome, receipt in zip(sent, receipts):
+        if isinstance(receipt, Exception):
+            outcome.error = f"Failed to get transaction receipt: {receipt}"
+        else:
+            outcome.receipt = receipt
+            # the transaction may have been mined as a fee-bumped replacement
+            outcome.tx_hash = receipt['transactionHash']
+
+    failed = [outcome for outcome in sent if outcome.receipt is not None and outcome.receipt['status'] == 0]
+    reasons = await explain_failed_transactions(w3, [outcome.tx_hash for outcome in failed])
+    for outcome in failed:
+        outcome.error = f"Transaction failed. Revert reason: {reasons[outcome.tx_hash]}"
+
+    return outcomes
 
 
 def calculate_md5_checksum(url):
@@ -120,47 +778,190 @@ def calculate_md5_checksum(url):
     Raises:
         SystemExit: If there's an error fetching the URL content.
     """
-    response = requests.get(url)
+    response = get_session().get(url, timeout=get_http_pool_config().timeout)
     response.raise_for_status()
     return hashlib.md5(response.content).hexdigest()
 
 
-def get_revert_reason(w3, tx_hash, block_number):
-    """Returns the custom Solidity error name for a failed transaction, or 'Could not parse error' if not decodable.
-    If the error is SlashAmountTooLarge, also prints its parameters.
+async def calculate_md5_checksums(urls, max_workers=16, return_exceptions=False):
+    """Calculate the MD5 checksums of many URLs concurrently.
+
+    Each distinct URL is fetched once. Values that are not http(s) URLs get the
+    all-zero checksum used by the contract scripts.
+
+    Args:
+        urls (Iterable[str]): The URLs to fetch content from.
+        max_workers (int): Maximum number of URLs fetched at the same time.
+        return_exceptions (bool): Return fetch errors in place of the checksums
+            instead of raising the first one.
+
+    Returns:
+        dict[str, str]: MD5 checksum per URL.
+    """
+    semaphore = asyncio.Semaphore(max_workers)
+
+    async def checksum(url):
+        if not url.startswith(("http://", "https://")):
+            return "0" * 32
+        async with semaphore:
+            return await asyncio.to_thread(calculate_md5_checksum, url)
+
+    urls = list(dict.fromkeys(urls))
+    checksums = await asyncio.gather(*(checksum(url) for url in urls), return_exceptions=return_exceptions)
+    return dict(zip(urls, checksums))
+
+
+@dataclass
+class RevertReason:
+    """A decoded Solidity revert: the error name and its ABI-decoded arguments."""
+
+    name: str
+    args: dict
+
+    def __str__(self):
+        if not self.args:
+            return self.name
+        return self.name + "(" + ", ".join(f"{key}={value}" for key, value in self.args.items()) + ")"
+
+
+def _build_error_selectors():
+    errors = [item for item in load_contract_abi() if item.get("type") == "error"]
+    # Built-in Solidity errors raised by require() and failed assertions
+    errors.append({"type": "error", "name": "Error", "inputs": [{"name": "message", "type": "string"}]})
+    errors.append({"type": "error", "name": "Panic", "inputs": [{"name": "code", "type": "uint256"}]})
+    return {
+        Web3.keccak(text=abi_signature(item))[:4]: (
+            item["name"],
+            [i["name"] for i in item.get("inputs", [])],
+            [i["type"] for i in item.get("inputs", [])],
+        )
+        for item in errors
+    }
+
+
+# Error selector -> (error name, argument names, argument types)
+ERROR_SELECTORS = _build_error_selectors()
+
+
+def decode_revert_data(revert_data):
+    """Decode raw revert data into a RevertReason.
+
+    Args:
+        revert_data (str | bytes): The revert data, hex string or bytes
+
+    Returns:
+        RevertReason | None: The decoded error, or None if the selector is unknown
+    """
+    if isinstance(revert_data, str):
+        revert_data = bytes.fromhex(revert_data.removeprefix("0x"))
+    error = ERROR_SELECTORS.get(bytes(revert_data[:4]))
+    if error is None:
+        return None
+    name, arg_names, arg_types = error
+    try:
+        values = abi_decode(arg_types, revert_data[4:])
+    except Exception:
+        return RevertReason(name=name, args={})
+    return RevertReason(name=name, args=dict(zip(arg_names, values)))
+
+
+def _extract_revert_data(error):
+    data = getattr(error, "data", None)
+    if isinstance(data, str) and data.startswith("0x") and len(data) >= 10:
+        return data
+    # Older providers only include the revert data in the error message
+    match = re.search(r"(0x[a-fA-F0-9]{8,})", str(error))
+    return match.group(1) if match else None
+
+
+def _revert_reason_from_error(error):
+    revert_data = _extract_revert_data(error)
+    reason = decode_revert_data(revert_data) if revert_data else None
+    if reason is not None:
+        return str(reason)
+    return "Could not parse error"
+
+
+def _replay_params(tx):
+    return {
+        'to': tx['to'],
+        'from': tx['from'],
+        'data': tx['input'],
+        'value': tx['value'],
+    }
+
+
+def get_revert_reason(w3, tx_hash, block_number=None):
+    """Returns the custom Solidity error of a failed transaction, or 'Could not parse error' if not decodable.
+
+    The transaction is replayed with ``eth_call`` at ``block_number`` (defaults to the block
+    it was mined in). Errors with arguments are returned with their decoded values,
+    e.g. ``OwnableUnauthorizedAccount(account=0x...)``.
     """
     tx = w3.eth.get_transaction(tx_hash)
+    if block_number is None:
+        block_number = tx['blockNumber']
     try:
-        w3.eth.call({
-            'to': tx['to'],
-            'from': tx['from'],
-            'data': tx['input'],
-            'value': tx['value'],
-        }, block_identifier=block_number)
+        w3.eth.call(_replay_params(tx), block_identifier=block_number)
     except ContractLogicError as e:
-        import re
-        msg = str(e)
-        hex_pattern = re.compile(r'(0x[a-fA-F0-9]{8,})')
-        match = hex_pattern.search(msg)
-        revert_data = match.group(1) if match else None
-        if revert_data and len(revert_data) >= 10:
-            selector = revert_data[:10]
-            contract_abi = load_contract_abi()
-            for item in contract_abi:
-                if item.get('type') == 'error':
-                    sig = item['name'] + '(' + ','.join([input['type'] for input in item.get('inputs', [])]) + ')'
-                    import eth_utils
-                    selector_bytes = eth_utils.keccak(text=sig)[:4]
-                    selector_hex = '0x' + selector_bytes.hex()
-                    if selector == selector_hex:
-                        # If error is SlashAmountTooLarge, decode parameters
-                        return item['name']
-        return "Could not parse error"
+        return _revert_reason_from_error(e)
     return "Could not parse error"
 
 
+async def async_get_revert_reason(w3, tx_hash, block_number=None):
+    """Async counterpart of ``get_revert_reason``, usable with both Web3 and AsyncWeb3."""
+    if not is_async_web3(w3):
+        return await asyncio.to_thread(get_revert_reason, w3, tx_hash, block_number)
+    tx = await w3.eth.get_transaction(tx_hash)
+    if block_number is None:
+        block_number = tx['blockNumber']
+    try:
+        await w3.eth.call(_replay_params(tx), block_identifier=block_number)
+    except ContractLogicError as e:
+        return _revert_reason_from_error(e)
+    return "Could not parse error"
+
+
+async def simulate_transaction(w3, function_call, account, value=0, block_identifier="latest"):
+    """Dry-run a contract function call from ``account`` with ``eth_call``.
+
+    Returns:
+        RevertReason | None: The error the transaction would revert with, or None if it would succeed
+    """
+    try:
+        await async_call(w3, function_call.call, {"from": account.address, "value": value}, block_identifier)
+    except ContractLogicError as e:
+        return _revert_reason_or_message(e)
+    return None
+
+
+async def explain_failed_transactions(w3, tx_hashes, max_workers=16):
+    """Decode the revert reasons of many failed transactions concurrently.
+
+    Args:
+        w3 (Web3 | AsyncWeb3): Web3 instance to use for blockchain interaction
+        tx_hashes (Iterable[str]): Hashes of the failed transactions
+        max_workers (int): Maximum number of transactions replayed at the same time
+
+    Returns:
+        dict[str, str]: Revert reason per transaction hash, in input order
+    """
+    semaphore = asyncio.Semaphore(max_workers)
+
+    async def explain(tx_hash):
+        async with semaphore:
+            try:
+                return await async_get_revert_reason(w3, tx_hash)
+            except Exception as e:
+                return f"Could not parse error: {e}"
+
+    tx_hashes = list(tx_hashes)
+    reasons = await asyncio.gather(*(explain(tx_hash) for tx_hash in tx_hashes))
+    return dict(zip(tx_hashes, reasons))
+
+
 async def get_evm_key_associations(
-    subtensor: bittensor.Subtensor, netuid: int, block: int | None = None
+    subtensor: "bittensor.Subtensor", netuid: int, block: int | None = None
 ) -> dict[int, str]:
     """
     Retrieve all EVM key associations for a specific subnet.
@@ -184,11 +985,8 @@ async def get_evm_key_associations(
     return uid_evm_address_map
 
 
-def get_executor_collateral(w3, contract_address, executor_uuid):
-    """Query the collateral amount for a given miner and executor UUID."""
-    contract_abi = load_contract_abi()
-    contract = w3.eth.contract(address=contract_address, abi=contract_abi)
-    # executor_uuid must be bytes16
+def executor_uuid_to_bytes(executor_uuid):
+    """Convert an executor UUID (UUID string, hex string or bytes) to the contract's bytes16."""
     if isinstance(executor_uuid, str):
         import uuid
         try:
@@ -201,25 +999,21 @@ def get_executor_collateral(w3, contract_address, executor_uuid):
         uuid_bytes = uuid_bytes[:16] if len(uuid_bytes) > 16 else uuid_bytes.ljust(16, b'\0')
     else:
         uuid_bytes = executor_uuid
+    return uuid_bytes
+
+
+def get_executor_collateral(w3, contract_address, executor_uuid):
+    """Query the collateral amount for a given miner and executor UUID."""
+    contract = get_contract(w3, contract_address)
+    # executor_uuid must be bytes16
+    uuid_bytes = executor_uuid_to_bytes(executor_uuid)
     executor_collateral =  contract.functions.collaterals(uuid_bytes).call()
     return w3.from_wei(executor_collateral, "ether")
 
 def get_miner_address_of_executor(w3, contract_address, executor_uuid):
     """Query the collateral amount for a given miner and executor UUID."""
-    contract_abi = load_contract_abi()
-    contract = w3.eth.contract(address=contract_address, abi=contract_abi)
+    contract = get_contract(w3, contract_address)
     # executor_uuid must be bytes16
-    if isinstance(executor_uuid, str):
-        import uuid
-        try:
-            # Try to parse as UUID string
-            uuid_bytes = uuid.UUID(executor_uuid).bytes
-        except Exception:
-            # If not a UUID, try to decode as hex
-            uuid_bytes = bytes.fromhex(executor_uuid.replace('0x', ''))
-        # Pad or trim to 16 bytes
-        uuid_bytes = uuid_bytes[:16] if len(uuid_bytes) > 16 else uuid_bytes.ljust(16, b'\0')
-    else:
-        uuid_bytes = executor_uuid
+    uuid_bytes = executor_uuid_to_bytes(executor_uuid)
     miner_address = contract.functions.executorToMiner(uuid_bytes).call()
-    return miner_address
\ No newline at end of file
+    return miner_address
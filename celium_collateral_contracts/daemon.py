@@ -0,0 +1,365 @@
+#!/usr/bin/env python3
+
+"""
+Collateral Command Daemon
+
+This module runs the command-line scripts of this package inside one long-lived
+process, so sequences of commands (e.g. those printed by ``generate_commands.py``)
+do not pay for interpreter startup, imports and connection setup on every call:
+- ``serve_main`` (``collateral-daemon``) listens on a Unix domain socket and runs
+  each received command's ``main()`` in-process, one command at a time; commands
+  that run until interrupted (``finalize_reclaim --watch``) are refused
+- Web3 connections, their read caches, contract objects and local nonce counters
+  are kept warm between commands (see ``common.share_connections``)
+- ``client_main`` (``collateral-client``) is a thin, stdlib-only client taking the
+  command name followed by the script's usual arguments; it prints the command's
+  output and exits with its exit code, and runs the command locally when no
+  daemon is listening
+
+Protocol: one JSON object per line in each direction. Requests are
+``{"id", "command", "argv", "env"}``, responses ``{"id", "exit_code", "stdout", "stderr"}``.
+"""
+import argparse
+import asyncio
+import importlib
+import inspect
+import io
+import json
+import os
+import socket
+import sys
+import tempfile
+import traceback
+from contextlib import redirect_stderr, redirect_stdout
+
+__all__ = [
+    "COMMANDS", "FORWARDED_ENV", "LONG_RUNNING_FLAGS", "MAX_MESSAGE_SIZE", "DaemonError",
+    "default_socket_path", "resolve_command", "check_terminates", "run_command", "CommandDaemon",
+    "DaemonClient", "serve_main", "client_main",
+]
+
+# Command name -> module providing its main()
+COMMANDS = {
+    "deposit_collateral": "deposit_collateral",
+    "reclaim_collateral": "reclaim_collateral",
+    "finalize_reclaim": "finalize_reclaim",
+    "deny_request": "deny_request",
+    "slash_collateral": "slash_collateral",
+    "get_executor_collateral": "get_executor_collateral",
+    "get_collaterals": "get_collaterals",
+    "get_reclaim_requests": "get_reclaim_requests",
+    "get_balance": "get_balance",
+    "get_current_block": "get_current_block",
+    "get_all_associations": "get_all_associations",
+    "get_hotkey_association": "get_hotkey_association",
+    "associate_evm_key": "associate_evm_key",
+    "send_to_ss58_precompile": "send_to_ss58_precompile",
+    "explain_reverts": "explain_reverts",
+    "backup_state": "backup_state",
+    "list_contracts": "list_contracts",
+    "batch_runner": "batch_runner",
+}
+
+# Environment variables the client forwards with each command; the daemon's own
+# values are unset while a command runs without them
+FORWARDED_ENV = ("PRIVATE_KEY",)
+
+# Command -> flags making it run until interrupted, which would block the daemon
+LONG_RUNNING_FLAGS = {
+    "finalize_reclaim": ("--watch",),
+}
+
+# Maximum size of one protocol line, in bytes
+MAX_MESSAGE_SIZE = 64 * 1024 * 1024
+
+
+class DaemonError(Exception):
+    """Raised when a request cannot be served by the daemon."""
+
+
+def default_socket_path():
+    """Socket path from ``COLLATERAL_DAEMON_SOCKET``, or a per-user path in the temp directory."""
+    return os.getenv("COLLATERAL_DAEMON_SOCKET") or os.path.join(
+        tempfile.gettempdir(), f"collateral-daemon-{os.getuid()}.sock"
+    )
+
+
+def resolve_command(command):
+    """Module name of a command; ``deposit-collateral`` and ``deposit_collateral.py`` are accepted too."""
+    name = command.removesuffix(".py").replace("-", "_")
+    if name not in COMMANDS:
+        raise DaemonError(f"Unknown command {command!r}, expected one of: {', '.join(sorted(COMMANDS))}")
+    return COMMANDS[name]
+
+
+def check_terminates(command, argv):
+    """Raise DaemonError if the arguments make a command run until interrupted."""
+    module = resolve_command(command)
+    for arg in argv:
+        name = arg.split("=", 1)[0]
+        if arg == "--":
+            break
+        # argparse accepts unambiguous prefixes of long options
+        if len(name) > 2 and name.startswith("--") and any(
+            flag.startswith(name) for flag in LONG_RUNNING_FLAGS.get(module, ())
+        ):
+            raise DaemonError(f"{command} {arg} does not terminate, run it outside the collateral daemon")
+
+
+def _exit_code(code, stderr):
+    # mirrors the interpreter's handling of SystemExit
+    if code is None:
+        return 0
+    if isinstance(code, int):
+        return code
+    print(code, file=stderr)
+    return 1
+
+
+async def run_command(command, argv, env=None):
+    """Run a command's ``main()`` in this process, capturing its output.
+
+    ``sys.argv``, ``sys.stdout``/``sys.stderr`` and the given environment variables
+    are process-wide, so callers must not run two commands at the same time. The
+    command runs in a worker thread (async mains on an event loop of their own), so
+    its blocking RPC requests do not stall the caller's event loop.
+
+    Args:
+        command (str): Command name, see ``COMMANDS``
+        argv (list[str]): Command-line arguments of the command
+        env (dict[str, str | None] | None): Environment variables set while it
+            runs; variables set to None are unset
+
+    Returns:
+        tuple[int, str, str]: Exit code, standard output and standard error
+    """
+    stdout, stderr = io.StringIO(), io.StringIO()
+    env = env or {}
+    saved_argv = sys.argv
+    saved_env = {name: os.environ.get(name) for name in env}
+    sys.argv = [command, *argv]
+    for name, value in env.items():
+        if value is None:
+            os.environ.pop(name, None)
+        else:
+            os.environ[name] = value
+    try:
+        with redirect_stdout(stdout), redirect_stderr(stderr):
+            try:
+                main = importlib.import_module(f"celium_collateral_contracts.{resolve_command(command)}").main
+                if inspect.iscoroutinefunction(main):
+                    await asyncio.to_thread(asyncio.run, main())
+                else:
+                    await asyncio.to_thread(main)
+                exit_code = 0
+            except SystemExit as e:
+                exit_code = _exit_code(e.code, stderr)
+            except DaemonError as e:
+                print(e, file=stderr)
+                exit_code = 2
+            except Exception:
+                traceback.print_exc()
+                exit_code = 1
+    finally:
+        sys.argv = saved_argv
+        for name, value in saved_env.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+    return exit_code, stdout.getvalue(), stderr.getvalue()
+
+
+class CommandDaemon:
+    """Serves commands over a Unix domain socket.
+
+    Args:
+        socket_path (str): Path of the socket, created with owner-only permissions
+        networks (Iterable[str]): Networks to connect to at startup
+    """
+
+    def __init__(self, socket_path=None, networks=()):
+        self.socket_path = socket_path or default_socket_path()
+        self.networks = list(networks)
+        self.commands_served = 0
+        self._lock = asyncio.Lock()
+        self._server = None
+
+    async def start(self):
+        from celium_collateral_contracts.common import get_web3_connection, share_connections
+
+        share_connections()
+        for network in self.networks:
+            try:
+                await asyncio.to_thread(get_web3_connection, network)
+            except Exception as e:
+                print(f"Could not connect to {network} yet, retrying on first use: {e}", file=sys.stderr)
+
+        if os.path.exists(self.socket_path):
+            if _is_listening(self.socket_path):
+                raise DaemonError(f"A daemon is already listening on {self.socket_path}")
+            os.unlink(self.socket_path)
+        old_umask = os.umask(0o177)
+        try:
+            self._server = await asyncio.start_unix_server(
+                self._handle_connection, path=self.socket_path, limit=MAX_MESSAGE_SIZE
+            )
+        finally:
+            os.umask(old_umask)
+        print(f"Collateral daemon listening on {self.socket_path}", file=sys.stderr, flush=True)
+
+    async def serve_forever(self):
+        if self._server is None:
+            await self.start()
+        try:
+            await self._server.serve_forever()
+        finally:
+            await self.close()
+
+    async def close(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+            if os.path.exists(self.socket_path):
+                os.unlink(self.socket_path)
+
+    async def handle_request(self, request):
+        """Run one request and build its response.
+
+        Forwarded variables the client did not send are unset, so commands never
+        sign with the daemon's own ``PRIVATE_KEY``. Commands running until
+        interrupted (see ``LONG_RUNNING_FLAGS``) are refused.
+        """
+        command, argv = request["command"], request.get("argv", [])
+        env = {name: None for name in FORWARDED_ENV}
+        env.update(request.get("env") or {})
+        try:
+            check_terminates(command, argv)
+        except DaemonError as e:
+            return {"id": request.get("id"), "exit_code": 2, "stdout": "", "stderr": f"{e}\n"}
+        async with self._lock:
+            exit_code, stdout, stderr = await run_command(command, argv, env)
+            self.commands_served += 1
+        return {"id": request.get("id"), "exit_code": exit_code, "stdout": stdout, "stderr": stderr}
+
+    async def _handle_connection(self, reader, writer):
+        try:
+            while line := await reader.readline():
+                try:
+                    request = json.loads(line)
+                    response = await self.handle_request(request)
+                except (ValueError, KeyError, TypeError) as e:
+                    response = {"id": None, "exit_code": 2, "stdout": "", "stderr": f"Invalid request: {e}\n"}
+                writer.write(json.dumps(response).encode() + b"\n")
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+
+def _is_listening(socket_path):
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        try:
+            sock.connect(socket_path)
+        except OSError:
+            return False
+    return True
+
+
+class DaemonClient:
+    """Blocking client of a ``CommandDaemon``; one connection serves many commands.
+
+    Raises:
+        ConnectionError: If no daemon listens on the socket
+    """
+
+    def __init__(self, socket_path=None):
+        self.socket_path = socket_path or default_socket_path()
+        self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            self._sock.connect(self.socket_path)
+        except (FileNotFoundError, ConnectionRefusedError) as e:
+            self._sock.close()
+            raise ConnectionError(f"No collateral daemon listening on {self.socket_path}") from e
+        self._file = self._sock.makefile("rwb")
+        self._next_id = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def run(self, command, argv, env=None):
+        """Run a command in the daemon.
+
+        Returns:
+            tuple[int, str, str]: Exit code, standard output and standard error
+        """
+        if env is None:
+            env = {name: os.environ[name] for name in FORWARDED_ENV if name in os.environ}
+        self._next_id += 1
+        request = {"id": self._next_id, "command": command, "argv": list(argv), "env": env}
+        self._file.write(json.dumps(request).encode() + b"\n")
+        self._file.flush()
+        line = self._file.readline()
+        if not line:
+            raise ConnectionError("The collateral daemon closed the connection")
+        response = json.loads(line)
+        return response["exit_code"], response["stdout"], response["stderr"]
+
+    def close(self):
+        self._file.close()
+        self._sock.close()
+
+
+def serve_main():
+    parser = argparse.ArgumentParser(
+        description="Run collateral commands in one long-lived process, served over a Unix domain socket"
+    )
+    parser.add_argument("--socket", help="Path of the socket (default: $COLLATERAL_DAEMON_SOCKET or a per-user temp path)")
+    parser.add_argument(
+        "--network", action="append", default=[],
+        help="Network to connect to at startup; may be repeated (others are connected on first use)"
+    )
+    args = parser.parse_args()
+
+    daemon = CommandDaemon(args.socket, args.network)
+    try:
+        asyncio.run(daemon.serve_forever())
+    except KeyboardInterrupt:
+        pass
+
+
+def client_main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv or argv[0] in ("-h", "--help"):
+        print(
+            "usage: collateral-client COMMAND [ARGS...]\n\n"
+            "Run a collateral command in the collateral daemon (or locally when none is running).\n"
+            f"Commands: {', '.join(sorted(COMMANDS))}",
+            file=sys.stderr,
+        )
+        sys.exit(0 if argv else 2)
+    command, command_argv = argv[0], argv[1:]
+    try:
+        client = DaemonClient()
+    except ConnectionError:
+        client = None
+    if client is None:
+        exit_code, stdout, stderr = asyncio.run(run_command(command, command_argv))
+    else:
+        with client:
+            exit_code, stdout, stderr = client.run(command, command_argv)
+    sys.stdout.write(stdout)
+    sys.stderr.write(stderr)
+    sys.exit(exit_code)
+
+
+if __name__ == "__main__":
+    if sys.argv[1:2] == ["client"]:
+        client_main(sys.argv[2:])
+    else:
+        serve_main()
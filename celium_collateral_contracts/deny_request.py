@@ -9,19 +9,29 @@ transparency and accountability.
 """
 
 import sys
+import csv
 import argparse
 import asyncio
+from dataclasses import dataclass
 from celium_collateral_contracts.common import (
-    load_contract_abi,
+    get_contract,
     get_web3_connection,
     get_account,
+    configure_preflight,
     validate_address_format,
-    build_and_send_transaction,
-    wait_for_receipt,
+    async_build_and_send_transaction,
+    async_wait_for_receipt,
     calculate_md5_checksum,
-    get_revert_reason,
+    calculate_md5_checksums,
+    send_transactions_pipelined,
+    async_get_revert_reason,
 )
 
+__all__ = [
+    "DenyReclaimRequestError", "deny_reclaim_request", "DenyOutcome", "deny_reclaim_requests_batch",
+    "read_reclaim_request_ids_file",
+]
+
 
 class DenyReclaimRequestError(Exception):
     """Raised when denying a reclaim request fails."""
@@ -33,7 +43,7 @@ async def deny_reclaim_request(
     """Deny a reclaim request on the contract.
 
     Args:
-        w3: Web3 instance
+        w3: Web3 or AsyncWeb3 instance
         account: Account to use for the transaction
         reclaim_request_id: ID of the reclaim request to deny
         url: URL containing the reason for denial
@@ -44,17 +54,16 @@ async def deny_reclaim_request(
     """
     validate_address_format(contract_address)
 
-    contract_abi = load_contract_abi()
-    contract = w3.eth.contract(address=contract_address, abi=contract_abi)
+    contract = get_contract(w3, contract_address)
 
     # Calculate MD5 checksum of the URL content
     md5_checksum = "0" * 32
     if url.startswith(("http://", "https://")):
         print("Calculating MD5 checksum of URL content...", file=sys.stderr)
-        md5_checksum = calculate_md5_checksum(url)
+        md5_checksum = await asyncio.to_thread(calculate_md5_checksum, url)
         print(f"MD5 checksum: {md5_checksum}", file=sys.stderr)
 
-    tx_hash = build_and_send_transaction(
+    tx_hash = await async_build_and_send_transaction(
         w3,
         contract.functions.denyReclaimRequest(
             reclaim_request_id, url, bytes.fromhex(md5_checksum)
@@ -63,10 +72,10 @@ async def deny_reclaim_request(
         gas_limit=200000,
     )
 
-    receipt = wait_for_receipt(w3, tx_hash)
+    receipt = await async_wait_for_receipt(w3, tx_hash)
     if receipt['status'] == 0:
         # Get revert reason for failed transaction
-        revert_reason = get_revert_reason(w3, tx_hash, receipt['blockNumber'])
+        revert_reason = await async_get_revert_reason(w3, tx_hash, receipt['blockNumber'])
         raise DenyReclaimRequestError(
             f"Transaction failed for denying reclaim request {reclaim_request_id}. Revert reason: {revert_reason}"
         )
@@ -75,6 +84,106 @@ async def deny_reclaim_request(
     return deny_event, receipt
 
 
+@dataclass
+class DenyOutcome:
+    """Result of denying a single reclaim request in a bulk denial."""
+
+    reclaim_request_id: int | str
+    success: bool
+    tx_hash: str | None = None
+    block_number: int | None = None
+    error: str | None = None
+
+
+async def deny_reclaim_requests_batch(
+        w3, account, denials, contract_address, max_workers=16):
+    """Deny many reclaim requests with pipelined transactions.
+
+    Denial checksums are fetched concurrently, all deny transactions are broadcast
+    back-to-back with sequential nonces, and receipts are collected in parallel.
+    A failure of one request, including an ID that is not a reclaim request ID,
+    does not stop the others.
+
+    Args:
+        w3: Web3 or AsyncWeb3 instance
+        account: Account to use for the transactions
+        denials: Iterable of (reclaim_request_id, url) pairs; IDs that are not
+            non-negative integers are reported as failed outcomes
+        contract_address: Address of the contract
+        max_workers: Maximum number of URLs fetched concurrently
+
+    Returns:
+        list[DenyOutcome]: Outcome per reclaim request, in input order
+    """
+    validate_address_format(contract_address)
+    contract = get_contract(w3, contract_address)
+
+    results = []
+    pending = []
+    for reclaim_request_id, url in denials:
+        try:
+            if int(reclaim_request_id) < 0:
+                raise ValueError(f"{reclaim_request_id} is negative")
+        except (TypeError, ValueError) as e:
+            results.append(DenyOutcome(
+                reclaim_request_id=reclaim_request_id, success=False, error=f"Invalid reclaim request ID: {e}"
+            ))
+            continue
+        result = DenyOutcome(reclaim_request_id=int(reclaim_request_id), success=False)
+        results.append(result)
+        pending.append((result, url))
+
+    print(f"Calculating MD5 checksums for {len(pending)} denials...", file=sys.stderr)
+    checksums = await calculate_md5_checksums(
+        (url for _, url in pending), max_workers=max_workers, return_exceptions=True
+    )
+    for result, url in pending:
+        if isinstance(checksums[url], Exception):
+            result.error = f"Failed to calculate MD5 checksum of {url}: {checksums[url]}"
+    pending = [(result, url) for result, url in pending if result.error is None]
+
+    outcomes = await send_transactions_pipelined(
+        w3,
+        account,
+        [
+            contract.functions.denyReclaimRequest(
+                result.reclaim_request_id, url, bytes.fromhex(checksums[url])
+            )
+            for result, url in pending
+        ],
+        gas_limit=200000,
+    )
+
+    for (result, _), outcome in zip(pending, outcomes):
+        result.success = outcome.success
+        result.tx_hash = outcome.tx_hash.to_0x_hex() if outcome.tx_hash is not None else None
+        result.block_number = outcome.receipt['blockNumber'] if outcome.receipt is not None else None
+        result.error = outcome.error
+    return results
+
+
+def read_reclaim_request_ids_file(path, default_url):
+    """Read (reclaim_request_id, url) pairs from a file with one ``id`` or ``id,url`` per line.
+
+    IDs that are not integers are kept as text, so ``deny_reclaim_requests_batch``
+    reports them as failed outcomes instead of the whole file being rejected.
+    """
+    denials = []
+    with open(path) as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            reclaim_request_id, _, url = line.partition(",")
+            reclaim_request_id = reclaim_request_id.strip()
+            try:
+                reclaim_request_id = int(reclaim_request_id)
+            except ValueError:
+                pass
+            denials.append((reclaim_request_id, url.strip() or default_url))
+    return denials
+
+
 async def main():
     parser = argparse.ArgumentParser(
         description="Deny a reclaim request on the Collateral contract"
@@ -83,16 +192,51 @@ async def main():
         "--contract-address", required=True, help="Address of the deployed Collateral contract"
     )
     parser.add_argument(
-        "--reclaim-request-id", required=True, type=int, help="ID of the reclaim request to deny"
+        "--reclaim-request-id", type=int, help="ID of the reclaim request to deny"
+    )
+    parser.add_argument(
+        "--reclaim-request-ids-file",
+        help="File with one reclaim request ID per line (optionally followed by ',<url>') to deny in bulk",
     )
     parser.add_argument("--url", required=True, help="URL containing the reason for denial")
     parser.add_argument("--private-key", help="Private key of the account to use")
     parser.add_argument("--network", default="finney", help="The Subtensor Network to connect to.")
+    parser.add_argument(
+        "--preflight", action="store_true",
+        help="Simulate transactions before broadcasting them and size their gas from estimate_gas"
+    )
     args = parser.parse_args()
+    if args.preflight:
+        configure_preflight()
+    if args.reclaim_request_id is None and not args.reclaim_request_ids_file:
+        parser.error("one of --reclaim-request-id or --reclaim-request-ids-file is required")
 
     w3 = get_web3_connection(args.network)
     account = get_account(args.private_key)
 
+    if args.reclaim_request_ids_file:
+        outcomes = await deny_reclaim_requests_batch(
+            w3=w3,
+            account=account,
+            denials=read_reclaim_request_ids_file(args.reclaim_request_ids_file, args.url),
+            contract_address=args.contract_address,
+        )
+        writer = csv.writer(sys.stdout)
+        writer.writerow(["reclaim_request_id", "success", "transaction_hash", "block_number", "error"])
+        for outcome in outcomes:
+            writer.writerow([
+                outcome.reclaim_request_id,
+                outcome.success,
+                outcome.tx_hash,
+                outcome.block_number,
+                outcome.error,
+            ])
+        print(
+            f"Denied {sum(outcome.success for outcome in outcomes)} of {len(outcomes)} reclaim requests",
+            file=sys.stderr,
+        )
+        return
+
     deny_event, receipt = await deny_reclaim_request(
         w3=w3,
         account=account,
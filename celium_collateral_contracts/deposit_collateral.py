@@ -7,19 +7,30 @@ This script allows users to deposit collateral into the Collateral smart contrac
 It handles validation of minimum collateral amounts, trustee verification, and
 executes the deposit transaction on the blockchain.
 """
+import sys
 import asyncio
 import argparse
 from web3 import Web3
 from uuid import UUID
 from celium_collateral_contracts.common import (
-    load_contract_abi,
+    get_contract,
     get_web3_connection,
     get_account,
+    configure_preflight,
     validate_address_format,
-    build_and_send_transaction,
-    wait_for_receipt,
-    get_revert_reason,
+    async_call,
+    async_build_and_send_transaction,
+    async_wait_for_receipt,
+    send_transactions_pipelined,
+    async_get_revert_reason,
 )
+from celium_collateral_contracts.receipt_collector import decode_receipt_events
+
+__all__ = [
+    "DepositCollateralError", "check_minimum_collateral", "verify_trustee",
+    "async_check_minimum_collateral", "async_verify_trustee", "deposit_collateral",
+    "deposit_collateral_batch",
+]
 
 
 class DepositCollateralError(Exception):
@@ -27,9 +38,7 @@ class DepositCollateralError(Exception):
     pass
 
 
-def check_minimum_collateral(contract, amount_wei):
-    """Check if the amount meets minimum collateral requirement."""
-    min_collateral = contract.functions.MIN_COLLATERAL_INCREASE().call()
+def _check_minimum(amount_wei, min_collateral):
     if amount_wei < min_collateral:
         raise ValueError(
             f"Error: Amount {Web3.from_wei(amount_wei, 'ether')} TAO is less than "
@@ -38,9 +47,7 @@ def check_minimum_collateral(contract, amount_wei):
     return min_collateral
 
 
-def verify_trustee(contract, expected_trustee):
-    """Verify if the provided trustee address matches the contract's trustee."""
-    trustee = contract.functions.TRUSTEE().call()
+def _check_trustee(trustee, expected_trustee):
     if trustee.lower() != expected_trustee.lower():
         raise ValueError(
             f"Error: Trustee address mismatch. Expected: {expected_trustee}, "
@@ -48,12 +55,33 @@ def verify_trustee(contract, expected_trustee):
         )
 
 
+def check_minimum_collateral(contract, amount_wei):
+    """Check if the amount meets minimum collateral requirement."""
+    return _check_minimum(amount_wei, contract.functions.MIN_COLLATERAL_INCREASE().call())
+
+
+def verify_trustee(contract, expected_trustee):
+    """Verify if the provided trustee address matches the contract's trustee."""
+    _check_trustee(contract.functions.TRUSTEE().call(), expected_trustee)
+
+
+async def async_check_minimum_collateral(contract, amount_wei):
+    """Async counterpart of ``check_minimum_collateral``, usable with both Web3 and AsyncWeb3."""
+    min_collateral = await async_call(contract.w3, contract.functions.MIN_COLLATERAL_INCREASE().call)
+    return _check_minimum(amount_wei, min_collateral)
+
+
+async def async_verify_trustee(contract, expected_trustee):
+    """Async counterpart of ``verify_trustee``, usable with both Web3 and AsyncWeb3."""
+    _check_trustee(await async_call(contract.w3, contract.functions.TRUSTEE().call), expected_trustee)
+
+
 async def deposit_collateral(w3, account, amount_tao,
                              contract_address, executor_uuid):
     """Deposit collateral into the contract.
 
     Args:
-        w3: Web3 instance
+        w3: Web3 or AsyncWeb3 instance
         account: Account to use for the transaction
         amount_tao: Amount to deposit in TAO
         contract_address: Address of the contract
@@ -64,21 +92,20 @@ async def deposit_collateral(w3, account, amount_tao,
     """
     validate_address_format(contract_address)
 
-    contract_abi = load_contract_abi()
-    contract = w3.eth.contract(address=contract_address, abi=contract_abi)
+    contract = get_contract(w3, contract_address)
 
     amount_wei = w3.to_wei(amount_tao, "ether")
-    check_minimum_collateral(contract, amount_wei)
+    await async_check_minimum_collateral(contract, amount_wei)
 
     executor_uuid_bytes = UUID(executor_uuid).bytes
 
-    tx_hash = build_and_send_transaction(
+    tx_hash = await async_build_and_send_transaction(
         w3, contract.functions.deposit(executor_uuid_bytes), account, value=amount_wei, gas_limit=200000,  # Higher gas limit for this function
     )
 
-    receipt = wait_for_receipt(w3, tx_hash)
+    receipt = await async_wait_for_receipt(w3, tx_hash)
     if receipt['status'] == 0:
-        revert_reason = get_revert_reason(w3, tx_hash, receipt['blockNumber'])
+        revert_reason = await async_get_revert_reason(w3, tx_hash, receipt['blockNumber'])
         raise DepositCollateralError(f"Transaction failed for depositing collateral. Revert reason: {revert_reason}")
     deposit_events = contract.events.Deposit().process_receipt(receipt)
     if not deposit_events:
@@ -88,6 +115,53 @@ async def deposit_collateral(w3, account, amount_tao,
     return deposit_event, receipt
 
 
+async def deposit_collateral_batch(w3, account, deposits, contract_address):
+    """Deposit collateral for many executors with pipelined transactions.
+
+    All deposit transactions are signed with locally tracked sequential nonces and
+    broadcast back-to-back; receipts are awaited afterwards, so the whole batch
+    usually confirms within a block or two instead of one block per deposit.
+
+    Args:
+        w3: Web3 or AsyncWeb3 instance
+        account: Account to use for the transactions
+        deposits: Iterable of (executor_uuid, amount_tao) pairs
+        contract_address: Address of the contract
+
+    Returns:
+        list[tuple]: (deposit_event, receipt) per deposit, in input order. The event
+            is None for deposits whose transaction failed, the receipt is None if the
+            transaction could not be sent or confirmed.
+    """
+    validate_address_format(contract_address)
+
+    contract = get_contract(w3, contract_address)
+    deposits = [(executor_uuid, w3.to_wei(amount_tao, "ether")) for executor_uuid, amount_tao in deposits]
+    if deposits:
+        await async_check_minimum_collateral(contract, min(amount_wei for _, amount_wei in deposits))
+
+    outcomes = await send_transactions_pipelined(
+        w3,
+        account,
+        [contract.functions.deposit(UUID(executor_uuid).bytes) for executor_uuid, _ in deposits],
+        gas_limit=200000,
+        values=[amount_wei for _, amount_wei in deposits],
+    )
+
+    deposit_events = decode_receipt_events(
+        w3, contract_address, [outcome.receipt for outcome in outcomes if outcome.success], ["Deposit"]
+    )
+    results = []
+    for (executor_uuid, _), outcome in zip(deposits, outcomes):
+        if not outcome.success:
+            print(f"Deposit for executor {executor_uuid} failed: {outcome.error}", file=sys.stderr)
+            results.append((None, outcome.receipt))
+            continue
+        events = deposit_events.get(outcome.receipt['transactionHash'], [])
+        results.append((events[0] if events else None, outcome.receipt))
+    return results
+
+
 async def main():
     """Handle command line arguments and execute deposit."""
     parser = argparse.ArgumentParser(
@@ -108,7 +182,13 @@ async def main():
     parser.add_argument("--network", default="finney", help="The Subtensor Network to connect to.")
     parser.add_argument("--executor-uuid", help="Executor UUID")
 
+    parser.add_argument(
+        "--preflight", action="store_true",
+        help="Simulate transactions before broadcasting them and size their gas from estimate_gas"
+    )
     args = parser.parse_args()
+    if args.preflight:
+        configure_preflight()
 
     w3 = get_web3_connection(args.network)
     account = get_account(args.private_key)
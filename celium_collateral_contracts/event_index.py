@@ -0,0 +1,320 @@
+"""
+Local Event Index
+
+This module maintains an on-disk SQLite index of the Collateral contract events
+(Deposit, ReclaimProcessStarted, Reclaimed, Denied and Slashed). It provides:
+- Incremental catch-up from a persisted last-synced-block checkpoint, recording
+  the block indexing started from so that earlier blocks are fetched over RPC
+- Indexed lookups by event name, executor ID, miner address and reclaim request ID
+- Block range queries served from disk instead of RPC log scans
+"""
+import sqlite3
+import uuid
+from dataclasses import dataclass
+
+from web3 import Web3
+
+from celium_collateral_contracts.common import async_call
+from celium_collateral_contracts.log_scanner import COLLATERAL_EVENTS, LogScanner
+
+__all__ = ["SCHEMA", "EVENT_COLUMNS", "IndexedEvent", "EventIndex"]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    contract_address TEXT NOT NULL,
+    block_number INTEGER NOT NULL,
+    log_index INTEGER NOT NULL,
+    transaction_hash TEXT NOT NULL,
+    event TEXT NOT NULL,
+    executor_id TEXT,
+    miner TEXT,
+    reclaim_request_id INTEGER,
+    amount TEXT,
+    expiration_time INTEGER,
+    url TEXT,
+    url_content_md5_checksum TEXT,
+    PRIMARY KEY (contract_address, block_number, log_index)
+);
+CREATE INDEX IF NOT EXISTS idx_events_executor ON events (contract_address, executor_id);
+CREATE INDEX IF NOT EXISTS idx_events_miner ON events (contract_address, miner);
+CREATE INDEX IF NOT EXISTS idx_events_reclaim ON events (contract_address, reclaim_request_id);
+CREATE INDEX IF NOT EXISTS idx_events_name ON events (contract_address, event, block_number);
+CREATE TABLE IF NOT EXISTS sync_state (
+    contract_address TEXT PRIMARY KEY,
+    last_synced_block INTEGER NOT NULL,
+    start_block INTEGER
+);
+"""
+
+EVENT_COLUMNS = (
+    "block_number",
+    "log_index",
+    "transaction_hash",
+    "event",
+    "executor_id",
+    "miner",
+    "reclaim_request_id",
+    "amount",
+    "expiration_time",
+    "url",
+    "url_content_md5_checksum",
+)
+
+
+@dataclass
+class IndexedEvent:
+    """Represents a Collateral contract event stored in the local index."""
+
+    block_number: int
+    log_index: int
+    transaction_hash: str
+    event: str
+    executor_id: str | None
+    miner: str | None
+    reclaim_request_id: int | None
+    amount: int | None
+    expiration_time: int | None
+    url: str | None
+    url_content_md5_checksum: str | None
+
+
+def _row_to_event(row):
+    values = dict(zip(EVENT_COLUMNS, row))
+    if values["amount"] is not None:
+        values["amount"] = int(values["amount"])
+    return IndexedEvent(**values)
+
+
+class EventIndex:
+    """SQLite-backed index of the events emitted by one Collateral contract.
+
+    Args:
+        path (str): Path of the SQLite database file (``":memory:"`` for a temporary index)
+        contract_address (str): The address of the deployed Collateral contract
+    """
+
+    def __init__(self, path, contract_address):
+        self.path = path
+        self.contract_address = Web3.to_checksum_address(contract_address)
+        self.connection = sqlite3.connect(path)
+        self.connection.executescript(SCHEMA)
+        columns = {row[1] for row in self.connection.execute("PRAGMA table_info(sync_state)")}
+        if "start_block" not in columns:
+            # databases created before the start block was recorded
+            self.connection.execute("ALTER TABLE sync_state ADD COLUMN start_block INTEGER")
+        self.connection.commit()
+
+    def close(self):
+        self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    @property
+    def last_synced_block(self):
+        """The last block whose events are fully stored in the index, or None."""
+        row = self.connection.execute(
+            "SELECT last_synced_block FROM sync_state WHERE contract_address = ?",
+            (self.contract_address,),
+        ).fetchone()
+        return row[0] if row else None
+
+    @property
+    def start_block(self):
+        """The first block whose events are stored in the index, or None for an empty index."""
+        row = self.connection.execute(
+            "SELECT start_block, last_synced_block FROM sync_state WHERE contract_address = ?",
+            (self.contract_address,),
+        ).fetchone()
+        if row is None:
+            return None
+        # older databases did not record it, they were synced from the default start block
+        return row[0] if row[0] is not None else 0
+
+    def _event_to_row(self, event, unsaved_requests):
+        args = event["args"]
+        name = event["event"]
+        executor_id = str(uuid.UUID(bytes=args["executorId"])) if "executorId" in args else None
+        miner = args.get("miner")
+        reclaim_request_id = args.get("reclaimRequestId")
+
+        if name == "ReclaimProcessStarted":
+            unsaved_requests[reclaim_request_id] = (executor_id, miner)
+        elif name == "Denied":
+            # Denied only carries the reclaim request ID, take the rest from the request itself
+            started = unsaved_requests.get(reclaim_request_id) or self.connection.execute(
+                "SELECT executor_id, miner FROM events "
+                "WHERE contract_address = ? AND reclaim_request_id = ? AND event = 'ReclaimProcessStarted'",
+                (self.contract_address, reclaim_request_id),
+            ).fetchone()
+            if started:
+                executor_id, miner = started
+
+        amount = args.get("amount")
+        checksum = args.get("urlContentMd5Checksum")
+        return (
+            self.contract_address,
+            event["blockNumber"],
+            event["logIndex"],
+            Web3.to_hex(event["transactionHash"]),
+            name,
+            executor_id,
+            miner,
+            reclaim_request_id,
+            str(amount) if amount is not None else None,
+            args.get("expirationTime"),
+            args.get("url"),
+            checksum.hex() if checksum is not None else None,
+        )
+
+    def _store(self, rows, last_block, start_block):
+        with self.connection:
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO events (contract_address, " + ", ".join(EVENT_COLUMNS) + ") "
+                "VALUES (" + ", ".join("?" * (len(EVENT_COLUMNS) + 1)) + ")",
+                rows,
+            )
+            self.connection.execute(
+                "INSERT INTO sync_state (contract_address, last_synced_block, start_block) VALUES (?, ?, ?) "
+                "ON CONFLICT (contract_address) DO UPDATE SET last_synced_block = excluded.last_synced_block",
+                (self.contract_address, last_block, start_block),
+            )
+
+    async def sync(self, w3, to_block=None, start_block=0, confirmations=0, **scanner_options):
+        """Catch the index up with the chain.
+
+        Scans from the block after the persisted checkpoint (or ``start_block`` for an
+        empty index, which is recorded as the index's ``start_block``) up to
+        ``to_block``. Events and the checkpoint are committed together after every
+        scanned chunk, so an interrupted sync resumes where it stopped.
+
+        Args:
+            w3 (Web3 | AsyncWeb3): Web3 instance to use for blockchain interaction
+            to_block (int | None): Last block to index, defaults to the latest block
+                minus ``confirmations``
+            start_block (int): First block to index when the index is empty
+            confirmations (int): Number of most recent blocks to leave unindexed when
+                ``to_block`` is not given
+            **scanner_options: Extra options forwarded to ``LogScanner``
+
+        Returns:
+            int: Number of new events stored
+        """
+        if to_block is None:
+            to_block = await async_call(w3, lambda: w3.eth.block_number) - confirmations
+
+        last_synced_block = self.last_synced_block
+        from_block = start_block if last_synced_block is None else last_synced_block + 1
+        if from_block > to_block:
+            return 0
+
+        scanner = LogScanner(w3, self.contract_address, COLLATERAL_EVENTS, **scanner_options)
+        rows = []
+        unsaved_requests = {}
+        stored = 0
+
+        def on_progress(last_block):
+            nonlocal rows, stored
+            self._store(rows, last_block, from_block)
+            stored += len(rows)
+            rows = []
+            unsaved_requests.clear()
+
+        async for event in scanner.scan(from_block, to_block, on_progress=on_progress):
+            rows.append(self._event_to_row(event, unsaved_requests))
+
+        return stored
+
+    def get_events(
+        self,
+        event=None,
+        executor_id=None,
+        miner=None,
+        reclaim_request_id=None,
+        block_num_low=None,
+        block_num_high=None,
+    ):
+        """Query indexed events.
+
+        All filters are optional and combined with AND.
+
+        Args:
+            event (str | Iterable[str] | None): Event name(s) to return
+            executor_id (str | None): Executor UUID string
+            miner (str | None): Miner address
+            reclaim_request_id (int | None): Reclaim request ID
+            block_num_low (int | None): The starting block number (inclusive)
+            block_num_high (int | None): The ending block number (inclusive)
+
+        Returns:
+            list[IndexedEvent]: Matching events in (block number, log index) order
+        """
+        conditions = ["contract_address = ?"]
+        params = [self.contract_address]
+        if event is not None:
+            names = [event] if isinstance(event, str) else list(event)
+            conditions.append("event IN (" + ", ".join("?" * len(names)) + ")")
+            params.extend(names)
+        if executor_id is not None:
+            conditions.append("executor_id = ?")
+            params.append(str(uuid.UUID(str(executor_id))))
+        if miner is not None:
+            conditions.append("miner = ?")
+            params.append(Web3.to_checksum_address(miner))
+        if reclaim_request_id is not None:
+            conditions.append("reclaim_request_id = ?")
+            params.append(reclaim_request_id)
+        if block_num_low is not None:
+            conditions.append("block_number >= ?")
+            params.append(block_num_low)
+        if block_num_high is not None:
+            conditions.append("block_number <= ?")
+            params.append(block_num_high)
+
+        rows = self.connection.execute(
+            "SELECT " + ", ".join(EVENT_COLUMNS) + " FROM events WHERE "
+            + " AND ".join(conditions) + " ORDER BY block_number, log_index",
+            params,
+        ).fetchall()
+        return [_row_to_event(row) for row in rows]
+
+    async def fetch_events(self, w3, event=None, block_num_low=0, block_num_high=None, **scanner_options):
+        """Query the events of a block range, syncing the index up to ``block_num_high`` first.
+
+        Blocks before the index's ``start_block`` are not covered by the index, their
+        events are scanned from the RPC instead (without storing them).
+
+        Args:
+            w3 (Web3 | AsyncWeb3): Web3 instance to use for blockchain interaction
+            event (str | Iterable[str] | None): Event name(s) to return
+            block_num_low (int): The starting block number (inclusive)
+            block_num_high (int | None): The ending block number (inclusive), defaults
+                to the latest block
+            **scanner_options: Extra options forwarded to ``LogScanner``
+
+        Returns:
+            list[IndexedEvent]: Matching events in (block number, log index) order
+        """
+        if block_num_high is None:
+            block_num_high = await async_call(w3, lambda: w3.eth.block_number)
+        last_synced_block = self.last_synced_block
+        if last_synced_block is None or last_synced_block < block_num_high:
+            await self.sync(w3, to_block=block_num_high, **scanner_options)
+
+        events = []
+        start_block = self.start_block
+        if start_block is not None and block_num_low < start_block:
+            names = None if event is None else {event} if isinstance(event, str) else set(event)
+            # all events are scanned, Denied rows take their executor from the request
+            scanner = LogScanner(w3, self.contract_address, COLLATERAL_EVENTS, **scanner_options)
+            unsaved_requests = {}
+            async for log in scanner.scan(block_num_low, min(block_num_high, start_block - 1)):
+                row = self._event_to_row(log, unsaved_requests)
+                if names is None or log["event"] in names:
+                    events.append(_row_to_event(row[1:]))
+            block_num_low = start_block
+        events.extend(self.get_events(event, block_num_low=block_num_low, block_num_high=block_num_high))
+        return events
@@ -0,0 +1,219 @@
+"""
+Real-time Event Stream
+
+This module pushes decoded Collateral contract events to consumers as soon as
+they are mined, instead of re-scanning recent blocks on every poll:
+- Over WebSocket, logs are received with an ``eth_subscribe`` logs subscription
+- Over HTTP-only endpoints, an ``eth_newFilter`` log filter is polled instead, also
+  used as a fallback when the WebSocket endpoint keeps refusing connections
+- After a disconnect the stream resubscribes automatically and backfills the
+  missed blocks with ``LogScanner``, so no event is lost; the resume block follows
+  the head during quiet periods, so the backfill only covers the disconnect
+- Events are de-duplicated by (block number, log index), so the overlap between
+  backfill and live logs is never delivered twice
+"""
+import asyncio
+import contextlib
+import sys
+
+from web3 import AsyncWeb3, WebSocketProvider
+
+from celium_collateral_contracts.common import async_call
+from celium_collateral_contracts.log_scanner import COLLATERAL_EVENTS, LogScanner
+from celium_collateral_contracts.read_cache import get_read_cache
+
+__all__ = ["DEDUP_WINDOW", "EventStream", "stream_events"]
+
+# Number of blocks below the resume block whose log keys are kept for de-duplication
+DEDUP_WINDOW = 16
+
+
+class EventStream:
+    """Async iterator over Collateral contract events as they are mined.
+
+    Args:
+        w3 (Web3 | AsyncWeb3): HTTP Web3 instance, used for backfills and for polling
+            when no WebSocket URL is given
+        contract_address (str): The address of the deployed Collateral contract
+        event_names (Iterable[str]): Names of the events to stream (defaults to all
+            Collateral events)
+        ws_url (str | None): WebSocket endpoint to subscribe to logs on; without it
+            a log filter is polled over ``w3``
+        from_block (int | None): First block to deliver events of, defaults to the
+            latest block when the stream starts
+        poll_interval (float): Seconds between filter polls in polling mode
+        reconnect_delay (float): Initial delay in seconds before resubscribing
+        max_reconnect_delay (float): Upper bound of the exponential reconnect delay
+        max_connect_failures (int): Consecutive failed WebSocket connects after which
+            the stream falls back to polling a log filter over ``w3``
+        quiet_interval (float): Seconds without logs after which the resume block is
+            advanced towards the head
+        **scanner_options: Extra options forwarded to the backfill ``LogScanner``
+    """
+
+    def __init__(
+        self,
+        w3,
+        contract_address,
+        event_names=COLLATERAL_EVENTS,
+        ws_url=None,
+        from_block=None,
+        poll_interval=2.0,
+        reconnect_delay=1.0,
+        max_reconnect_delay=30.0,
+        max_connect_failures=3,
+        quiet_interval=30.0,
+        **scanner_options,
+    ):
+        self.w3 = w3
+        self.scanner = LogScanner(w3, contract_address, event_names, **scanner_options)
+        self.ws_url = ws_url
+        self.poll_interval = poll_interval
+        self.reconnect_delay = reconnect_delay
+        self.max_reconnect_delay = max_reconnect_delay
+        self.max_connect_failures = max_connect_failures
+        self.quiet_interval = quiet_interval
+
+        # First block that may still contain undelivered events
+        self.resume_block = from_block
+        self._seen = set()
+
+    def _filter_params(self):
+        return {"address": self.scanner.contract_address, "topics": [list(self.scanner.topics)]}
+
+    @contextlib.asynccontextmanager
+    async def _websocket_logs(self):
+        async with AsyncWeb3(WebSocketProvider(self.ws_url)) as ws_w3:
+            await ws_w3.eth.subscribe("logs", self._filter_params())
+
+            read_cache = get_read_cache(self.w3)
+
+            async def logs():
+                async for message in ws_w3.socket.process_subscriptions():
+                    # logs received over the socket bypass the read cache of the HTTP instance
+                    if read_cache is not None:
+                        read_cache.observe_logs([message["result"]])
+                    yield message["result"]
+
+            yield logs()
+
+    @contextlib.asynccontextmanager
+    async def _polling_logs(self):
+        log_filter = await async_call(self.w3, self.w3.eth.filter, self._filter_params())
+
+        async def logs():
+            while True:
+                for log in await async_call(self.w3, self.w3.eth.get_filter_changes, log_filter.filter_id):
+                    yield log
+                await asyncio.sleep(self.poll_interval)
+
+        try:
+            yield logs()
+        finally:
+            try:
+                await async_call(self.w3, self.w3.eth.uninstall_filter, log_filter.filter_id)
+            except Exception:
+                pass
+
+    def _accept(self, block_number, log_index):
+        """Record a log key, returning False if the log was delivered before."""
+        key = (block_number, log_index)
+        if key in self._seen:
+            return False
+        self._seen.add(key)
+        self._advance(block_number)
+        return True
+
+    def _advance(self, block_number):
+        """Move the resume block forward, forgetting log keys outside the de-duplication window."""
+        if block_number > self.resume_block:
+            self.resume_block = block_number
+            self._seen = {seen for seen in self._seen if seen[0] >= block_number - DEDUP_WINDOW}
+
+    async def _live_logs(self, logs):
+        """Yield live logs, advancing the resume block to the head while none arrive."""
+        quiet_head = None
+        next_log = asyncio.ensure_future(anext(logs))
+        try:
+            while True:
+                done, _ = await asyncio.wait({next_log}, timeout=self.quiet_interval)
+                if not done:
+                    # Logs of blocks up to the head seen one interval ago have been delivered
+                    if quiet_head is not None:
+                        self._advance(quiet_head)
+                    quiet_head = await async_call(self.w3, lambda: self.w3.eth.block_number)
+                    continue
+                try:
+                    log = next_log.result()
+                except StopAsyncIteration:
+                    return
+                yield log
+                next_log = asyncio.ensure_future(anext(logs))
+        finally:
+            next_log.cancel()
+
+    async def events(self):
+        """Stream decoded events, resubscribing and backfilling after disconnects.
+
+        Yields:
+            EventData: Decoded events; live events arrive in the order they are mined
+        """
+        if self.resume_block is None:
+            self.resume_block = await async_call(self.w3, lambda: self.w3.eth.block_number)
+
+        delay = self.reconnect_delay
+        use_websocket = self.ws_url is not None
+        connect_failures = 0
+        while True:
+            subscribe = self._websocket_logs if use_websocket else self._polling_logs
+            connected = False
+            try:
+                async with subscribe() as logs:
+                    connected = True
+                    connect_failures = 0
+                    # Subscribed first, so blocks mined during the backfill arrive as live logs
+                    head = await async_call(self.w3, lambda: self.w3.eth.block_number)
+                    async for event in self.scanner.scan(self.resume_block, head):
+                        if self._accept(event["blockNumber"], event["logIndex"]):
+                            yield event
+                    self._advance(head)
+                    delay = self.reconnect_delay
+
+                    live_logs = self._live_logs(logs)
+                    try:
+                        async for log in live_logs:
+                            if log.get("removed"):
+                                continue
+                            if self._accept(log["blockNumber"], log["logIndex"]):
+                                yield self.scanner.decode_log(log)
+                    finally:
+                        await live_logs.aclose()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                if use_websocket and not connected:
+                    connect_failures += 1
+                    if connect_failures >= self.max_connect_failures:
+                        print(
+                            f"WebSocket connection failed {connect_failures} times, polling a log filter instead: {e}",
+                            file=sys.stderr,
+                        )
+                        use_websocket = False
+                        continue
+                print(f"Event stream interrupted, resubscribing in {delay}s: {e}", file=sys.stderr)
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, self.max_reconnect_delay)
+
+    def __aiter__(self):
+        return self.events()
+
+
+async def stream_events(w3, contract_address, event_names=COLLATERAL_EVENTS, ws_url=None,
+                        from_block=None, **options):
+    """Stream decoded Collateral events as they are mined.
+
+    Convenience wrapper around ``EventStream``; see ``EventStream`` for the
+    available options.
+    """
+    async for event in EventStream(w3, contract_address, event_names, ws_url, from_block, **options):
+        yield event
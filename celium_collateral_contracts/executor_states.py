@@ -0,0 +1,328 @@
+"""
+Bulk Executor State Reads
+
+This module reads Collateral contract state for many executors and reclaim
+requests at once. Instead of one ``eth_call`` per value, calls to
+``collaterals(bytes16)``, ``executorToMiner(bytes16)`` and ``reclaims(uint256)``
+are packed into batches that are sent as:
+- A single Multicall3 ``aggregate3`` call per batch, when Multicall3 is deployed
+- A single JSON-RPC batch request per batch otherwise
+"""
+import asyncio
+import uuid
+import weakref
+from dataclasses import dataclass
+
+from web3 import Web3
+
+from celium_collateral_contracts.common import (
+    async_call,
+    async_get_chain_id,
+    executor_uuid_to_bytes,
+    get_chain_id,
+    get_contract,
+    is_async_web3,
+)
+
+__all__ = [
+    "DEFAULT_BATCH_SIZE", "MULTICALL3_ADDRESS", "MULTICALL3_ABI", "BulkReadError", "ExecutorState",
+    "ReclaimState", "has_multicall", "async_has_multicall", "execute_calls", "async_execute_calls",
+    "get_executor_states", "async_get_executor_states", "get_reclaims", "async_get_reclaims",
+]
+
+# Multicall3 is deployed at the same address on most EVM chains
+MULTICALL3_ADDRESS = "0xcA11bde05977b3631167028862bE2a173976CA11"
+MULTICALL3_ABI = [
+    {
+        "type": "function",
+        "name": "aggregate3",
+        "stateMutability": "payable",
+        "inputs": [
+            {
+                "name": "calls",
+                "type": "tuple[]",
+                "components": [
+                    {"name": "target", "type": "address"},
+                    {"name": "allowFailure", "type": "bool"},
+                    {"name": "callData", "type": "bytes"},
+                ],
+            }
+        ],
+        "outputs": [
+            {
+                "name": "returnData",
+                "type": "tuple[]",
+                "components": [
+                    {"name": "success", "type": "bool"},
+                    {"name": "returnData", "type": "bytes"},
+                ],
+            }
+        ],
+    }
+]
+
+DEFAULT_BATCH_SIZE = 500
+
+
+class BulkReadError(Exception):
+    """Raised when a batched contract read fails."""
+    pass
+
+
+@dataclass
+class ExecutorState:
+    """On-chain state of a single executor."""
+
+    executor_uuid: str
+    collateral: int
+    miner: str
+
+
+@dataclass
+class ReclaimState:
+    """On-chain state of a single reclaim request (amount is 0 once finalized or denied)."""
+
+    reclaim_request_id: int
+    executor_uuid: str
+    miner: str
+    amount: int
+    deny_timeout: int
+
+
+def has_multicall(w3, block_identifier="latest"):
+    """Check whether Multicall3 is deployed on the connected chain."""
+    return len(w3.eth.get_code(MULTICALL3_ADDRESS, block_identifier)) > 0
+
+
+async def async_has_multicall(w3, block_identifier="latest"):
+    """Async counterpart of ``has_multicall``, usable with both Web3 and AsyncWeb3."""
+    return len(await async_call(w3, w3.eth.get_code, MULTICALL3_ADDRESS, block_identifier)) > 0
+
+
+# Web3 instance -> {chain ID: whether Multicall3 is deployed}, see execute_calls
+_multicall_chains = weakref.WeakKeyDictionary()
+
+
+def _detect_multicall(w3, block_identifier):
+    chains = _multicall_chains.setdefault(w3, {})
+    chain_id = get_chain_id(w3)
+    if chain_id not in chains:
+        chains[chain_id] = has_multicall(w3, block_identifier)
+    return chains[chain_id]
+
+
+async def _async_detect_multicall(w3, block_identifier):
+    chains = _multicall_chains.setdefault(w3, {})
+    chain_id = await async_get_chain_id(w3)
+    if chain_id not in chains:
+        chains[chain_id] = await async_has_multicall(w3, block_identifier)
+    return chains[chain_id]
+
+
+def _multicall_calls(target, calldata):
+    return [(target, True, data) for data in calldata]
+
+
+def _multicall_results(results):
+    return [bytes(data) if success else None for success, data in results]
+
+
+def _multicall(w3, target, calldata, block_identifier):
+    multicall = w3.eth.contract(address=MULTICALL3_ADDRESS, abi=MULTICALL3_ABI)
+    results = multicall.functions.aggregate3(
+        _multicall_calls(target, calldata)
+    ).call(block_identifier=block_identifier)
+    return _multicall_results(results)
+
+
+async def _async_multicall(w3, target, calldata, block_identifier):
+    multicall = w3.eth.contract(address=MULTICALL3_ADDRESS, abi=MULTICALL3_ABI)
+    results = await multicall.functions.aggregate3(
+        _multicall_calls(target, calldata)
+    ).call(block_identifier=block_identifier)
+    return _multicall_results(results)
+
+
+def _rpc_batch(w3, target, calldata, block_identifier):
+    with w3.batch_requests() as batch:
+        for data in calldata:
+            batch.add(w3.eth.call({"to": target, "data": data}, block_identifier))
+        return [bytes(result) for result in batch.execute()]
+
+
+async def _async_rpc_batch(w3, target, calldata, block_identifier):
+    async with w3.batch_requests() as batch:
+        for data in calldata:
+            batch.add(w3.eth.call({"to": target, "data": data}, block_identifier))
+        return [bytes(result) for result in await batch.async_execute()]
+
+
+def execute_calls(w3, target, calldata, block_identifier="latest",
+                  batch_size=DEFAULT_BATCH_SIZE, use_multicall=None):
+    """Execute many read-only calls against one contract in batches.
+
+    Args:
+        w3 (Web3): Web3 instance to use for blockchain interaction
+        target (str): Address of the called contract
+        calldata (list[bytes | str]): ABI-encoded call data for each call
+        block_identifier (int | str): Block to read the state at
+        batch_size (int): Maximum number of calls per batch
+        use_multicall (bool | None): Force (True) or disable (False) Multicall3,
+            by default it is used when deployed. Deployment is checked once per Web3
+            instance and chain, so reading blocks from before the deployment needs False.
+
+    Returns:
+        list[bytes | None]: Raw return data per call, None for reverted multicalls
+    """
+    target = Web3.to_checksum_address(target)
+    if use_multicall is None:
+        use_multicall = _detect_multicall(w3, block_identifier)
+    execute_batch = _multicall if use_multicall else _rpc_batch
+
+    results = []
+    for start in range(0, len(calldata), batch_size):
+        try:
+            results.extend(execute_batch(w3, target, calldata[start:start + batch_size], block_identifier))
+        except Exception as e:
+            raise BulkReadError(f"Batched read of calls {start}-{start + batch_size} failed: {e}") from e
+    return results
+
+
+async def async_execute_calls(w3, target, calldata, block_identifier="latest",
+                              batch_size=DEFAULT_BATCH_SIZE, use_multicall=None):
+    """Async counterpart of ``execute_calls``, usable with both Web3 and AsyncWeb3.
+
+    With AsyncWeb3 the batches are awaited natively, with the blocking Web3 backend
+    ``execute_calls`` runs in a worker thread.
+    """
+    if not is_async_web3(w3):
+        return await asyncio.to_thread(
+            execute_calls, w3, target, calldata, block_identifier, batch_size, use_multicall
+        )
+
+    target = Web3.to_checksum_address(target)
+    if use_multicall is None:
+        use_multicall = await _async_detect_multicall(w3, block_identifier)
+    execute_batch = _async_multicall if use_multicall else _async_rpc_batch
+
+    results = []
+    for start in range(0, len(calldata), batch_size):
+        try:
+            results.extend(await execute_batch(w3, target, calldata[start:start + batch_size], block_identifier))
+        except Exception as e:
+            raise BulkReadError(f"Batched read of calls {start}-{start + batch_size} failed: {e}") from e
+    return results
+
+
+def _executor_states_calldata(contract, executor_uuids):
+    calldata = []
+    for executor_uuid in executor_uuids:
+        uuid_bytes = executor_uuid_to_bytes(executor_uuid)
+        calldata.append(contract.functions.collaterals(uuid_bytes)._encode_transaction_data())
+        calldata.append(contract.functions.executorToMiner(uuid_bytes)._encode_transaction_data())
+    return calldata
+
+
+def _decode_executor_states(w3, executor_uuids, results):
+    states = {}
+    for i, executor_uuid in enumerate(executor_uuids):
+        collateral_data, miner_data = results[2 * i], results[2 * i + 1]
+        if collateral_data is None or miner_data is None:
+            raise BulkReadError(f"Reading state of executor {executor_uuid} reverted")
+        (collateral,) = w3.codec.decode(["uint256"], collateral_data)
+        (miner,) = w3.codec.decode(["address"], miner_data)
+        states[executor_uuid] = ExecutorState(
+            executor_uuid=str(uuid.UUID(bytes=executor_uuid_to_bytes(executor_uuid))),
+            collateral=collateral,
+            miner=Web3.to_checksum_address(miner),
+        )
+    return states
+
+
+def get_executor_states(w3, contract_address, executor_uuids, block_identifier="latest",
+                        batch_size=DEFAULT_BATCH_SIZE, use_multicall=None):
+    """Read collateral and owning miner for many executors in batched calls.
+
+    Args:
+        w3 (Web3): Web3 instance to use for blockchain interaction
+        contract_address (str): Address of the Collateral contract
+        executor_uuids (Iterable[str | bytes]): Executor UUIDs to read
+        block_identifier (int | str): Block to read the state at
+        batch_size (int): Maximum number of calls per batch
+        use_multicall (bool | None): See ``execute_calls``
+
+    Returns:
+        dict[str | bytes, ExecutorState]: States keyed by the given executor UUIDs
+    """
+    contract = get_contract(w3, contract_address)
+    executor_uuids = list(dict.fromkeys(executor_uuids))
+    calldata = _executor_states_calldata(contract, executor_uuids)
+    results = execute_calls(w3, contract.address, calldata, block_identifier, batch_size, use_multicall)
+    return _decode_executor_states(w3, executor_uuids, results)
+
+
+async def async_get_executor_states(w3, contract_address, executor_uuids, block_identifier="latest",
+                                    batch_size=DEFAULT_BATCH_SIZE, use_multicall=None):
+    """Async counterpart of ``get_executor_states``, usable with both Web3 and AsyncWeb3."""
+    contract = get_contract(w3, contract_address)
+    executor_uuids = list(dict.fromkeys(executor_uuids))
+    calldata = _executor_states_calldata(contract, executor_uuids)
+    results = await async_execute_calls(w3, contract.address, calldata, block_identifier, batch_size, use_multicall)
+    return _decode_executor_states(w3, executor_uuids, results)
+
+
+def _reclaims_calldata(contract, reclaim_request_ids):
+    return [
+        contract.functions.reclaims(reclaim_request_id)._encode_transaction_data()
+        for reclaim_request_id in reclaim_request_ids
+    ]
+
+
+def _decode_reclaims(w3, reclaim_request_ids, results):
+    reclaims = {}
+    for reclaim_request_id, data in zip(reclaim_request_ids, results):
+        if data is None:
+            raise BulkReadError(f"Reading reclaim request {reclaim_request_id} reverted")
+        executor_id, miner, amount, deny_timeout = w3.codec.decode(
+            ["bytes16", "address", "uint256", "uint64"], data
+        )
+        reclaims[reclaim_request_id] = ReclaimState(
+            reclaim_request_id=reclaim_request_id,
+            executor_uuid=str(uuid.UUID(bytes=executor_id)),
+            miner=Web3.to_checksum_address(miner),
+            amount=amount,
+            deny_timeout=deny_timeout,
+        )
+    return reclaims
+
+
+def get_reclaims(w3, contract_address, reclaim_request_ids, block_identifier="latest",
+                 batch_size=DEFAULT_BATCH_SIZE, use_multicall=None):
+    """Read many reclaim requests in batched calls.
+
+    Args:
+        w3 (Web3): Web3 instance to use for blockchain interaction
+        contract_address (str): Address of the Collateral contract
+        reclaim_request_ids (Iterable[int]): Reclaim request IDs to read
+        block_identifier (int | str): Block to read the state at
+        batch_size (int): Maximum number of calls per batch
+        use_multicall (bool | None): See ``execute_calls``
+
+    Returns:
+        dict[int, ReclaimState]: States keyed by reclaim request ID
+    """
+    contract = get_contract(w3, contract_address)
+    reclaim_request_ids = list(dict.fromkeys(reclaim_request_ids))
+    calldata = _reclaims_calldata(contract, reclaim_request_ids)
+    results = execute_calls(w3, contract.address, calldata, block_identifier, batch_size, use_multicall)
+    return _decode_reclaims(w3, reclaim_request_ids, results)
+
+
+async def async_get_reclaims(w3, contract_address, reclaim_request_ids, block_identifier="latest",
+                             batch_size=DEFAULT_BATCH_SIZE, use_multicall=None):
+    """Async counterpart of ``get_reclaims``, usable with both Web3 and AsyncWeb3."""
+    contract = get_contract(w3, contract_address)
+    reclaim_request_ids = list(dict.fromkeys(reclaim_request_ids))
+    calldata = _reclaims_calldata(contract, reclaim_request_ids)
+    results = await async_execute_calls(w3, contract.address, calldata, block_identifier, batch_size, use_multicall)
+    return _decode_reclaims(w3, reclaim_request_ids, results)
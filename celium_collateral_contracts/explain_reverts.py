@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+
+"""
+Revert Explanation Script
+
+This script decodes the revert reasons of failed Collateral contract
+transactions. Transactions are replayed concurrently and their custom errors
+are decoded together with their arguments, which makes post-mortems over many
+failed slashes, denials or deposits fast.
+"""
+
+import argparse
+import asyncio
+import csv
+import sys
+from celium_collateral_contracts.common import get_web3_connection, explain_failed_transactions
+
+
+async def main():
+    parser = argparse.ArgumentParser(
+        description="Decode the revert reasons of failed Collateral contract transactions"
+    )
+    parser.add_argument("--tx-hashes", help="Comma-separated list of transaction hashes")
+    parser.add_argument("--tx-hashes-file", help="File with one transaction hash per line")
+    parser.add_argument(
+        "--max-workers", type=int, default=16, help="Maximum number of transactions replayed concurrently"
+    )
+    parser.add_argument("--network", default="finney", help="The Subtensor Network to connect to.")
+    args = parser.parse_args()
+
+    tx_hashes = []
+    if args.tx_hashes:
+        tx_hashes.extend(tx_hash.strip() for tx_hash in args.tx_hashes.split(",") if tx_hash.strip())
+    if args.tx_hashes_file:
+        with open(args.tx_hashes_file) as f:
+            tx_hashes.extend(line.strip() for line in f if line.strip())
+    if not tx_hashes:
+        parser.error("one of --tx-hashes or --tx-hashes-file is required")
+
+    w3 = get_web3_connection(args.network)
+    reasons = await explain_failed_transactions(w3, tx_hashes, max_workers=args.max_workers)
+
+    writer = csv.writer(sys.stdout)
+    writer.writerow(["transaction_hash", "revert_reason"])
+    writer.writerows(reasons.items())
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
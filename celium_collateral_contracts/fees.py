@@ -0,0 +1,196 @@
+"""
+Transaction Fee Strategy
+
+This module prices transactions from recent blocks instead of the node's single
+``eth_gasPrice`` value:
+- EIP-1559 (type-2) fees: the priority fee is a percentile of the tips paid in the
+  last blocks (``eth_feeHistory``), the max fee leaves headroom for base fee growth
+- Chains without a base fee fall back to legacy ``gasPrice`` transactions
+- Fees of stuck transactions are bumped for same-nonce replacements, see
+  ``common.wait_for_receipt`` and ``FeeConfig.replacement_deadline``
+"""
+import asyncio
+import math
+import statistics
+import weakref
+from dataclasses import dataclass
+
+from web3 import AsyncWeb3
+
+__all__ = [
+    "FeeConfig", "Fees", "configure_fees", "get_fee_config", "suggest_fees", "async_suggest_fees",
+]
+
+
+@dataclass
+class FeeConfig:
+    """Settings of the fee strategy.
+
+    Args:
+        mode (str): ``"auto"`` uses EIP-1559 fees when the chain has a base fee and
+            legacy gas prices otherwise, ``"eip1559"`` and ``"legacy"`` force one kind
+        history_blocks (int): Number of recent blocks whose tips are considered
+        priority_fee_percentile (float): Percentile of the tips paid in each block
+        base_fee_multiplier (float): Max fee headroom over the next block's base fee,
+            2 keeps a transaction valid through six consecutive full blocks
+        min_priority_fee (int): Lower bound of the priority fee, in wei
+        max_fee_cap (int | None): Upper bound of the max fee (or gas price), in wei
+        replacement_deadline (float | None): Seconds without a receipt after which a
+            transaction is re-broadcast with bumped fees at the same nonce; None
+            disables replacements
+        bump_percent (float): Fee increase per replacement; nodes require at least 10%
+        max_replacements (int): Maximum number of replacements per transaction
+    """
+
+    mode: str = "auto"
+    history_blocks: int = 10
+    priority_fee_percentile: float = 50
+    base_fee_multiplier: float = 2.0
+    min_priority_fee: int = 0
+    max_fee_cap: int | None = None
+    replacement_deadline: float | None = None
+    bump_percent: float = 12.5
+    max_replacements: int = 3
+
+
+@dataclass(frozen=True)
+class Fees:
+    """Fee fields of a transaction: either EIP-1559 fees or a legacy gas price (all in wei)."""
+
+    max_fee_per_gas: int | None = None
+    max_priority_fee_per_gas: int | None = None
+    gas_price: int | None = None
+
+    @property
+    def is_eip1559(self):
+        return self.max_fee_per_gas is not None
+
+    @classmethod
+    def from_transaction(cls, transaction):
+        """Read the fee fields of a transaction dict."""
+        if "maxFeePerGas" in transaction:
+            return cls(
+                max_fee_per_gas=transaction["maxFeePerGas"],
+                max_priority_fee_per_gas=transaction["maxPriorityFeePerGas"],
+            )
+        return cls(gas_price=transaction["gasPrice"])
+
+    def to_transaction_params(self):
+        """Fee fields to put into a transaction dict."""
+        if self.is_eip1559:
+            return {
+                "type": 2,
+                "maxFeePerGas": self.max_fee_per_gas,
+                "maxPriorityFeePerGas": self.max_priority_fee_per_gas,
+            }
+        return {"gasPrice": self.gas_price}
+
+    def bump(self, percent):
+        """Fees raised by ``percent``, rounded up, as required to replace a pending transaction."""
+        def raise_fee(fee):
+            return None if fee is None else math.ceil(fee * (100 + percent) / 100)
+
+        return Fees(
+            max_fee_per_gas=raise_fee(self.max_fee_per_gas),
+            max_priority_fee_per_gas=raise_fee(self.max_priority_fee_per_gas),
+            gas_price=raise_fee(self.gas_price),
+        )
+
+    def at_least(self, other):
+        """The field-wise maximum of two fees of the same kind."""
+        if other.is_eip1559 != self.is_eip1559:
+            return self
+        if self.is_eip1559:
+            return Fees(
+                max_fee_per_gas=max(self.max_fee_per_gas, other.max_fee_per_gas),
+                max_priority_fee_per_gas=max(self.max_priority_fee_per_gas, other.max_priority_fee_per_gas),
+            )
+        return Fees(gas_price=max(self.gas_price, other.gas_price))
+
+    def exceeds(self, cap):
+        """Check whether the max fee (or gas price) is above ``cap``."""
+        if cap is None:
+            return False
+        return (self.max_fee_per_gas if self.is_eip1559 else self.gas_price) > cap
+
+
+_config = FeeConfig()
+# Web3 instances of chains found to have no base fee
+_legacy_chains = weakref.WeakSet()
+
+
+def configure_fees(config):
+    """Replace the fee strategy settings."""
+    global _config
+    _config = config
+
+
+def get_fee_config():
+    """Return the current fee strategy settings."""
+    return _config
+
+
+def _fees_from_history(history, config):
+    base_fees = history["baseFeePerGas"]
+    if not base_fees or not base_fees[-1]:
+        return None
+    # the last entry is the base fee of the next block
+    base_fee = base_fees[-1]
+    tips = [rewards[0] for rewards in history.get("reward") or [] if rewards]
+    priority_fee = max(int(statistics.median(tips)) if tips else 0, config.min_priority_fee)
+    max_fee = int(base_fee * config.base_fee_multiplier) + priority_fee
+    if config.max_fee_cap is not None:
+        max_fee = min(max_fee, config.max_fee_cap)
+        priority_fee = min(priority_fee, max_fee)
+    return Fees(max_fee_per_gas=max_fee, max_priority_fee_per_gas=priority_fee)
+
+
+def _legacy_fees(gas_price, config):
+    if config.max_fee_cap is not None:
+        gas_price = min(gas_price, config.max_fee_cap)
+    return Fees(gas_price=gas_price)
+
+
+def suggest_fees(w3):
+    """Suggest the fees of a transaction sent now.
+
+    Returns:
+        Fees: EIP-1559 fees from ``eth_feeHistory``, or a legacy gas price on chains
+        without a base fee (or with ``mode="legacy"``)
+    """
+    config = _config
+    if config.mode != "legacy" and w3 not in _legacy_chains:
+        try:
+            history = w3.eth.fee_history(config.history_blocks, "latest", [config.priority_fee_percentile])
+        except Exception:
+            if config.mode == "eip1559":
+                raise
+        else:
+            fees = _fees_from_history(history, config)
+            if fees is not None:
+                return fees
+            if config.mode == "eip1559":
+                raise ValueError("The chain has no base fee, EIP-1559 transactions are not supported")
+            _legacy_chains.add(w3)
+    return _legacy_fees(w3.eth.gas_price, config)
+
+
+async def async_suggest_fees(w3):
+    """Async counterpart of ``suggest_fees``, usable with both Web3 and AsyncWeb3."""
+    if not isinstance(w3, AsyncWeb3):
+        return await asyncio.to_thread(suggest_fees, w3)
+    config = _config
+    if config.mode != "legacy" and w3 not in _legacy_chains:
+        try:
+            history = await w3.eth.fee_history(config.history_blocks, "latest", [config.priority_fee_percentile])
+        except Exception:
+            if config.mode == "eip1559":
+                raise
+        else:
+            fees = _fees_from_history(history, config)
+            if fees is not None:
+                return fees
+            if config.mode == "eip1559":
+                raise ValueError("The chain has no base fee, EIP-1559 transactions are not supported")
+            _legacy_chains.add(w3)
+    return _legacy_fees(await w3.eth.gas_price, config)
@@ -6,20 +6,38 @@ Reclaim Finalization Script
 This script allows users to finalize their collateral reclaim requests after
 the waiting period has elapsed. It processes the reclaim request and returns
 the collateral to the user's address.
+
+With ``--watch`` it runs as a service that tracks open reclaim requests and
+finalizes every request as soon as its deny timeout has passed. Matured requests
+are dry-run first, so requests that would revert are never broadcast, and the
+remaining ones are sent as one pipelined batch.
 """
 
 import sys
 import argparse
 import asyncio
+from dataclasses import dataclass
 from celium_collateral_contracts.common import (
-    load_contract_abi,
+    get_contract,
     get_web3_connection,
+    get_websocket_url,
     get_account,
+    configure_preflight,
     validate_address_format,
-    build_and_send_transaction,
-    wait_for_receipt,
-    get_revert_reason,
+    async_build_and_send_transaction,
+    async_wait_for_receipt,
+    async_get_revert_reason,
+    send_transactions_pipelined,
+    simulate_transaction,
 )
+from celium_collateral_contracts.event_index import EventIndex
+from celium_collateral_contracts.event_stream import EventStream
+from celium_collateral_contracts.reclaim_tracker import ReclaimTracker
+
+__all__ = [
+    "FinalizeReclaimError", "finalize_reclaim", "FinalizeOutcome", "finalize_reclaims_batch",
+    "watch_and_finalize",
+]
 
 
 class FinalizeReclaimError(Exception):
@@ -31,7 +49,7 @@ async def finalize_reclaim(w3, account, reclaim_request_id, contract_address):
     """Finalize a reclaim request on the contract.
 
     Args:
-        w3: Web3 instance
+        w3: Web3 or AsyncWeb3 instance
         account: Account to use for the transaction
         reclaim_request_id: ID of the reclaim request to finalize
         contract_address: Address of the contract
@@ -44,21 +62,20 @@ async def finalize_reclaim(w3, account, reclaim_request_id, contract_address):
     """
     validate_address_format(contract_address)
 
-    contract_abi = load_contract_abi()
-    contract = w3.eth.contract(address=contract_address, abi=contract_abi)
+    contract = get_contract(w3, contract_address)
 
-    tx_hash = build_and_send_transaction(
+    tx_hash = await async_build_and_send_transaction(
         w3,
         contract.functions.finalizeReclaim(reclaim_request_id),
         account,
         gas_limit=200000,
     )
-    receipt = wait_for_receipt(w3, tx_hash)
+    receipt = await async_wait_for_receipt(w3, tx_hash)
 
 
     if receipt['status'] == 0:
         # Try to get revert reason
-        revert_reason = get_revert_reason(w3, tx_hash, receipt['blockNumber'])
+        revert_reason = await async_get_revert_reason(w3, tx_hash, receipt['blockNumber'])
         raise FinalizeReclaimError(f"Transaction failed for finalizing reclaim request {reclaim_request_id}. Revert reason: {revert_reason}")
 
     reclaim_events = contract.events.Reclaimed().process_receipt(receipt)
@@ -84,6 +101,127 @@ async def finalize_reclaim(w3, account, reclaim_request_id, contract_address):
     return reclaim_event, receipt
 
 
+@dataclass
+class FinalizeOutcome:
+    """Result of finalizing a single reclaim request in a batch."""
+
+    reclaim_request_id: int
+    success: bool
+    # The request was not broadcast because the dry run reverted
+    skipped: bool = False
+    revert_reason: str | None = None
+    amount: int | None = None
+    tx_hash: str | None = None
+    block_number: int | None = None
+    error: str | None = None
+
+
+async def finalize_reclaims_batch(w3, account, reclaim_request_ids, contract_address, simulate=True):
+    """Finalize many reclaim requests with pipelined transactions.
+
+    Each request is first dry-run with ``eth_call`` (concurrently); requests that
+    would revert, e.g. with ``BeforeDenyTimeout`` or ``ReclaimNotFound``, are skipped
+    instead of broadcast. The others are sent back-to-back with sequential nonces.
+
+    Args:
+        w3 (Web3 | AsyncWeb3): Web3 instance
+        account: Account to use for the transactions
+        reclaim_request_ids (Iterable[int]): IDs of the reclaim requests to finalize
+        contract_address (str): Address of the contract
+        simulate (bool): Dry-run the requests before broadcasting them
+
+    Returns:
+        list[FinalizeOutcome]: Outcome per reclaim request, in input order
+    """
+    validate_address_format(contract_address)
+    contract = get_contract(w3, contract_address)
+    results = [FinalizeOutcome(reclaim_request_id=i, success=False) for i in dict.fromkeys(reclaim_request_ids)]
+
+    if simulate:
+        reasons = await asyncio.gather(*(
+            simulate_transaction(w3, contract.functions.finalizeReclaim(result.reclaim_request_id), account)
+            for result in results
+        ), return_exceptions=True)
+        for result, reason in zip(results, reasons):
+            if isinstance(reason, Exception):
+                # e.g. a transient RPC error, the request is not broadcast this time
+                result.error = f"Dry run failed: {reason}"
+            elif reason is not None:
+                result.skipped = True
+                result.revert_reason = reason.name
+                result.error = f"Dry run reverted: {reason}"
+    pending = [result for result in results if not result.skipped and result.error is None]
+
+    outcomes = await send_transactions_pipelined(
+        w3,
+        account,
+        [contract.functions.finalizeReclaim(result.reclaim_request_id) for result in pending],
+        gas_limit=200000,
+    )
+    for result, outcome in zip(pending, outcomes):
+        result.success = outcome.success
+        result.tx_hash = outcome.tx_hash.to_0x_hex() if outcome.tx_hash is not None else None
+        result.block_number = outcome.receipt['blockNumber'] if outcome.receipt is not None else None
+        result.error = outcome.error
+        reclaim_events = contract.events.Reclaimed().process_receipt(outcome.receipt) if outcome.success else []
+        if reclaim_events:
+            result.amount = reclaim_events[0]['args']['amount']
+    return results
+
+
+async def watch_and_finalize(w3, account, contract_address, tracker, poll_interval=12.0):
+    """Finalize open reclaim requests as soon as their deny timeout has passed.
+
+    Runs until cancelled. Each round, all matured requests of the tracker are
+    finalized in one ``finalize_reclaims_batch``. Finalized requests and requests
+    that can never be finalized (e.g. ``ReclaimNotFound``, or
+    ``InsufficientCollateralForReclaim`` after a slash) are dropped from the
+    tracker; requests whose dry run hit ``BeforeDenyTimeout`` or failed, and failed
+    transactions are retried in the next round. Errors of a round (e.g. RPC
+    errors) are reported on stderr and do not stop the watcher.
+
+    Args:
+        w3 (Web3 | AsyncWeb3): Web3 instance
+        account: Account to use for the transactions
+        contract_address (str): Address of the contract
+        tracker (ReclaimTracker): Tracker of the open reclaim requests, kept
+            current by the caller (see ``ReclaimTracker.start_following``)
+        poll_interval (float): Maximum seconds between two rounds
+    """
+    while True:
+        matured = tracker.expiring_within(0, include_expired=True)
+        if matured:
+            print(f"Finalizing {len(matured)} matured reclaim requests...", file=sys.stderr)
+            try:
+                results = await finalize_reclaims_batch(
+                    w3, account, [reclaim.reclaim_request_id for reclaim in matured], contract_address
+                )
+            except Exception as e:
+                print(f"Finalization round failed, retrying in the next round: {e}", file=sys.stderr)
+                results = []
+            for result in results:
+                if result.success:
+                    print(f"Finalized reclaim request {result.reclaim_request_id} in tx {result.tx_hash}")
+                    tracker.close(result.reclaim_request_id)
+                elif result.skipped and result.revert_reason != "BeforeDenyTimeout":
+                    print(
+                        f"Dropping reclaim request {result.reclaim_request_id}: {result.error}", file=sys.stderr
+                    )
+                    tracker.close(result.reclaim_request_id)
+                elif not result.skipped:
+                    print(
+                        f"Failed to finalize reclaim request {result.reclaim_request_id}: {result.error}",
+                        file=sys.stderr,
+                    )
+
+        # Sleep until the next deadline passes, but re-check at least every poll_interval
+        delay = poll_interval
+        next_reclaim = tracker.most_urgent()
+        if next_reclaim is not None and next_reclaim.deny_timeout > tracker.clock():
+            delay = min(delay, next_reclaim.deny_timeout - tracker.clock() + 1)
+        await asyncio.sleep(delay)
+
+
 async def main():
     parser = argparse.ArgumentParser(
         description="Finalize a reclaim request on the Collateral contract"
@@ -91,16 +229,54 @@ async def main():
     parser.add_argument(
         "--contract-address", required=True, help="Address of the deployed Collateral contract"
     )
-    parser.add_argument(
-        "--reclaim-request-id", required=True, type=int, help="ID of the reclaim request to finalize"
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument(
+        "--reclaim-request-id", type=int, help="ID of the reclaim request to finalize"
+    )
+    target.add_argument(
+        "--watch", action="store_true",
+        help="Keep running and finalize every reclaim request as soon as its deny timeout has passed"
     )
     parser.add_argument("--private-key", help="Private key of the account to use")
     parser.add_argument("--network", default="finney", help="The Subtensor Network to connect to.")
+    parser.add_argument(
+        "--start-block", type=int, default=0,
+        help="With --watch: first block of the event history (e.g. the deployment block)"
+    )
+    parser.add_argument(
+        "--index-db", help="With --watch: path of a local event index database to read the event history from"
+    )
+    parser.add_argument(
+        "--poll-interval", type=float, default=12.0, help="With --watch: maximum seconds between two rounds"
+    )
+    parser.add_argument(
+        "--preflight", action="store_true",
+        help="Simulate transactions before broadcasting them and size their gas from estimate_gas"
+    )
     args = parser.parse_args()
+    if args.preflight:
+        configure_preflight()
 
     w3 = get_web3_connection(args.network)
     account = get_account(args.private_key)
 
+    if args.watch:
+        index = EventIndex(args.index_db, args.contract_address) if args.index_db else None
+        tracker = None
+        try:
+            tracker = await ReclaimTracker.load(w3, args.contract_address, start_block=args.start_block, index=index)
+            print(f"Watching {len(tracker)} open reclaim requests from block {tracker.block_number}", file=sys.stderr)
+            tracker.start_following(EventStream(
+                w3, args.contract_address, ws_url=get_websocket_url(args.network), from_block=tracker.block_number + 1
+            ))
+            await watch_and_finalize(w3, account, args.contract_address, tracker, args.poll_interval)
+        finally:
+            if tracker is not None:
+                tracker.stop()
+            if index is not None:
+                index.close()
+        return
+
     try:
         reclaim_event, receipt = await finalize_reclaim(
             w3=w3,
@@ -1,9 +1,41 @@
 import argparse
+import json
 import os
-from rich.console import Console
-from rich.table import Table
 from eth_account import Account
 
+def batch_steps(args):
+    """The generated operations as batch_runner.py steps, keyed like the command table."""
+    common = {"contract_address": args.contract_address}
+    miner = {**common, "private_key": args.miner_private_key}
+    owner = {**common, "private_key": args.owner_private_key}
+    steps = []
+    if args.executor_uuid:
+        steps.append({"id": "deposit_collateral", "op": "deposit", **miner,
+                      "executor_uuid": args.executor_uuid, "amount_tao": "0.001"})
+    # get_eligible_executors: the collateral of each listed executor
+    if args.executor_uuids:
+        for index, executor_uuid in enumerate(args.executor_uuids.split(",")):
+            steps.append({"id": f"get_eligible_executors-{index}", "op": "get_executor_collateral", **common,
+                          "executor_uuid": executor_uuid.strip()})
+    if args.executor_uuid:
+        steps.append({"id": "reclaim_collateral", "op": "reclaim", **miner,
+                      "executor_uuid": args.executor_uuid, "url": "reclaim_request_url"})
+    if args.block_start is not None and args.block_end is not None:
+        steps.append({"id": "get_reclaim_requests", "op": "get_reclaim_requests", **common,
+                      "block_start": args.block_start, "block_end": args.block_end})
+    if args.reclaim_request_id is not None:
+        steps.append({"id": "deny_request", "op": "deny", **owner,  # Denied by owner
+                      "reclaim_request_id": args.reclaim_request_id, "url": "deny_request_url"})
+        steps.append({"id": "finalize_reclaim", "op": "finalize", **owner,  # Finalized by owner
+                      "reclaim_request_id": args.reclaim_request_id})
+    if args.executor_uuid:
+        steps.append({"id": "slash_collateral", "op": "slash", **owner,
+                      "executor_uuid": args.executor_uuid, "url": "slash_url"})
+        steps.append({"id": "get_executor_collateral", "op": "get_executor_collateral", **common,
+                      "executor_uuid": args.executor_uuid})
+    return steps
+
+
 def main():
     parser = argparse.ArgumentParser(description="Generate command strings for collateral contract scripts.")
     parser.add_argument("--network", required=True, help="Network to use (e.g., local, test)")
@@ -16,6 +48,10 @@ def main():
     parser.add_argument("--block-start", type=int, help="Starting block for reclaim requests", default=12345)
     parser.add_argument("--block-end", type=int, help="Ending block for reclaim requests", default=12355)
     parser.add_argument("--raw", action='store_true', help="Output raw command strings, one per line")
+    parser.add_argument(
+        "--batch", action='store_true',
+        help="Output the operations as JSONL steps for batch_runner.py, which runs them in one process"
+    )
     # Amount is hardcoded for now as per test script example
     # URL is hardcoded for now as per test script example
 
@@ -25,7 +61,6 @@ def main():
     owner_address = Account.from_key(args.owner_private_key).address
     miner_address = Account.from_key(args.miner_private_key).address
 
-    console = Console()
     commands_to_print = []
 
     # Define script paths relative to the current script
@@ -144,17 +179,26 @@ def main():
         )
         commands_to_print.append(("get_executor_collateral", get_executor_collateral_command))
 
+    if args.batch:
+        for step in batch_steps(args):
+            print(json.dumps(step))
+        return
+
     # Print the table
     if args.raw:
         for key, command in commands_to_print:
             print(command)
     else:
+        # rich is only needed for the table output
+        from rich.console import Console
+        from rich.table import Table
+
         table = Table(title="Generated Commands", show_lines=True, border_style="blue")
         table.add_column("Command Key", style="dim", width=30)
         table.add_column("Command", style="green", justify="left")
         for key, command in commands_to_print:
             table.add_row(key, command)
-        console.print(table)
+        Console().print(table)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -15,6 +15,8 @@ import json
 from eth_account import Account
 from eth_keys import keys
 
+__all__ = ["generate_and_save_keypair"]
+
 
 def generate_and_save_keypair(output_path: pathlib.Path, overwrite: bool = False) -> dict:
     """
@@ -9,10 +9,18 @@ import asyncio
 import argparse
 import csv
 import sys
+import uuid
 from collections import defaultdict
-from celium_collateral_contracts.common import load_contract_abi, get_web3_connection, get_executor_collateral
+from celium_collateral_contracts.common import get_web3_connection
+from celium_collateral_contracts.event_index import EventIndex
+from celium_collateral_contracts.executor_states import get_executor_states
+from celium_collateral_contracts.log_scanner import LogScanner
 from dataclasses import dataclass
 
+__all__ = [
+    "DepositEvent", "iter_deposit_events", "get_deposit_events", "get_deposit_events_from_index",
+]
+
 
 @dataclass
 class DepositEvent:
@@ -22,6 +30,35 @@ class DepositEvent:
     amount: int
     block_number: int
     transaction_hash: str
+    # UUID of the executor the deposit was made for
+    executor_id: str | None = None
+
+
+async def iter_deposit_events(w3, contract_address, block_num_low, block_num_high, **scanner_options):
+    """Stream Deposit events emitted by the Collateral contract within a block range.
+
+    The range is fetched in adaptive chunks by ``LogScanner``, so arbitrarily large
+    ranges can be scanned without hitting provider limits or holding all logs in memory.
+
+    Args:
+        w3 (Web3): Web3 instance to use for blockchain interaction
+        contract_address (str): The address of the deployed Collateral contract
+        block_num_low (int): The starting block number (inclusive)
+        block_num_high (int): The ending block number (inclusive)
+        **scanner_options: Extra options forwarded to ``LogScanner``
+
+    Yields:
+        DepositEvent: Deposit events in block order
+    """
+    scanner = LogScanner(w3, contract_address, ["Deposit"], **scanner_options)
+    async for event in scanner.scan(block_num_low, block_num_high):
+        yield DepositEvent(
+            account=event["args"]["miner"],
+            amount=event["args"]["amount"],
+            block_number=event["blockNumber"],
+            transaction_hash=event["transactionHash"].hex(),
+            executor_id=str(uuid.UUID(bytes=event["args"]["executorId"])),
+        )
 
 
 async def get_deposit_events(w3, contract_address, block_num_low, block_num_high):
@@ -36,41 +73,38 @@ async def get_deposit_events(w3, contract_address, block_num_low, block_num_high
     Returns:
         list[DepositEvent]: List of Deposit events
     """
-    contract_abi = load_contract_abi()
-
-    contract = w3.eth.contract(address=contract_address, abi=contract_abi)
-
-    checksum_address = w3.to_checksum_address(contract_address)
-
-    event_signature = "Deposit(address,uint256)"
-    event_topic = w3.keccak(text=event_signature).hex()
+    return [
+        event
+        async for event in iter_deposit_events(w3, contract_address, block_num_low, block_num_high)
+    ]
 
-    filter_params = {
-        "fromBlock": hex(block_num_low),
-        "toBlock": hex(block_num_high),
-        "address": checksum_address,
-        "topics": [event_topic]
-    }
 
-    logs = w3.eth.get_logs(filter_params)
+async def get_deposit_events_from_index(w3, index, block_num_low, block_num_high):
+    """Fetch Deposit events within a block range from a local event index.
 
-    formatted_events = []
-    for log in logs:
-        account_address = "0x" + log["topics"][1].hex()[-40:]
-        account = w3.to_checksum_address(account_address)
+    The index is synced up to ``block_num_high`` first, so only blocks that were not
+    indexed before (including blocks before the index's start block) are fetched
+    from the RPC.
 
-        decoded_event = contract.events.Deposit().process_log(log)
+    Args:
+        w3 (Web3): Web3 instance to use for blockchain interaction
+        index (EventIndex): Local event index of the Collateral contract
+        block_num_low (int): The starting block number (inclusive)
+        block_num_high (int): The ending block number (inclusive)
 
-        formatted_events.append(
-            DepositEvent(
-                account=account,
-                amount=decoded_event['args']['amount'],
-                block_number=log["blockNumber"],
-                transaction_hash=log["transactionHash"].hex(),
-            )
+    Returns:
+        list[DepositEvent]: List of Deposit events
+    """
+    return [
+        DepositEvent(
+            account=event.miner,
+            amount=event.amount,
+            block_number=event.block_number,
+            transaction_hash=event.transaction_hash,
+            executor_id=event.executor_id,
         )
-
-    return formatted_events
+        for event in await index.fetch_events(w3, "Deposit", block_num_low, block_num_high)
+    ]
 
 
 async def main():
@@ -87,25 +121,32 @@ async def main():
         "--block-end", required=True, type=int, help="Ending block number (inclusive)"
     )
     parser.add_argument("--network", default="finney", help="The Subtensor Network to connect to.")
+    parser.add_argument(
+        "--index-db", help="Path of a local event index database to read events from and keep in sync"
+    )
     args = parser.parse_args()
 
     w3 = get_web3_connection(args.network)
 
-    deposit_events = await get_deposit_events(
-        w3, args.contract_address, args.block_start, args.block_end
-    )
-
     cumulative_deposits = defaultdict(int)
-    for event in deposit_events:
-        cumulative_deposits[event.executorId] += event.amount
-
-    executor_ids = set(event.executorId for event in deposit_events)
+    if args.index_db:
+        with EventIndex(args.index_db, args.contract_address) as index:
+            deposit_events = await get_deposit_events_from_index(
+                w3, index, args.block_start, args.block_end
+            )
+        for event in deposit_events:
+            cumulative_deposits[event.executor_id] += event.amount
+    else:
+        async for event in iter_deposit_events(
+            w3, args.contract_address, args.block_start, args.block_end
+        ):
+            cumulative_deposits[event.executor_id] += event.amount
+
+    executor_states = get_executor_states(w3, args.contract_address, cumulative_deposits)
     results = []
-    for executor_id in executor_ids:
-        collateral = get_executor_collateral(
-            w3, args.contract_address, executor_id)
+    for executor_id, state in executor_states.items():
         results.append(
-            [executor_id, w3.from_wei(cumulative_deposits[executor_id], 'ether'), w3.from_wei(collateral, 'ether')])
+            [executor_id, w3.from_wei(cumulative_deposits[executor_id], 'ether'), w3.from_wei(state.collateral, 'ether')])
 
     writer = csv.writer(sys.stdout)
     writer.writerow(
@@ -12,10 +12,18 @@ import sys
 import csv
 import argparse
 from dataclasses import dataclass
-from celium_collateral_contracts.common import get_web3_connection, load_contract_abi
+from celium_collateral_contracts.common import get_web3_connection
+from celium_collateral_contracts.executor_states import async_get_reclaims
+from celium_collateral_contracts.event_index import EventIndex
+from celium_collateral_contracts.log_scanner import LogScanner
 import uuid
 import datetime
 
+__all__ = [
+    "ReclaimProcessStartedEvent", "get_reclaim_process_started_events",
+    "get_reclaim_process_started_events_from_index",
+]
+
 
 @dataclass
 class ReclaimProcessStartedEvent:
@@ -30,73 +38,92 @@ class ReclaimProcessStartedEvent:
     executor_uuid: str
 
 
+def _format_expiration_time(expiration_time):
+    return datetime.datetime.utcfromtimestamp(expiration_time).strftime('%Y-%m-%d %H:%M:%S UTC')
+
+
+async def _filter_pending(w3, contract_address, events):
+    """Keep the events whose reclaim request is still pending, using one aggregated ``reclaims()`` query."""
+    reclaims = await async_get_reclaims(w3, contract_address, [event.reclaim_request_id for event in events])
+    return [event for event in events if reclaims[event.reclaim_request_id].amount]
+
+
 async def get_reclaim_process_started_events(
-    w3, contract_address, block_num_low, block_num_high
+    w3, contract_address, block_num_low, block_num_high, pending_only=False
 ):
     """Fetch all ReclaimProcessStarted events emitted by the Collateral contract within a block range.
 
+    Executor, amount and expiration time are decoded from the events themselves, so
+    no contract call is made per event.
+
     Args:
-        w3 (Web3): Web3 instance to use for blockchain interaction
+        w3 (Web3 | AsyncWeb3): Web3 instance to use for blockchain interaction
         contract_address (str): The address of the deployed Collateral contract
         block_num_low (int): The starting block number (inclusive)
         block_num_high (int): The ending block number (inclusive)
+        pending_only (bool): Only return reclaim requests that were neither finalized
+            nor denied yet, checked with one batched ``reclaims()`` query
 
     Returns:
         list[ReclaimProcessStartedEvent]: List of ReclaimProcessStarted events
     """
-    contract_abi = load_contract_abi()
-
-    contract = w3.eth.contract(address=contract_address, abi=contract_abi)
-
-    checksum_address = w3.to_checksum_address(contract_address)
-    
-    event_signature = "ReclaimProcessStarted(uint256,bytes16,address,uint256,uint64,string,bytes16)"
-    event_topic = w3.keccak(text=event_signature).hex()
-
-    filter_params = {
-        "fromBlock": hex(block_num_low),
-        "toBlock": hex(block_num_high),
-        "address": checksum_address,
-        "topics": [
-            event_topic,  # Event signature topic
-            None,  # reclaimRequestId (indexed)
-            None,  # account (indexed)
-        ]
-    }
-    logs = w3.eth.get_logs(filter_params)
-    def get_reclaim_by_id(reclaim_id):
-        """Fetch reclaim information using reclaim_id."""
-        reclaim = contract.functions.reclaims(reclaim_id).call()
-        return {
-            "miner": reclaim[1],
-            "amount": float(w3.from_wei(reclaim[2], "ether")),
-            "denyTimeout": datetime.datetime.utcfromtimestamp(reclaim[3]).strftime('%Y-%m-%d %H:%M:%S UTC'),
-            "executorUuid": reclaim[0].hex(),
-        }
+    scanner = LogScanner(w3, contract_address, ["ReclaimProcessStarted"])
 
     formatted_events = []
-    for log in logs:
-        reclaim_request_id = int(log["topics"][1].hex(), 16)
-
-        decoded_event = contract.events.ReclaimProcessStarted().process_log(log)
-
-        reclaim_info = get_reclaim_by_id(reclaim_request_id)
-        # Convert executorUuid hex string to bytes before creating UUID
-        executor_uuid_bytes = bytes.fromhex(reclaim_info["executorUuid"])
+    async for decoded_event in scanner.scan(block_num_low, block_num_high):
+        args = decoded_event['args']
         formatted_events.append(
             ReclaimProcessStartedEvent(
-                reclaim_request_id=reclaim_request_id,
-                amount=reclaim_info["amount"],
-                expiration_time=reclaim_info["denyTimeout"],
-                executor_uuid=str(uuid.UUID(bytes=executor_uuid_bytes)),
-                url=decoded_event['args']['url'],
-                url_content_md5_checksum=decoded_event['args']['urlContentMd5Checksum'].hex(),
-                block_number=log["blockNumber"],
+                reclaim_request_id=args['reclaimRequestId'],
+                amount=float(w3.from_wei(args['amount'], "ether")),
+                expiration_time=_format_expiration_time(args['expirationTime']),
+                executor_uuid=str(uuid.UUID(bytes=args['executorId'])),
+                url=args['url'],
+                url_content_md5_checksum=args['urlContentMd5Checksum'].hex(),
+                block_number=decoded_event["blockNumber"],
             ))
 
+    if pending_only and formatted_events:
+        return await _filter_pending(w3, contract_address, formatted_events)
     return formatted_events
 
 
+async def get_reclaim_process_started_events_from_index(
+    w3, index, block_num_low, block_num_high, pending_only=False
+):
+    """Fetch ReclaimProcessStarted events within a block range from a local event index.
+
+    The index is synced up to ``block_num_high`` first, so only blocks that were not
+    indexed before (including blocks before the index's start block) are fetched
+    from the RPC. Amount and expiration time are taken from the events themselves.
+
+    Args:
+        w3 (Web3): Web3 instance to use for blockchain interaction
+        index (EventIndex): Local event index of the Collateral contract
+        block_num_low (int): The starting block number (inclusive)
+        block_num_high (int): The ending block number (inclusive)
+        pending_only (bool): Only return reclaim requests that are still pending
+
+    Returns:
+        list[ReclaimProcessStartedEvent]: List of ReclaimProcessStarted events
+    """
+    events = [
+        ReclaimProcessStartedEvent(
+            reclaim_request_id=event.reclaim_request_id,
+            amount=float(w3.from_wei(event.amount, "ether")),
+            expiration_time=_format_expiration_time(event.expiration_time),
+            url=event.url,
+            url_content_md5_checksum=event.url_content_md5_checksum,
+            block_number=event.block_number,
+            executor_uuid=event.executor_id,
+        )
+        for event in await index.fetch_events(w3, "ReclaimProcessStarted", block_num_low, block_num_high)
+    ]
+    if pending_only and events:
+        return await _filter_pending(w3, index.contract_address, events)
+    return events
+
+
 async def main():
     parser = argparse.ArgumentParser(
         description="Fetch ReclaimProcessStarted events from Collateral contract")
@@ -112,13 +139,26 @@ async def main():
     parser.add_argument(
         "--network",
         default="finney")
+    parser.add_argument(
+        "--index-db", help="Path of a local event index database to read events from and keep in sync"
+    )
+    parser.add_argument(
+        "--pending-only", action="store_true",
+        help="Only list reclaim requests that were neither finalized nor denied yet"
+    )
     
     args = parser.parse_args()
 
     w3 = get_web3_connection(args.network)
-    events = await get_reclaim_process_started_events(
-        w3, args.contract_address, args.block_start, args.block_end
-    )
+    if args.index_db:
+        with EventIndex(args.index_db, args.contract_address) as index:
+            events = await get_reclaim_process_started_events_from_index(
+                w3, index, args.block_start, args.block_end, args.pending_only
+            )
+    else:
+        events = await get_reclaim_process_started_events(
+            w3, args.contract_address, args.block_start, args.block_end, args.pending_only
+        )
 
     fieldnames = [
         "reclaim_request_id",
@@ -0,0 +1,252 @@
+"""
+Pooled HTTP Sessions
+
+This module provides the shared HTTP layer used for RPC providers and URL
+checksums. Instead of a fresh connection per provider or request, it keeps one
+``requests.Session`` per network (and one aiohttp session per async provider) with:
+- A bounded keep-alive connection pool, so TCP and TLS handshakes are paid once
+- Connect/read timeouts applied to every request
+- Retries with exponential backoff for connection errors, and for read errors and
+  transient HTTP statuses of GET requests only
+- Counters for connections opened vs. reused, read from the underlying urllib3 pools
+"""
+import threading
+from dataclasses import dataclass
+
+import requests
+from aiohttp import ClientError, ClientSession, ClientTimeout, TCPConnector
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from web3 import AsyncHTTPProvider
+from web3._utils.caching import generate_cache_key
+from web3._utils.http_session_manager import HTTPSessionManager
+from web3.providers.rpc.utils import ExceptionRetryConfiguration
+
+__all__ = [
+    "HttpPoolConfig", "ConnectionStats", "DEFAULT_SESSION", "build_session", "build_async_session",
+    "PooledAsyncHTTPProvider", "configure_http_pool", "get_http_pool_config", "get_session",
+    "get_connection_stats", "close_sessions",
+]
+
+
+@dataclass
+class HttpPoolConfig:
+    """Settings of the pooled HTTP sessions.
+
+    Args:
+        pool_connections (int): Number of hosts whose connection pools are kept per session
+        pool_maxsize (int): Maximum number of kept-alive connections per host
+        pool_block (bool): Wait for a free connection instead of opening extra ones
+            that are discarded after use
+        keep_alive (bool): Keep connections open between requests
+        connect_timeout (float): Seconds to wait for a connection to be established
+        read_timeout (float): Seconds to wait for a response
+        max_retries (int): Retries for connection errors, and for read errors and
+            ``retry_statuses`` of GET requests
+        backoff_factor (float): Exponential backoff factor between retries, in seconds
+        retry_statuses (tuple[int, ...]): HTTP statuses that are retried
+    """
+
+    pool_connections: int = 4
+    pool_maxsize: int = 32
+    pool_block: bool = False
+    keep_alive: bool = True
+    connect_timeout: float = 10.0
+    read_timeout: float = 60.0
+    max_retries: int = 3
+    backoff_factor: float = 0.5
+    retry_statuses: tuple = (429, 502, 503, 504)
+
+    @property
+    def timeout(self):
+        """The (connect, read) timeout tuple passed to ``requests``."""
+        return (self.connect_timeout, self.read_timeout)
+
+    @property
+    def async_timeout(self):
+        """The connect and read timeouts as passed to ``aiohttp``."""
+        return ClientTimeout(sock_connect=self.connect_timeout, sock_read=self.read_timeout)
+
+
+@dataclass
+class ConnectionStats:
+    """Connection counters of the pooled sessions."""
+
+    requests: int
+    connections_opened: int
+
+    @property
+    def connections_reused(self):
+        """Number of requests served over an already open connection."""
+        return max(0, self.requests - self.connections_opened)
+
+
+# Session used for requests that are not tied to a network, e.g. URL checksums
+DEFAULT_SESSION = "default"
+
+_config = HttpPoolConfig()
+# Pooled sessions per network
+_sessions = {}
+_sessions_lock = threading.Lock()
+
+
+def build_session(config=None):
+    """Create a requests session with a pooled, retrying HTTP adapter."""
+    config = config or _config
+    retry = Retry(
+        total=config.max_retries,
+        connect=config.max_retries,
+        read=config.max_retries,
+        status=config.max_retries,
+        backoff_factor=config.backoff_factor,
+        status_forcelist=config.retry_statuses,
+        # JSON-RPC is POST only and not idempotent: a POST that may have reached the
+        # node, e.g. eth_sendRawTransaction, is never resent. Connection errors are
+        # still retried for any method because nothing was sent yet.
+        allowed_methods=frozenset({"GET"}),
+        other=0,
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(
+        pool_connections=config.pool_connections,
+        pool_maxsize=config.pool_maxsize,
+        pool_block=config.pool_block,
+        max_retries=retry,
+    )
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    if not config.keep_alive:
+        session.headers["Connection"] = "close"
+    return session
+
+
+def build_async_session(config=None):
+    """Create an aiohttp session with a pooled connector.
+
+    Must be called from the event loop the session is used on.
+    """
+    config = config or _config
+    connector = TCPConnector(
+        limit=config.pool_connections * config.pool_maxsize,
+        limit_per_host=config.pool_maxsize,
+        force_close=not config.keep_alive,
+        enable_cleanup_closed=True,
+    )
+    # web3 expects HTTP errors to be raised by the session
+    return ClientSession(connector=connector, timeout=config.async_timeout, raise_for_status=True)
+
+
+class _PooledSessionManager(HTTPSessionManager):
+    """Session manager of ``PooledAsyncHTTPProvider``.
+
+    web3 creates the aiohttp session of a provider on first use, and again once the
+    event loop it was created on is closed, with a connector that closes every
+    connection after one request. Here those sessions are built from the pool
+    settings instead.
+    """
+
+    def __init__(self, config):
+        super().__init__()
+        self.config = config
+
+    async def async_cache_and_return_session(self, endpoint_uri, session=None, request_timeout=None):
+        if session is None:
+            # Same key as web3: sessions are cached per thread and endpoint
+            cache_key = generate_cache_key(f"{threading.get_ident()}:{endpoint_uri}")
+            cached = self.session_cache.get_cache_entry(cache_key)
+            if cached is not None and (cached.closed or cached._loop.is_closed()):
+                self.session_cache.pop(cache_key)
+                if not cached.closed:
+                    await cached.close()
+                cached = None
+            if cached is None:
+                session = build_async_session(self.config)
+
+        cached = await super().async_cache_and_return_session(endpoint_uri, session, request_timeout)
+        if session is not None and cached is not session:
+            # Another request cached its session first
+            await session.close()
+        return cached
+
+
+class PooledAsyncHTTPProvider(AsyncHTTPProvider):
+    """AsyncHTTPProvider whose aiohttp sessions follow the pool settings.
+
+    Connections are kept alive and bounded like those of the pooled ``requests``
+    sessions, and requests that web3 considers safe to resend are retried with the
+    same backoff.
+    """
+
+    def __init__(self, endpoint_uri, config=None, **kwargs):
+        config = config or _config
+        kwargs.setdefault("request_kwargs", {"timeout": config.async_timeout})
+        kwargs.setdefault(
+            "exception_retry_configuration",
+            ExceptionRetryConfiguration(
+                errors=(ClientError, TimeoutError),
+                retries=config.max_retries,
+                backoff_factor=config.backoff_factor,
+            ),
+        )
+        super().__init__(endpoint_uri, **kwargs)
+        self._request_session_manager = _PooledSessionManager(config)
+
+
+def configure_http_pool(config):
+    """Replace the pool settings; sessions created before are closed and rebuilt on next use."""
+    global _config
+    with _sessions_lock:
+        _config = config
+        for session in _sessions.values():
+            session.close()
+        _sessions.clear()
+
+
+def get_http_pool_config():
+    """Return the current pool settings."""
+    return _config
+
+
+def get_session(network=DEFAULT_SESSION):
+    """Return the shared pooled session of a network, created on first use."""
+    with _sessions_lock:
+        session = _sessions.get(network)
+        if session is None:
+            session = _sessions[network] = build_session(_config)
+        return session
+
+
+def get_connection_stats(network=None):
+    """Count requests and opened connections of the pooled sessions.
+
+    Args:
+        network (str | None): Only count the session of this network, all sessions by default
+
+    Returns:
+        ConnectionStats: Counters of the connection pools currently held by the sessions
+    """
+    with _sessions_lock:
+        if network is None:
+            sessions = list(_sessions.values())
+        else:
+            sessions = [_sessions[network]] if network in _sessions else []
+
+    stats = ConnectionStats(requests=0, connections_opened=0)
+    for session in sessions:
+        for adapter in set(session.adapters.values()):
+            if not isinstance(adapter, HTTPAdapter):
+                continue
+            for key in list(adapter.poolmanager.pools.keys()):
+                pool = adapter.poolmanager.pools[key]
+                stats.requests += pool.num_requests
+                stats.connections_opened += pool.num_connections
+    return stats
+
+
+def close_sessions():
+    """Close all pooled sessions and their connections."""
+    with _sessions_lock:
+        for session in _sessions.values():
+            session.close()
+        _sessions.clear()
@@ -0,0 +1,207 @@
+"""
+Chunked Log Scanner
+
+This module provides a shared engine for fetching and decoding Collateral
+contract events over large block ranges. Instead of issuing a single
+``eth_getLogs`` request for the whole range, the scanner:
+- Splits the range into chunks whose size adapts to the provider's responses
+  (shrinking on "too many results"/timeouts, growing when responses are small)
+- Fetches several chunks concurrently with bounded parallelism
+- Yields decoded events in block order as an async stream, so memory stays flat
+- Records the last fully scanned block, so interrupted scans can be resumed
+"""
+import asyncio
+import sys
+from collections import deque
+
+import requests
+from web3 import Web3
+
+from celium_collateral_contracts.common import async_call, get_contract, get_event_topics
+
+__all__ = [
+    "COLLATERAL_EVENTS", "RANGE_TOO_LARGE_ERRORS", "LogScannerError", "LogScanner", "scan_events",
+]
+
+COLLATERAL_EVENTS = ("Deposit", "ReclaimProcessStarted", "Reclaimed", "Denied", "Slashed")
+
+# Substrings of provider error messages that mean the requested range was too large
+RANGE_TOO_LARGE_ERRORS = (
+    "too many",
+    "limit exceeded",
+    "more than",
+    "response size",
+    "query timeout",
+    "timed out",
+    "timeout",
+    "range too large",
+    "block range",
+)
+
+
+class LogScannerError(Exception):
+    """Raised when a block range cannot be fetched after all retries."""
+    pass
+
+
+def _is_range_too_large(error):
+    if isinstance(error, (requests.exceptions.Timeout, TimeoutError, asyncio.TimeoutError)):
+        return True
+    message = str(error).lower()
+    return any(pattern in message for pattern in RANGE_TOO_LARGE_ERRORS)
+
+
+class LogScanner:
+    """Adaptive, concurrent scanner for Collateral contract events.
+
+    Args:
+        w3 (Web3 | AsyncWeb3): Web3 instance to use for blockchain interaction
+        contract_address (str): The address of the deployed Collateral contract
+        event_names (Iterable[str]): Names of the events to fetch (defaults to all
+            Collateral events)
+        initial_chunk_size (int): Number of blocks requested per chunk at the start
+        min_chunk_size (int): Lower bound for the adaptive chunk size
+        max_chunk_size (int): Upper bound for the adaptive chunk size
+        target_logs_per_chunk (int): Number of logs per response the chunk size aims for
+        max_workers (int): Maximum number of chunks fetched concurrently
+        max_retries (int): Retries for transient errors before giving up on a chunk
+        retry_delay (float): Initial backoff delay in seconds between retries
+    """
+
+    def __init__(
+        self,
+        w3,
+        contract_address,
+        event_names=COLLATERAL_EVENTS,
+        initial_chunk_size=2000,
+        min_chunk_size=10,
+        max_chunk_size=100000,
+        target_logs_per_chunk=1000,
+        max_workers=4,
+        max_retries=5,
+        retry_delay=1.0,
+    ):
+        self.w3 = w3
+        self.contract_address = Web3.to_checksum_address(contract_address)
+        self.contract = get_contract(w3, self.contract_address)
+
+        self.event_names = tuple(event_names)
+        event_topics = get_event_topics()
+        missing = set(self.event_names) - set(event_topics)
+        if missing:
+            raise ValueError(f"Unknown events: {', '.join(sorted(missing))}")
+        self.topics = {event_topics[name]: name for name in self.event_names}
+
+        self.chunk_size = initial_chunk_size
+        self.min_chunk_size = min_chunk_size
+        self.max_chunk_size = max_chunk_size
+        self.target_logs_per_chunk = target_logs_per_chunk
+        self.max_workers = max_workers
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+
+        self.last_scanned_block = None
+
+    def decode_log(self, log):
+        """Decode a raw log into web3 event data using the contract ABI."""
+        topic = Web3.to_hex(log["topics"][0])
+        event_name = self.topics[topic]
+        return self.contract.events[event_name]().process_log(log)
+
+    def _grow(self, num_logs):
+        if num_logs > self.target_logs_per_chunk:
+            self.chunk_size = max(self.min_chunk_size, self.chunk_size // 2)
+        elif num_logs < self.target_logs_per_chunk // 2:
+            self.chunk_size = min(self.max_chunk_size, self.chunk_size * 2)
+
+    def _shrink(self, attempted_size):
+        self.chunk_size = max(self.min_chunk_size, min(self.chunk_size, attempted_size // 2))
+
+    async def _get_logs(self, start, end):
+        filter_params = {
+            "fromBlock": start,
+            "toBlock": end,
+            "address": self.contract_address,
+            "topics": [list(self.topics)],
+        }
+        return await async_call(self.w3, self.w3.eth.get_logs, filter_params)
+
+    async def _fetch_range(self, start, end):
+        """Fetch logs for ``[start, end]``, splitting the range when the provider rejects it."""
+        attempt = 0
+        while True:
+            try:
+                logs = await self._get_logs(start, end)
+            except Exception as e:
+                if _is_range_too_large(e) and end > start:
+                    self._shrink(end - start + 1)
+                    middle = (start + end) // 2
+                    left = await self._fetch_range(start, middle)
+                    right = await self._fetch_range(middle + 1, end)
+                    return left + right
+                attempt += 1
+                if attempt > self.max_retries:
+                    raise LogScannerError(
+                        f"Failed to fetch logs for blocks {start}-{end}: {e}"
+                    ) from e
+                delay = self.retry_delay * 2 ** (attempt - 1)
+                print(
+                    f"Error fetching logs for blocks {start}-{end}, retrying in {delay}s: {e}",
+                    file=sys.stderr,
+                )
+                await asyncio.sleep(delay)
+                continue
+            self._grow(len(logs))
+            return logs
+
+    async def scan(self, block_num_low, block_num_high, on_progress=None):
+        """Stream decoded events emitted within a block range.
+
+        Chunks are fetched concurrently, but events are yielded in block order.
+        After every chunk has been yielded, ``last_scanned_block`` is updated and
+        ``on_progress`` (if given) is called with it, so callers can persist a
+        checkpoint and resume a scan later from ``last_scanned_block + 1``.
+
+        Args:
+            block_num_low (int): The starting block number (inclusive)
+            block_num_high (int): The ending block number (inclusive)
+            on_progress (Callable[[int], None] | None): Called with the last fully
+                scanned block number after each chunk
+
+        Yields:
+            EventData: Decoded events in (block number, log index) order
+        """
+        next_start = block_num_low
+        pending = deque()
+        try:
+            while next_start <= block_num_high or pending:
+                while next_start <= block_num_high and len(pending) < self.max_workers:
+                    end = min(next_start + self.chunk_size - 1, block_num_high)
+                    task = asyncio.create_task(self._fetch_range(next_start, end))
+                    pending.append((end, task))
+                    next_start = end + 1
+
+                end, task = pending.popleft()
+                logs = await task
+                logs = sorted(logs, key=lambda log: (log["blockNumber"], log["logIndex"]))
+                for log in logs:
+                    yield self.decode_log(log)
+
+                self.last_scanned_block = end
+                if on_progress is not None:
+                    on_progress(end)
+        finally:
+            for _, task in pending:
+                task.cancel()
+
+
+async def scan_events(w3, contract_address, block_num_low, block_num_high,
+                      event_names=COLLATERAL_EVENTS, **scanner_options):
+    """Stream decoded Collateral events within a block range.
+
+    Convenience wrapper around ``LogScanner.scan``; see ``LogScanner`` for the
+    available scanner options.
+    """
+    scanner = LogScanner(w3, contract_address, event_names, **scanner_options)
+    async for event in scanner.scan(block_num_low, block_num_high):
+        yield event
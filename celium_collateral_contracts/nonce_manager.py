@@ -0,0 +1,112 @@
+"""
+Local Nonce Management
+
+This module tracks the next transaction nonce of an account locally, so many
+transactions can be signed and broadcast back-to-back without querying
+``eth_getTransactionCount`` for each one. The local nonce is re-synchronized
+with the chain whenever a send fails because of a nonce conflict.
+"""
+import threading
+
+from web3 import Web3
+
+__all__ = [
+    "NONCE_ERRORS", "ALREADY_KNOWN_ERRORS", "is_nonce_error", "is_already_known_error",
+    "NonceManager", "get_nonce_manager",
+]
+
+# Substrings of node errors caused by a stale or conflicting nonce
+NONCE_ERRORS = (
+    "nonce too low",
+    "nonce too high",
+    "invalid nonce",
+    "replacement transaction underpriced",
+    # Substrate transaction pool errors surfaced by Frontier
+    "priority is too low",
+    "outdated",
+    "stale",
+)
+# Substrings of node errors meaning the very same transaction is already in the pool
+ALREADY_KNOWN_ERRORS = ("already known", "known transaction", "already imported")
+
+
+def is_nonce_error(error):
+    """Check whether a send error was caused by a stale or conflicting nonce."""
+    message = str(error).lower()
+    return any(pattern in message for pattern in NONCE_ERRORS)
+
+
+def is_already_known_error(error):
+    """Check whether a send error means the transaction is already in the pool."""
+    message = str(error).lower()
+    return any(pattern in message for pattern in ALREADY_KNOWN_ERRORS)
+
+
+class NonceManager:
+    """Hands out sequential nonces for one account.
+
+    The first nonce is read from the chain (including pending transactions),
+    later ones are counted locally. Thread-safe.
+
+    Args:
+        w3 (Web3 | AsyncWeb3): Web3 instance to use for blockchain interaction
+        address (str): Address of the account sending the transactions
+    """
+
+    def __init__(self, w3, address):
+        self.w3 = w3
+        self.address = Web3.to_checksum_address(address)
+        self._lock = threading.Lock()
+        self._next_nonce = None
+
+    def allocate(self):
+        """Reserve and return the next nonce."""
+        with self._lock:
+            if self._next_nonce is None:
+                self._next_nonce = self.w3.eth.get_transaction_count(self.address, "pending")
+            nonce = self._next_nonce
+            self._next_nonce += 1
+            return nonce
+
+    async def async_allocate(self):
+        """Reserve and return the next nonce, for managers of an AsyncWeb3 instance."""
+        while True:
+            with self._lock:
+                if self._next_nonce is not None:
+                    nonce = self._next_nonce
+                    self._next_nonce += 1
+                    return nonce
+            count = await self.w3.eth.get_transaction_count(self.address, "pending")
+            with self._lock:
+                if self._next_nonce is None:
+                    self._next_nonce = count
+
+    def release(self, nonce):
+        """Give back a nonce whose transaction was never broadcast."""
+        with self._lock:
+            if self._next_nonce is not None and nonce == self._next_nonce - 1:
+                self._next_nonce = nonce
+            else:
+                # a later nonce is already in use, the gap has to be resolved from the chain
+                self._next_nonce = None
+
+    def resync(self):
+        """Forget the local nonce so the next allocation reads it from the chain again."""
+        with self._lock:
+            self._next_nonce = None
+
+
+# Attribute of a Web3 instance holding its nonce managers by account address. The
+# managers reference the instance, so they are kept on it and collected with it.
+_NONCE_MANAGERS_ATTRIBUTE = "_collateral_nonce_managers"
+_nonce_managers_lock = threading.Lock()
+
+
+def get_nonce_manager(w3, address):
+    """Return the shared NonceManager of an account for a Web3 instance."""
+    address = Web3.to_checksum_address(address)
+    with _nonce_managers_lock:
+        managers = vars(w3).setdefault(_NONCE_MANAGERS_ATTRIBUTE, {})
+        if address not in managers:
+            managers[address] = NonceManager(w3, address)
+        return managers[address]
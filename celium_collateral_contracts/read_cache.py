@@ -0,0 +1,314 @@
+"""
+Block-aware Read Cache
+
+This module provides a Web3 middleware that memoizes read-only RPC requests
+which are repeated far more often than their values change:
+- Forever: ``eth_chainId``, the contract constants ``MIN_COLLATERAL_INCREASE``,
+  ``NETUID`` and ``DECISION_TIMEOUT``, and calls pinned to a block number
+- With a TTL: ``TRUSTEE()`` and ``owner()``, which only change by admin transactions
+- Per block: gas price and fee history, and calls/code reads at the latest block
+Cached calls taking an executor ID or reclaim request ID are invalidated as soon
+as a log carrying that ID is observed in a response, and hits and misses are
+counted per method.
+"""
+import json
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+
+from web3.middleware.base import Web3Middleware
+
+from celium_collateral_contracts.common import executor_uuid_to_bytes, get_function_selectors
+
+__all__ = [
+    "CONSTANT_FUNCTIONS", "ADMIN_FUNCTIONS", "FOREVER", "TTL", "BLOCK", "LOG_METHODS", "CacheStats",
+    "ReadCache", "get_read_cache", "ReadCacheMiddleware", "install_read_cache",
+]
+
+CONSTANT_FUNCTIONS = ("MIN_COLLATERAL_INCREASE", "NETUID", "DECISION_TIMEOUT")
+ADMIN_FUNCTIONS = ("TRUSTEE", "owner")
+
+FOREVER = "forever"
+TTL = "ttl"
+BLOCK = "block"
+
+# Responses carrying logs that may invalidate cached entries
+LOG_METHODS = ("eth_getLogs", "eth_getFilterChanges", "eth_getFilterLogs", "eth_getTransactionReceipt")
+
+
+@dataclass
+class CacheStats:
+    """Hit and miss counters of a read cache."""
+
+    hits: int = 0
+    misses: int = 0
+    invalidations: int = 0
+    by_method: dict = field(default_factory=dict)
+
+    @property
+    def hit_rate(self):
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def record(self, method, hit):
+        counters = self.by_method.setdefault(method, [0, 0])
+        if hit:
+            self.hits += 1
+            counters[0] += 1
+        else:
+            self.misses += 1
+            counters[1] += 1
+
+
+def _is_block_number(block_identifier):
+    return isinstance(block_identifier, int) or (
+        isinstance(block_identifier, str) and block_identifier.startswith("0x")
+    )
+
+
+class ReadCache:
+    """Cache state shared by the read cache middleware of one Web3 instance.
+
+    Args:
+        block_ttl (float): Seconds the latest block number is trusted before it is
+            fetched again to expire per-block entries
+        admin_ttl (float): Seconds ``TRUSTEE()`` and ``owner()`` results are kept
+        max_entries (int): Maximum number of cached responses (least recently used
+            entries are evicted first)
+    """
+
+    def __init__(self, block_ttl=2.0, admin_ttl=300.0, max_entries=10000):
+        self.block_ttl = block_ttl
+        self.admin_ttl = admin_ttl
+        self.max_entries = max_entries
+        self.stats = CacheStats()
+
+        selectors = get_function_selectors()
+        self._constant_selectors = {selectors[name] for name in CONSTANT_FUNCTIONS}
+        self._admin_selectors = {selectors[name] for name in ADMIN_FUNCTIONS}
+
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        # 32-byte call argument (hex) -> cache keys of the calls taking it
+        self._keys_by_argument = {}
+        self.block_number = None
+        self._block_fetched_at = 0.0
+
+    def policy(self, method, params):
+        """Return the caching policy of a request, or None if it must not be cached."""
+        if method == "eth_chainId":
+            return FOREVER
+        if method in ("eth_gasPrice", "eth_maxPriorityFeePerGas"):
+            return BLOCK
+        if method == "eth_feeHistory":
+            return BLOCK if params[1] in ("latest", "pending") else FOREVER
+        if method == "eth_getCode":
+            return FOREVER if _is_block_number(params[1]) else BLOCK
+        if method == "eth_call":
+            data = params[0].get("data") or params[0].get("input") or ""
+            if data in self._constant_selectors:
+                return FOREVER
+            if data in self._admin_selectors:
+                return TTL
+            if len(params) > 1 and _is_block_number(params[1]):
+                return FOREVER
+            return BLOCK
+        return None
+
+    def needs_block_number(self):
+        return self.block_number is None or time.monotonic() - self._block_fetched_at > self.block_ttl
+
+    def set_block_number(self, block_number):
+        with self._lock:
+            if self.block_number is not None and block_number != self.block_number:
+                for key in [key for key, entry in self._entries.items() if entry[1] == BLOCK]:
+                    self._drop(key)
+            self.block_number = block_number
+            self._block_fetched_at = time.monotonic()
+
+    def get(self, method, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                response, policy, expires_at, _ = entry
+                if policy == TTL and time.monotonic() > expires_at:
+                    self._drop(key)
+                    entry = None
+                else:
+                    self._entries.move_to_end(key)
+            self.stats.record(method, entry is not None)
+            return entry[0] if entry is not None else None
+
+    def put(self, method, params, key, policy, response):
+        if "error" in response or response.get("result") is None:
+            return
+        with self._lock:
+            expires_at = time.monotonic() + self.admin_ttl if policy == TTL else None
+            argument = self._call_argument(params[0]) if method == "eth_call" else None
+            self._entries[key] = (response, policy, expires_at, argument)
+            self._entries.move_to_end(key)
+            if argument is not None:
+                self._keys_by_argument.setdefault(argument, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                self._drop(next(iter(self._entries)))
+
+    @staticmethod
+    def _call_argument(transaction):
+        data = transaction.get("data") or transaction.get("input") or ""
+        # single-argument calls like collaterals(bytes16) or reclaims(uint256)
+        if len(data) == 2 + 8 + 64:
+            return data[10:].lower()
+        return None
+
+    def _drop(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is None or entry[3] is None:
+            return
+        keys = self._keys_by_argument.get(entry[3])
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._keys_by_argument[entry[3]]
+
+    def invalidate_argument(self, argument):
+        """Drop cached calls taking a 32-byte argument (hex, without 0x)."""
+        with self._lock:
+            keys = self._keys_by_argument.pop(argument.lower().removeprefix("0x"), ())
+            for key in keys:
+                if key in self._entries:
+                    self._drop(key)
+                    self.stats.invalidations += 1
+
+    def invalidate_executor(self, executor_uuid):
+        """Drop cached calls of an executor, e.g. ``collaterals`` and ``executorToMiner``."""
+        self.invalidate_argument(executor_uuid_to_bytes(executor_uuid).ljust(32, b"\0").hex())
+
+    def invalidate_reclaim(self, reclaim_request_id):
+        """Drop the cached ``reclaims`` call of a reclaim request."""
+        self.invalidate_argument(reclaim_request_id.to_bytes(32, "big").hex())
+
+    def observe_logs(self, logs):
+        """Invalidate cached calls taking an ID that appears in the indexed topics of logs."""
+        for log in logs:
+            for topic in log.get("topics", [])[1:]:
+                self.invalidate_argument(topic if isinstance(topic, str) else topic.hex())
+
+    def observe_response(self, method, response):
+        result = response.get("result")
+        if not result:
+            return
+        if method == "eth_getTransactionReceipt":
+            self.observe_logs(result.get("logs", []))
+        elif isinstance(result, list):
+            self.observe_logs(log for log in result if isinstance(log, Mapping))
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._keys_by_argument.clear()
+
+
+# Read caches per Web3 instance
+_read_caches = weakref.WeakKeyDictionary()
+
+
+def get_read_cache(w3):
+    """Return the read cache installed on a Web3 instance, or None."""
+    return _read_caches.get(w3)
+
+
+def _cache_key(method, params, policy, block_number):
+    key = json.dumps([method, params], sort_keys=True, default=str)
+    return (key, block_number) if policy == BLOCK else (key, None)
+
+
+class ReadCacheMiddleware(Web3Middleware):
+    """Serves repeated read-only requests from the Web3 instance's ``ReadCache``.
+
+    Batched requests are passed through, only their logs invalidate cached calls.
+    """
+
+    # single requests are handled by the wrap_make_request functions, these only
+    # see the responses of batched requests
+    def response_processor(self, method, response):
+        if method in LOG_METHODS:
+            get_read_cache(self._w3).observe_response(method, response)
+        return response
+
+    async def async_response_processor(self, method, response):
+        return self.response_processor(method, response)
+
+    def wrap_make_request(self, make_request):
+        cache = get_read_cache(self._w3)
+
+        def middleware(method, params):
+            if method == "eth_blockNumber":
+                response = make_request(method, params)
+                if "result" in response:
+                    cache.set_block_number(int(response["result"], 16))
+                return response
+
+            policy = cache.policy(method, params)
+            if policy is None:
+                response = make_request(method, params)
+                if method in LOG_METHODS:
+                    cache.observe_response(method, response)
+                return response
+
+            if policy == BLOCK and cache.needs_block_number():
+                cache.set_block_number(int(make_request("eth_blockNumber", [])["result"], 16))
+            key = _cache_key(method, params, policy, cache.block_number)
+            response = cache.get(method, key)
+            if response is None:
+                response = make_request(method, params)
+                cache.put(method, params, key, policy, response)
+            return response
+
+        return middleware
+
+    async def async_wrap_make_request(self, make_request):
+        cache = get_read_cache(self._w3)
+
+        async def middleware(method, params):
+            if method == "eth_blockNumber":
+                response = await make_request(method, params)
+                if "result" in response:
+                    cache.set_block_number(int(response["result"], 16))
+                return response
+
+            policy = cache.policy(method, params)
+            if policy is None:
+                response = await make_request(method, params)
+                if method in LOG_METHODS:
+                    cache.observe_response(method, response)
+                return response
+
+            if policy == BLOCK and cache.needs_block_number():
+                cache.set_block_number(int((await make_request("eth_blockNumber", []))["result"], 16))
+            key = _cache_key(method, params, policy, cache.block_number)
+            response = cache.get(method, key)
+            if response is None:
+                response = await make_request(method, params)
+                cache.put(method, params, key, policy, response)
+            return response
+
+        return middleware
+
+
+def install_read_cache(w3, **options):
+    """Install the read cache middleware on a Web3 or AsyncWeb3 instance.
+
+    Args:
+        **options: ``ReadCache`` options
+
+    Returns:
+        ReadCache: The cache, also available through ``get_read_cache(w3)``
+    """
+    cache = _read_caches.get(w3)
+    if cache is None:
+        cache = _read_caches[w3] = ReadCache(**options)
+        w3.middleware_onion.add(ReadCacheMiddleware, name="read_cache")
+    return cache
@@ -0,0 +1,209 @@
+"""
+Block-driven Receipt Collection
+
+This module waits for the receipts of many transactions at once. Instead of
+polling every transaction hash on its own, a ``ReceiptCollector``:
+- Watches the chain head with a single ``eth_blockNumber`` poll
+- On every new block, fetches the receipts of all outstanding transactions in one
+  batched JSON-RPC request
+- Resolves one future per transaction hash, so callers await only their own receipts
+- Hands the receipts mined in a block to callbacks in bulk, e.g. to process their
+  Deposit/Slashed events with ``decode_receipt_events``
+"""
+import asyncio
+import sys
+import time
+
+from hexbytes import HexBytes
+from web3.datastructures import AttributeDict
+from web3.exceptions import TimeExhausted, TransactionNotFound
+
+from celium_collateral_contracts.common import async_call, is_async_web3
+from celium_collateral_contracts.log_scanner import COLLATERAL_EVENTS, LogScanner
+
+try:
+    # formats raw batched receipts like ``eth.get_transaction_receipt``; web3 does not
+    # export it, so receipts are fetched one by one if it moves
+    from web3._utils.method_formatters import receipt_formatter
+except ImportError:
+    receipt_formatter = None
+
+__all__ = ["ReceiptCollector", "decode_receipt_events"]
+
+# Maximum number of receipts requested in one JSON-RPC batch
+DEFAULT_BATCH_SIZE = 100
+
+
+class ReceiptCollector:
+    """Collects transaction receipts with one batched request per new block.
+
+    Use as an async context manager, or call ``close()`` when done.
+
+    Args:
+        w3 (Web3 | AsyncWeb3): Web3 instance to use for blockchain interaction
+        poll_interval (float): Seconds between two polls of the chain head
+        batch_size (int): Maximum number of receipts per JSON-RPC batch
+        on_receipts (Callable[[list], Awaitable] | None): Coroutine function called
+            with the receipts found after each new block
+    """
+
+    def __init__(self, w3, poll_interval=1.0, batch_size=DEFAULT_BATCH_SIZE, on_receipts=None):
+        self.w3 = w3
+        self.poll_interval = poll_interval
+        self.batch_size = batch_size
+        self.on_receipts = on_receipts
+        # transaction hash -> (future, monotonic deadline or None)
+        self._pending = {}
+        self._last_block = None
+        self._task = None
+        self._batching = receipt_formatter is not None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    def watch(self, tx_hash, timeout=None):
+        """Start collecting the receipt of a transaction.
+
+        Returns:
+            asyncio.Future: Resolved with the receipt, or failed with ``TimeExhausted``
+            if the transaction is not mined within ``timeout`` seconds
+        """
+        tx_hash = HexBytes(tx_hash)
+        entry = self._pending.get(tx_hash)
+        if entry is None:
+            deadline = time.monotonic() + timeout if timeout is not None else None
+            entry = self._pending[tx_hash] = (asyncio.get_running_loop().create_future(), deadline)
+            # receipts of blocks mined before the transaction was sent are not looked up again
+            self._last_block = None
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+        return entry[0]
+
+    async def wait(self, tx_hash, timeout=300):
+        """Wait for the receipt of a transaction."""
+        return await asyncio.shield(self.watch(tx_hash, timeout))
+
+    async def wait_all(self, tx_hashes, timeout=300, return_exceptions=False):
+        """Wait for the receipts of many transactions.
+
+        Returns:
+            list: Receipts in the order of ``tx_hashes`` (or errors in their place with
+            ``return_exceptions``)
+        """
+        return await asyncio.gather(
+            *(self.wait(tx_hash, timeout) for tx_hash in tx_hashes), return_exceptions=return_exceptions
+        )
+
+    async def _fetch_receipts(self, tx_hashes):
+        """Fetch receipts in batched requests; transactions not mined yet are left out."""
+        if self._batching:
+            try:
+                return await self._fetch_receipts_batched(tx_hashes)
+            except NotImplementedError:
+                # providers without JSON-RPC batching, e.g. IPC
+                self._batching = False
+        receipts = {}
+        for tx_hash in tx_hashes:
+            try:
+                receipts[tx_hash] = await async_call(self.w3, self.w3.eth.get_transaction_receipt, tx_hash)
+            except TransactionNotFound:
+                pass
+        return receipts
+
+    async def _make_batch_request(self, requests):
+        # the provider's batch function runs the Web3 instance's middleware (e.g. the
+        # read cache) without switching the whole provider into batching mode like
+        # ``w3.batch_requests()``, which also fails the batch on one missing receipt
+        provider = self.w3.provider
+        if is_async_web3(self.w3):
+            make_batch_request = await provider.batch_request_func(self.w3, self.w3.middleware_onion)
+            return await make_batch_request(requests)
+        make_batch_request = provider.batch_request_func(self.w3, self.w3.middleware_onion)
+        return await asyncio.to_thread(make_batch_request, requests)
+
+    async def _fetch_receipts_batched(self, tx_hashes):
+        receipts = {}
+        for start in range(0, len(tx_hashes), self.batch_size):
+            chunk = tx_hashes[start:start + self.batch_size]
+            requests = [("eth_getTransactionReceipt", [tx_hash.to_0x_hex()]) for tx_hash in chunk]
+            responses = await self._make_batch_request(requests)
+            if not isinstance(responses, list):
+                raise ValueError(f"Batched receipt request failed: {responses.get('error', responses)}")
+            for tx_hash, response in zip(chunk, responses):
+                if "error" in response:
+                    # the transaction stays outstanding, its neighbours are resolved
+                    print(f"Receipt request of {tx_hash.to_0x_hex()} failed: {response['error']}", file=sys.stderr)
+                elif response.get("result"):
+                    receipts[tx_hash] = AttributeDict.recursive(receipt_formatter(response["result"]))
+        return receipts
+
+    def _expire(self):
+        now = time.monotonic()
+        for tx_hash, (future, deadline) in list(self._pending.items()):
+            if future.done():
+                del self._pending[tx_hash]
+            elif deadline is not None and now >= deadline:
+                del self._pending[tx_hash]
+                future.set_exception(TimeExhausted(f"Transaction {tx_hash.to_0x_hex()} is not in the chain yet"))
+
+    async def _run(self):
+        while True:
+            self._expire()
+            if not self._pending:
+                return
+            try:
+                head = await async_call(self.w3, lambda: self.w3.eth.block_number)
+                if self._last_block is None or head > self._last_block:
+                    receipts = await self._fetch_receipts(list(self._pending))
+                    self._last_block = head
+                    for tx_hash, receipt in receipts.items():
+                        future, _ = self._pending.pop(tx_hash)
+                        if not future.done():
+                            future.set_result(receipt)
+                    if receipts and self.on_receipts is not None:
+                        await self.on_receipts(list(receipts.values()))
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"Receipt collection failed, retrying: {e}", file=sys.stderr)
+            await asyncio.sleep(self.poll_interval)
+
+    async def close(self):
+        """Stop collecting; receipts still outstanding fail with ``CancelledError``."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        for future, _ in self._pending.values():
+            future.cancel()
+        self._pending.clear()
+
+
+def decode_receipt_events(w3, contract_address, receipts, event_names=COLLATERAL_EVENTS):
+    """Decode the Collateral events of many receipts at once.
+
+    Args:
+        w3 (Web3 | AsyncWeb3): Web3 instance
+        contract_address (str): The address of the deployed Collateral contract
+        receipts (Iterable): Transaction receipts
+        event_names (Iterable[str]): Names of the events to decode
+
+    Returns:
+        dict[HexBytes, list[EventData]]: Decoded events per transaction hash, in log
+        order; transactions without matching events are left out
+    """
+    scanner = LogScanner(w3, contract_address, event_names)
+    events = {}
+    for receipt in receipts:
+        for log in receipt["logs"]:
+            if log["address"] != scanner.contract_address or not log["topics"]:
+                continue
+            if w3.to_hex(log["topics"][0]) in scanner.topics:
+                events.setdefault(HexBytes(receipt["transactionHash"]), []).append(scanner.decode_log(log))
+    return events
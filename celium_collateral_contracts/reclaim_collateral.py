@@ -12,17 +12,20 @@ import sys
 import argparse
 from uuid import UUID
 from celium_collateral_contracts.common import (
-    load_contract_abi,
+    get_contract,
     get_web3_connection,
     get_account,
+    configure_preflight,
     validate_address_format,
-    build_and_send_transaction,
-    wait_for_receipt,
+    async_build_and_send_transaction,
+    async_wait_for_receipt,
     calculate_md5_checksum,
-    get_revert_reason,
+    async_get_revert_reason,
 )
 import asyncio
 
+__all__ = ["ReclaimCollateralError", "reclaim_collateral"]
+
 
 class ReclaimCollateralError(Exception):
     """Exception raised when there is an error during the collateral reclaim process."""
@@ -39,7 +42,7 @@ async def reclaim_collateral(
     """Reclaim collateral from the contract.
 
     Args:
-        w3 (Web3): Web3 instance
+        w3 (Web3 | AsyncWeb3): Web3 instance
         account: The account to use for the transaction
         contract_address (str): Address of the collateral contract
         url (str): URL for reclaim information
@@ -51,19 +54,18 @@ async def reclaim_collateral(
     Raises:
         Exception: If the transaction fails
     """
-    contract_abi = load_contract_abi()
-    contract = w3.eth.contract(address=contract_address, abi=contract_abi)
+    contract = get_contract(w3, contract_address)
 
     # Calculate MD5 checksum if URL is valid
     md5_checksum = "0" * 32
     if url.startswith(("http://", "https://")):
         print("Calculating MD5 checksum of URL content...", file=sys.stderr)
-        md5_checksum = calculate_md5_checksum(url)
+        md5_checksum = await asyncio.to_thread(calculate_md5_checksum, url)
         print(f"MD5 checksum: {md5_checksum}", file=sys.stderr)
 
     executor_uuid_bytes = UUID(executor_uuid).bytes
 
-    tx_hash = build_and_send_transaction(
+    tx_hash = await async_build_and_send_transaction(
         w3,
         contract.functions.reclaimCollateral(            
             executor_uuid_bytes,
@@ -74,9 +76,9 @@ async def reclaim_collateral(
         gas_limit=200000,  # Higher gas limit for this function
     )
 
-    receipt = wait_for_receipt(w3, tx_hash)
+    receipt = await async_wait_for_receipt(w3, tx_hash)
     if receipt['status'] == 0:
-        revert_reason = get_revert_reason(w3, tx_hash, receipt['blockNumber'])
+        revert_reason = await async_get_revert_reason(w3, tx_hash, receipt['blockNumber'])
         raise ReclaimCollateralError(f"Transaction failed for reclaiming collateral. Revert reason: {revert_reason}")
     reclaim_event = contract.events.ReclaimProcessStarted().process_receipt(
         receipt,
@@ -129,7 +131,13 @@ async def main():
         help="Executor UUID for the reclaim operation"
     )
 
+    parser.add_argument(
+        "--preflight", action="store_true",
+        help="Simulate transactions before broadcasting them and size their gas from estimate_gas"
+    )
     args = parser.parse_args()
+    if args.preflight:
+        configure_preflight()
 
     validate_address_format(args.contract_address)
 
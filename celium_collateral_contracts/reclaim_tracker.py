@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+
+"""
+Pending Reclaim Tracker
+
+This module keeps the open reclaim requests of the Collateral contract (started
+but neither finalized nor denied) so the trustee can review them before their
+deny deadline passes, without re-scanning block ranges:
+- Seeded from a bulk read of the chain and kept current from Collateral events
+- Open requests are kept in a min-heap keyed by ``expirationTime``, so the most
+  urgent request is found in O(1) and "expiring within N seconds" queries only
+  visit the requests they return
+- A deadline scheduler awaits a callback for every request as it comes within a
+  lead time of its deadline, most urgent first
+"""
+import argparse
+import asyncio
+import heapq
+import math
+import sys
+import time
+import uuid
+
+from celium_collateral_contracts.backup_state import take_snapshot
+from celium_collateral_contracts.common import get_web3_connection, get_websocket_url
+from celium_collateral_contracts.event_index import EventIndex
+from celium_collateral_contracts.event_stream import EventStream
+from celium_collateral_contracts.executor_states import ReclaimState
+
+__all__ = ["ReclaimTracker"]
+
+
+class ReclaimTracker:
+    """Open reclaim requests ordered by their deny deadline.
+
+    Args:
+        clock (Callable[[], float]): Returns the current unix time, compared with the
+            requests' ``expirationTime`` (defaults to ``time.time``)
+    """
+
+    def __init__(self, clock=time.time):
+        self.clock = clock
+        self.block_number = None
+        # reclaim request ID -> ReclaimState of the open requests
+        self.open = {}
+        # (expiration time, reclaim request ID) of the open requests; closed requests
+        # are removed lazily when they reach the top
+        self._heap = []
+        # Requests not yet handed to the scheduler's callback, same layout as _heap
+        self._queue = []
+        self._changed = asyncio.Event()
+        self._last_log = (-1, -1)
+        self._task = None
+
+    def __len__(self):
+        return len(self.open)
+
+    @classmethod
+    def from_snapshot(cls, snapshot, clock=time.time):
+        """Build a tracker from the open reclaims of a ``CollateralSnapshot``."""
+        tracker = cls(clock)
+        tracker.block_number = snapshot.block_number
+        tracker._last_log = (snapshot.block_number, math.inf)
+        for reclaim in snapshot.reclaims.values():
+            if reclaim.amount:
+                tracker.add(reclaim)
+        return tracker
+
+    @classmethod
+    async def load(cls, w3, contract_address, block_number=None, start_block=0, index=None, clock=time.time):
+        """Seed a tracker from a bulk read of the chain; see ``backup_state.take_snapshot``."""
+        return cls.from_snapshot(await take_snapshot(w3, contract_address, block_number, start_block, index), clock)
+
+    def add(self, reclaim: ReclaimState):
+        """Track an open reclaim request."""
+        if reclaim.reclaim_request_id in self.open:
+            return
+        self.open[reclaim.reclaim_request_id] = reclaim
+        entry = (reclaim.deny_timeout, reclaim.reclaim_request_id)
+        heapq.heappush(self._heap, entry)
+        heapq.heappush(self._queue, entry)
+        self._changed.set()
+
+    def close(self, reclaim_request_id):
+        """Stop tracking a reclaim request that was finalized or denied."""
+        reclaim = self.open.pop(reclaim_request_id, None)
+        # drop stale heap entries once they make up most of the heap
+        if len(self._heap) > 2 * len(self.open) + 64:
+            self._heap = [entry for entry in self._heap if entry[1] in self.open]
+            heapq.heapify(self._heap)
+            self._queue = [entry for entry in self._queue if entry[1] in self.open]
+            heapq.heapify(self._queue)
+        return reclaim
+
+    @staticmethod
+    def _prune(heap, open_requests):
+        while heap and heap[0][1] not in open_requests:
+            heapq.heappop(heap)
+
+    def most_urgent(self):
+        """The open reclaim request with the earliest deadline, or None."""
+        self._prune(self._heap, self.open)
+        return self.open[self._heap[0][1]] if self._heap else None
+
+    def expiring_within(self, seconds, include_expired=False):
+        """Open reclaim requests whose deadline is at most ``seconds`` away, most urgent first.
+
+        Only the heap nodes up to the deadline bound are visited, so the cost grows
+        with the number of returned requests rather than the number of open ones.
+
+        Args:
+            seconds (float): Look-ahead from now, in seconds
+            include_expired (bool): Also return requests whose deadline already passed
+                (they can no longer be denied, only finalized)
+
+        Returns:
+            list[ReclaimState]: Matching requests sorted by deadline
+        """
+        self._prune(self._heap, self.open)
+        now = self.clock()
+        bound = now + seconds
+        heap = self._heap
+        found = []
+        stack = [0] if heap else []
+        while stack:
+            i = stack.pop()
+            expiration_time, reclaim_request_id = heap[i]
+            if expiration_time > bound:
+                continue
+            if reclaim_request_id in self.open and (include_expired or expiration_time >= now):
+                found.append(heap[i])
+            stack.extend(child for child in (2 * i + 1, 2 * i + 2) if child < len(heap))
+        return [self.open[reclaim_request_id] for _, reclaim_request_id in sorted(found)]
+
+    def apply_event(self, event):
+        """Apply one decoded Collateral event; events already applied are ignored.
+
+        Returns:
+            bool: Whether the event changed the set of open requests
+        """
+        position = (event["blockNumber"], event["logIndex"])
+        if position <= self._last_log:
+            return False
+        self._last_log = position
+        self.block_number = event["blockNumber"]
+
+        args = event["args"]
+        name = event["event"]
+        if name == "ReclaimProcessStarted":
+            self.add(ReclaimState(
+                reclaim_request_id=args["reclaimRequestId"],
+                executor_uuid=str(uuid.UUID(bytes=args["executorId"])),
+                miner=args["miner"],
+                amount=args["amount"],
+                deny_timeout=args["expirationTime"],
+            ))
+        elif name in ("Reclaimed", "Denied"):
+            return self.close(args["reclaimRequestId"]) is not None
+        else:
+            return False
+        return True
+
+    async def follow(self, events):
+        """Apply events from an async iterator (e.g. an ``EventStream``) until it ends."""
+        async for event in events:
+            self.apply_event(event)
+
+    def start_following(self, events):
+        """Apply events from an async iterator in a background task."""
+        self._task = asyncio.create_task(self.follow(events))
+        return self._task
+
+    async def run(self, callback, lead_time=math.inf, include_expired=False):
+        """Await ``callback(reclaim)`` for every open request once it is within ``lead_time`` of its deadline.
+
+        Requests are handed over one at a time in deadline order, so a request
+        that arrives with an earlier deadline is processed before later ones. Each
+        request is handed over once; requests closed before their turn are skipped.
+
+        Args:
+            callback (Callable[[ReclaimState], Awaitable]): Review coroutine function
+            lead_time (float): Seconds before the deadline a request becomes due,
+                by default every request is due as soon as it is tracked
+            include_expired (bool): Also hand over requests whose deadline already passed
+        """
+        while True:
+            self._changed.clear()
+            self._prune(self._queue, self.open)
+            if not self._queue:
+                await self._changed.wait()
+                continue
+
+            expiration_time, reclaim_request_id = self._queue[0]
+            wait = expiration_time - lead_time - self.clock()
+            if wait > 0:
+                try:
+                    await asyncio.wait_for(self._changed.wait(), timeout=wait)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            heapq.heappop(self._queue)
+            if include_expired or expiration_time >= self.clock():
+                try:
+                    await callback(self.open[reclaim_request_id])
+                except Exception as e:
+                    print(f"Reclaim callback failed for request {reclaim_request_id}: {e}", file=sys.stderr)
+
+    def stop(self):
+        """Stop following events."""
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+
+async def main():
+    parser = argparse.ArgumentParser(
+        description="Track open reclaim requests and print them as their deny deadlines approach"
+    )
+    parser.add_argument(
+        "--contract-address", required=True, help="Address of the deployed Collateral contract"
+    )
+    parser.add_argument(
+        "--lead-time", type=float, default=math.inf,
+        help="Print requests this many seconds before their deadline (default: as soon as they are seen)"
+    )
+    parser.add_argument(
+        "--start-block", type=int, default=0, help="First block of the event history (e.g. the deployment block)"
+    )
+    parser.add_argument("--index-db", help="Path of a local event index database to read the event history from")
+    parser.add_argument("--network", default="finney")
+    parser.add_argument(
+        "--no-websocket", action="store_true", help="Poll a log filter instead of subscribing over WebSocket"
+    )
+    args = parser.parse_args()
+
+    w3 = get_web3_connection(args.network)
+    index = EventIndex(args.index_db, args.contract_address) if args.index_db else None
+    tracker = await ReclaimTracker.load(w3, args.contract_address, start_block=args.start_block, index=index)
+    print(f"Tracking {len(tracker)} open reclaim requests from block {tracker.block_number}", file=sys.stderr)
+
+    ws_url = None if args.no_websocket else get_websocket_url(args.network)
+    tracker.start_following(
+        EventStream(w3, args.contract_address, ws_url=ws_url, from_block=tracker.block_number + 1)
+    )
+
+    async def print_reclaim(reclaim):
+        remaining = reclaim.deny_timeout - tracker.clock()
+        print(
+            f"Reclaim {reclaim.reclaim_request_id}: executor {reclaim.executor_uuid}, miner {reclaim.miner}, "
+            f"amount {w3.from_wei(reclaim.amount, 'ether')} TAO, deny deadline in {remaining:.0f}s",
+            flush=True,
+        )
+
+    await tracker.run(print_reclaim, lead_time=args.lead_time)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -16,6 +16,8 @@ from eth_account import Account
 from celium_collateral_contracts.address_conversion import ss58_to_pubkey
 from celium_collateral_contracts.common import get_web3_connection, get_account, wait_for_receipt, build_and_send_transaction
 
+__all__ = ["send_tao_to_ss58"]
+
 
 async def send_tao_to_ss58(
     w3: Web3, sender_account: Account, recipient_ss58: str, amount_wei: int
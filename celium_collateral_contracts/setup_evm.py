@@ -13,6 +13,8 @@ from celium_collateral_contracts.address_conversion import h160_to_ss58
 from celium_collateral_contracts.generate_keypair import generate_and_save_keypair
 from celium_collateral_contracts.subtensor import associate_evm_key
 
+__all__ = ["DENY_TIMEOUT", "MIN_COLLATERAL_INCREASE"]
+
 DENY_TIMEOUT = 3 * 24 * 60 * 60  # 3 days
 MIN_COLLATERAL_INCREASE = 10000000000000  # 0.01 TAO
 
@@ -0,0 +1,1002 @@
+"""
+Collateral Contract Simulator
+
+This module runs the Collateral contract (``src/Collateral.sol``) in pure Python
+behind a Web3 provider, as an offline stand-in for a local chain:
+- ``CollateralSimulator`` is a minimal single-node chain: accounts, nonces, a
+  transaction pool, blocks, receipts and logs, with every state value kept per
+  block so calls pinned to past blocks see past state (like an archive node)
+- The contract functions, events and custom errors follow the Solidity source;
+  a reverted transaction leaves no state change behind
+- Block timestamps are controlled by the test (``advance_time``,
+  ``set_next_block_timestamp``, or the ``evm_increaseTime``/``evm_mine`` RPC methods)
+- ``SimulatorProvider`` / ``AsyncSimulatorProvider`` answer the ``eth_*`` JSON-RPC
+  methods the library uses, including batched requests and log filters, so
+  ``Web3(SimulatorProvider(simulator))`` works with every function of this package
+
+Signed transactions are verified like on a real node. ``eth_sendTransaction`` is
+accepted from any address without a signature (impersonation), which makes
+seeding large states cheap.
+"""
+import bisect
+import itertools
+import threading
+import time
+
+from eth_abi import decode as abi_decode, encode as abi_encode
+from eth_account import Account
+from eth_account._utils.legacy_transactions import Transaction as LegacyTransaction
+from eth_account.typed_transactions import TypedTransaction
+from eth_utils import keccak
+from hexbytes import HexBytes
+from web3 import AsyncWeb3, Web3
+from web3.providers.async_base import AsyncJSONBaseProvider
+from web3.providers.base import JSONBaseProvider
+
+from celium_collateral_contracts.common import abi_signature, load_contract_abi
+
+__all__ = [
+    "DEFAULT_CHAIN_ID", "DEFAULT_BLOCK_TIME", "FUNCTION_GAS", "SimulatorError",
+    "CollateralContractModel", "CollateralSimulator", "SimulatorProvider", "AsyncSimulatorProvider",
+]
+
+DEFAULT_CHAIN_ID = 1337
+DEFAULT_BLOCK_TIME = 12
+DEFAULT_BASE_FEE = 10 ** 9
+DEFAULT_PRIORITY_FEE = 10 ** 8
+BLOCK_GAS_LIMIT = 30_000_000
+TRANSFER_GAS = 21_000
+ZERO_ADDRESS = "0x0000000000000000000000000000000000000000"
+
+# Gas used by successful calls of each contract function
+FUNCTION_GAS = {
+    "deposit": 55_000,
+    "reclaimCollateral": 120_000,
+    "finalizeReclaim": 60_000,
+    "denyReclaimRequest": 40_000,
+    "slashCollateral": 50_000,
+    "setTrustee": 30_000,
+    "transferOwnership": 30_000,
+    "renounceOwnership": 25_000,
+}
+VIEW_GAS = 25_000
+
+# Panic code of checked arithmetic over- and underflows
+PANIC_ARITHMETIC = 0x11
+
+# Runtime code reported by eth_getCode for simulated contracts
+SIMULATED_CODE = bytes.fromhex("6080604052")
+
+_ABI = load_contract_abi()
+_FUNCTIONS = {
+    keccak(text=abi_signature(item))[:4]: item for item in _ABI if item.get("type") == "function"
+}
+_EVENTS = {item["name"]: item for item in _ABI if item.get("type") == "event"}
+_EVENT_TOPICS = {name: keccak(text=abi_signature(item)) for name, item in _EVENTS.items()}
+
+
+class SimulatorError(Exception):
+    """A JSON-RPC error of the simulated node."""
+
+    def __init__(self, message, code=-32000, data=None):
+        super().__init__(message)
+        self.code = code
+        self.data = data
+
+
+class _Revert(Exception):
+    """Raised by contract code to revert the current call with ``data``."""
+
+    def __init__(self, data=b""):
+        super().__init__(data)
+        self.data = data
+
+
+def _custom_error(name, arg_types=(), args=()):
+    return keccak(text=f"{name}({','.join(arg_types)})")[:4] + abi_encode(list(arg_types), list(args))
+
+
+def _require_error(message):
+    return keccak(text="Error(string)")[:4] + abi_encode(["string"], [message])
+
+
+def _panic(code):
+    return keccak(text="Panic(uint256)")[:4] + abi_encode(["uint256"], [code])
+
+
+def _checksum(address):
+    return Web3.to_checksum_address(address) if address else None
+
+
+def _to_int(value):
+    if value is None:
+        return 0
+    if isinstance(value, str):
+        return int(value, 16)
+    return int(value)
+
+
+def _to_bytes(value):
+    if value is None:
+        return b""
+    return bytes(HexBytes(value))
+
+
+def _hex(value):
+    return "0x" + bytes(value).hex()
+
+
+class _VersionedState:
+    """Key-value state whose past values stay readable by block number."""
+
+    def __init__(self):
+        # key -> ([block numbers], [values]) in block order
+        self._history = {}
+
+    def get(self, key, default=0, block_number=None):
+        entry = self._history.get(key)
+        if entry is None:
+            return default
+        blocks, values = entry
+        if block_number is None:
+            return values[-1]
+        index = bisect.bisect_right(blocks, block_number)
+        return values[index - 1] if index else default
+
+    def set(self, key, value, block_number):
+        blocks, values = self._history.setdefault(key, ([], []))
+        if blocks and blocks[-1] == block_number:
+            values[-1] = value
+        else:
+            blocks.append(block_number)
+            values.append(value)
+
+
+class _Overlay:
+    """Uncommitted writes of one transaction or call on top of the state at a block."""
+
+    def __init__(self, state, block_number=None):
+        self.state = state
+        self.block_number = block_number
+        self.writes = {}
+
+    def get(self, key, default=0):
+        if key in self.writes:
+            return self.writes[key]
+        return self.state.get(key, default, self.block_number)
+
+    def set(self, key, value):
+        self.writes[key] = value
+
+    def transfer(self, sender, recipient, amount):
+        balance = self.get(("balance", sender))
+        if balance < amount:
+            # the failed low-level call surfaces as TransferFailed in the contract
+            raise _Revert(_custom_error("TransferFailed"))
+        self.set(("balance", sender), balance - amount)
+        self.set(("balance", recipient), self.get(("balance", recipient)) + amount)
+
+    def commit(self, block_number):
+        for key, value in self.writes.items():
+            self.state.set(key, value, block_number)
+
+
+class _Call:
+    """Execution context of one contract call."""
+
+    def __init__(self, storage, contract, sender, value, timestamp):
+        self.storage = storage
+        self.contract = contract
+        self.sender = sender
+        self.value = value
+        self.timestamp = timestamp
+        # (address, topics, data) of the emitted events
+        self.logs = []
+
+    def get(self, *key, default=0):
+        return self.storage.get((self.contract, *key), default)
+
+    def set(self, value, *key):
+        self.storage.set((self.contract, *key), value)
+
+    def emit(self, name, *args):
+        event = _EVENTS[name]
+        topics = [_EVENT_TOPICS[name]]
+        data_types, data_values = [], []
+        for item, value in zip(event["inputs"], args):
+            if item["indexed"]:
+                topics.append(abi_encode([item["type"]], [value]))
+            else:
+                data_types.append(item["type"])
+                data_values.append(value)
+        self.logs.append((self.contract, topics, abi_encode(data_types, data_values)))
+
+
+class CollateralContractModel:
+    """The functions of ``src/Collateral.sol``, executed on simulator state.
+
+    Each method mirrors the Solidity function of the same name; ``_Revert`` raised
+    anywhere discards all writes of the call.
+    """
+
+    @staticmethod
+    def initialize_state(call, netuid, trustee, min_collateral_increase, decision_timeout, owner):
+        call.set(netuid, "NETUID")
+        call.set(trustee, "TRUSTEE")
+        call.set(min_collateral_increase, "MIN_COLLATERAL_INCREASE")
+        call.set(decision_timeout, "DECISION_TIMEOUT")
+        call.set(owner, "owner")
+        call.set(0, "nextReclaimId")
+
+    @staticmethod
+    def _only_trustee(call):
+        if call.sender != call.get("TRUSTEE", default=ZERO_ADDRESS):
+            raise _Revert(_custom_error("NotTrustee"))
+
+    @staticmethod
+    def _only_owner(call):
+        if call.sender != call.get("owner", default=ZERO_ADDRESS):
+            raise _Revert(_custom_error("OwnableUnauthorizedAccount", ["address"], [call.sender]))
+
+    def deposit(self, call, executor_id):
+        if call.value < call.get("MIN_COLLATERAL_INCREASE"):
+            raise _Revert(_custom_error("InsufficientAmount"))
+        owner = call.get("executorToMiner", executor_id, default=ZERO_ADDRESS)
+        if owner == ZERO_ADDRESS:
+            call.set(call.sender, "executorToMiner", executor_id)
+        elif owner != call.sender:
+            raise _Revert(_custom_error("ExecutorNotOwned"))
+        call.set(call.get("collaterals", executor_id) + call.value, "collaterals", executor_id)
+        call.emit("Deposit", executor_id, call.sender, call.value)
+
+    def reclaimCollateral(self, call, executor_id, url, url_content_md5_checksum):
+        if call.get("executorToMiner", executor_id, default=ZERO_ADDRESS) != call.sender:
+            raise _Revert(_custom_error("ExecutorNotOwned"))
+        amount = call.get("collaterals", executor_id) - call.get("pendingReclaims", executor_id)
+        if amount < 0:
+            # e.g. a new deposit after a slash that left a reclaim pending
+            raise _Revert(_panic(PANIC_ARITHMETIC))
+        if amount == 0:
+            raise _Revert(_custom_error("AmountZero"))
+        expiration_time = call.timestamp + call.get("DECISION_TIMEOUT")
+        reclaim_request_id = call.get("nextReclaimId") + 1
+        call.set(reclaim_request_id, "nextReclaimId")
+        call.set((executor_id, call.sender, amount, expiration_time), "reclaims", reclaim_request_id)
+        call.set(call.get("pendingReclaims", executor_id) + amount, "pendingReclaims", executor_id)
+        call.emit(
+            "ReclaimProcessStarted", reclaim_request_id, executor_id, call.sender, amount, expiration_time,
+            url, url_content_md5_checksum,
+        )
+
+    def finalizeReclaim(self, call, reclaim_request_id):
+        reclaim = call.get("reclaims", reclaim_request_id, default=None)
+        if reclaim is None:
+            raise _Revert(_custom_error("ReclaimNotFound"))
+        executor_id, miner, amount, deny_timeout = reclaim
+        if deny_timeout >= call.timestamp:
+            raise _Revert(_custom_error("BeforeDenyTimeout"))
+        call.set(None, "reclaims", reclaim_request_id)
+        call.set(call.get("pendingReclaims", executor_id) - amount, "pendingReclaims", executor_id)
+        if call.get("collaterals", executor_id) < amount:
+            # miner got slashed and can't withdraw
+            raise _Revert(_custom_error("InsufficientCollateralForReclaim"))
+        call.set(call.get("collaterals", executor_id) - amount, "collaterals", executor_id)
+        call.emit("Reclaimed", reclaim_request_id, executor_id, miner, amount)
+        call.storage.transfer(call.contract, miner, amount)
+        call.set(ZERO_ADDRESS, "executorToMiner", executor_id)
+
+    def denyReclaimRequest(self, call, reclaim_request_id, url, url_content_md5_checksum):
+        self._only_trustee(call)
+        reclaim = call.get("reclaims", reclaim_request_id, default=None)
+        if reclaim is None:
+            raise _Revert(_custom_error("ReclaimNotFound"))
+        executor_id, _, amount, deny_timeout = reclaim
+        if deny_timeout < call.timestamp:
+            raise _Revert(_custom_error("PastDenyTimeout"))
+        call.set(call.get("pendingReclaims", executor_id) - amount, "pendingReclaims", executor_id)
+        call.emit("Denied", reclaim_request_id, url, url_content_md5_checksum)
+        call.set(None, "reclaims", reclaim_request_id)
+
+    def slashCollateral(self, call, executor_id, url, url_content_md5_checksum):
+        self._only_trustee(call)
+        amount = call.get("collaterals", executor_id)
+        if amount == 0:
+            raise _Revert(_custom_error("AmountZero"))
+        call.set(0, "collaterals", executor_id)
+        miner = call.get("executorToMiner", executor_id, default=ZERO_ADDRESS)
+        # burn the collateral
+        call.storage.transfer(call.contract, ZERO_ADDRESS, amount)
+        call.set(ZERO_ADDRESS, "executorToMiner", executor_id)
+        call.emit("Slashed", executor_id, miner, amount, url, url_content_md5_checksum)
+
+    def setTrustee(self, call, new_trustee):
+        self._only_owner(call)
+        if new_trustee == ZERO_ADDRESS:
+            raise _Revert(_require_error("Trustee address must be non-zero"))
+        call.set(new_trustee, "TRUSTEE")
+
+    def transferOwnership(self, call, new_owner):
+        self._only_owner(call)
+        if new_owner == ZERO_ADDRESS:
+            raise _Revert(_custom_error("OwnableInvalidOwner", ["address"], [ZERO_ADDRESS]))
+        call.emit("OwnershipTransferred", call.get("owner"), new_owner)
+        call.set(new_owner, "owner")
+
+    def renounceOwnership(self, call):
+        self._only_owner(call)
+        call.emit("OwnershipTransferred", call.get("owner"), ZERO_ADDRESS)
+        call.set(ZERO_ADDRESS, "owner")
+
+    def initialize(self, call, *args):
+        raise _Revert(_custom_error("InvalidInitialization"))
+
+    # -- views -- #
+
+    def NETUID(self, call):
+        return call.get("NETUID")
+
+    def TRUSTEE(self, call):
+        return call.get("TRUSTEE", default=ZERO_ADDRESS)
+
+    def DECISION_TIMEOUT(self, call):
+        return call.get("DECISION_TIMEOUT")
+
+    def MIN_COLLATERAL_INCREASE(self, call):
+        return call.get("MIN_COLLATERAL_INCREASE")
+
+    def owner(self, call):
+        return call.get("owner", default=ZERO_ADDRESS)
+
+    def UPGRADE_INTERFACE_VERSION(self, call):
+        return "5.0.0"
+
+    def executorToMiner(self, call, executor_id):
+        return call.get("executorToMiner", executor_id, default=ZERO_ADDRESS)
+
+    def collaterals(self, call, executor_id):
+        return call.get("collaterals", executor_id)
+
+    def reclaims(self, call, reclaim_request_id):
+        return call.get("reclaims", reclaim_request_id, default=None) or (b"\x00" * 16, ZERO_ADDRESS, 0, 0)
+
+    def dispatch(self, call, data):
+        """Run the function selected by ``data`` and return its ABI-encoded output."""
+        function = _FUNCTIONS.get(bytes(data[:4])) if len(data) >= 4 else None
+        if function is None:
+            # receive() and fallback() only accept deposits through deposit()
+            raise _Revert(_custom_error("InvalidDepositMethod"))
+        method = getattr(self, function["name"], None)
+        if method is None:
+            raise _Revert(_require_error(f"{function['name']} is not supported by the simulator"))
+        if call.value and function.get("stateMutability") != "payable":
+            raise _Revert()
+        try:
+            args = abi_decode([item["type"] for item in function["inputs"]], bytes(data[4:]))
+        except Exception:
+            raise _Revert()
+        args = [_checksum(arg) if item["type"] == "address" else arg for item, arg in zip(function["inputs"], args)]
+        result = method(call, *args)
+        outputs = [item["type"] for item in function.get("outputs", [])]
+        if not outputs:
+            return b""
+        return abi_encode(outputs, list(result) if len(outputs) > 1 else [result])
+
+
+class CollateralSimulator:
+    """A single-node chain running Collateral contracts in-process.
+
+    Args:
+        chain_id (int): Chain ID checked in signed transactions
+        timestamp (int | None): Timestamp of the genesis block, defaults to now
+        block_time (int): Seconds between consecutive blocks, unless changed with
+            ``advance_time`` or ``set_next_block_timestamp``
+        base_fee (int): Constant base fee per gas, in wei
+        priority_fee (int): Tip reported by ``eth_feeHistory`` and ``eth_maxPriorityFeePerGas``
+        automine (bool): Mine a block for every transaction as soon as it is
+            executable; otherwise transactions wait in the pool until ``mine()``
+        max_log_block_range (int | None): Reject ``eth_getLogs`` requests spanning
+            more blocks, like rate-limited RPC providers
+    """
+
+    def __init__(self, chain_id=DEFAULT_CHAIN_ID, timestamp=None, block_time=DEFAULT_BLOCK_TIME,
+                 base_fee=DEFAULT_BASE_FEE, priority_fee=DEFAULT_PRIORITY_FEE, automine=True,
+                 max_log_block_range=None):
+        self.chain_id = chain_id
+        self.block_time = block_time
+        self.base_fee = base_fee
+        self.priority_fee = priority_fee
+        self.automine = automine
+        self.max_log_block_range = max_log_block_range
+        self.contract = CollateralContractModel()
+        self.state = _VersionedState()
+        self.blocks = []
+        self.transactions = {}
+        self.receipts = {}
+        # executable transactions by (sender, nonce) in arrival order, the same by hash,
+        # and transactions waiting for a nonce gap
+        self._pool = {}
+        self._pool_hashes = {}
+        self._pool_counts = {}
+        self._queued = {}
+        self._contracts = set()
+        self._block_hashes = {}
+        self._filters = {}
+        self._filter_ids = itertools.count(1)
+        self._account_ids = itertools.count(1)
+        self._next_timestamp = None
+        self._lock = threading.RLock()
+        self._append_block(int(time.time()) if timestamp is None else timestamp, [], [])
+
+    # -- test controls -- #
+
+    @property
+    def block_number(self):
+        return len(self.blocks) - 1
+
+    @property
+    def timestamp(self):
+        """Timestamp of the latest block."""
+        return self.blocks[-1]["timestamp"]
+
+    def advance_time(self, seconds):
+        """Move the timestamp of the next block ``seconds`` further into the future."""
+        with self._lock:
+            self._next_timestamp = self._pending_timestamp() + seconds
+
+    def set_next_block_timestamp(self, timestamp):
+        """Set the exact timestamp of the next block."""
+        with self._lock:
+            if timestamp <= self.timestamp:
+                raise SimulatorError(f"Timestamp {timestamp} is not after the latest block's {self.timestamp}")
+            self._next_timestamp = timestamp
+
+    def fund(self, address, amount):
+        """Add ``amount`` wei to the balance of ``address``."""
+        with self._lock:
+            key = ("balance", _checksum(address))
+            self.state.set(key, self.state.get(key) + amount, self.block_number)
+
+    def create_account(self, balance=10 ** 24):
+        """Create a funded account with a deterministic private key."""
+        account = Account.from_key(keccak(text=f"collateral-simulator-account-{next(self._account_ids)}"))
+        self.fund(account.address, balance)
+        return account
+
+    def deploy_collateral(self, trustee, netuid=1, min_collateral_increase=10 ** 15, decision_timeout=3600,
+                          owner=None):
+        """Deploy an initialized Collateral contract (behind its proxy) and return its address."""
+        with self._lock:
+            address = _checksum(_hex(keccak(text=f"collateral-{len(self._contracts)}")[12:]))
+            overlay = _Overlay(self.state)
+            call = _Call(overlay, address, owner or trustee, 0, self.timestamp)
+            self.contract.initialize_state(
+                call, netuid, _checksum(trustee), min_collateral_increase, decision_timeout, _checksum(owner or trustee)
+            )
+            overlay.commit(self.block_number)
+            self._contracts.add(address)
+            return address
+
+    def mine(self, blocks=1, timestamp=None):
+        """Mine blocks, the first one with all executable pool transactions.
+
+        Returns:
+            int: The number of the last mined block
+        """
+        with self._lock:
+            if timestamp is not None:
+                self.set_next_block_timestamp(timestamp)
+            for _ in range(blocks):
+                self._mine_block()
+            return self.block_number
+
+    def transact(self, sender, to, data=b"", value=0, gas=None):
+        """Send a transaction from any address without a signature.
+
+        Returns:
+            HexBytes: Transaction hash
+        """
+        with self._lock:
+            sender = _checksum(sender)
+            nonce = self._pending_nonce(sender)
+            tx = {
+                "type": 2, "from": sender, "to": _checksum(to), "input": _to_bytes(data), "value": value, "nonce": nonce,
+                "gas": gas if gas is not None else self._estimate_gas(sender, to, data, value),
+                "maxFeePerGas": 2 * self.base_fee + self.priority_fee, "maxPriorityFeePerGas": self.priority_fee,
+                "chainId": self.chain_id, "v": 0, "r": 0, "s": 0,
+            }
+            tx["hash"] = keccak(b"impersonated" + abi_encode(
+                ["address", "address", "bytes", "uint256", "uint256", "uint256"],
+                [sender, tx["to"] or ZERO_ADDRESS, tx["input"], value, nonce, self.chain_id],
+            ))
+            self._submit(tx)
+            return HexBytes(tx["hash"])
+
+    # -- execution -- #
+
+    def _append_block(self, timestamp, transactions, logs, gas_used=0):
+        parent_hash = self.blocks[-1]["hash"] if self.blocks else b"\x00" * 32
+        number = len(self.blocks)
+        block_hash = keccak(parent_hash + number.to_bytes(8, "big") + timestamp.to_bytes(8, "big"))
+        block = {
+            "number": number, "hash": block_hash, "parentHash": parent_hash, "timestamp": timestamp,
+            "transactions": transactions, "logs": logs, "gasUsed": gas_used,
+        }
+        self.blocks.append(block)
+        self._block_hashes[block_hash] = number
+        return block
+
+    def _pending_timestamp(self):
+        if self._next_timestamp is not None:
+            return self._next_timestamp
+        return self.timestamp + self.block_time
+
+    def _pending_nonce(self, sender):
+        return self.state.get(("nonce", sender)) + self._pool_counts.get(sender, 0)
+
+    def _effective_gas_price(self, tx):
+        if "gasPrice" in tx:
+            return tx["gasPrice"]
+        return min(tx["maxFeePerGas"], self.base_fee + tx["maxPriorityFeePerGas"])
+
+    def _run(self, overlay, sender, to, data, value, timestamp):
+        """Execute a message call on ``overlay``; returns (output, logs, gas) or raises ``_Revert``."""
+        if value:
+            overlay.transfer(sender, to or ZERO_ADDRESS, value)
+        if to not in self._contracts:
+            return b"", [], TRANSFER_GAS
+        call = _Call(overlay, to, sender, value, timestamp)
+        output = self.contract.dispatch(call, data)
+        function = _FUNCTIONS.get(bytes(data[:4]))
+        return output, call.logs, FUNCTION_GAS.get(function["name"], VIEW_GAS) if function else TRANSFER_GAS
+
+    def _estimate_gas(self, sender, to, data, value):
+        overlay = _Overlay(self.state)
+        try:
+            _, _, gas = self._run(overlay, _checksum(sender), _checksum(to), _to_bytes(data), value, self._pending_timestamp())
+        except _Revert as e:
+            raise SimulatorError("execution reverted", code=3, data=_hex(e.data))
+        return gas
+
+    def _submit(self, tx):
+        """Admit a transaction to the pool, as a node does on eth_sendRawTransaction."""
+        if tx["hash"] in self.transactions or tx["hash"] in self._pool_hashes:
+            raise SimulatorError("already known")
+        if tx["gas"] < TRANSFER_GAS:
+            raise SimulatorError("intrinsic gas too low")
+        max_price = tx.get("gasPrice", tx.get("maxFeePerGas"))
+        if max_price < self.base_fee:
+            raise SimulatorError(
+                f"max fee per gas less than block base fee: maxFeePerGas: {max_price} baseFee: {self.base_fee}"
+            )
+        sender = tx["from"]
+        if self.state.get(("balance", sender)) < tx["gas"] * max_price + tx["value"]:
+            raise SimulatorError("insufficient funds for gas * price + value")
+
+        nonce, pending_nonce = tx["nonce"], self._pending_nonce(sender)
+        if nonce < self.state.get(("nonce", sender)):
+            raise SimulatorError(f"nonce too low: next nonce {self.state.get(('nonce', sender))}, tx nonce {nonce}")
+        if nonce < pending_nonce:
+            pooled = self._pool[sender, nonce]
+            self._check_replacement(pooled, tx)
+            del self._pool_hashes[pooled["hash"]]
+            self._add_to_pool(tx)
+        elif nonce > pending_nonce:
+            queued = self._queued.setdefault(sender, {})
+            if nonce in queued:
+                self._check_replacement(queued[nonce], tx)
+            queued[nonce] = tx
+        else:
+            self._add_to_pool(tx)
+            self._promote(sender)
+        if self.automine:
+            while self._pool:
+                self._mine_block()
+
+    @staticmethod
+    def _check_replacement(pooled, tx):
+        def price(transaction):
+            return transaction.get("gasPrice", transaction.get("maxFeePerGas"))
+
+        def tip(transaction):
+            return transaction.get("maxPriorityFeePerGas", transaction.get("gasPrice"))
+
+        # nodes require a 10% bump of every fee field to replace a pending transaction
+        if price(tx) * 10 < price(pooled) * 11 or tip(tx) * 10 < tip(pooled) * 11:
+            raise SimulatorError("replacement transaction underpriced")
+
+    def _add_to_pool(self, tx):
+        key = (tx["from"], tx["nonce"])
+        if key not in self._pool:
+            self._pool_counts[tx["from"]] = self._pool_counts.get(tx["from"], 0) + 1
+        self._pool[key] = tx
+        self._pool_hashes[tx["hash"]] = tx
+
+    def _promote(self, sender):
+        queued = self._queued.get(sender)
+        while queued:
+            tx = queued.pop(self._pending_nonce(sender), None)
+            if tx is None:
+                break
+            self._add_to_pool(tx)
+        if not queued:
+            self._queued.pop(sender, None)
+
+    def _mine_block(self):
+        number = len(self.blocks)
+        timestamp = self._pending_timestamp()
+        self._next_timestamp = None
+        pool = list(self._pool.values())
+        self._pool, self._pool_hashes, self._pool_counts = {}, {}, {}
+        included, logs, cumulative_gas = [], [], 0
+        for tx in pool:
+            sender = tx["from"]
+            gas_price = self._effective_gas_price(tx)
+            if self.state.get(("balance", sender)) < tx["gas"] * gas_price + tx["value"]:
+                # dropped, like a node evicting a transaction it can no longer pay for
+                continue
+            overlay = _Overlay(self.state)
+            try:
+                _, call_logs, gas_used = self._run(overlay, sender, tx["to"], tx["input"], tx["value"], timestamp)
+                status = 1
+                if gas_used > tx["gas"]:
+                    raise _Revert()
+            except _Revert:
+                status, call_logs = 0, []
+                gas_used = min(tx["gas"], FUNCTION_GAS.get(_FUNCTIONS.get(tx["input"][:4], {}).get("name"), tx["gas"]))
+                overlay = _Overlay(self.state)
+            except Exception:
+                # a bug in the model fails this transaction like an invalid opcode, not the whole block
+                status, call_logs, gas_used = 0, [], tx["gas"]
+                overlay = _Overlay(self.state)
+            overlay.set(("balance", sender), overlay.get(("balance", sender)) - gas_used * gas_price)
+            overlay.set(("nonce", sender), overlay.get(("nonce", sender)) + 1)
+            overlay.commit(number)
+
+            index = len(included)
+            cumulative_gas += gas_used
+            receipt_logs = []
+            for address, topics, data in call_logs:
+                log = {
+                    "address": address, "topics": topics, "data": data, "blockNumber": number,
+                    "transactionHash": tx["hash"], "transactionIndex": index, "logIndex": len(logs),
+                }
+                logs.append(log)
+                receipt_logs.append(log)
+            tx.update(blockNumber=number, transactionIndex=index, gasPrice=gas_price)
+            self.transactions[tx["hash"]] = tx
+            self.receipts[tx["hash"]] = {
+                "status": status, "gasUsed": gas_used, "cumulativeGasUsed": cumulative_gas, "logs": receipt_logs,
+            }
+            included.append(tx["hash"])
+        block = self._append_block(timestamp, included, logs, cumulative_gas)
+        for log in logs:
+            log["blockHash"] = block["hash"]
+
+    # -- JSON-RPC -- #
+
+    def _block_number_of(self, block_identifier, allow_pending=False):
+        if block_identifier in (None, "latest", "safe", "finalized"):
+            return self.block_number
+        if block_identifier == "earliest":
+            return 0
+        if block_identifier == "pending":
+            return self.block_number + 1 if allow_pending else self.block_number
+        if isinstance(block_identifier, dict):
+            block_identifier = block_identifier.get("blockNumber") or self._block_by_hash(block_identifier["blockHash"])
+        number = _to_int(block_identifier)
+        if number > self.block_number:
+            raise SimulatorError(f"header not found for block {number}")
+        return number
+
+    def _block_by_hash(self, block_hash):
+        number = self._block_hashes.get(_to_bytes(block_hash))
+        if number is None:
+            raise SimulatorError("header not found")
+        return number
+
+    def _call_params(self, tx):
+        return (
+            _checksum(tx.get("from")) or ZERO_ADDRESS,
+            _checksum(tx.get("to")),
+            _to_bytes(tx.get("data", tx.get("input"))),
+            _to_int(tx.get("value")),
+        )
+
+    def _call(self, tx, block_identifier="latest"):
+        number = self._block_number_of(block_identifier, allow_pending=True)
+        if number > self.block_number:
+            overlay, timestamp = _Overlay(self.state), self._pending_timestamp()
+        else:
+            overlay, timestamp = _Overlay(self.state, number), self.blocks[number]["timestamp"]
+        sender, to, data, value = self._call_params(tx)
+        try:
+            output, _, gas = self._run(overlay, sender, to, data, value, timestamp)
+        except _Revert as e:
+            raise SimulatorError("execution reverted", code=3, data=_hex(e.data))
+        return output, gas
+
+    def _format_log(self, log):
+        return {
+            "address": log["address"], "topics": [_hex(topic) for topic in log["topics"]], "data": _hex(log["data"]),
+            "blockNumber": hex(log["blockNumber"]), "blockHash": _hex(log["blockHash"]),
+            "transactionHash": _hex(log["transactionHash"]), "transactionIndex": hex(log["transactionIndex"]),
+            "logIndex": hex(log["logIndex"]), "removed": False,
+        }
+
+    def _format_transaction(self, tx):
+        mined = "blockNumber" in tx
+        formatted = {
+            "hash": _hex(tx["hash"]), "from": tx["from"], "to": tx["to"], "input": _hex(tx["input"]),
+            "value": hex(tx["value"]), "nonce": hex(tx["nonce"]), "gas": hex(tx["gas"]),
+            "gasPrice": hex(tx.get("gasPrice", tx.get("maxFeePerGas"))), "type": hex(tx["type"]),
+            "chainId": hex(self.chain_id), "v": hex(tx["v"]), "r": hex(tx["r"]), "s": hex(tx["s"]),
+            "blockNumber": hex(tx["blockNumber"]) if mined else None,
+            "blockHash": _hex(self.blocks[tx["blockNumber"]]["hash"]) if mined else None,
+            "transactionIndex": hex(tx["transactionIndex"]) if mined else None,
+        }
+        if "maxFeePerGas" in tx:
+            formatted.update(
+                maxFeePerGas=hex(tx["maxFeePerGas"]), maxPriorityFeePerGas=hex(tx["maxPriorityFeePerGas"]), accessList=[]
+            )
+        return formatted
+
+    def _format_receipt(self, tx_hash):
+        tx = self.transactions[tx_hash]
+        receipt = self.receipts[tx_hash]
+        return {
+            "transactionHash": _hex(tx_hash), "transactionIndex": hex(tx["transactionIndex"]),
+            "blockNumber": hex(tx["blockNumber"]), "blockHash": _hex(self.blocks[tx["blockNumber"]]["hash"]),
+            "from": tx["from"], "to": tx["to"], "contractAddress": None, "type": hex(tx["type"]),
+            "status": hex(receipt["status"]), "gasUsed": hex(receipt["gasUsed"]),
+            "cumulativeGasUsed": hex(receipt["cumulativeGasUsed"]), "effectiveGasPrice": hex(tx["gasPrice"]),
+            "logs": [self._format_log(log) for log in receipt["logs"]], "logsBloom": "0x" + "00" * 256,
+        }
+
+    def _format_block(self, number, full_transactions=False):
+        block = self.blocks[number]
+        transactions = [
+            self._format_transaction(self.transactions[tx_hash]) if full_transactions else _hex(tx_hash)
+            for tx_hash in block["transactions"]
+        ]
+        return {
+            "number": hex(number), "hash": _hex(block["hash"]), "parentHash": _hex(block["parentHash"]),
+            "timestamp": hex(block["timestamp"]), "transactions": transactions, "gasUsed": hex(block["gasUsed"]),
+            "gasLimit": hex(BLOCK_GAS_LIMIT), "baseFeePerGas": hex(self.base_fee), "miner": ZERO_ADDRESS,
+            "difficulty": "0x0", "totalDifficulty": "0x0", "extraData": "0x", "size": "0x0",
+            "nonce": "0x0000000000000000", "mixHash": "0x" + "00" * 32, "sha3Uncles": "0x" + "00" * 32,
+            "stateRoot": "0x" + "00" * 32, "transactionsRoot": "0x" + "00" * 32,
+            "receiptsRoot": "0x" + "00" * 32, "logsBloom": "0x" + "00" * 256, "uncles": [],
+        }
+
+    def _matching_logs(self, criteria, from_block, to_block):
+        addresses = criteria.get("address")
+        if isinstance(addresses, str):
+            addresses = [addresses]
+        addresses = {_checksum(address) for address in addresses} if addresses else None
+        topic_filters = []
+        for topic in criteria.get("topics") or []:
+            if topic is None:
+                topic_filters.append(None)
+            else:
+                topic_filters.append({_to_bytes(t) for t in (topic if isinstance(topic, list) else [topic])})
+        logs = []
+        for block in self.blocks[from_block:to_block + 1]:
+            for log in block["logs"]:
+                if addresses is not None and log["address"] not in addresses:
+                    continue
+                if len(topic_filters) > len(log["topics"]) or any(
+                    allowed is not None and log["topics"][i] not in allowed for i, allowed in enumerate(topic_filters)
+                ):
+                    continue
+                logs.append(self._format_log(log))
+        return logs
+
+    def _get_logs(self, criteria):
+        if criteria.get("blockHash") is not None:
+            from_block = to_block = self._block_by_hash(criteria["blockHash"])
+        else:
+            from_block = self._block_number_of(criteria.get("fromBlock", "latest"))
+            to_block = self._block_number_of(criteria.get("toBlock", "latest"))
+        if self.max_log_block_range is not None and to_block - from_block + 1 > self.max_log_block_range:
+            raise SimulatorError(f"block range too large, the limit is {self.max_log_block_range} blocks")
+        return self._matching_logs(criteria, from_block, to_block)
+
+    def _send_raw_transaction(self, raw):
+        raw = HexBytes(raw)
+        try:
+            if raw[0] >= 0xc0:
+                fields = LegacyTransaction.from_bytes(raw).as_dict()
+                fields["type"] = 0
+                chain_id = (fields["v"] - 35) // 2 if fields["v"] >= 35 else None
+            else:
+                fields = TypedTransaction.from_bytes(raw).as_dict()
+                chain_id = fields["chainId"]
+            sender = Account.recover_transaction(raw)
+        except Exception as e:
+            raise SimulatorError(f"invalid transaction: {e}")
+        if chain_id is not None and chain_id != self.chain_id:
+            raise SimulatorError(f"invalid chain id {chain_id}, expected {self.chain_id}")
+        tx = {
+            "hash": keccak(raw), "from": sender, "to": _checksum(_hex(fields["to"])) if fields["to"] else None,
+            "input": bytes(fields["data"]), "value": fields["value"], "nonce": fields["nonce"], "gas": fields["gas"],
+            "type": fields["type"], "v": fields["v"], "r": fields["r"], "s": fields["s"],
+        }
+        if fields["type"] == 2:
+            tx.update(maxFeePerGas=fields["maxFeePerGas"], maxPriorityFeePerGas=fields["maxPriorityFeePerGas"])
+        else:
+            tx["gasPrice"] = fields["gasPrice"]
+        self._submit(tx)
+        return _hex(tx["hash"])
+
+    def _send_transaction(self, tx):
+        sender, to, data, value = self._call_params(tx)
+        if "nonce" in tx and _to_int(tx["nonce"]) != self._pending_nonce(sender):
+            raise SimulatorError("nonce too low" if _to_int(tx["nonce"]) < self._pending_nonce(sender) else "nonce too high")
+        gas = _to_int(tx["gas"]) if tx.get("gas") is not None else None
+        return _hex(self.transact(sender, to, data, value, gas))
+
+    def _fee_history(self, block_count, newest_block, reward_percentiles=None):
+        newest = self._block_number_of(newest_block)
+        oldest = max(0, newest - _to_int(block_count) + 1)
+        count = newest - oldest + 1
+        history = {
+            "oldestBlock": hex(oldest),
+            "baseFeePerGas": [hex(self.base_fee)] * (count + 1),
+            "gasUsedRatio": [self.blocks[number]["gasUsed"] / BLOCK_GAS_LIMIT for number in range(oldest, newest + 1)],
+        }
+        if reward_percentiles:
+            history["reward"] = [[hex(self.priority_fee)] * len(reward_percentiles) for _ in range(count)]
+        return history
+
+    def _new_filter(self, criteria=None, blocks=False):
+        filter_id = hex(next(self._filter_ids))
+        self._filters[filter_id] = {"criteria": criteria, "blocks": blocks, "next_block": self.block_number + 1}
+        return filter_id
+
+    def _filter_changes(self, filter_id, all_logs=False):
+        log_filter = self._filters.get(filter_id)
+        if log_filter is None:
+            raise SimulatorError("filter not found")
+        if log_filter["blocks"]:
+            start, log_filter["next_block"] = log_filter["next_block"], self.block_number + 1
+            return [_hex(block["hash"]) for block in self.blocks[start:]]
+        criteria = log_filter["criteria"]
+        if all_logs:
+            return self._get_logs(criteria)
+        start = max(log_filter["next_block"], self._block_number_of(criteria.get("fromBlock", "latest")))
+        end = self._block_number_of(criteria.get("toBlock", "latest"))
+        log_filter["next_block"] = self.block_number + 1
+        return self._matching_logs(criteria, start, end) if start <= end else []
+
+    def _dispatch(self, method, params):
+        if method == "eth_chainId":
+            return hex(self.chain_id)
+        if method == "net_version":
+            return str(self.chain_id)
+        if method == "web3_clientVersion":
+            return "CollateralSimulator/v1"
+        if method == "eth_syncing":
+            return False
+        if method == "eth_accounts":
+            return []
+        if method == "eth_blockNumber":
+            return hex(self.block_number)
+        if method == "eth_getBlockByNumber":
+            if params[0] == "pending":
+                return None
+            return self._format_block(self._block_number_of(params[0]), len(params) > 1 and params[1])
+        if method == "eth_getBlockByHash":
+            number = self._block_hashes.get(_to_bytes(params[0]))
+            return None if number is None else self._format_block(number, len(params) > 1 and params[1])
+        if method == "eth_getBalance":
+            return hex(self.state.get(("balance", _checksum(params[0])), 0, self._block_number_of(params[1] if len(params) > 1 else None)))
+        if method == "eth_getTransactionCount":
+            address = _checksum(params[0])
+            block_identifier = params[1] if len(params) > 1 else "latest"
+            if block_identifier == "pending":
+                return hex(self._pending_nonce(address))
+            return hex(self.state.get(("nonce", address), 0, self._block_number_of(block_identifier)))
+        if method == "eth_getCode":
+            return _hex(SIMULATED_CODE) if _checksum(params[0]) in self._contracts else "0x"
+        if method == "eth_call":
+            return _hex(self._call(params[0], params[1] if len(params) > 1 else "latest")[0])
+        if method == "eth_estimateGas":
+            return hex(self._call(params[0], params[1] if len(params) > 1 else "pending")[1])
+        if method == "eth_gasPrice":
+            return hex(self.base_fee + self.priority_fee)
+        if method == "eth_maxPriorityFeePerGas":
+            return hex(self.priority_fee)
+        if method == "eth_feeHistory":
+            return self._fee_history(*params)
+        if method == "eth_sendRawTransaction":
+            return self._send_raw_transaction(params[0])
+        if method == "eth_sendTransaction":
+            return self._send_transaction(params[0])
+        if method == "eth_getTransactionByHash":
+            tx_hash = _to_bytes(params[0])
+            tx = self.transactions.get(tx_hash) or self._pool_hashes.get(tx_hash)
+            return None if tx is None else self._format_transaction(tx)
+        if method == "eth_getTransactionReceipt":
+            tx_hash = _to_bytes(params[0])
+            return self._format_receipt(tx_hash) if tx_hash in self.receipts else None
+        if method == "eth_getLogs":
+            return self._get_logs(params[0])
+        if method == "eth_newFilter":
+            return self._new_filter(params[0])
+        if method == "eth_newBlockFilter":
+            return self._new_filter(blocks=True)
+        if method == "eth_getFilterChanges":
+            return self._filter_changes(params[0])
+        if method == "eth_getFilterLogs":
+            return self._filter_changes(params[0], all_logs=True)
+        if method == "eth_uninstallFilter":
+            return self._filters.pop(params[0], None) is not None
+        if method == "evm_mine":
+            self.mine(timestamp=_to_int(params[0]) if params else None)
+            return "0x0"
+        if method == "evm_increaseTime":
+            self.advance_time(_to_int(params[0]))
+            return hex(self._pending_timestamp())
+        if method == "evm_setNextBlockTimestamp":
+            self.set_next_block_timestamp(_to_int(params[0]))
+            return None
+        raise SimulatorError(f"the method {method} does not exist/is not available", code=-32601)
+
+    def request(self, method, params, request_id=0):
+        """Answer one JSON-RPC request.
+
+        Returns:
+            dict: The JSON-RPC response, with either a ``result`` or an ``error``
+        """
+        with self._lock:
+            try:
+                return {"jsonrpc": "2.0", "id": request_id, "result": self._dispatch(method, list(params or []))}
+            except SimulatorError as e:
+                error = {"code": e.code, "message": str(e)}
+                if e.data is not None:
+                    error["data"] = e.data
+                return {"jsonrpc": "2.0", "id": request_id, "error": error}
+            except Exception as e:
+                return {"jsonrpc": "2.0", "id": request_id, "error": {"code": -32603, "message": f"internal error: {e!r}"}}
+
+    def get_web3(self):
+        """A Web3 instance connected to this simulator."""
+        return Web3(SimulatorProvider(self))
+
+    def get_async_web3(self):
+        """An AsyncWeb3 instance connected to this simulator."""
+        return AsyncWeb3(AsyncSimulatorProvider(self))
+
+
+class SimulatorProvider(JSONBaseProvider):
+    """Web3 provider answering requests from a ``CollateralSimulator``."""
+
+    def __init__(self, simulator=None, **kwargs):
+        super().__init__(**kwargs)
+        self.simulator = simulator if simulator is not None else CollateralSimulator()
+
+    def make_request(self, method, params):
+        return self.simulator.request(method, params, next(self.request_counter))
+
+    def make_batch_request(self, requests):
+        return [self.make_request(method, params) for method, params in requests]
+
+    def is_connected(self, show_traceback=False):
+        return True
+
+
+class AsyncSimulatorProvider(AsyncJSONBaseProvider):
+    """AsyncWeb3 provider answering requests from a ``CollateralSimulator``."""
+
+    def __init__(self, simulator=None, **kwargs):
+        super().__init__(**kwargs)
+        self.simulator = simulator if simulator is not None else CollateralSimulator()
+
+    async def make_request(self, method, params):
+        return self.simulator.request(method, params, next(self.request_counter))
+
+    async def make_batch_request(self, requests):
+        return [await self.make_request(method, params) for method, params in requests]
+
+    async def is_connected(self, show_traceback=False):
+        return True
@@ -9,19 +9,30 @@ URLs for verification purposes.
 """
 
 import sys
+import csv
 import asyncio
 import argparse
+from dataclasses import dataclass
 from uuid import UUID
 from celium_collateral_contracts.common import (
-    load_contract_abi,
+    get_contract,
     get_web3_connection,
     get_account,
+    configure_preflight,
     validate_address_format,
-    build_and_send_transaction,
-    wait_for_receipt,
+    async_build_and_send_transaction,
+    async_wait_for_receipt,
     calculate_md5_checksum,
-    get_revert_reason,
+    calculate_md5_checksums,
+    send_transactions_pipelined,
+    async_get_revert_reason,
 )
+from celium_collateral_contracts.receipt_collector import decode_receipt_events
+
+__all__ = [
+    "SlashCollateralError", "slash_collateral", "SlashOutcome", "slash_collateral_batch",
+    "read_executor_uuids_file",
+]
 
 
 class SlashCollateralError(Exception):
@@ -39,7 +50,7 @@ async def slash_collateral(
     """Slash collateral from a miner.
 
     Args:
-        w3 (Web3): Web3 instance
+        w3 (Web3 | AsyncWeb3): Web3 instance
         account: The account to use for the transaction
         contract_address (str): Address of the collateral contract
         url (str): URL containing information about the slash
@@ -51,19 +62,18 @@ async def slash_collateral(
     Raises:
         Exception: If the transaction fails
     """
-    contract_abi = load_contract_abi()
-    contract = w3.eth.contract(address=contract_address, abi=contract_abi)
+    contract = get_contract(w3, contract_address)
 
     # Calculate MD5 checksum if URL is valid
     md5_checksum = "0" * 32
     if url.startswith(("http://", "https://")):
         print("Calculating MD5 checksum of URL content...", file=sys.stderr)
-        md5_checksum = calculate_md5_checksum(url)
+        md5_checksum = await asyncio.to_thread(calculate_md5_checksum, url)
         print(f"MD5 checksum: {md5_checksum}", file=sys.stderr)
 
     executor_uuid_bytes = UUID(executor_uuid).bytes
 
-    tx_hash = build_and_send_transaction(
+    tx_hash = await async_build_and_send_transaction(
         w3,
         contract.functions.slashCollateral(
             executor_uuid_bytes,
@@ -74,15 +84,117 @@ async def slash_collateral(
         gas_limit=200000,  # Higher gas limit for this function
     )
 
-    receipt = wait_for_receipt(w3, tx_hash)
+    receipt = await async_wait_for_receipt(w3, tx_hash)
     if receipt['status'] == 0:
-        revert_reason = get_revert_reason(w3, tx_hash, receipt['blockNumber'])
+        revert_reason = await async_get_revert_reason(w3, tx_hash, receipt['blockNumber'])
         raise SlashCollateralError(f"Transaction failed for slashing collateral. Revert reason: {revert_reason}")
     slash_event = contract.events.Slashed().process_receipt(receipt)[0]
 
     return receipt, slash_event
 
 
+@dataclass
+class SlashOutcome:
+    """Result of slashing a single executor in a bulk slash."""
+
+    executor_uuid: str
+    success: bool
+    miner: str | None = None
+    amount: int | None = None
+    tx_hash: str | None = None
+    block_number: int | None = None
+    error: str | None = None
+
+
+async def slash_collateral_batch(
+    w3,
+    account,
+    contract_address,
+    slashes,
+    max_workers=16,
+):
+    """Slash collateral from many executors with pipelined transactions.
+
+    Evidence checksums are fetched concurrently, all slash transactions are broadcast
+    back-to-back with sequential nonces, and receipts are collected in parallel.
+    A failure of one executor does not stop the others.
+
+    Args:
+        w3 (Web3 | AsyncWeb3): Web3 instance
+        account: The account to use for the transactions
+        contract_address (str): Address of the collateral contract
+        slashes (Iterable[tuple[str, str]]): (executor_uuid, url) pairs
+        max_workers (int): Maximum number of URLs fetched concurrently
+
+    Returns:
+        list[SlashOutcome]: Outcome per executor, in input order
+    """
+    validate_address_format(contract_address)
+    contract = get_contract(w3, contract_address)
+
+    results = []
+    valid_slashes = []
+    for executor_uuid, url in slashes:
+        try:
+            UUID(executor_uuid)
+        except ValueError as e:
+            results.append(SlashOutcome(executor_uuid=executor_uuid, success=False, error=f"Invalid executor UUID: {e}"))
+            continue
+        result = SlashOutcome(executor_uuid=executor_uuid, success=False)
+        results.append(result)
+        valid_slashes.append((result, url))
+
+    print(f"Calculating MD5 checksums for {len(valid_slashes)} slashes...", file=sys.stderr)
+    checksums = await calculate_md5_checksums(
+        (url for _, url in valid_slashes), max_workers=max_workers, return_exceptions=True
+    )
+    for result, url in valid_slashes:
+        if isinstance(checksums[url], Exception):
+            result.error = f"Failed to calculate MD5 checksum of {url}: {checksums[url]}"
+    valid_slashes = [(result, url) for result, url in valid_slashes if result.error is None]
+
+    outcomes = await send_transactions_pipelined(
+        w3,
+        account,
+        [
+            contract.functions.slashCollateral(
+                UUID(result.executor_uuid).bytes,
+                url,
+                bytes.fromhex(checksums[url]),
+            )
+            for result, url in valid_slashes
+        ],
+        gas_limit=200000,  # Higher gas limit for this function
+    )
+
+    slash_events = decode_receipt_events(
+        w3, contract_address, [outcome.receipt for outcome in outcomes if outcome.success], ["Slashed"]
+    )
+    for (result, _), outcome in zip(valid_slashes, outcomes):
+        result.success = outcome.success
+        result.tx_hash = outcome.tx_hash.to_0x_hex() if outcome.tx_hash is not None else None
+        result.block_number = outcome.receipt['blockNumber'] if outcome.receipt is not None else None
+        result.error = outcome.error
+        events = slash_events.get(outcome.receipt['transactionHash'], []) if outcome.success else []
+        if events:
+            result.miner = events[0]['args']['miner']
+            result.amount = events[0]['args']['amount']
+    return results
+
+
+def read_executor_uuids_file(path, default_url):
+    """Read (executor_uuid, url) pairs from a file with one ``uuid`` or ``uuid,url`` per line."""
+    slashes = []
+    with open(path) as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            executor_uuid, _, url = line.partition(",")
+            slashes.append((executor_uuid.strip(), url.strip() or default_url))
+    return slashes
+
+
 async def main():
     parser = argparse.ArgumentParser(
         description="Slash collateral from a miner."
@@ -101,16 +213,53 @@ async def main():
         "--executor-uuid",
         help="Executor UUID for the slashing operation"
     )
+    parser.add_argument(
+        "--executor-uuids-file",
+        help="File with one executor UUID per line (optionally followed by ',<url>') to slash in bulk"
+    )
     parser.add_argument("--private-key", help="Private key of the account to use")
     parser.add_argument("--network", default="finney", help="The Subtensor Network to connect to.")
 
+    parser.add_argument(
+        "--preflight", action="store_true",
+        help="Simulate transactions before broadcasting them and size their gas from estimate_gas"
+    )
     args = parser.parse_args()
+    if args.preflight:
+        configure_preflight()
+    if not args.executor_uuid and not args.executor_uuids_file:
+        parser.error("one of --executor-uuid or --executor-uuids-file is required")
 
     validate_address_format(args.contract_address)
 
     w3 = get_web3_connection(args.network)
     account = get_account(args.private_key)
 
+    if args.executor_uuids_file:
+        outcomes = await slash_collateral_batch(
+            w3,
+            account,
+            args.contract_address,
+            read_executor_uuids_file(args.executor_uuids_file, args.url),
+        )
+        writer = csv.writer(sys.stdout)
+        writer.writerow(["executor_uuid", "success", "miner", "amount_tao", "transaction_hash", "block_number", "error"])
+        for outcome in outcomes:
+            writer.writerow([
+                outcome.executor_uuid,
+                outcome.success,
+                outcome.miner,
+                w3.from_wei(outcome.amount, 'ether') if outcome.amount is not None else None,
+                outcome.tx_hash,
+                outcome.block_number,
+                outcome.error,
+            ])
+        print(
+            f"Slashed {sum(outcome.success for outcome in outcomes)} of {len(outcomes)} executors",
+            file=sys.stderr,
+        )
+        return
+
     try:
         receipt, event = await slash_collateral(
             w3,
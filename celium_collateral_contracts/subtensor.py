@@ -4,6 +4,8 @@ import eth_account
 import eth_utils
 import eth_keys.datatypes
 
+__all__ = ["associate_evm_key"]
+
 
 def associate_evm_key(
     subtensor: bittensor.Subtensor,
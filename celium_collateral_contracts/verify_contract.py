@@ -15,6 +15,11 @@ import time
 from web3 import Web3
 from celium_collateral_contracts.common import get_web3_connection
 
+__all__ = [
+    "ANVIL_PORT", "ANVIL_RPC_URL", "ANVIL_PRIVATE_KEY", "get_contract_config",
+    "get_deployed_bytecode", "deploy_on_devnet_and_get_bytecode", "verify_contract",
+]
+
 ANVIL_PORT = 8555
 ANVIL_RPC_URL = f"http://127.0.0.1:{ANVIL_PORT}"
 # the first preset private key available in anvil
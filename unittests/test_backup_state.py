@@ -0,0 +1,212 @@
+import asyncio
+import os
+import tempfile
+import unittest
+import uuid
+
+from celium_collateral_contracts.backup_state import (
+    SnapshotError,
+    backup_collateral_state,
+    compact_snapshots,
+    merge_deltas,
+    read_snapshot,
+    restore_state,
+    take_delta,
+    take_snapshot,
+    write_snapshot,
+)
+from celium_collateral_contracts.common import get_contract
+from celium_collateral_contracts.event_index import EventIndex
+from celium_collateral_contracts.simulator import CollateralSimulator
+
+DEPOSIT = 10 ** 16
+CHECKSUM = b"\x00" * 16
+DECISION_TIMEOUT = 60
+
+
+class CollateralStateTestCase(unittest.TestCase):
+    def setUp(self):
+        self.simulator = CollateralSimulator(timestamp=1_700_000_000)
+        self.trustee = self.simulator.create_account()
+        self.miner = self.simulator.create_account()
+        self.contract_address = self.simulator.deploy_collateral(self.trustee.address, decision_timeout=DECISION_TIMEOUT)
+        self.w3 = self.simulator.get_web3()
+        self.contract = get_contract(self.w3, self.contract_address)
+        self.reclaim_request_ids = 0
+
+    def transact(self, sender, function, value=0):
+        self.simulator.transact(sender.address, self.contract_address, function._encode_transaction_data(), value, 300_000)
+
+    def deposit(self, executor_uuid=None, amount=DEPOSIT):
+        executor_uuid = executor_uuid or str(uuid.uuid4())
+        self.transact(self.miner, self.contract.functions.deposit(uuid.UUID(executor_uuid).bytes), amount)
+        return executor_uuid
+
+    def reclaim(self, executor_uuid):
+        self.transact(self.miner, self.contract.functions.reclaimCollateral(uuid.UUID(executor_uuid).bytes, "url", CHECKSUM))
+        self.reclaim_request_ids += 1
+        return self.reclaim_request_ids
+
+    def deny(self, reclaim_request_id):
+        self.transact(self.trustee, self.contract.functions.denyReclaimRequest(reclaim_request_id, "url", CHECKSUM))
+
+    def finalize(self, reclaim_request_id):
+        self.simulator.advance_time(DECISION_TIMEOUT + 1)
+        self.transact(self.miner, self.contract.functions.finalizeReclaim(reclaim_request_id))
+
+    def slash(self, executor_uuid):
+        self.transact(self.trustee, self.contract.functions.slashCollateral(uuid.UUID(executor_uuid).bytes, "url", CHECKSUM))
+
+    def snapshot(self, **options):
+        return asyncio.run(take_snapshot(self.w3, self.contract_address, **options))
+
+    def delta(self, base_block, **options):
+        return asyncio.run(take_delta(self.w3, self.contract_address, base_block, **options))
+
+    def temporary_path(self, suffix):
+        fd, path = tempfile.mkstemp(suffix=suffix)
+        os.close(fd)
+        self.addCleanup(os.remove, path)
+        return path
+
+
+class TestSnapshots(CollateralStateTestCase):
+    def test_snapshot_matches_the_contract_state(self):
+        kept, reclaimed, denied, slashed = (self.deposit() for _ in range(4))
+        self.deposit(kept)
+        open_request = self.reclaim(kept)
+        self.finalize(self.reclaim(reclaimed))
+        self.deny(self.reclaim(denied))
+        self.slash(slashed)
+
+        snapshot = self.snapshot()
+        self.assertEqual(snapshot.block_number, self.w3.eth.block_number)
+        self.assertEqual(snapshot.executors[kept].collateral, 2 * DEPOSIT)
+        self.assertEqual(snapshot.executors[denied].collateral, DEPOSIT)
+        for executor_uuid, state in snapshot.executors.items():
+            executor_id = uuid.UUID(executor_uuid).bytes
+            self.assertEqual(state.collateral, self.contract.functions.collaterals(executor_id).call())
+            self.assertEqual(state.miner, self.contract.functions.executorToMiner(executor_id).call())
+        self.assertNotIn(reclaimed, snapshot.executors)
+        # only the request still waiting for a decision is kept
+        self.assertEqual(list(snapshot.reclaims), [open_request])
+        self.assertEqual(snapshot.reclaims[open_request].amount, 2 * DEPOSIT)
+        self.assertEqual(snapshot.pending_reclaims(), {kept: 2 * DEPOSIT})
+
+    def test_snapshot_at_a_pinned_block(self):
+        executor_uuid = self.deposit()
+        block_number = self.w3.eth.block_number
+        self.slash(executor_uuid)
+        self.deposit()
+
+        snapshot = self.snapshot(block_number=block_number)
+        self.assertEqual(snapshot.block_number, block_number)
+        self.assertEqual(list(snapshot.executors), [executor_uuid])
+        self.assertEqual(snapshot.executors[executor_uuid].collateral, DEPOSIT)
+
+    def test_snapshot_from_an_event_index(self):
+        executor_uuid = self.deposit()
+        self.reclaim(executor_uuid)
+        self.deposit()
+        with EventIndex(":memory:", self.contract_address) as index:
+            self.assertEqual(self.snapshot(index=index), self.snapshot())
+            self.assertEqual(index.last_synced_block, self.w3.eth.block_number)
+
+    def test_snapshot_files_round_trip(self):
+        self.reclaim(self.deposit())
+        snapshot = self.snapshot()
+        for suffix in (".json", ".json.gz"):
+            with self.subTest(suffix=suffix):
+                path = self.temporary_path(suffix)
+                write_snapshot(snapshot, path)
+                self.assertEqual(read_snapshot(path), snapshot)
+
+    def test_backup_of_a_contract_object(self):
+        self.reclaim(self.deposit())
+        path = self.temporary_path(".json")
+        snapshot = backup_collateral_state(self.contract, path)
+        self.assertEqual(read_snapshot(path), snapshot)
+        self.assertEqual(snapshot, self.snapshot())
+
+    def test_unsupported_versions_are_rejected(self):
+        snapshot = self.snapshot()
+        snapshot.version = 0
+        path = self.temporary_path(".json")
+        write_snapshot(snapshot, path)
+        with self.assertRaisesRegex(SnapshotError, "Unsupported snapshot version: 0"):
+            read_snapshot(path)
+
+
+class TestDeltas(CollateralStateTestCase):
+    def setUp(self):
+        super().setUp()
+        self.kept, self.emptied, self.denied = (self.deposit() for _ in range(3))
+        self.open_request = self.reclaim(self.emptied)
+        self.denied_request = self.reclaim(self.denied)
+        self.base = self.snapshot()
+
+    def change_state(self):
+        """Touch every kind of entry of the base snapshot, returning the delta blocks."""
+        self.deposit(self.kept)
+        self.deny(self.denied_request)
+        first_block = self.w3.eth.block_number
+        self.finalize(self.open_request)
+        self.reclaim(self.kept)
+        self.deposit()
+        return first_block, self.w3.eth.block_number
+
+    def test_delta_contains_only_touched_entries(self):
+        untouched = self.deposit()
+        base = self.snapshot()
+        self.deposit(self.kept)
+        self.finalize(self.open_request)
+
+        delta = self.delta(base.block_number)
+        self.assertEqual((delta.base_block, delta.block_number), (base.block_number, self.w3.eth.block_number))
+        self.assertEqual(set(delta.executors), {self.kept, self.emptied})
+        self.assertNotIn(untouched, delta.executors)
+        self.assertIsNone(delta.executors[self.emptied])
+        self.assertEqual(delta.executors[self.kept].collateral, 2 * DEPOSIT)
+        self.assertEqual(delta.reclaims, {self.open_request: None})
+
+    def test_restoring_deltas_matches_a_full_snapshot(self):
+        first_block, last_block = self.change_state()
+        deltas = [
+            self.delta(first_block, block_number=last_block),
+            self.delta(self.base.block_number, block_number=first_block),
+        ]
+        expected = self.snapshot()
+
+        self.assertEqual(restore_state(self.base, deltas), expected)
+        self.assertEqual(restore_state(self.base, [merge_deltas(deltas)]), expected)
+        self.assertEqual(restore_state(self.base, [self.delta(self.base.block_number)]), expected)
+        # the base snapshot is left as it was
+        self.assertEqual(self.base, self.snapshot(block_number=self.base.block_number))
+
+    def test_compaction_of_snapshot_files(self):
+        first_block, last_block = self.change_state()
+        base_path = self.temporary_path(".json.gz")
+        write_snapshot(self.base, base_path)
+        delta_paths = []
+        for base_block, block_number in ((self.base.block_number, first_block), (first_block, last_block)):
+            delta_paths.append(self.temporary_path(".json"))
+            write_snapshot(self.delta(base_block, block_number=block_number), delta_paths[-1])
+        self.assertEqual(read_snapshot(delta_paths[1]), self.delta(first_block, block_number=last_block))
+
+        output_path = self.temporary_path(".json")
+        compact_snapshots(base_path, delta_paths, output_path)
+        self.assertEqual(read_snapshot(output_path), self.snapshot())
+
+    def test_broken_delta_chains_are_rejected(self):
+        first_block, last_block = self.change_state()
+        later = self.delta(first_block, block_number=last_block)
+        with self.assertRaisesRegex(SnapshotError, "cannot be applied to a snapshot at block"):
+            restore_state(self.base, [later])
+        with self.assertRaisesRegex(SnapshotError, "Gap between block"):
+            merge_deltas([self.delta(self.base.block_number, block_number=first_block - 1), later])
+        with self.assertRaisesRegex(SnapshotError, "before the base block"):
+            self.delta(last_block + 1, block_number=last_block)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,140 @@
+import asyncio
+import json
+import unittest
+import uuid
+from decimal import Decimal
+
+from celium_collateral_contracts.backup_state import ZERO_ADDRESS
+from celium_collateral_contracts.batch_runner import BatchRunner, BatchRunnerError, load_steps, parse_steps
+from celium_collateral_contracts.common import get_connection_sharing, get_executor_collateral
+
+from test_backup_state import DECISION_TIMEOUT, CollateralStateTestCase
+
+EXECUTOR_UUID = "6f1f7c4e-51a4-4a8e-9a3c-0d6a2c1f9b11"
+OTHER_EXECUTOR_UUID = "0b7a9e5d-3c2f-4d3e-8f61-2a4b5c6d7e8f"
+
+
+class TestParseSteps(unittest.TestCase):
+    def test_dependencies_follow_references_and_file_order(self):
+        steps = parse_steps([
+            {"id": "deposit", "op": "deposit_collateral", "executor_uuid": EXECUTOR_UUID, "amount_tao": 0.01},
+            {"id": "other", "op": "deposit", "executor_uuid": OTHER_EXECUTOR_UUID.upper(), "amount_tao": 0.01},
+            {"id": "reclaim", "op": "reclaim", "executor_uuid": EXECUTOR_UUID.replace("-", "")},
+            {"op": "get_balance"},
+            {"id": "finalize", "op": "finalize", "reclaim_request_id": "@reclaim"},
+            {"id": "collateral", "op": "get_executor_collateral", "executor_uuid": EXECUTOR_UUID},
+            {"id": "query", "op": "get_reclaim", "reclaim_request_id": "@reclaim", "after": "other"},
+            {"id": "deny", "op": "deny", "reclaim_request_id": 7},
+            {"id": "denied", "op": "get_reclaim", "reclaim_request_id": "7"},
+        ])
+        self.assertEqual({step.id: step.after for step in steps}, {
+            "deposit": [],
+            "other": [],
+            "reclaim": ["deposit"],
+            "step-4": [],
+            "finalize": ["reclaim"],
+            "collateral": ["finalize"],
+            "query": ["other", "reclaim", "collateral", "finalize"],
+            "deny": [],
+            "denied": ["deny"],
+        })
+        self.assertEqual(steps[0].op, "deposit")
+        self.assertEqual(steps[4].params, {"reclaim_request_id": "@reclaim"})
+
+    def test_invalid_steps_are_rejected(self):
+        deposit = {"id": "deposit", "op": "deposit", "executor_uuid": EXECUTOR_UUID, "amount_tao": 0.01}
+        for records, message in (
+            ([["deposit"]], "Step 1 is not a mapping"),
+            ([{"op": "withdraw"}], "unknown op 'withdraw'"),
+            ([{"op": "deposit", "executor_uuid": EXECUTOR_UUID}], "missing amount_tao"),
+            ([deposit, deposit], "Duplicate step ID deposit"),
+            ([{**deposit, "after": ["reclaim"]}], "depends on unknown step reclaim"),
+            ([{**deposit, "executor_uuid": "not-a-uuid"}], "invalid executor UUID"),
+            ([
+                {"id": "a", "op": "get_balance", "after": "b"},
+                {"id": "b", "op": "get_balance", "after": "a"},
+            ], "Dependency cycle"),
+        ):
+            with self.subTest(message=message), self.assertRaisesRegex(BatchRunnerError, message):
+                parse_steps(records)
+
+
+class TestBatchRunner(CollateralStateTestCase):
+    def run_batch(self, records, on_result=None):
+        runner = BatchRunner(
+            self.w3, self.contract_address, self.miner.key.hex(), poll_interval=0.01
+        )
+        sharing = get_connection_sharing()
+        results = asyncio.run(runner.run(parse_steps(records), on_result))
+        # nonces were shared during the run only
+        self.assertEqual(get_connection_sharing(), sharing)
+        return {result.id: result for result in results}
+
+    def test_lifecycle_waits_for_deny_timeout(self):
+        trustee_key = self.trustee.key.hex()
+
+        def on_result(result):
+            if result.id == "deny":
+                # the finalization polls the chain until a block passes the deny timeout
+                self.simulator.advance_time(DECISION_TIMEOUT + 1)
+                self.simulator.mine()
+
+        results = self.run_batch([
+            {"id": "deposit", "op": "deposit", "executor_uuid": EXECUTOR_UUID, "amount_tao": 0.02},
+            {"id": "deposit-other", "op": "deposit", "executor_uuid": OTHER_EXECUTOR_UUID, "amount_tao": 0.01},
+            {"id": "reclaim", "op": "reclaim", "executor_uuid": EXECUTOR_UUID, "url": "url"},
+            {"id": "reclaim-other", "op": "reclaim", "executor_uuid": OTHER_EXECUTOR_UUID, "url": "url"},
+            {
+                "id": "deny", "op": "deny", "reclaim_request_id": "@reclaim-other", "url": "url",
+                "private_key": trustee_key,
+            },
+            {"id": "finalize", "op": "finalize", "reclaim_request_id": "@reclaim", "after": "deny"},
+            {"id": "collateral", "op": "get_executor_collateral", "executor_uuid": EXECUTOR_UUID},
+            {"id": "request", "op": "get_reclaim", "reclaim_request_id": "@reclaim-other"},
+        ], on_result)
+
+        self.assertTrue(all(result.success for result in results.values()), results)
+        self.assertEqual(results["finalize"].result["amount"], 2 * 10 ** 16)
+        self.assertGreater(results["finalize"].result["block_number"], results["deny"].result["block_number"])
+        # ordered after the finalization, which released the executor
+        self.assertEqual(results["collateral"].result, {"collateral_tao": "0", "miner": ZERO_ADDRESS})
+        self.assertEqual(results["request"].result["amount"], 0)
+        self.assertEqual(
+            get_executor_collateral(self.w3, self.contract_address, OTHER_EXECUTOR_UUID), Decimal("0.01")
+        )
+
+    def test_failed_steps_skip_their_dependents(self):
+        results = self.run_batch([
+            {"id": "deposit", "op": "deposit", "executor_uuid": EXECUTOR_UUID, "amount_tao": 0.01},
+            # only the trustee may slash
+            {"id": "slash", "op": "slash", "executor_uuid": EXECUTOR_UUID, "url": "url"},
+            {"id": "reclaim", "op": "reclaim", "executor_uuid": EXECUTOR_UUID, "url": "url"},
+            {"id": "finalize", "op": "finalize", "reclaim_request_id": "@reclaim"},
+            {"id": "balance", "op": "get_balance"},
+        ])
+        self.assertTrue(results["deposit"].success)
+        self.assertFalse(results["slash"].success)
+        self.assertIn("NotTrustee", results["slash"].error)
+        self.assertEqual([results["reclaim"].skipped, results["finalize"].skipped], [True, True])
+        self.assertEqual(results["reclaim"].error, "Dependency slash failed")
+        self.assertTrue(results["balance"].success)
+        self.assertEqual(results["balance"].result["address"], self.miner.address)
+        self.assertEqual(get_executor_collateral(self.w3, self.contract_address, EXECUTOR_UUID), Decimal("0.01"))
+
+    def test_load_steps_reads_jsonl(self):
+        path = self.temporary_path(".jsonl")
+        with open(path, "w") as f:
+            f.write("# lifecycle\n\n")
+            f.write(json.dumps({"id": "deposit", "op": "deposit", "executor_uuid": EXECUTOR_UUID, "amount_tao": 1}))
+            f.write("\n" + json.dumps({"op": "reclaim", "executor_uuid": str(uuid.UUID(EXECUTOR_UUID))}) + "\n")
+        steps = load_steps(path)
+        self.assertEqual([(step.id, step.after) for step in steps], [("deposit", []), ("step-2", ["deposit"])])
+
+        with open(path, "a") as f:
+            f.write("{not json\n")
+        with self.assertRaisesRegex(BatchRunnerError, "Line 5 of .* is not valid JSON"):
+            load_steps(path)
+
+
+if __name__ == "__main__":
+    unittest.main()
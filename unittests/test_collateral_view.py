@@ -0,0 +1,104 @@
+import asyncio
+import unittest
+
+from celium_collateral_contracts.collateral_view import CollateralView, ViewMismatch
+from celium_collateral_contracts.log_scanner import scan_events
+
+from test_backup_state import DEPOSIT, CollateralStateTestCase
+
+
+class TestCollateralView(CollateralStateTestCase):
+    def setUp(self):
+        super().setUp()
+        self.kept, self.reclaimed, self.slashed = (self.deposit() for _ in range(3))
+        self.pending_request = self.reclaim(self.slashed)
+        self.view = asyncio.run(CollateralView.load(self.w3, self.contract_address))
+
+    def events_since_view(self):
+        async def collect():
+            return [event async for event in scan_events(
+                self.w3, self.contract_address, self.view.block_number + 1, self.w3.eth.block_number
+            )]
+
+        return asyncio.run(collect())
+
+    def change_state(self):
+        self.deposit(self.kept)
+        self.reclaim(self.kept)
+        self.finalize(self.reclaim(self.reclaimed))
+        self.slash(self.slashed)
+        self.deny(self.reclaim(self.deposit()))
+
+    def assert_matches_the_chain(self, view):
+        expected = asyncio.run(CollateralView.load(self.w3, self.contract_address))
+        self.assertEqual(view.block_number, expected.block_number)
+        self.assertEqual(view.collaterals, expected.collaterals)
+        self.assertEqual(view.miners, expected.miners)
+        self.assertEqual(view.pending, expected.pending)
+        self.assertEqual(view.reclaims, expected.reclaims)
+        self.assertEqual(asyncio.run(view.check_consistency(self.w3)), [])
+
+    def test_seeded_view_answers_queries(self):
+        self.assertEqual(self.view.get_collateral(self.kept), DEPOSIT)
+        self.assertEqual(self.view.get_miner(self.kept), self.miner.address)
+        self.assertEqual(self.view.get_pending_reclaim_amount(self.slashed), DEPOSIT)
+        self.assertEqual(self.view.get_available_collateral(self.slashed), 0)
+        self.assertFalse(self.view.is_sufficiently_collateralized(self.slashed, DEPOSIT))
+        self.assertTrue(self.view.is_sufficiently_collateralized(self.slashed, DEPOSIT, include_pending=True))
+        self.assertIsNone(self.view.get_miner("00000000-0000-0000-0000-000000000000"))
+
+    def test_applied_events_keep_the_view_current(self):
+        self.change_state()
+        events = self.events_since_view()
+        self.assertTrue(all(self.view.apply_event(event) for event in events))
+        self.assert_matches_the_chain(self.view)
+        self.assertEqual(self.view.get_collateral(self.slashed), 0)
+        self.assertEqual(self.view.get_pending_reclaim_amount(self.kept), 2 * DEPOSIT)
+        # a slash leaves the reclaim pending, like the contract
+        self.assertEqual(self.view.get_pending_reclaim_amount(self.slashed), DEPOSIT)
+
+    def test_old_and_repeated_events_are_ignored(self):
+        async def history():
+            return [event async for event in scan_events(self.w3, self.contract_address, 0, self.view.block_number)]
+
+        seeded_collaterals = dict(self.view.collaterals)
+        self.assertFalse(any(self.view.apply_event(event) for event in asyncio.run(history())))
+        self.assertEqual(self.view.collaterals, seeded_collaterals)
+
+        self.deposit(self.kept)
+        event, = self.events_since_view()
+        self.assertTrue(self.view.apply_event(event))
+        self.assertFalse(self.view.apply_event(event))
+        self.assertEqual(self.view.get_collateral(self.kept), 2 * DEPOSIT)
+
+    def test_following_an_event_stream(self):
+        self.change_state()
+        history = self.events_since_view()
+
+        async def follow():
+            async def events():
+                for event in history:
+                    yield event
+
+            await self.view.start_following(events())
+
+        asyncio.run(follow())
+        self.assert_matches_the_chain(self.view)
+
+    def test_drifted_entries_are_reported_and_repaired(self):
+        self.view.collaterals[self.kept] = 5
+        del self.view.miners[self.reclaimed]
+        self.view.reclaims[self.pending_request].amount = 1
+
+        mismatches = asyncio.run(self.view.check_consistency(self.w3, repair=False))
+        self.assertCountEqual(mismatches, [
+            ViewMismatch(self.kept, "collateral", 5, DEPOSIT),
+            ViewMismatch(self.reclaimed, "miner", "0x" + "00" * 20, self.miner.address),
+            ViewMismatch(self.pending_request, "reclaim_amount", 1, DEPOSIT),
+        ])
+        self.assertEqual(len(asyncio.run(self.view.check_consistency(self.w3))), 3)
+        self.assert_matches_the_chain(self.view)
+
+
+if __name__ == "__main__":
+    unittest.main()
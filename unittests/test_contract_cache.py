@@ -0,0 +1,57 @@
+import gc
+import unittest
+import uuid
+import weakref
+
+from web3 import Web3
+
+from celium_collateral_contracts.common import (
+    get_contract,
+    get_event_topics,
+    get_function_selectors,
+    load_contract_abi,
+)
+from celium_collateral_contracts.log_scanner import COLLATERAL_EVENTS
+from celium_collateral_contracts.simulator import CollateralSimulator
+
+
+class TestContractCache(unittest.TestCase):
+    def setUp(self):
+        self.simulator = CollateralSimulator(timestamp=1_700_000_000)
+        self.trustee = self.simulator.create_account()
+        self.contract_address = self.simulator.deploy_collateral(self.trustee.address)
+
+    def test_abi_is_parsed_once(self):
+        self.assertIs(load_contract_abi(), load_contract_abi())
+
+    def test_tables_match_the_abi_encoding(self):
+        w3 = self.simulator.get_web3()
+        contract = get_contract(w3, self.contract_address)
+        selectors = get_function_selectors()
+        self.assertEqual(
+            selectors["deposit"], contract.functions.deposit(uuid.uuid4().bytes)._encode_transaction_data()[:10]
+        )
+        self.assertEqual(
+            selectors["reclaims"], contract.functions.reclaims(1)._encode_transaction_data()[:10]
+        )
+        topics = get_event_topics()
+        self.assertLessEqual(set(COLLATERAL_EVENTS), set(topics))
+        self.assertEqual(topics["Deposit"], Web3.to_hex(Web3.keccak(text="Deposit(bytes16,address,uint256)")))
+
+    def test_contract_objects_are_shared_per_connection(self):
+        w3 = self.simulator.get_web3()
+        contract = get_contract(w3, self.contract_address)
+        self.assertIs(get_contract(w3, self.contract_address.lower()), contract)
+        self.assertIsNot(get_contract(self.simulator.get_web3(), self.contract_address), contract)
+        self.assertEqual(contract.address, self.contract_address)
+
+    def test_contract_objects_are_released_with_their_connection(self):
+        w3 = self.simulator.get_web3()
+        contract = weakref.ref(get_contract(w3, self.contract_address))
+        del w3
+        gc.collect()
+        self.assertIsNone(contract())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,177 @@
+import asyncio
+import importlib
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import unittest
+import uuid
+from unittest import mock
+
+from celium_collateral_contracts import common
+from celium_collateral_contracts.common import share_connections
+from celium_collateral_contracts.daemon import (
+    CommandDaemon,
+    DaemonClient,
+    DaemonError,
+    check_terminates,
+    resolve_command,
+    run_command,
+)
+
+from test_backup_state import CollateralStateTestCase
+
+
+class TestRunCommand(unittest.TestCase):
+    def test_resolve_command_accepts_script_names(self):
+        self.assertEqual(resolve_command("deposit-collateral"), "deposit_collateral")
+        self.assertEqual(resolve_command("deny_request.py"), "deny_request")
+        with self.assertRaisesRegex(DaemonError, "Unknown command 'withdraw'"):
+            resolve_command("withdraw")
+
+    def test_commands_running_until_interrupted_are_refused(self):
+        for argv in (["--watch"], ["--contract-address", "0x0", "--wat"]):
+            with self.subTest(argv=argv), self.assertRaisesRegex(DaemonError, "does not terminate"):
+                check_terminates("finalize-reclaim", argv)
+        check_terminates("finalize_reclaim", ["--reclaim-request-id", "1", "--", "--watch"])
+        check_terminates("deny_request", ["--watch"])
+
+    def test_failures_map_to_exit_codes_and_restore_the_process(self):
+        self.assertNotIn("COLLATERAL_TEST_ENV", os.environ)
+        argv = list(sys.argv)
+
+        exit_code, stdout, stderr = asyncio.run(run_command("withdraw", [], {"COLLATERAL_TEST_ENV": "1"}))
+        self.assertEqual((exit_code, stdout), (2, ""))
+        self.assertIn("Unknown command", stderr)
+
+        # argparse exits with 2 and its usage message
+        exit_code, _, stderr = asyncio.run(run_command("get_executor_collateral", ["--network", "sim"]))
+        self.assertEqual(exit_code, 2)
+        self.assertIn("--contract-address", stderr)
+
+        exit_code, stdout, _ = asyncio.run(run_command("get_executor_collateral", ["--help"]))
+        self.assertEqual(exit_code, 0)
+        self.assertIn("usage: get_executor_collateral", stdout)
+
+        self.assertNotIn("COLLATERAL_TEST_ENV", os.environ)
+        self.assertEqual(sys.argv, argv)
+
+
+class TestCommandDaemon(CollateralStateTestCase):
+    def setUp(self):
+        super().setUp()
+        # commands connecting to the "sim" network reach the simulator
+        share_connections()
+        self.addCleanup(share_connections, False)
+        common._shared_connections["sim", True] = self.w3
+
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        self.socket_path = os.path.join(directory, "daemon.sock")
+        self.daemon = CommandDaemon(self.socket_path)
+        loop = asyncio.new_event_loop()
+        loop.run_until_complete(self.daemon.start())
+        serving = loop.create_task(self.daemon.serve_forever())
+
+        def serve():
+            try:
+                loop.run_until_complete(serving)
+            except asyncio.CancelledError:
+                pass
+
+        thread = threading.Thread(target=serve)
+        thread.start()
+
+        def stop():
+            loop.call_soon_threadsafe(serving.cancel)
+            thread.join()
+            loop.close()
+
+        self.addCleanup(stop)
+
+    def test_commands_share_the_daemon_connection(self):
+        executor_uuid = str(uuid.uuid4())
+        with DaemonClient(self.socket_path) as client:
+            exit_code, stdout, stderr = client.run("deposit-collateral", [
+                "--network", "sim", "--contract-address", self.contract_address, "--amount-tao", "0.01",
+                "--executor-uuid", executor_uuid,
+            ], env={"PRIVATE_KEY": self.miner.key.hex()})
+            self.assertEqual(exit_code, 0, stderr)
+            self.assertIn("Successfully deposited 0.01 TAO", stdout)
+            self.assertNotIn("PRIVATE_KEY", os.environ)
+
+            exit_code, stdout, _ = client.run("get_executor_collateral.py", [
+                "--network", "sim", "--contract-address", self.contract_address, "--executor-uuid", executor_uuid,
+            ])
+            self.assertEqual(exit_code, 0)
+            self.assertEqual(
+                stdout, f"Collateral for miner {self.miner.address}, executor {executor_uuid}: 0.01 TAO\n"
+            )
+
+            # without a key the command fails, the connection keeps serving
+            exit_code, _, stderr = client.run("reclaim_collateral", [
+                "--network", "sim", "--contract-address", self.contract_address, "--url", "url",
+                "--executor-uuid", executor_uuid,
+            ], env={})
+            self.assertEqual(exit_code, 1)
+            self.assertIn("PRIVATE_KEY environment variable not set", stderr)
+
+            self.assertEqual(client.run("withdraw", [])[0], 2)
+            exit_code, _, stderr = client.run("finalize_reclaim", ["--network", "sim", "--watch"])
+            self.assertEqual(exit_code, 2)
+            self.assertIn("run it outside the collateral daemon", stderr)
+        self.assertEqual(self.daemon.commands_served, 3)
+
+    def test_commands_do_not_use_the_daemon_key(self):
+        os.environ["PRIVATE_KEY"] = self.miner.key.hex()
+        self.addCleanup(os.environ.pop, "PRIVATE_KEY", None)
+        executor_uuid = self.deposit()
+        with DaemonClient(self.socket_path) as client:
+            exit_code, _, stderr = client.run("reclaim_collateral", [
+                "--network", "sim", "--contract-address", self.contract_address, "--url", "url",
+                "--executor-uuid", executor_uuid,
+            ], env={})
+        self.assertEqual(exit_code, 1)
+        self.assertIn("PRIVATE_KEY environment variable not set", stderr)
+        self.assertEqual(os.environ["PRIVATE_KEY"], self.miner.key.hex())
+
+    def test_commands_do_not_block_the_event_loop(self):
+        def slow_connection(*args):
+            time.sleep(0.5)
+            raise ConnectionError("unreachable")
+
+        # the deposit blocks in get_web3_connection while another client connects
+        module = importlib.import_module("celium_collateral_contracts.deposit_collateral")
+        with mock.patch.object(module, "get_web3_connection", slow_connection):
+            first = DaemonClient(self.socket_path)
+            self.addCleanup(first.close)
+            thread = threading.Thread(target=first.run, args=("deposit_collateral", [
+                "--contract-address", self.contract_address, "--amount-tao", "0.01",
+            ]))
+            thread.start()
+            time.sleep(0.1)
+            start = time.monotonic()
+            with DaemonClient(self.socket_path) as second:
+                # refused before waiting for the running command
+                self.assertEqual(second.run("finalize_reclaim", ["--watch"])[0], 2)
+            self.assertLess(time.monotonic() - start, 0.3)
+            thread.join()
+
+    def test_invalid_requests_and_second_daemon(self):
+        with DaemonClient(self.socket_path) as client:
+            client._file.write(b"{\"argv\": []}\n")
+            client._file.flush()
+            self.assertIn(b"Invalid request", client._file.readline())
+
+        with self.assertRaisesRegex(DaemonError, "already listening"):
+            asyncio.run(CommandDaemon(self.socket_path).start())
+
+    def test_client_requires_a_listening_daemon(self):
+        with self.assertRaisesRegex(ConnectionError, "No collateral daemon listening"):
+            DaemonClient(self.socket_path + ".missing")
+
+
+if __name__ == "__main__":
+    unittest.main()
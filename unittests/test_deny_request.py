@@ -0,0 +1,54 @@
+import asyncio
+import os
+import tempfile
+import unittest
+import uuid
+
+from celium_collateral_contracts.common import get_contract
+from celium_collateral_contracts.deny_request import deny_reclaim_requests_batch, read_reclaim_request_ids_file
+from celium_collateral_contracts.deposit_collateral import deposit_collateral
+from celium_collateral_contracts.reclaim_collateral import reclaim_collateral
+from celium_collateral_contracts.simulator import CollateralSimulator
+
+
+class TestDenyReclaimRequestsBatch(unittest.TestCase):
+    def setUp(self):
+        self.simulator = CollateralSimulator(timestamp=1_700_000_000)
+        self.trustee = self.simulator.create_account()
+        self.miner = self.simulator.create_account()
+        self.contract_address = self.simulator.deploy_collateral(self.trustee.address)
+        self.w3 = self.simulator.get_web3()
+        asyncio.run(self.open_reclaims(2))
+
+    async def open_reclaims(self, count):
+        for _ in range(count):
+            executor_uuid = str(uuid.uuid4())
+            await deposit_collateral(self.w3, self.miner, 0.01, self.contract_address, executor_uuid)
+            await reclaim_collateral(self.w3, self.miner, self.contract_address, "url", executor_uuid)
+
+    def write_ids_file(self, content):
+        fd, path = tempfile.mkstemp(suffix=".txt")
+        with os.fdopen(fd, "w") as f:
+            f.write(content)
+        self.addCleanup(os.remove, path)
+        return path
+
+    def test_malformed_lines_fail_without_aborting_the_batch(self):
+        path = self.write_ids_file("# reclaims to deny\n1\nnot-an-id,other-url\n\n-3\n2,reason\n")
+        denials = read_reclaim_request_ids_file(path, "default")
+        self.assertEqual(denials, [(1, "default"), ("not-an-id", "other-url"), (-3, "default"), (2, "reason")])
+
+        outcomes = asyncio.run(deny_reclaim_requests_batch(self.w3, self.trustee, denials, self.contract_address))
+        self.assertEqual([outcome.reclaim_request_id for outcome in outcomes], [1, "not-an-id", -3, 2])
+        self.assertEqual([outcome.success for outcome in outcomes], [True, False, False, True])
+        self.assertTrue(outcomes[1].error.startswith("Invalid reclaim request ID"))
+        self.assertTrue(outcomes[2].error.startswith("Invalid reclaim request ID"))
+        self.assertRegex(outcomes[0].tx_hash, "^0x[0-9a-f]{64}$")
+
+        contract = get_contract(self.w3, self.contract_address)
+        self.assertEqual(contract.functions.reclaims(1).call()[2], 0)
+        self.assertEqual(contract.functions.reclaims(2).call()[2], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,46 @@
+import asyncio
+import unittest
+
+from web3 import Web3
+
+from celium_collateral_contracts.common import get_contract
+from celium_collateral_contracts.deposit_collateral import (
+    async_check_minimum_collateral,
+    async_verify_trustee,
+    check_minimum_collateral,
+    verify_trustee,
+)
+from celium_collateral_contracts.simulator import CollateralSimulator
+
+MIN_COLLATERAL_INCREASE = 10 ** 15
+
+
+class TestDepositValidation(unittest.TestCase):
+    def setUp(self):
+        self.simulator = CollateralSimulator()
+        self.trustee = self.simulator.create_account()
+        contract_address = self.simulator.deploy_collateral(
+            self.trustee.address, min_collateral_increase=MIN_COLLATERAL_INCREASE
+        )
+        self.contract = get_contract(self.simulator.get_web3(), contract_address)
+        self.async_contract = get_contract(self.simulator.get_async_web3(), contract_address)
+
+    def test_sync_helpers_validate(self):
+        self.assertEqual(check_minimum_collateral(self.contract, MIN_COLLATERAL_INCREASE), MIN_COLLATERAL_INCREASE)
+        with self.assertRaisesRegex(ValueError, "less than minimum"):
+            check_minimum_collateral(self.contract, MIN_COLLATERAL_INCREASE - 1)
+        verify_trustee(self.contract, self.trustee.address.lower())
+        with self.assertRaisesRegex(ValueError, "mismatch"):
+            verify_trustee(self.contract, Web3.to_checksum_address("0x" + "11" * 20))
+
+    def test_async_helpers_validate_with_both_backends(self):
+        for contract in (self.contract, self.async_contract):
+            with self.assertRaisesRegex(ValueError, "less than minimum"):
+                asyncio.run(async_check_minimum_collateral(contract, 1))
+            with self.assertRaisesRegex(ValueError, "mismatch"):
+                asyncio.run(async_verify_trustee(contract, "0x" + "11" * 20))
+            asyncio.run(async_verify_trustee(contract, self.trustee.address))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,153 @@
+import asyncio
+import os
+import sqlite3
+import tempfile
+import unittest
+import uuid
+from unittest import mock
+
+from celium_collateral_contracts.common import get_contract
+from celium_collateral_contracts.event_index import EventIndex
+from celium_collateral_contracts.get_collaterals import get_deposit_events_from_index
+from celium_collateral_contracts.get_reclaim_requests import get_reclaim_process_started_events_from_index
+from celium_collateral_contracts.log_scanner import LogScanner, LogScannerError
+from celium_collateral_contracts.simulator import CollateralSimulator
+
+DEPOSIT = 10 ** 16
+CHECKSUM = b"\x00" * 16
+
+
+class TestEventIndex(unittest.TestCase):
+    def setUp(self):
+        self.simulator = CollateralSimulator(timestamp=1_700_000_000)
+        self.trustee = self.simulator.create_account()
+        self.miner = self.simulator.create_account()
+        self.contract_address = self.simulator.deploy_collateral(self.trustee.address)
+        self.w3 = self.simulator.get_web3()
+        self.contract = get_contract(self.w3, self.contract_address)
+        fd, self.path = tempfile.mkstemp(suffix=".sqlite")
+        os.close(fd)
+        self.addCleanup(os.remove, self.path)
+
+    def transact(self, sender, function, value=0):
+        self.simulator.transact(sender.address, self.contract_address, function._encode_transaction_data(), value, 300_000)
+
+    def deposit(self):
+        executor_uuid = str(uuid.uuid4())
+        self.transact(self.miner, self.contract.functions.deposit(uuid.UUID(executor_uuid).bytes), DEPOSIT)
+        return executor_uuid
+
+    def reclaim(self, executor_uuid):
+        self.transact(self.miner, self.contract.functions.reclaimCollateral(uuid.UUID(executor_uuid).bytes, "url", CHECKSUM))
+
+    def deny(self, reclaim_request_id):
+        self.transact(self.trustee, self.contract.functions.denyReclaimRequest(reclaim_request_id, "url", CHECKSUM))
+
+    def sync(self, index, **options):
+        return asyncio.run(index.sync(self.w3, **options))
+
+    def test_sync_indexes_events_and_checkpoints(self):
+        first, second = self.deposit(), self.deposit()
+        self.reclaim(first)
+        self.deny(1)
+        with EventIndex(self.path, self.contract_address) as index:
+            self.assertIsNone(index.last_synced_block)
+            self.assertEqual(self.sync(index), 4)
+            self.assertEqual(index.last_synced_block, self.w3.eth.block_number)
+
+            self.assertEqual([event.event for event in index.get_events(executor_id=first)],
+                             ["Deposit", "ReclaimProcessStarted", "Denied"])
+            self.assertEqual(len(index.get_events(event="Deposit", miner=self.miner.address.lower())), 2)
+            denied, = index.get_events(event="Denied")
+            self.assertEqual((denied.executor_id, denied.miner, denied.reclaim_request_id), (first, self.miner.address, 1))
+            deposit, = index.get_events(executor_id=second)
+            self.assertEqual(deposit.amount, DEPOSIT)
+
+            # nothing new: the checkpoint is already at the head
+            self.assertEqual(self.sync(index), 0)
+
+    def test_sync_resumes_from_the_checkpoint(self):
+        executor_uuid = self.deposit()
+        self.reclaim(executor_uuid)
+        with EventIndex(self.path, self.contract_address) as index:
+            self.sync(index, confirmations=1)
+            self.assertEqual(index.last_synced_block, self.w3.eth.block_number - 1)
+            self.assertEqual(len(index.get_events()), 1)
+
+        # a Denied event whose request was indexed by an earlier sync
+        self.deny(1)
+        self.deposit()
+        with EventIndex(self.path, self.contract_address) as index:
+            self.assertEqual(self.sync(index), 3)
+            denied, = index.get_events(event="Denied")
+            self.assertEqual(denied.executor_id, executor_uuid)
+            self.assertEqual(len(index.get_events(block_num_low=index.last_synced_block)), 1)
+
+    def test_interrupted_sync_keeps_completed_chunks(self):
+        for _ in range(4):
+            self.deposit()
+        head = self.w3.eth.block_number
+        get_logs = LogScanner._get_logs
+
+        async def fail_after_block_two(scanner, start, end):
+            if end > 2:
+                raise RuntimeError("node unavailable")
+            return await get_logs(scanner, start, end)
+
+        with EventIndex(self.path, self.contract_address) as index:
+            with mock.patch.object(LogScanner, "_get_logs", fail_after_block_two):
+                with self.assertRaises(LogScannerError):
+                    self.sync(index, initial_chunk_size=1, max_chunk_size=1, max_workers=1, max_retries=0)
+            self.assertEqual(index.last_synced_block, 2)
+            self.assertEqual(len(index.get_events()), 2)
+
+            self.assertEqual(self.sync(index), 2)
+            self.assertEqual(index.last_synced_block, head)
+            self.assertEqual(len({event.executor_id for event in index.get_events()}), 4)
+
+    def test_blocks_before_the_start_block_are_scanned(self):
+        first = self.deposit()
+        self.reclaim(first)
+        self.deposit()
+        self.deny(1)
+        with EventIndex(self.path, self.contract_address) as index:
+            self.assertIsNone(index.start_block)
+            self.sync(index, start_block=3)
+            self.assertEqual(index.start_block, 3)
+            self.assertEqual(len(index.get_events()), 2)
+
+            events = asyncio.run(index.fetch_events(self.w3))
+            self.assertEqual(
+                [event.event for event in events], ["Deposit", "ReclaimProcessStarted", "Deposit", "Denied"]
+            )
+            self.assertEqual([event.executor_id for event in events[:2]], [first, first])
+            started, = asyncio.run(index.fetch_events(self.w3, "ReclaimProcessStarted", 0, 3))
+            self.assertEqual(started.reclaim_request_id, 1)
+            # the scanned blocks are not stored
+            self.assertEqual(index.start_block, 3)
+            self.assertEqual(len(index.get_events()), 2)
+
+            deposits = asyncio.run(get_deposit_events_from_index(self.w3, index, 0, self.w3.eth.block_number))
+            self.assertEqual(len(deposits), 2)
+            reclaims = asyncio.run(
+                get_reclaim_process_started_events_from_index(self.w3, index, 0, self.w3.eth.block_number)
+            )
+            self.assertEqual([event.executor_uuid for event in reclaims], [first])
+
+    def test_databases_without_a_start_block_are_migrated(self):
+        self.deposit()
+        connection = sqlite3.connect(self.path)
+        connection.execute(
+            "CREATE TABLE sync_state (contract_address TEXT PRIMARY KEY, last_synced_block INTEGER NOT NULL)"
+        )
+        connection.execute("INSERT INTO sync_state VALUES (?, 0)", (self.contract_address,))
+        connection.commit()
+        connection.close()
+        with EventIndex(self.path, self.contract_address) as index:
+            self.assertEqual(index.start_block, 0)
+            self.assertEqual(self.sync(index), 1)
+            self.assertEqual(index.start_block, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,82 @@
+import asyncio
+import contextlib
+import unittest
+import uuid
+from unittest import mock
+
+from celium_collateral_contracts.deposit_collateral import deposit_collateral
+from celium_collateral_contracts.event_stream import EventStream
+from celium_collateral_contracts.simulator import CollateralSimulator
+
+
+class TestEventStream(unittest.TestCase):
+    def setUp(self):
+        self.simulator = CollateralSimulator(timestamp=1_700_000_000)
+        self.trustee = self.simulator.create_account()
+        self.miner = self.simulator.create_account()
+        self.contract_address = self.simulator.deploy_collateral(self.trustee.address)
+        self.w3 = self.simulator.get_web3()
+
+    def deposit(self):
+        return asyncio.run(deposit_collateral(self.w3, self.miner, 0.01, self.contract_address, str(uuid.uuid4())))
+
+    def test_falls_back_to_polling_when_websocket_is_unavailable(self):
+        attempts = []
+
+        @contextlib.asynccontextmanager
+        async def refused(stream):
+            attempts.append(stream.ws_url)
+            raise ConnectionError("connection refused")
+            yield
+
+        async def first_event(stream):
+            events = stream.events()
+            try:
+                next_event = asyncio.ensure_future(anext(events))
+                while len(attempts) < 3:
+                    await asyncio.sleep(0.01)
+                # let the fallback install its log filter, so the deposit arrives as a live log
+                await asyncio.sleep(0.1)
+                await deposit_collateral(self.w3, self.miner, 0.01, self.contract_address, str(uuid.uuid4()))
+                return await asyncio.wait_for(next_event, 10)
+            finally:
+                await events.aclose()
+
+        stream = EventStream(
+            self.w3, self.contract_address, ws_url="ws://127.0.0.1:1", from_block=0,
+            reconnect_delay=0.01, poll_interval=0.01, max_connect_failures=3,
+        )
+        with mock.patch.object(EventStream, "_websocket_logs", refused):
+            event = asyncio.run(first_event(stream))
+        self.assertEqual(event["event"], "Deposit")
+        self.assertEqual(len(attempts), 3)
+
+    def test_resume_block_follows_the_head_while_quiet(self):
+        self.deposit()
+        deposit_block = self.w3.eth.block_number
+
+        async def follow(stream):
+            events = stream.events()
+            try:
+                event = await anext(events)
+                # the backfill covered every block up to the head
+                self.assertEqual(stream.resume_block, deposit_block)
+                self.simulator.mine(5)
+                next_event = asyncio.ensure_future(anext(events))
+                while stream.resume_block < deposit_block + 5:
+                    await asyncio.sleep(0.01)
+                next_event.cancel()
+                with contextlib.suppress(asyncio.CancelledError):
+                    await next_event
+                return event
+            finally:
+                await events.aclose()
+
+        stream = EventStream(self.w3, self.contract_address, from_block=0, poll_interval=0.01, quiet_interval=0.02)
+        event = asyncio.run(asyncio.wait_for(follow(stream), 10))
+        self.assertEqual(event["blockNumber"], deposit_block)
+        self.assertEqual(stream.resume_block, deposit_block + 5)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,112 @@
+import asyncio
+import importlib
+import unittest
+import uuid
+from unittest import mock
+
+from celium_collateral_contracts.common import get_contract
+from celium_collateral_contracts.executor_states import (
+    BulkReadError,
+    async_get_executor_states,
+    async_get_reclaims,
+    get_executor_states,
+    get_reclaims,
+)
+from celium_collateral_contracts.simulator import CollateralSimulator, SimulatorProvider
+
+ZERO_ADDRESS = "0x" + "00" * 20
+CHECKSUM = b"\x00" * 16
+
+executor_states = importlib.import_module("celium_collateral_contracts.executor_states")
+
+
+class TestBulkReads(unittest.TestCase):
+    def setUp(self):
+        self.simulator = CollateralSimulator(timestamp=1_700_000_000)
+        self.trustee = self.simulator.create_account()
+        self.miner = self.simulator.create_account()
+        self.contract_address = self.simulator.deploy_collateral(self.trustee.address)
+        self.w3 = self.simulator.get_web3()
+        self.contract = get_contract(self.w3, self.contract_address)
+        self.executor_uuids = [self.deposit((i + 1) * 10 ** 16) for i in range(5)]
+
+    def transact(self, function, value=0):
+        self.simulator.transact(
+            self.miner.address, self.contract_address, function._encode_transaction_data(), value, 300_000
+        )
+
+    def deposit(self, amount):
+        executor_uuid = str(uuid.uuid4())
+        self.transact(self.contract.functions.deposit(uuid.UUID(executor_uuid).bytes), amount)
+        return executor_uuid
+
+    def test_executor_states_match_single_reads_across_batches(self):
+        unknown = str(uuid.uuid4())
+        with mock.patch.object(
+            SimulatorProvider, "make_batch_request", autospec=True, side_effect=SimulatorProvider.make_batch_request
+        ) as make_batch_request:
+            states = get_executor_states(
+                self.w3, self.contract_address, self.executor_uuids + [unknown, self.executor_uuids[0]], batch_size=4
+            )
+        # 6 distinct executors, 2 calls each, in batches of 4
+        self.assertEqual(make_batch_request.call_count, 3)
+        self.assertEqual(list(states), self.executor_uuids + [unknown])
+        for executor_uuid in self.executor_uuids:
+            executor_id = uuid.UUID(executor_uuid).bytes
+            self.assertEqual(states[executor_uuid].collateral, self.contract.functions.collaterals(executor_id).call())
+            self.assertEqual(states[executor_uuid].miner, self.miner.address)
+        self.assertEqual((states[unknown].collateral, states[unknown].miner), (0, ZERO_ADDRESS))
+
+    def test_reads_at_a_historical_block(self):
+        block_number = self.w3.eth.block_number
+        executor_id = uuid.UUID(self.executor_uuids[0]).bytes
+        self.transact(self.contract.functions.reclaimCollateral(executor_id, "url", CHECKSUM))
+
+        reclaims = get_reclaims(self.w3, self.contract_address, [1])
+        self.assertEqual(reclaims[1].executor_uuid, self.executor_uuids[0])
+        self.assertEqual(reclaims[1].amount, 10 ** 16)
+        self.assertEqual(get_reclaims(self.w3, self.contract_address, [1], block_number)[1].amount, 0)
+
+    def test_async_reads_with_both_backends(self):
+        async_w3 = self.simulator.get_async_web3()
+        expected = get_executor_states(self.w3, self.contract_address, self.executor_uuids)
+        for w3 in (self.w3, async_w3):
+            with self.subTest(backend=type(w3).__name__):
+                states = asyncio.run(
+                    async_get_executor_states(w3, self.contract_address, self.executor_uuids, batch_size=3)
+                )
+                self.assertEqual(states, expected)
+                self.assertEqual(asyncio.run(async_get_reclaims(w3, self.contract_address, [1]))[1].amount, 0)
+
+    def test_multicall_deployment_is_checked_once_per_connection(self):
+        async_w3 = self.simulator.get_async_web3()
+        with mock.patch.object(
+            executor_states, "has_multicall", wraps=executor_states.has_multicall
+        ) as has_multicall, mock.patch.object(
+            executor_states, "async_has_multicall", wraps=executor_states.async_has_multicall
+        ) as async_has_multicall:
+            for _ in range(3):
+                get_executor_states(self.w3, self.contract_address, self.executor_uuids)
+                asyncio.run(async_get_executor_states(async_w3, self.contract_address, self.executor_uuids))
+            other_w3 = self.simulator.get_web3()
+            get_reclaims(other_w3, self.contract_address, [1])
+
+        self.assertEqual([call.args[0] for call in has_multicall.call_args_list], [self.w3, other_w3])
+        self.assertEqual(async_has_multicall.call_count, 1)
+
+    def test_reverted_multicall_entries_raise(self):
+        def aggregate(w3, target, calldata, block_identifier):
+            return [None] + [bytes(32)] * (len(calldata) - 1)
+
+        with mock.patch.object(executor_states, "_multicall", aggregate):
+            with self.assertRaisesRegex(BulkReadError, "reverted"):
+                get_executor_states(self.w3, self.contract_address, self.executor_uuids, use_multicall=True)
+
+    def test_failed_batches_raise_bulk_read_error(self):
+        with mock.patch.object(SimulatorProvider, "make_batch_request", side_effect=ConnectionError("reset")):
+            with self.assertRaisesRegex(BulkReadError, "calls 0-500 failed: reset"):
+                get_executor_states(self.w3, self.contract_address, self.executor_uuids)
+
+
+if __name__ == "__main__":
+    unittest.main()
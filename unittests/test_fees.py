@@ -0,0 +1,146 @@
+import asyncio
+import importlib
+import unittest
+import uuid
+from unittest import mock
+
+from web3.exceptions import TransactionNotFound
+
+from celium_collateral_contracts.common import (
+    async_wait_for_receipt,
+    build_and_send_transaction,
+    get_contract,
+    wait_for_receipt,
+)
+from celium_collateral_contracts.fees import (
+    FeeConfig,
+    Fees,
+    async_suggest_fees,
+    configure_fees,
+    get_fee_config,
+    suggest_fees,
+)
+from celium_collateral_contracts.simulator import CollateralSimulator
+
+common = importlib.import_module("celium_collateral_contracts.common")
+
+BASE_FEE = 10 ** 9
+PRIORITY_FEE = 10 ** 8
+DEPOSIT = 10 ** 16
+
+
+class TestFeeSuggestion(unittest.TestCase):
+    def setUp(self):
+        self.addCleanup(configure_fees, get_fee_config())
+        self.simulator = CollateralSimulator(timestamp=1_700_000_000, base_fee=BASE_FEE, priority_fee=PRIORITY_FEE)
+        self.simulator.mine(3)
+
+    def test_eip1559_fees_follow_the_fee_history(self):
+        expected = Fees(max_fee_per_gas=2 * BASE_FEE + PRIORITY_FEE, max_priority_fee_per_gas=PRIORITY_FEE)
+        self.assertEqual(suggest_fees(self.simulator.get_web3()), expected)
+        self.assertEqual(asyncio.run(async_suggest_fees(self.simulator.get_async_web3())), expected)
+        self.assertEqual(expected.to_transaction_params()["type"], 2)
+
+    def test_config_bounds_the_fees(self):
+        configure_fees(FeeConfig(min_priority_fee=3 * PRIORITY_FEE, base_fee_multiplier=1.5))
+        fees = suggest_fees(self.simulator.get_web3())
+        self.assertEqual(fees, Fees(max_fee_per_gas=int(1.5 * BASE_FEE) + 3 * PRIORITY_FEE,
+                                    max_priority_fee_per_gas=3 * PRIORITY_FEE))
+
+        configure_fees(FeeConfig(max_fee_cap=BASE_FEE + PRIORITY_FEE // 2))
+        fees = suggest_fees(self.simulator.get_web3())
+        self.assertEqual(fees.max_fee_per_gas, BASE_FEE + PRIORITY_FEE // 2)
+        self.assertEqual(fees.max_priority_fee_per_gas, PRIORITY_FEE)
+
+        configure_fees(FeeConfig(mode="legacy"))
+        self.assertEqual(suggest_fees(self.simulator.get_web3()), Fees(gas_price=BASE_FEE + PRIORITY_FEE))
+
+    def test_chains_without_base_fee_use_legacy_gas_prices(self):
+        self.simulator.base_fee = 0
+        w3 = self.simulator.get_web3()
+        self.assertEqual(suggest_fees(w3), Fees(gas_price=PRIORITY_FEE))
+        # the chain is remembered, later suggestions skip eth_feeHistory
+        self.simulator.base_fee = BASE_FEE
+        self.assertEqual(suggest_fees(w3), Fees(gas_price=BASE_FEE + PRIORITY_FEE))
+
+        configure_fees(FeeConfig(mode="eip1559"))
+        self.simulator.base_fee = 0
+        with self.assertRaisesRegex(ValueError, "no base fee"):
+            suggest_fees(self.simulator.get_web3())
+
+    def test_bumps_round_up_and_keep_the_suggestion_as_floor(self):
+        fees = Fees(max_fee_per_gas=101, max_priority_fee_per_gas=9)
+        self.assertEqual(fees.bump(10), Fees(max_fee_per_gas=112, max_priority_fee_per_gas=10))
+        self.assertEqual(Fees(gas_price=100).bump(12.5), Fees(gas_price=113))
+        self.assertEqual(
+            fees.bump(10).at_least(Fees(max_fee_per_gas=200, max_priority_fee_per_gas=1)),
+            Fees(max_fee_per_gas=200, max_priority_fee_per_gas=10),
+        )
+        self.assertEqual(fees.at_least(Fees(gas_price=500)), fees)
+        self.assertTrue(fees.exceeds(100))
+        self.assertFalse(fees.exceeds(None))
+
+
+class TestFeeReplacement(unittest.TestCase):
+    def setUp(self):
+        self.addCleanup(configure_fees, get_fee_config())
+        self.simulator = CollateralSimulator(timestamp=1_700_000_000)
+        self.trustee = self.simulator.create_account()
+        self.miner = self.simulator.create_account()
+        self.contract_address = self.simulator.deploy_collateral(self.trustee.address)
+        self.w3 = self.simulator.get_web3()
+        self.contract = get_contract(self.w3, self.contract_address)
+        self.simulator.automine = False
+
+    def send_and_mine_late(self):
+        tx_hash = build_and_send_transaction(
+            self.w3, self.contract.functions.deposit(uuid.uuid4().bytes), self.miner, 200_000, DEPOSIT
+        )
+
+        async def wait():
+            receipt = asyncio.ensure_future(async_wait_for_receipt(self.w3, tx_hash, timeout=10, poll_latency=0.01))
+            # leave time for the replacements before the block is mined
+            await asyncio.sleep(0.3)
+            self.simulator.mine()
+            return await receipt
+
+        return tx_hash, asyncio.run(wait())
+
+    def test_stuck_transactions_are_replaced_with_bumped_fees(self):
+        configure_fees(FeeConfig(replacement_deadline=0.05, bump_percent=12.5, max_replacements=2))
+        tx_hash, receipt = self.send_and_mine_late()
+        self.assertEqual(receipt["status"], 1)
+        self.assertNotEqual(receipt["transactionHash"], tx_hash)
+
+        # the replaced transaction left the pool without being mined
+        with self.assertRaises(TransactionNotFound):
+            self.w3.eth.get_transaction(tx_hash)
+        mined = self.w3.eth.get_transaction(receipt["transactionHash"])
+        self.assertEqual(mined["nonce"], 0)
+        self.assertEqual(Fees.from_transaction(mined), suggest_fees(self.w3).bump(12.5).bump(12.5))
+
+    def test_replacements_stop_at_the_fee_cap(self):
+        fees = suggest_fees(self.w3)
+        configure_fees(FeeConfig(replacement_deadline=0.05, max_fee_cap=fees.max_fee_per_gas))
+        tx_hash, receipt = self.send_and_mine_late()
+        self.assertEqual(receipt["transactionHash"], tx_hash)
+
+    def test_unwaited_transactions_are_forgotten_oldest_first(self):
+        configure_fees(FeeConfig(replacement_deadline=0.05))
+        self.simulator.automine = True
+        self.addCleanup(common._replaceable_transactions.clear)
+        with mock.patch.object(common, "MAX_REPLACEABLE_TRANSACTIONS", 3):
+            tx_hashes = [
+                build_and_send_transaction(
+                    self.w3, self.contract.functions.deposit(uuid.uuid4().bytes), self.miner, 200_000, DEPOSIT
+                )
+                for _ in range(5)
+            ]
+        self.assertEqual(list(common._replaceable_transactions), [bytes(tx_hash) for tx_hash in tx_hashes[2:]])
+        self.assertEqual(wait_for_receipt(self.w3, tx_hashes[0], timeout=1)["status"], 1)
+        self.assertEqual(wait_for_receipt(self.w3, tx_hashes[4], timeout=1)["status"], 1)
+        self.assertEqual(len(common._replaceable_transactions), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,89 @@
+import asyncio
+import importlib
+import unittest
+import uuid
+from unittest import mock
+
+from celium_collateral_contracts.common import get_executor_collateral
+from celium_collateral_contracts.deposit_collateral import deposit_collateral
+from celium_collateral_contracts.finalize_reclaim import finalize_reclaims_batch, watch_and_finalize
+from celium_collateral_contracts.reclaim_collateral import reclaim_collateral
+from celium_collateral_contracts.reclaim_tracker import ReclaimTracker
+from celium_collateral_contracts.simulator import CollateralSimulator
+
+DECISION_TIMEOUT = 60
+
+finalize_module = importlib.import_module("celium_collateral_contracts.finalize_reclaim")
+
+
+class TestFinalizeReclaims(unittest.TestCase):
+    def setUp(self):
+        self.simulator = CollateralSimulator(timestamp=1_700_000_000)
+        self.trustee = self.simulator.create_account()
+        self.miner = self.simulator.create_account()
+        self.contract_address = self.simulator.deploy_collateral(
+            self.trustee.address, decision_timeout=DECISION_TIMEOUT
+        )
+        self.w3 = self.simulator.get_web3()
+        self.executor_uuids = [str(uuid.uuid4()) for _ in range(2)]
+        asyncio.run(self.open_reclaims())
+        self.simulator.advance_time(DECISION_TIMEOUT + 1)
+        self.simulator.mine()
+
+    async def open_reclaims(self):
+        for executor_uuid in self.executor_uuids:
+            await deposit_collateral(self.w3, self.miner, 0.01, self.contract_address, executor_uuid)
+            await reclaim_collateral(self.w3, self.miner, self.contract_address, "url", executor_uuid)
+
+    def test_dry_run_errors_become_failed_outcomes(self):
+        simulate = finalize_module.simulate_transaction
+
+        async def flaky_simulate(w3, function_call, account):
+            if function_call.args[0] == 1:
+                raise ConnectionError("connection reset")
+            return await simulate(w3, function_call, account)
+
+        with mock.patch.object(finalize_module, "simulate_transaction", flaky_simulate):
+            first, second = asyncio.run(finalize_reclaims_batch(self.w3, self.miner, [1, 2], self.contract_address))
+        self.assertFalse(first.success)
+        self.assertFalse(first.skipped)
+        self.assertIn("connection reset", first.error)
+        self.assertIsNone(first.tx_hash)
+        self.assertTrue(second.success)
+        self.assertRegex(second.tx_hash, "^0x[0-9a-f]{64}$")
+
+    def test_watcher_survives_failed_rounds(self):
+        finalize_batch = finalize_module.finalize_reclaims_batch
+        calls = []
+
+        async def failing_once(*args, **kwargs):
+            calls.append(args)
+            if len(calls) == 1:
+                raise ConnectionError("node unavailable")
+            return await finalize_batch(*args, **kwargs)
+
+        async def watch():
+            tracker = await ReclaimTracker.load(self.w3, self.contract_address, clock=lambda: self.simulator.timestamp)
+            self.assertEqual(len(tracker), 2)
+            task = asyncio.create_task(
+                watch_and_finalize(self.w3, self.miner, self.contract_address, tracker, poll_interval=0.01)
+            )
+            try:
+                for _ in range(500):
+                    if not tracker:
+                        break
+                    await asyncio.sleep(0.01)
+            finally:
+                task.cancel()
+            return tracker
+
+        with mock.patch.object(finalize_module, "finalize_reclaims_batch", failing_once):
+            tracker = asyncio.run(watch())
+        self.assertEqual(len(tracker), 0)
+        self.assertGreaterEqual(len(calls), 2)
+        for executor_uuid in self.executor_uuids:
+            self.assertEqual(get_executor_collateral(self.w3, self.contract_address, executor_uuid), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,114 @@
+import asyncio
+import json
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+
+from urllib3.exceptions import ConnectTimeoutError, ReadTimeoutError
+
+from celium_collateral_contracts.common import RPC_URLS, get_async_web3_connection
+from celium_collateral_contracts.http_pool import HttpPoolConfig, build_session, configure_http_pool
+
+
+class UnavailableHandler(BaseHTTPRequestHandler):
+    def respond(self):
+        self.server.requests.append(self.command)
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self.send_response(503)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    do_GET = do_POST = respond
+
+    def log_message(self, format, *args):
+        pass
+
+
+class TestHttpPoolRetries(unittest.TestCase):
+    def setUp(self):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), UnavailableHandler)
+        self.server.requests = []
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.url = f"http://127.0.0.1:{self.server.server_port}/"
+        self.session = build_session(HttpPoolConfig(max_retries=2, backoff_factor=0))
+
+    def tearDown(self):
+        self.session.close()
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_get_retries_transient_statuses(self):
+        self.assertEqual(self.session.get(self.url, timeout=5).status_code, 503)
+        self.assertEqual(self.server.requests, ["GET"] * 3)
+
+    def test_post_is_sent_once(self):
+        response = self.session.post(self.url, json={"method": "eth_sendRawTransaction"}, timeout=5)
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(self.server.requests, ["POST"])
+
+    def test_post_retries_connection_errors(self):
+        retry = self.session.get_adapter(self.url).max_retries
+        retried = retry.increment("POST", self.url, error=ConnectTimeoutError("connect timed out"))
+        self.assertEqual(retried.connect, retry.connect - 1)
+        with self.assertRaises(ReadTimeoutError):
+            retry.increment("POST", self.url, error=ReadTimeoutError(None, self.url, "read timed out"))
+
+
+class ChainIdHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        super().setup()
+        self.server.connections += 1
+
+    def do_POST(self):
+        request = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        body = json.dumps({"jsonrpc": "2.0", "id": request["id"], "result": "0x3b1"}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class TestAsyncHttpPool(unittest.TestCase):
+    def setUp(self):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), ChainIdHandler)
+        self.server.connections = 0
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        url = f"http://127.0.0.1:{self.server.server_port}/"
+        patcher = mock.patch.dict(RPC_URLS, {"pooled": url})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(configure_http_pool, HttpPoolConfig())
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_async_connection_uses_the_pool_config(self):
+        configure_http_pool(HttpPoolConfig(pool_maxsize=3, connect_timeout=2, read_timeout=7))
+
+        async def run():
+            w3 = get_async_web3_connection("pooled", read_cache=False)
+            for _ in range(5):
+                self.assertEqual(await w3.eth.chain_id, 945)
+            session = await w3.provider.cache_async_session(None)
+            try:
+                return session.connector.limit_per_host, session.timeout
+            finally:
+                await session.close()
+
+        limit_per_host, timeout = asyncio.run(run())
+        self.assertEqual(limit_per_host, 3)
+        self.assertEqual((timeout.sock_connect, timeout.sock_read), (2, 7))
+        # Connections are kept alive between requests
+        self.assertEqual(self.server.connections, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,117 @@
+import json
+import os
+import subprocess
+import sys
+import unittest
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Dependencies that only the commands needing them may load
+HEAVY_MODULES = ("bittensor", "bittensor_wallet", "scalecodec", "rich", "web3")
+
+# Names the package exposed before its imports became lazy -> module defining them.
+# Third-party names the old star imports re-exported by accident (e.g. ``URI``) are not listed.
+BASELINE_PUBLIC_NAMES = {
+    "address_conversion": ("h160_to_ss58", "ss58_to_pubkey"),
+    "associate_evm_key": ("main",),
+    "collateral_contract": ("CollateralContract",),
+    "common": (
+        "RPC_URLS", "build_and_send_transaction", "calculate_md5_checksum", "get_account",
+        "get_evm_key_associations", "get_executor_collateral", "get_miner_address_of_executor",
+        "get_revert_reason", "get_web3_connection", "load_contract_abi", "validate_address_format",
+        "wait_for_receipt",
+    ),
+    "deny_request": ("DenyReclaimRequestError", "deny_reclaim_request"),
+    "deposit_collateral": ("DepositCollateralError", "check_minimum_collateral", "verify_trustee", "deposit_collateral"),
+    "finalize_reclaim": ("FinalizeReclaimError", "finalize_reclaim"),
+    "generate_keypair": ("generate_and_save_keypair",),
+    "get_collaterals": ("DepositEvent", "get_deposit_events"),
+    "get_reclaim_requests": ("ReclaimProcessStartedEvent", "get_reclaim_process_started_events"),
+    "reclaim_collateral": ("ReclaimCollateralError", "reclaim_collateral"),
+    "send_to_ss58_precompile": ("send_tao_to_ss58",),
+    "setup_evm": ("DENY_TIMEOUT", "MIN_COLLATERAL_INCREASE"),
+    "slash_collateral": ("SlashCollateralError", "slash_collateral"),
+    "subtensor": ("associate_evm_key",),
+    "verify_contract": (
+        "ANVIL_PORT", "ANVIL_PRIVATE_KEY", "ANVIL_RPC_URL", "deploy_on_devnet_and_get_bytecode",
+        "get_contract_config", "get_deployed_bytecode", "verify_contract",
+    ),
+}
+
+# Seconds a fresh interpreter may spend importing the module under test
+PACKAGE_IMPORT_BUDGET = 0.5
+RPC_IMPORT_BUDGET = 3.0
+
+
+def measure_import(statement):
+    """Run an import in a fresh interpreter, returning its duration and the heavy modules it loaded."""
+    code = (
+        "import json, sys, time\n"
+        "start = time.perf_counter()\n"
+        f"{statement}\n"
+        "elapsed = time.perf_counter() - start\n"
+        f"loaded = [name for name in {HEAVY_MODULES!r} if name in sys.modules]\n"
+        "print(json.dumps({'elapsed': elapsed, 'loaded': loaded}))\n"
+    )
+    env = dict(os.environ, PYTHONPATH=PROJECT_ROOT + os.pathsep + os.environ.get("PYTHONPATH", ""))
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, env=env, cwd=PROJECT_ROOT, check=True
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+class TestImportTime(unittest.TestCase):
+    def test_package_import_is_lazy(self):
+        result = measure_import("import celium_collateral_contracts")
+        self.assertEqual(result["loaded"], [])
+        self.assertLess(result["elapsed"], PACKAGE_IMPORT_BUDGET)
+
+    def test_address_conversion_needs_no_web3(self):
+        result = measure_import(
+            "from celium_collateral_contracts.address_conversion import h160_to_ss58\n"
+            "h160_to_ss58('0x1234567890123456789012345678901234567890')"
+        )
+        self.assertEqual(result["loaded"], ["scalecodec"])
+        self.assertLess(result["elapsed"], PACKAGE_IMPORT_BUDGET)
+
+    def test_rpc_commands_do_not_load_bittensor(self):
+        result = measure_import("import celium_collateral_contracts.get_executor_collateral")
+        self.assertEqual(result["loaded"], ["web3"])
+        self.assertLess(result["elapsed"], RPC_IMPORT_BUDGET)
+
+    def test_lazy_names_resolve(self):
+        result = measure_import(
+            "import celium_collateral_contracts as c\n"
+            "assert c.get_web3_connection is c.common.get_web3_connection\n"
+            "assert c.CollateralContract.__module__ == 'celium_collateral_contracts.collateral_contract'"
+        )
+        self.assertNotIn("bittensor", result["loaded"])
+
+    def test_all_exported_names_exist(self):
+        import celium_collateral_contracts
+
+        for name in celium_collateral_contracts.__all__:
+            self.assertIsNotNone(getattr(celium_collateral_contracts, name), name)
+
+    def test_baseline_public_names_resolve_to_the_same_objects(self):
+        # in a fresh interpreter: a submodule imported directly, not through a package
+        # lookup, stays bound over its same-named function until the next lookup
+        checks = "".join(
+            f"assert {name} is importlib.import_module('celium_collateral_contracts.{module_name}').{name}, {name!r}\n"
+            for module_name, names in BASELINE_PUBLIC_NAMES.items()
+            for name in names
+        )
+        measure_import("import importlib\nfrom celium_collateral_contracts import *\n" + checks)
+
+    def test_exported_names_follow_the_module_all(self):
+        import importlib
+
+        import celium_collateral_contracts
+
+        for module_name in celium_collateral_contracts._EXPORTING_MODULES:
+            module = importlib.import_module(f"celium_collateral_contracts.{module_name}")
+            with self.subTest(module=module_name):
+                self.assertTrue(set(module.__all__) <= set(celium_collateral_contracts.__all__))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,83 @@
+import asyncio
+import unittest
+import uuid
+from unittest import mock
+
+from celium_collateral_contracts.common import get_contract
+from celium_collateral_contracts.log_scanner import LogScanner, LogScannerError
+from celium_collateral_contracts.simulator import CollateralSimulator
+
+DEPOSIT = 10 ** 16
+
+
+class TestLogScanner(unittest.TestCase):
+    def setUp(self):
+        self.simulator = CollateralSimulator(timestamp=1_700_000_000, automine=False)
+        self.trustee = self.simulator.create_account()
+        self.miner = self.simulator.create_account()
+        self.contract_address = self.simulator.deploy_collateral(self.trustee.address)
+        self.w3 = self.simulator.get_web3()
+        self.contract = get_contract(self.w3, self.contract_address)
+
+    def deposit_block(self, count):
+        """Mine one block with ``count`` deposits, then an empty block."""
+        for _ in range(count):
+            data = self.contract.functions.deposit(uuid.uuid4().bytes)._encode_transaction_data()
+            self.simulator.transact(self.miner.address, self.contract_address, data, DEPOSIT, 200_000)
+        self.simulator.mine(2)
+
+    def scan(self, scanner, low, high, on_progress=None):
+        async def collect():
+            return [event async for event in scanner.scan(low, high, on_progress)]
+
+        return asyncio.run(collect())
+
+    def test_rejected_ranges_are_split_and_events_stay_ordered(self):
+        for count in (1, 3, 2, 1, 4, 2):
+            self.deposit_block(count)
+        head = self.w3.eth.block_number
+        self.simulator.max_log_block_range = 3
+
+        scanner = LogScanner(
+            self.w3, self.contract_address, initial_chunk_size=8, min_chunk_size=1, max_workers=3, retry_delay=0
+        )
+        progress = []
+        events = self.scan(scanner, 0, head, progress.append)
+
+        self.assertEqual(len(events), 13)
+        keys = [(event["blockNumber"], event["logIndex"]) for event in events]
+        self.assertEqual(keys, sorted(keys))
+        self.assertEqual(len(set(keys)), len(keys))
+        self.assertEqual(scanner.last_scanned_block, head)
+        self.assertEqual(progress, sorted(progress))
+        self.assertEqual(progress[-1], head)
+
+    def test_chunks_grow_while_responses_are_small(self):
+        self.deposit_block(1)
+        self.simulator.mine(20)
+        scanner = LogScanner(self.w3, self.contract_address, initial_chunk_size=1, max_chunk_size=8, max_workers=1)
+        events = self.scan(scanner, 0, self.w3.eth.block_number)
+        self.assertEqual(len(events), 1)
+        self.assertEqual(scanner.chunk_size, 8)
+
+    def test_only_requested_events_are_returned(self):
+        self.deposit_block(2)
+        deposit_only = LogScanner(self.w3, self.contract_address, ("Deposit",))
+        reclaims_only = LogScanner(self.w3, self.contract_address, ("ReclaimProcessStarted",))
+        head = self.w3.eth.block_number
+        self.assertEqual([event["event"] for event in self.scan(deposit_only, 0, head)], ["Deposit"] * 2)
+        self.assertEqual(self.scan(reclaims_only, 0, head), [])
+        with self.assertRaisesRegex(ValueError, "Unknown events: Transfer"):
+            LogScanner(self.w3, self.contract_address, ("Transfer",))
+
+    def test_persistent_errors_are_raised_after_retries(self):
+        scanner = LogScanner(self.w3, self.contract_address, max_retries=2, retry_delay=0)
+        with mock.patch.object(scanner, "_get_logs", side_effect=RuntimeError("node unavailable")) as get_logs:
+            with self.assertRaisesRegex(LogScannerError, "node unavailable"):
+                self.scan(scanner, 0, 10)
+        self.assertEqual(get_logs.call_count, 3)
+        self.assertIsNone(scanner.last_scanned_block)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,124 @@
+import asyncio
+import gc
+import unittest
+import uuid
+import weakref
+from unittest import mock
+
+from web3.exceptions import Web3RPCError
+
+from celium_collateral_contracts.common import (
+    build_and_send_transaction,
+    get_contract,
+    send_transactions_pipelined,
+)
+from celium_collateral_contracts.nonce_manager import (
+    NonceManager,
+    get_nonce_manager,
+    is_already_known_error,
+    is_nonce_error,
+)
+from celium_collateral_contracts.simulator import CollateralSimulator
+
+DEPOSIT = 10 ** 16
+
+
+class TestNonceManager(unittest.TestCase):
+    def setUp(self):
+        self.simulator = CollateralSimulator(timestamp=1_700_000_000)
+        self.trustee = self.simulator.create_account()
+        self.miner = self.simulator.create_account()
+        self.contract_address = self.simulator.deploy_collateral(self.trustee.address)
+        self.w3 = self.simulator.get_web3()
+        self.contract = get_contract(self.w3, self.contract_address)
+
+    def send_out_of_band(self):
+        """Use up a nonce of the miner without the nonce manager knowing."""
+        data = self.contract.functions.deposit(uuid.uuid4().bytes)._encode_transaction_data()
+        self.simulator.transact(self.miner.address, self.contract_address, data, DEPOSIT, 200_000)
+
+    def test_nonces_are_counted_locally_from_the_pending_count(self):
+        self.simulator.automine = False
+        self.send_out_of_band()
+        manager = NonceManager(self.w3, self.miner.address)
+        with mock.patch.object(
+            self.w3.eth, "get_transaction_count", wraps=self.w3.eth.get_transaction_count
+        ) as get_transaction_count:
+            self.assertEqual([manager.allocate() for _ in range(3)], [1, 2, 3])
+        get_transaction_count.assert_called_once_with(self.miner.address, "pending")
+
+    def test_release_reuses_or_resyncs(self):
+        manager = NonceManager(self.w3, self.miner.address)
+        first, second = manager.allocate(), manager.allocate()
+        manager.release(second)
+        self.assertEqual(manager.allocate(), second)
+        # releasing a nonce below the last allocated one leaves a gap only the chain can resolve
+        manager.release(first)
+        self.send_out_of_band()
+        self.assertEqual(manager.allocate(), 1)
+
+    def test_async_allocations_are_unique(self):
+        manager = NonceManager(self.simulator.get_async_web3(), self.miner.address)
+
+        async def allocate_many():
+            return await asyncio.gather(*(manager.async_allocate() for _ in range(10)))
+
+        self.assertEqual(sorted(asyncio.run(allocate_many())), list(range(10)))
+
+    def test_managers_are_shared_per_connection_and_account(self):
+        manager = get_nonce_manager(self.w3, self.miner.address.lower())
+        self.assertIs(get_nonce_manager(self.w3, self.miner.address), manager)
+        self.assertIsNot(get_nonce_manager(self.w3, self.trustee.address), manager)
+        self.assertIsNot(get_nonce_manager(self.simulator.get_web3(), self.miner.address), manager)
+
+    def test_managers_are_released_with_their_connection(self):
+        w3 = self.simulator.get_web3()
+        manager = weakref.ref(get_nonce_manager(w3, self.miner.address))
+        del w3
+        gc.collect()
+        self.assertIsNone(manager())
+
+    def test_stale_nonce_is_recovered_once(self):
+        manager = NonceManager(self.w3, self.miner.address)
+        manager.allocate()
+        manager.release(0)
+        self.send_out_of_band()
+
+        function = self.contract.functions.deposit(uuid.uuid4().bytes)
+        tx_hash = build_and_send_transaction(self.w3, function, self.miner, 200_000, DEPOSIT, nonce_manager=manager)
+        self.assertEqual(self.w3.eth.get_transaction(tx_hash)["nonce"], 1)
+        self.assertEqual(self.w3.eth.get_transaction_receipt(tx_hash)["status"], 1)
+        self.assertEqual(manager.allocate(), 2)
+
+    def test_pipelined_batch_recovers_from_a_stale_nonce(self):
+        functions = [self.contract.functions.deposit(uuid.uuid4().bytes) for _ in range(3)]
+        asyncio.run(send_transactions_pipelined(self.w3, self.miner, functions[:1], values=[DEPOSIT]))
+        self.send_out_of_band()
+
+        outcomes = asyncio.run(send_transactions_pipelined(self.w3, self.miner, functions[1:], values=[DEPOSIT] * 2))
+        self.assertTrue(all(outcome.success for outcome in outcomes))
+        nonces = [self.w3.eth.get_transaction(outcome.tx_hash)["nonce"] for outcome in outcomes]
+        self.assertEqual(nonces, [2, 3])
+
+    def test_send_errors_are_classified(self):
+        self.simulator.automine = False
+        transaction = {
+            "to": self.contract_address, "value": 0, "gas": 100_000, "nonce": 0, "chainId": self.simulator.chain_id,
+            "maxFeePerGas": 2 * 10 ** 9, "maxPriorityFeePerGas": 10 ** 8,
+        }
+        raw_tx = self.miner.sign_transaction(transaction).raw_transaction
+        self.w3.eth.send_raw_transaction(raw_tx)
+        with self.assertRaises(Web3RPCError) as context:
+            self.w3.eth.send_raw_transaction(raw_tx)
+        self.assertTrue(is_already_known_error(context.exception))
+        self.assertFalse(is_nonce_error(context.exception))
+
+        self.simulator.mine()
+        with self.assertRaises(Web3RPCError) as context:
+            self.w3.eth.send_raw_transaction(self.miner.sign_transaction({**transaction, "data": "0x01"}).raw_transaction)
+        self.assertTrue(is_nonce_error(context.exception))
+        self.assertFalse(is_already_known_error(context.exception))
+
+
+if __name__ == "__main__":
+    unittest.main()
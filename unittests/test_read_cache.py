@@ -0,0 +1,144 @@
+import unittest
+import uuid
+from collections import Counter
+
+from celium_collateral_contracts.common import get_contract
+from celium_collateral_contracts.read_cache import get_read_cache, install_read_cache
+from celium_collateral_contracts.simulator import CollateralSimulator
+
+DEPOSIT = 10 ** 16
+CHECKSUM = b"\x00" * 16
+
+
+class TestReadCache(unittest.TestCase):
+    def setUp(self):
+        self.simulator = CollateralSimulator(timestamp=1_700_000_000)
+        self.trustee = self.simulator.create_account()
+        self.miner = self.simulator.create_account()
+        self.contract_address = self.simulator.deploy_collateral(self.trustee.address)
+        self.requests = Counter()
+        request = self.simulator.request
+
+        def counting_request(method, params, request_id=0):
+            self.requests[method] += 1
+            return request(method, params, request_id)
+
+        self.simulator.request = counting_request
+        self.w3 = self.simulator.get_web3()
+        self.contract = get_contract(self.w3, self.contract_address)
+
+    def install(self, **options):
+        cache = install_read_cache(self.w3, **options)
+        self.requests.clear()
+        return cache
+
+    def transact(self, sender, function, value=0):
+        """Send a transaction around the cached instance, mining a block."""
+        return self.simulator.transact(
+            sender.address, self.contract_address, function._encode_transaction_data(), value, 300_000
+        )
+
+    def test_constants_are_cached_forever(self):
+        cache = self.install(block_ttl=0)
+        for _ in range(3):
+            self.assertEqual(self.contract.functions.NETUID().call(), 1)
+            self.w3.eth.chain_id
+            self.simulator.mine()
+        self.assertEqual(self.requests["eth_call"], 1)
+        self.assertEqual(self.requests["eth_chainId"], 1)
+        self.assertEqual(cache.stats.by_method["eth_call"], [2, 1])
+        self.assertEqual(cache.stats.misses, 2)
+        self.assertIs(get_read_cache(self.w3), cache)
+        self.assertIs(install_read_cache(self.w3), cache)
+
+    def test_admin_reads_expire_after_their_ttl(self):
+        cache = self.install(admin_ttl=60)
+        self.assertEqual(self.contract.functions.TRUSTEE().call(), self.trustee.address)
+        self.contract.functions.TRUSTEE().call()
+        self.assertEqual(self.requests["eth_call"], 1)
+
+        cache.admin_ttl = 0
+        cache.clear()
+        self.contract.functions.TRUSTEE().call()
+        self.contract.functions.TRUSTEE().call()
+        self.assertEqual(self.requests["eth_call"], 3)
+
+    def test_latest_reads_expire_with_the_block(self):
+        executor_id = uuid.uuid4().bytes
+        self.install(block_ttl=0)
+        self.assertEqual(self.contract.functions.collaterals(executor_id).call(), 0)
+        self.assertEqual(self.contract.functions.collaterals(executor_id).call(), 0)
+        self.assertEqual(self.requests["eth_call"], 1)
+
+        block_number = self.w3.eth.block_number
+        self.transact(self.miner, self.contract.functions.deposit(executor_id), DEPOSIT)
+        self.assertEqual(self.contract.functions.collaterals(executor_id).call(), DEPOSIT)
+        # reads pinned to a block never change
+        for _ in range(2):
+            self.assertEqual(self.contract.functions.collaterals(executor_id).call(block_identifier=block_number), 0)
+        self.assertEqual(self.requests["eth_call"], 3)
+
+    def test_observed_logs_invalidate_calls_of_their_ids(self):
+        executor_id = uuid.uuid4().bytes
+        other_id = uuid.uuid4().bytes
+        cache = self.install(block_ttl=3600)
+        self.contract.functions.collaterals(executor_id).call()
+        self.contract.functions.collaterals(other_id).call()
+        self.contract.functions.reclaims(1).call()
+
+        tx_hash = self.transact(self.miner, self.contract.functions.deposit(executor_id), DEPOSIT)
+        self.w3.eth.get_transaction_receipt(tx_hash)
+        self.assertEqual(self.contract.functions.collaterals(executor_id).call(), DEPOSIT)
+        self.assertEqual(self.contract.functions.collaterals(other_id).call(), 0)
+        self.assertEqual(cache.stats.invalidations, 1)
+
+        self.transact(self.miner, self.contract.functions.reclaimCollateral(executor_id, "url", CHECKSUM))
+        self.w3.eth.get_logs({"address": self.contract_address, "fromBlock": 0, "toBlock": "latest"})
+        self.assertEqual(self.contract.functions.reclaims(1).call()[2], DEPOSIT)
+        self.assertEqual(self.requests["eth_call"], 5)
+
+    def test_least_recently_used_entries_are_evicted(self):
+        # one of the entries is taken by eth_chainId
+        self.install(block_ttl=3600, max_entries=3)
+        first, second, third = (uuid.uuid4().bytes for _ in range(3))
+        for executor_id in (first, second, first, third, first):
+            self.contract.functions.collaterals(executor_id).call()
+        self.assertEqual(self.requests["eth_call"], 3)
+        self.contract.functions.collaterals(second).call()
+        self.assertEqual(self.requests["eth_call"], 4)
+
+    def test_argument_index_stays_bounded(self):
+        cache = self.install(block_ttl=0, max_entries=5)
+        for _ in range(4):
+            for _ in range(10):
+                self.contract.functions.collaterals(uuid.uuid4().bytes).call()
+            self.simulator.mine()
+            self.w3.eth.block_number
+        # evicted and expired calls leave no keys behind
+        self.assertEqual(len(cache._keys_by_argument), 0)
+        for _ in range(10):
+            self.contract.functions.collaterals(uuid.uuid4().bytes).call()
+        self.assertLessEqual(sum(map(len, cache._keys_by_argument.values())), cache.max_entries)
+        self.assertEqual(
+            set().union(*cache._keys_by_argument.values()),
+            {key for key, entry in cache._entries.items() if entry[3] is not None},
+        )
+
+    def test_errors_are_not_cached(self):
+        self.install(block_ttl=3600)
+        collaterals = self.simulator.contract.collaterals
+
+        def unavailable(call, *args):
+            raise RuntimeError("node unavailable")
+
+        self.simulator.contract.collaterals = unavailable
+        executor_id = uuid.uuid4().bytes
+        with self.assertRaisesRegex(Exception, "node unavailable"):
+            self.contract.functions.collaterals(executor_id).call()
+        self.simulator.contract.collaterals = collaterals
+        self.assertEqual(self.contract.functions.collaterals(executor_id).call(), 0)
+        self.assertEqual(self.requests["eth_call"], 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
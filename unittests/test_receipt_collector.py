@@ -0,0 +1,155 @@
+import asyncio
+import unittest
+import uuid
+from unittest import mock
+
+from hexbytes import HexBytes
+from web3.exceptions import TimeExhausted
+
+from celium_collateral_contracts.common import get_contract
+from celium_collateral_contracts.read_cache import install_read_cache
+from celium_collateral_contracts.receipt_collector import ReceiptCollector, decode_receipt_events
+from celium_collateral_contracts.simulator import AsyncSimulatorProvider, CollateralSimulator, SimulatorProvider
+
+DEPOSIT = 10 ** 16
+
+
+class TestReceiptCollector(unittest.TestCase):
+    def setUp(self):
+        self.simulator = CollateralSimulator(timestamp=1_700_000_000, automine=False)
+        self.trustee = self.simulator.create_account()
+        self.miner = self.simulator.create_account()
+        self.contract_address = self.simulator.deploy_collateral(self.trustee.address)
+        self.w3 = self.simulator.get_web3()
+        self.contract = get_contract(self.w3, self.contract_address)
+
+    def send_deposits(self, count):
+        tx_hashes = []
+        for _ in range(count):
+            data = self.contract.functions.deposit(uuid.uuid4().bytes)._encode_transaction_data()
+            tx_hashes.append(self.simulator.transact(self.miner.address, self.contract_address, data, DEPOSIT, 200_000))
+        return tx_hashes
+
+    async def collect(self, collector, tx_hashes):
+        """Wait for the receipts, mining the transactions after the first lookup."""
+        receipts = asyncio.ensure_future(collector.wait_all(tx_hashes, timeout=10))
+        await asyncio.sleep(0.05)
+        self.simulator.mine()
+        return await receipts
+
+    def test_receipts_are_fetched_in_one_batch_per_block(self):
+        tx_hashes = self.send_deposits(5)
+        found = []
+
+        async def on_receipts(receipts):
+            found.append(len(receipts))
+
+        async def run():
+            async with ReceiptCollector(self.w3, poll_interval=0.01, batch_size=3, on_receipts=on_receipts) as collector:
+                return await self.collect(collector, tx_hashes)
+
+        with mock.patch.object(
+            SimulatorProvider, "make_batch_request", autospec=True, side_effect=SimulatorProvider.make_batch_request
+        ) as make_batch_request, mock.patch.object(self.w3.eth, "get_transaction_receipt") as get_transaction_receipt:
+            receipts = asyncio.run(run())
+
+        self.assertEqual([receipt["transactionHash"] for receipt in receipts], [HexBytes(h) for h in tx_hashes])
+        self.assertTrue(all(receipt["status"] == 1 for receipt in receipts))
+        self.assertEqual(found, [5])
+        # one lookup before the block was mined and one after, 2 chunks each
+        self.assertEqual(make_batch_request.call_count, 4)
+        get_transaction_receipt.assert_not_called()
+
+    def test_async_web3_and_providers_without_batching(self):
+        for w3 in (self.simulator.get_async_web3(), self.simulator.get_web3()):
+            provider = AsyncSimulatorProvider if w3.provider.is_async else SimulatorProvider
+            with self.subTest(backend=type(w3).__name__), mock.patch.object(
+                provider, "make_batch_request", side_effect=NotImplementedError
+            ):
+                tx_hashes = self.send_deposits(2)
+
+                async def run():
+                    async with ReceiptCollector(w3, poll_interval=0.01) as collector:
+                        return await self.collect(collector, tx_hashes)
+
+                receipts = asyncio.run(run())
+                self.assertEqual([receipt["transactionHash"] for receipt in receipts], [HexBytes(h) for h in tx_hashes])
+
+    def test_missing_transactions_time_out(self):
+        tx_hashes = self.send_deposits(1) + ["0x" + "11" * 32]
+
+        async def run():
+            async with ReceiptCollector(self.w3, poll_interval=0.01) as collector:
+                receipts = asyncio.ensure_future(collector.wait_all(tx_hashes, timeout=0.3, return_exceptions=True))
+                await asyncio.sleep(0.05)
+                self.simulator.mine()
+                return await receipts
+
+        receipt, error = asyncio.run(run())
+        self.assertEqual(receipt["status"], 1)
+        self.assertIsInstance(error, TimeExhausted)
+
+    def test_unresolved_entries_leave_their_neighbours_resolved(self):
+        first, second, third = self.send_deposits(3)
+        missing = "0x" + "11" * 32
+        request = self.simulator.request
+
+        def failing_request(method, params, request_id=0):
+            if method == "eth_getTransactionReceipt" and params[0] == HexBytes(second).to_0x_hex():
+                return {"jsonrpc": "2.0", "id": request_id, "error": {"code": -32000, "message": "unavailable"}}
+            return request(method, params, request_id)
+
+        async def run():
+            async with ReceiptCollector(self.w3, poll_interval=0.01) as collector:
+                futures = [collector.watch(tx_hash) for tx_hash in (first, missing, second, third)]
+                self.simulator.mine()
+                await asyncio.wait_for(asyncio.gather(futures[0], futures[3]), 5)
+                await asyncio.sleep(0.05)
+                return [future.done() for future in futures], futures[0].result(), futures[3].result()
+
+        with mock.patch.object(self.simulator, "request", failing_request):
+            done, first_receipt, third_receipt = asyncio.run(run())
+        self.assertEqual(done, [True, False, False, True])
+        self.assertEqual(first_receipt["transactionHash"], HexBytes(first))
+        self.assertEqual(third_receipt["status"], 1)
+
+    def test_batched_receipts_go_through_the_middleware(self):
+        install_read_cache(self.w3, block_ttl=3600)
+        executor_id = uuid.uuid4().bytes
+        self.assertEqual(self.contract.functions.collaterals(executor_id).call(), 0)
+        data = self.contract.functions.deposit(executor_id)._encode_transaction_data()
+        tx_hash = self.simulator.transact(self.miner.address, self.contract_address, data, DEPOSIT, 200_000)
+
+        async def run():
+            async with ReceiptCollector(self.w3, poll_interval=0.01) as collector:
+                return await self.collect(collector, [tx_hash])
+
+        receipt, = asyncio.run(run())
+        self.assertEqual(receipt["status"], 1)
+        # the Deposit log of the batched receipt invalidated the cached call
+        self.assertEqual(self.contract.functions.collaterals(executor_id).call(), DEPOSIT)
+
+    def test_close_cancels_outstanding_receipts(self):
+        tx_hash, = self.send_deposits(1)
+
+        async def run():
+            collector = ReceiptCollector(self.w3, poll_interval=0.01)
+            future = collector.watch(tx_hash)
+            await asyncio.sleep(0.05)
+            await collector.close()
+            return future
+
+        self.assertTrue(asyncio.run(run()).cancelled())
+
+    def test_decode_receipt_events(self):
+        tx_hashes = self.send_deposits(2)
+        self.simulator.mine()
+        receipts = [self.w3.eth.get_transaction_receipt(tx_hash) for tx_hash in tx_hashes]
+        events = decode_receipt_events(self.w3, self.contract_address, receipts)
+        self.assertEqual(list(events), [HexBytes(tx_hash) for tx_hash in tx_hashes])
+        self.assertEqual([event["event"] for events in events.values() for event in events], ["Deposit"] * 2)
+        self.assertEqual(decode_receipt_events(self.w3, self.contract_address, receipts, ("Slashed",)), {})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,111 @@
+import asyncio
+import unittest
+
+from celium_collateral_contracts.executor_states import ReclaimState
+from celium_collateral_contracts.log_scanner import scan_events
+from celium_collateral_contracts.reclaim_tracker import ReclaimTracker
+
+from test_backup_state import DECISION_TIMEOUT, DEPOSIT, CollateralStateTestCase
+
+NOW = 1_800_000_000
+
+
+def reclaim_state(reclaim_request_id, deny_timeout):
+    return ReclaimState(
+        reclaim_request_id=reclaim_request_id,
+        executor_uuid="00000000-0000-0000-0000-000000000000",
+        miner="0x" + "00" * 20,
+        amount=DEPOSIT,
+        deny_timeout=deny_timeout,
+    )
+
+
+class TestReclaimTrackerQueries(unittest.TestCase):
+    def setUp(self):
+        self.now = NOW
+        self.tracker = ReclaimTracker(clock=lambda: self.now)
+        for reclaim_request_id, remaining in ((1, 300), (2, -10), (3, 60), (4, 3600), (5, 60)):
+            self.tracker.add(reclaim_state(reclaim_request_id, NOW + remaining))
+
+    def ids(self, reclaims):
+        return [reclaim.reclaim_request_id for reclaim in reclaims]
+
+    def test_requests_are_ordered_by_deadline(self):
+        self.assertEqual(self.tracker.most_urgent().reclaim_request_id, 2)
+        self.assertEqual(self.ids(self.tracker.expiring_within(300)), [3, 5, 1])
+        self.assertEqual(self.ids(self.tracker.expiring_within(300, include_expired=True)), [2, 3, 5, 1])
+        self.assertEqual(self.ids(self.tracker.expiring_within(0)), [])
+
+        self.tracker.close(2)
+        self.tracker.close(3)
+        self.assertEqual(self.tracker.most_urgent().reclaim_request_id, 5)
+        self.now += 100
+        self.assertEqual(self.ids(self.tracker.expiring_within(3600, include_expired=True)), [5, 1, 4])
+        self.assertEqual(self.ids(self.tracker.expiring_within(3600)), [1, 4])
+
+    def test_closed_requests_are_compacted(self):
+        for reclaim_request_id in range(10, 510):
+            self.tracker.add(reclaim_state(reclaim_request_id, NOW + reclaim_request_id))
+        for reclaim_request_id in range(10, 500):
+            self.assertIsNotNone(self.tracker.close(reclaim_request_id))
+        self.assertIsNone(self.tracker.close(10))
+        self.assertEqual(len(self.tracker), 15)
+        self.assertLessEqual(len(self.tracker._heap), 2 * len(self.tracker) + 64)
+        self.assertEqual(self.ids(self.tracker.expiring_within(505)), [3, 5, 1, 500, 501, 502, 503, 504, 505])
+
+    def test_scheduler_hands_over_due_requests_in_deadline_order(self):
+        handled = []
+
+        async def schedule():
+            async def review(reclaim):
+                handled.append(reclaim.reclaim_request_id)
+                if reclaim.reclaim_request_id == 3:
+                    # arrives while the scheduler is busy, with the earliest deadline
+                    self.tracker.add(reclaim_state(6, NOW + 30))
+                    self.tracker.close(1)
+
+            task = asyncio.create_task(self.tracker.run(review, lead_time=600))
+            await asyncio.sleep(0.05)
+            self.now += 3000
+            self.tracker.add(reclaim_state(7, NOW + 3500))
+            await asyncio.sleep(0.05)
+            task.cancel()
+
+        asyncio.run(schedule())
+        # 2 already expired, 1 closed before its turn, 7 and 4 only due after the clock moved
+        self.assertEqual(handled, [3, 6, 5, 7, 4])
+
+
+class TestReclaimTrackerOnChain(CollateralStateTestCase):
+    def test_tracker_follows_reclaim_events(self):
+        first, second, third = (self.deposit() for _ in range(3))
+        denied = self.reclaim(first)
+        self.simulator.advance_time(10)
+        kept = self.reclaim(second)
+        self.deny(denied)
+
+        tracker = asyncio.run(ReclaimTracker.load(self.w3, self.contract_address, clock=lambda: self.simulator.timestamp))
+        self.assertEqual(list(tracker.open), [kept])
+        self.assertEqual(tracker.most_urgent().executor_uuid, second)
+        seeded_block = tracker.block_number
+
+        finalized = self.reclaim(third)
+        self.finalize(kept)
+        self.finalize(finalized)
+        self.reclaim(self.deposit())
+
+        async def events():
+            return [event async for event in scan_events(self.w3, self.contract_address, 0, self.w3.eth.block_number)]
+
+        history = asyncio.run(events())
+        changed = [tracker.apply_event(event) for event in history]
+        # events up to the seeded block are part of the snapshot
+        self.assertFalse(any(changed[:len([e for e in history if e["blockNumber"] <= seeded_block])]))
+        self.assertFalse(any(tracker.apply_event(event) for event in history))
+        self.assertEqual(list(tracker.open), [finalized + 1])
+        self.assertEqual(tracker.block_number, self.w3.eth.block_number)
+        self.assertEqual(tracker.most_urgent().deny_timeout, self.simulator.timestamp + DECISION_TIMEOUT)
+
+
+if __name__ == "__main__":
+    unittest.main()
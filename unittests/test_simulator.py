@@ -0,0 +1,219 @@
+import asyncio
+import unittest
+import uuid
+from decimal import Decimal
+
+from web3.exceptions import ContractCustomError, ContractPanicError, Web3RPCError
+
+from celium_collateral_contracts.common import (
+    decode_revert_data,
+    get_contract,
+    get_executor_collateral,
+    get_miner_address_of_executor,
+    send_transactions_pipelined,
+)
+from celium_collateral_contracts.deny_request import deny_reclaim_request
+from celium_collateral_contracts.deposit_collateral import deposit_collateral, deposit_collateral_batch
+from celium_collateral_contracts.executor_states import get_executor_states
+from celium_collateral_contracts.finalize_reclaim import FinalizeReclaimError, finalize_reclaim
+from celium_collateral_contracts.get_collaterals import get_deposit_events
+from celium_collateral_contracts.get_reclaim_requests import get_reclaim_process_started_events
+from celium_collateral_contracts.log_scanner import scan_events
+from celium_collateral_contracts.reclaim_collateral import reclaim_collateral
+from celium_collateral_contracts.simulator import CollateralSimulator
+from celium_collateral_contracts.slash_collateral import SlashCollateralError, slash_collateral
+
+DECISION_TIMEOUT = 60
+
+
+class TestCollateralSimulator(unittest.TestCase):
+    def setUp(self):
+        self.simulator = CollateralSimulator(timestamp=1_700_000_000)
+        self.trustee = self.simulator.create_account()
+        self.miner = self.simulator.create_account()
+        self.contract_address = self.simulator.deploy_collateral(
+            self.trustee.address, decision_timeout=DECISION_TIMEOUT
+        )
+        self.w3 = self.simulator.get_web3()
+        self.contract = get_contract(self.w3, self.contract_address)
+
+    def run_async(self, coroutine):
+        return asyncio.run(coroutine)
+
+    def deposit(self, amount_tao=0.01):
+        executor_uuid = str(uuid.uuid4())
+        self.run_async(deposit_collateral(self.w3, self.miner, amount_tao, self.contract_address, executor_uuid))
+        return executor_uuid
+
+    def reclaim(self, executor_uuid):
+        _, event = self.run_async(reclaim_collateral(self.w3, self.miner, self.contract_address, "url", executor_uuid))
+        return event["args"]["reclaimRequestId"]
+
+    def test_deposit_assigns_executor(self):
+        executor_uuid = self.deposit()
+        self.assertEqual(get_executor_collateral(self.w3, self.contract_address, executor_uuid), Decimal("0.01"))
+        self.assertEqual(
+            get_miner_address_of_executor(self.w3, self.contract_address, executor_uuid), self.miner.address
+        )
+
+    def test_deposit_below_minimum_reverts_with_custom_error(self):
+        with self.assertRaises(ContractCustomError) as context:
+            self.contract.functions.deposit(uuid.uuid4().bytes).call({"from": self.miner.address, "value": 1})
+        self.assertEqual(decode_revert_data(context.exception.data).name, "InsufficientAmount")
+
+    def test_finalize_waits_for_deny_timeout(self):
+        executor_uuid = self.deposit()
+        reclaim_request_id = self.reclaim(executor_uuid)
+        with self.assertRaisesRegex(FinalizeReclaimError, "BeforeDenyTimeout"):
+            self.run_async(finalize_reclaim(self.w3, self.miner, reclaim_request_id, self.contract_address))
+
+        balance = self.w3.eth.get_balance(self.miner.address)
+        self.simulator.advance_time(DECISION_TIMEOUT + 1)
+        self.run_async(finalize_reclaim(self.w3, self.miner, reclaim_request_id, self.contract_address))
+        self.assertEqual(get_executor_collateral(self.w3, self.contract_address, executor_uuid), 0)
+        self.assertGreater(self.w3.eth.get_balance(self.miner.address), balance)
+
+    def test_deny_then_slash(self):
+        executor_uuid = self.deposit()
+        reclaim_request_id = self.reclaim(executor_uuid)
+        self.run_async(deny_reclaim_request(self.w3, self.trustee, reclaim_request_id, "url", self.contract_address))
+        self.assertEqual(self.contract.functions.reclaims(reclaim_request_id).call()[2], 0)
+
+        with self.assertRaisesRegex(SlashCollateralError, "NotTrustee"):
+            self.run_async(slash_collateral(self.w3, self.miner, self.contract_address, "url", executor_uuid))
+        self.run_async(slash_collateral(self.w3, self.trustee, self.contract_address, "url", executor_uuid))
+        self.assertEqual(get_executor_collateral(self.w3, self.contract_address, executor_uuid), 0)
+
+    def test_reverted_transaction_keeps_state(self):
+        executor_uuid = self.deposit()
+        reclaim_request_id = self.reclaim(executor_uuid)
+        self.run_async(slash_collateral(self.w3, self.trustee, self.contract_address, "url", executor_uuid))
+        self.simulator.advance_time(DECISION_TIMEOUT + 1)
+        with self.assertRaisesRegex(FinalizeReclaimError, "InsufficientCollateralForReclaim"):
+            self.run_async(finalize_reclaim(self.w3, self.miner, reclaim_request_id, self.contract_address))
+        # the reclaim is still recorded because the whole call reverted
+        self.assertGreater(self.contract.functions.reclaims(reclaim_request_id).call()[2], 0)
+
+    def test_calls_read_historical_state(self):
+        executor_uuid = self.deposit()
+        block_number = self.w3.eth.block_number
+        self.run_async(slash_collateral(self.w3, self.trustee, self.contract_address, "url", executor_uuid))
+        executor_id = uuid.UUID(executor_uuid).bytes
+        self.assertGreater(self.contract.functions.collaterals(executor_id).call(block_identifier=block_number), 0)
+        self.assertEqual(self.contract.functions.collaterals(executor_id).call(), 0)
+
+    def test_events_and_log_range_limit(self):
+        self.simulator.max_log_block_range = 5
+        executor_uuids = [self.deposit() for _ in range(6)]
+        self.reclaim(executor_uuids[0])
+        with self.assertRaises(Web3RPCError):
+            self.w3.eth.get_logs({"address": self.contract_address, "fromBlock": 0, "toBlock": "latest"})
+
+        latest = self.w3.eth.block_number
+
+        async def scan():
+            return [event async for event in scan_events(
+                self.w3, self.contract_address, 0, latest, initial_chunk_size=100, min_chunk_size=1
+            )]
+
+        self.assertEqual(len(self.run_async(scan())), 7)
+
+        self.simulator.max_log_block_range = None
+        deposits = self.run_async(get_deposit_events(self.w3, self.contract_address, 0, latest))
+        self.assertEqual(len(deposits), len(executor_uuids))
+        self.assertTrue(all(event.account == self.miner.address for event in deposits))
+        reclaims = self.run_async(get_reclaim_process_started_events(self.w3, self.contract_address, 0, latest))
+        self.assertEqual([event.executor_uuid for event in reclaims], executor_uuids[:1])
+
+    def test_pipelined_deposits_share_a_block(self):
+        self.simulator.automine = False
+        executor_uuids = [str(uuid.uuid4()) for _ in range(5)]
+        nonce = self.w3.eth.get_transaction_count(self.miner.address)
+
+        async def deposit_batch():
+            task = asyncio.ensure_future(deposit_collateral_batch(
+                self.w3, self.miner, [(executor_uuid, 0.01) for executor_uuid in executor_uuids],
+                self.contract_address,
+            ))
+            # mine once every deposit is in the pool
+            while self.w3.eth.get_transaction_count(self.miner.address, "pending") < nonce + len(executor_uuids):
+                await asyncio.sleep(0.01)
+            self.simulator.mine()
+            return await task
+
+        results = self.run_async(deposit_batch())
+        self.assertTrue(all(event is not None for event, _ in results))
+        self.assertEqual(len({receipt["blockNumber"] for _, receipt in results}), 1)
+        states = get_executor_states(self.w3, self.contract_address, executor_uuids)
+        self.assertTrue(all(state.miner == self.miner.address for state in states.values()))
+
+    def test_nonce_and_replacement_rules(self):
+        self.simulator.automine = False
+        transaction = {
+            "to": self.contract_address, "value": 0, "gas": 100_000, "nonce": 0, "chainId": self.simulator.chain_id,
+            "maxFeePerGas": 2 * 10 ** 9, "maxPriorityFeePerGas": 10 ** 8,
+        }
+        self.w3.eth.send_raw_transaction(self.miner.sign_transaction(transaction).raw_transaction)
+        with self.assertRaisesRegex(Web3RPCError, "underpriced"):
+            self.w3.eth.send_raw_transaction(
+                self.miner.sign_transaction({**transaction, "data": "0x01"}).raw_transaction
+            )
+        self.simulator.mine()
+        with self.assertRaisesRegex(Web3RPCError, "nonce too low"):
+            self.w3.eth.send_raw_transaction(
+                self.miner.sign_transaction({**transaction, "data": "0x01"}).raw_transaction
+            )
+
+    def test_send_transactions_pipelined_reports_reverts(self):
+        executor_id = uuid.uuid4().bytes
+        functions = [
+            self.contract.functions.deposit(executor_id),
+            self.contract.functions.slashCollateral(executor_id, "url", b"\x00" * 16),
+        ]
+        outcomes = self.run_async(send_transactions_pipelined(
+            self.w3, self.miner, functions, gas_limit=200000, values=[10 ** 16, 0]
+        ))
+        self.assertTrue(outcomes[0].success)
+        self.assertFalse(outcomes[1].success)
+
+    def test_reclaim_underflow_panics(self):
+        # a reclaim left pending by a slash exceeds the new deposit
+        executor_uuid = self.deposit(0.02)
+        self.reclaim(executor_uuid)
+        self.run_async(slash_collateral(self.w3, self.trustee, self.contract_address, "url", executor_uuid))
+        self.run_async(deposit_collateral(self.w3, self.miner, 0.01, self.contract_address, executor_uuid))
+        function = self.contract.functions.reclaimCollateral(uuid.UUID(executor_uuid).bytes, "url", b"\x00" * 16)
+        with self.assertRaises(ContractPanicError) as context:
+            function.call({"from": self.miner.address})
+        self.assertEqual(decode_revert_data(context.exception.data).args, {"code": 0x11})
+
+    def test_unexpected_errors_fail_one_transaction(self):
+        def broken(call, *args):
+            raise RuntimeError("model bug")
+
+        executor_id = uuid.uuid4().bytes
+        self.simulator.contract.slashCollateral = broken
+        self.simulator.contract.collaterals = broken
+        self.simulator.automine = False
+        deposit = self.contract.functions.deposit(executor_id)._encode_transaction_data()
+        slash = self.contract.functions.slashCollateral(executor_id, "url", b"\x00" * 16)._encode_transaction_data()
+        deposit_hash = self.simulator.transact(self.miner.address, self.contract_address, deposit, 10 ** 16, 100_000)
+        slash_hash = self.simulator.transact(self.trustee.address, self.contract_address, slash, 0, 100_000)
+        self.simulator.mine()
+
+        self.assertEqual(self.w3.eth.get_transaction_receipt(deposit_hash)["status"], 1)
+        self.assertEqual(self.w3.eth.get_transaction_receipt(slash_hash)["status"], 0)
+        with self.assertRaisesRegex(Web3RPCError, "model bug"):
+            self.contract.functions.collaterals(executor_id).call()
+
+    def test_block_timestamps_are_controlled(self):
+        start = self.w3.eth.get_block("latest")["timestamp"]
+        self.simulator.mine()
+        self.assertEqual(self.w3.eth.get_block("latest")["timestamp"], start + self.simulator.block_time)
+        self.simulator.set_next_block_timestamp(start + 1000)
+        self.w3.provider.make_request("evm_mine", [])
+        self.assertEqual(self.w3.eth.get_block("latest")["timestamp"], start + 1000)
+
+
+if __name__ == "__main__":
+    unittest.main()
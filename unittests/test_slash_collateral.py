@@ -0,0 +1,23 @@
+import asyncio
+import contextlib
+import io
+import sys
+import unittest
+from unittest import mock
+
+from celium_collateral_contracts.slash_collateral import main
+
+
+class TestSlashCollateralCli(unittest.TestCase):
+    def test_requires_an_executor(self):
+        argv = ["slash_collateral.py", "--contract-address", "0x" + "00" * 20, "--url", "url"]
+        stderr = io.StringIO()
+        with mock.patch.object(sys, "argv", argv), contextlib.redirect_stderr(stderr):
+            with self.assertRaises(SystemExit) as context:
+                asyncio.run(main())
+        self.assertEqual(context.exception.code, 2)
+        self.assertIn("--executor-uuid or --executor-uuids-file", stderr.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()